@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+API Documentation Artifacts for NetBox MCP Server
+
+The OpenAPI spec (JSON and YAML) and the Postman collection only change when
+the tools change. They are rendered once per registry version and kept as
+bytes, pre-compressed with gzip and, if the brotli package is installed,
+brotli. Each representation has a strong ETag, so clients polling the
+documentation endpoints get 304 Not Modified until the tools change.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from .openapi_generator import OpenAPIConfig, OpenAPIGenerator
+from .registry import get_registry_version
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Content encodings in order of preference
+ENCODINGS = ("br", "gzip", "identity")
+
+# OpenAPI spec configuration served by the API
+OPENAPI_CONFIG = OpenAPIConfig(
+    title="NetBox MCP Server API",
+    description="Production-ready Model Context Protocol server for NetBox automation with 142+ enterprise-grade tools",
+    version="1.0.0",
+    server_url="http://localhost:8000"
+)
+
+# Postman collection configuration served by the API
+POSTMAN_CONFIG = OpenAPIConfig(
+    title="NetBox MCP Server API",
+    version="1.0.0",
+    server_url="http://localhost:8000"
+)
+
+
+@dataclass
+class Artifact:
+    """A rendered document in each available content encoding."""
+
+    media_type: str
+    bodies: Dict[str, bytes] = field(default_factory=dict)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def render(cls, media_type: str, body: bytes) -> "Artifact":
+        """Compress body and tag every encoding."""
+        artifact = cls(media_type=media_type)
+        artifact.bodies["identity"] = body
+        artifact.bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if BROTLI_AVAILABLE:
+            artifact.bodies["br"] = brotli.compress(body)
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        for encoding in artifact.bodies:
+            suffix = "" if encoding == "identity" else f"-{encoding}"
+            artifact.etags[encoding] = f'"{digest}{suffix}"'
+        return artifact
+
+    def negotiate(self, accept_encoding: Optional[str]) -> str:
+        """The preferred available encoding the client accepts."""
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in self.bodies and (encoding in accepted or "*" in accepted or encoding == "identity"):
+                return encoding
+        return "identity"
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether If-None-Match names any representation of this artifact."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag in tags for tag in self.etags.values())
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Encodings named in an Accept-Encoding header, except those with q=0."""
+    accepted = []
+    for item in (accept_encoding or "").split(","):
+        encoding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if encoding and quality > 0:
+            accepted.append(encoding.lower())
+    return accepted
+
+
+def _render_openapi_json() -> Artifact:
+    spec = OpenAPIGenerator(OPENAPI_CONFIG).generate_spec()
+    body = json.dumps(spec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Artifact.render("application/json", body)
+
+
+def _render_openapi_yaml() -> Artifact:
+    spec = OpenAPIGenerator(OPENAPI_CONFIG).generate_spec()
+    body = yaml.dump(spec, default_flow_style=False, sort_keys=False).encode("utf-8")
+    return Artifact.render("application/x-yaml", body)
+
+
+def _render_postman() -> Artifact:
+    collection = OpenAPIGenerator(POSTMAN_CONFIG).generate_postman_collection()
+    body = json.dumps(collection, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Artifact.render("application/json", body)
+
+
+RENDERERS: Dict[str, Callable[[], Artifact]] = {
+    "openapi.json": _render_openapi_json,
+    "openapi.yaml": _render_openapi_yaml,
+    "postman": _render_postman,
+}
+
+
+class ArtifactStore:
+    """Rendered artifacts of the current registry version."""
+
+    def __init__(self, renderers: Optional[Dict[str, Callable[[], Artifact]]] = None):
+        self.renderers = renderers or RENDERERS
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._artifacts: Dict[str, Artifact] = {}
+        self.renders = 0
+
+    def get(self, name: str) -> Artifact:
+        """
+        Get an artifact, rendering it if the registry changed since it was rendered.
+
+        Args:
+            name: One of the renderer names
+
+        Returns:
+            The rendered artifact
+        """
+        version = get_registry_version()
+        with self._lock:
+            if version != self._version:
+                self._artifacts.clear()
+                self._version = version
+            artifact = self._artifacts.get(name)
+            if artifact is None:
+                artifact = self.renderers[name]()
+                self._artifacts[name] = artifact
+                self.renders += 1
+                logger.info(f"Rendered API artifact {name} for registry version {version[:12]} "
+                            f"({len(artifact.bodies['identity'])} bytes, encodings: {', '.join(artifact.bodies)})")
+            return artifact
+
+
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the global artifact store."""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
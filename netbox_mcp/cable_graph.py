@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Cable Topology Graph for NetBox MCP Server
+
+In-memory graph of every cable termination, built from one streamed cable
+listing and one front-port listing, so multi-hop path traces, connected
+components and failure blast radius are answered without per-hop queries.
+
+**Layout:**
+- Terminations (interfaces, front/rear ports, console and power ports,
+  circuit terminations, ...) are numbered 0..N-1
+- Cable adjacency is stored in CSR form: offsets[n]..offsets[n+1] index the
+  neighbour and cable arrays of node n
+- Front-port/rear-port pass-throughs are kept as position maps, so traces
+  through patch panels follow the same position on the far side
+- Cables created after the build go into an overlay and deleted cables are
+  masked out, so writes never force a rebuild; the overlay is folded into
+  the CSR arrays on the next rebuild
+
+Every termination belongs to an owner (a device, circuit or power panel);
+components and blast radius are computed over owners.
+"""
+
+import logging
+import re
+import threading
+import time
+from array import array
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+TERMINATION_URL = re.compile(r"/api/(?P<app>[^/]+)/(?P<endpoint>[^/]+)/(?P<id>\d+)/?$")
+
+# Owner fields of a termination, in lookup order
+OWNER_FIELDS = (("device", "device", "name"), ("circuit", "circuit", "cid"),
+                ("power_panel", "power_panel", "name"), ("module", "module", "display"))
+
+# Cable IDs per request when fetching cables created since the build
+CABLE_FETCH_CHUNK_SIZE = 100
+
+# Node key: (endpoint label such as "dcim.interfaces", object ID)
+NodeKey = Tuple[str, int]
+
+
+def termination_key(termination: Dict[str, Any]) -> Optional[NodeKey]:
+    """Node key of a termination from its API URL."""
+    match = TERMINATION_URL.search(termination.get("url") or "")
+    if not match:
+        return None
+    return f"{match['app']}.{match['endpoint'].replace('-', '_')}", int(match["id"])
+
+
+def termination_owner(termination: Dict[str, Any]) -> Tuple[str, str]:
+    """Owner key (e.g. "device:12") and display name of a termination."""
+    for field, kind, name_field in OWNER_FIELDS:
+        owner = termination.get(field)
+        if isinstance(owner, dict) and owner.get("id") is not None:
+            return f"{kind}:{owner['id']}", str(owner.get(name_field) or owner.get("display") or owner["id"])
+    key = termination_key(termination)
+    label = f"{key[0]}:{key[1]}" if key else "unknown"
+    return label, str(termination.get("display") or label)
+
+
+class CableGraph:
+    """Termination graph with CSR cable adjacency and a write overlay."""
+
+    def __init__(self):
+        self.node_index: Dict[NodeKey, int] = {}
+        self.node_keys: List[NodeKey] = []
+        self.node_names: List[str] = []
+        self.node_owner: List[str] = []
+        self.owner_names: Dict[str, str] = {}
+        self.owner_nodes: Dict[str, List[int]] = defaultdict(list)
+
+        self.offsets = array("l", [0])
+        self.neighbors = array("l")
+        self.edge_cables = array("l")
+
+        self.overlay: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self.removed_cables: Set[int] = set()
+        self.cable_nodes: Dict[int, Tuple[List[int], List[int]]] = {}
+
+        # front port node -> (rear port node, position); (rear port node, position) -> front port node
+        self.front_to_rear: Dict[int, Tuple[int, int]] = {}
+        self.rear_to_front: Dict[Tuple[int, int], int] = {}
+        self.rear_ports: Set[int] = set()
+        self.built_at = time.time()
+
+    # ----- construction -------------------------------------------------
+
+    def _node(self, termination: Dict[str, Any]) -> Optional[int]:
+        key = termination_key(termination)
+        if key is None:
+            return None
+        node = self.node_index.get(key)
+        if node is None:
+            node = len(self.node_keys)
+            self.node_index[key] = node
+            self.node_keys.append(key)
+            self.node_names.append(str(termination.get("name") or termination.get("display") or key[1]))
+            owner, owner_name = termination_owner(termination)
+            self.node_owner.append(owner)
+            self.owner_names[owner] = owner_name
+            self.owner_nodes[owner].append(node)
+        return node
+
+    def _cable_ends(self, cable: Any) -> Tuple[List[int], List[int]]:
+        ends = []
+        for side in ("a_terminations", "b_terminations"):
+            nodes = [self._node(dict(t)) for t in (getattr(cable, side, None) or [])]
+            ends.append([node for node in nodes if node is not None])
+        return ends[0], ends[1]
+
+    @classmethod
+    def build(cls, cables: Iterable[Any], front_ports: Iterable[Any] = ()) -> "CableGraph":
+        """
+        Build the graph from raw pynetbox cable and front-port records.
+
+        Args:
+            cables: Cable Records with a_terminations/b_terminations
+            front_ports: FrontPort Records with rear_port/rear_port_position
+        """
+        graph = cls()
+        edges: List[Tuple[int, int, int]] = []
+        for cable in cables:
+            a_nodes, b_nodes = graph._cable_ends(cable)
+            graph.cable_nodes[cable.id] = (a_nodes, b_nodes)
+            for a in a_nodes:
+                for b in b_nodes:
+                    edges.append((a, b, cable.id))
+                    edges.append((b, a, cable.id))
+
+        for front_port in front_ports:
+            graph.add_pass_through(dict(front_port))
+
+        graph._compact(edges)
+        return graph
+
+    def _compact(self, edges: List[Tuple[int, int, int]]) -> None:
+        """Lay out directed edges in CSR arrays (counting sort by source)."""
+        node_count = len(self.node_keys)
+        counts = [0] * (node_count + 1)
+        for source, _, _ in edges:
+            counts[source + 1] += 1
+        for i in range(node_count):
+            counts[i + 1] += counts[i]
+
+        neighbors = array("l", [0]) * len(edges)
+        cables = array("l", [0]) * len(edges)
+        cursor = counts[:-1]
+        for source, target, cable_id in edges:
+            neighbors[cursor[source]] = target
+            cables[cursor[source]] = cable_id
+            cursor[source] += 1
+
+        self.offsets = array("l", counts)
+        self.neighbors = neighbors
+        self.edge_cables = cables
+
+    def add_pass_through(self, front_port: Dict[str, Any]) -> None:
+        """Record the rear port and position behind a front port."""
+        rear_port = front_port.get("rear_port")
+        if not isinstance(rear_port, dict):
+            return
+        if not rear_port.get("url"):
+            return
+        front = self._node(front_port)
+        rear = self._node({**rear_port, "device": rear_port.get("device") or front_port.get("device")})
+        if front is None or rear is None:
+            return
+        position = int(front_port.get("rear_port_position") or 1)
+        self.front_to_rear[front] = (rear, position)
+        self.rear_to_front[(rear, position)] = front
+        self.rear_ports.add(rear)
+
+    # ----- incremental updates --------------------------------------------
+
+    def add_cable(self, cable: Any) -> None:
+        """
+        Add a cable created or updated after the build to the overlay.
+
+        An updated cable stays masked in the CSR arrays; its new
+        terminations live in the overlay under the same ID.
+        """
+        self.remove_cable(cable.id)
+        a_nodes, b_nodes = self._cable_ends(cable)
+        self.cable_nodes[cable.id] = (a_nodes, b_nodes)
+        for a in a_nodes:
+            for b in b_nodes:
+                self.overlay[a].append((b, cable.id))
+                self.overlay[b].append((a, cable.id))
+
+    def remove_cable(self, cable_id: int) -> None:
+        """Mask a deleted cable out of the CSR arrays and the overlay."""
+        if self.cable_nodes.pop(cable_id, None) is None:
+            return
+        self.removed_cables.add(cable_id)
+        for node, edges in self.overlay.items():
+            self.overlay[node] = [edge for edge in edges if edge[1] != cable_id]
+
+    # ----- queries ----------------------------------------------------------
+
+    def cable_neighbors(self, node: int) -> List[Tuple[int, int]]:
+        """(far-end node, cable ID) pairs of a node."""
+        result = []
+        if node + 1 < len(self.offsets):
+            for i in range(self.offsets[node], self.offsets[node + 1]):
+                if self.edge_cables[i] not in self.removed_cables:
+                    result.append((self.neighbors[i], self.edge_cables[i]))
+        result.extend(self.overlay.get(node, ()))
+        return result
+
+    def find_node(self, owner: str, name: str) -> Optional[int]:
+        """Node of the termination called name on an owner (e.g. "device:12")."""
+        for node in self.owner_nodes.get(owner, ()):
+            if self.node_names[node] == name:
+                return node
+        return None
+
+    def describe(self, node: int) -> Dict[str, Any]:
+        """Display form of a node."""
+        kind, object_id = self.node_keys[node]
+        return {
+            "type": kind,
+            "id": object_id,
+            "name": self.node_names[node],
+            "owner": self.owner_names[self.node_owner[node]],
+        }
+
+    def trace(self, start: int, max_hops: int = 64) -> Dict[str, Any]:
+        """
+        Follow cables and patch-panel pass-throughs from a termination.
+
+        Entering a rear port through a front port pushes its position, and
+        leaving the far rear port pops it to pick the matching front port,
+        so multiplexed rear ports are traced position by position.
+
+        Returns:
+            Dict with the list of segments, the far end and why the trace stopped
+        """
+        segments = []
+        positions: List[int] = []
+        visited = {start}
+        node = start
+        status = "complete"
+
+        for _ in range(max_hops):
+            far_ends = self.cable_neighbors(node)
+            if not far_ends:
+                # Either nothing is cabled, or a pass-through leads to an uncabled port
+                status = "incomplete" if segments else "not_connected"
+                break
+
+            cable_id = far_ends[0][1]
+            segment = {
+                "from": self.describe(node),
+                "cable": cable_id,
+                "to": [self.describe(far) for far, _ in far_ends],
+            }
+            segments.append(segment)
+            if len(far_ends) > 1:
+                status = "split"
+                break
+
+            far = far_ends[0][0]
+            if far in self.front_to_rear:
+                rear, position = self.front_to_rear[far]
+                positions.append(position)
+                next_node = rear
+            elif far in self.rear_ports:
+                position = positions.pop() if positions else 1
+                next_node = self.rear_to_front.get((far, position))
+                if next_node is None:
+                    status = "incomplete"
+                    break
+            else:
+                break  # Reached an endpoint
+
+            segment["pass_through"] = self.describe(next_node)
+            if next_node in visited:
+                status = "loop"
+                break
+            visited.add(next_node)
+            node = next_node
+        else:
+            status = "max_hops"
+
+        far_end = segments[-1]["to"] if segments else []
+        return {"segments": segments, "far_end": far_end, "status": status}
+
+    def owner_neighbors(self, owner: str) -> Set[str]:
+        """Owners cabled directly to an owner."""
+        result = set()
+        for node in self.owner_nodes.get(owner, ()):
+            for far, _ in self.cable_neighbors(node):
+                if self.node_owner[far] != owner:
+                    result.add(self.node_owner[far])
+        return result
+
+    def components(self, owners: Iterable[str], exclude: Iterable[str] = ()) -> List[List[str]]:
+        """
+        Connected components of a set of owners over cables among them.
+
+        Args:
+            owners: Owners to partition; cables leaving the set are not followed
+            exclude: Owners treated as removed (failed)
+
+        Returns:
+            Components as lists of owners, largest first
+        """
+        allowed = set(owners) - set(exclude)
+        seen: Set[str] = set()
+        result = []
+        for owner in sorted(allowed):
+            if owner in seen:
+                continue
+            component = []
+            queue = deque([owner])
+            seen.add(owner)
+            while queue:
+                current = queue.popleft()
+                component.append(current)
+                for neighbor in self.owner_neighbors(current):
+                    if neighbor in allowed and neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+            result.append(component)
+        result.sort(key=len, reverse=True)
+        return result
+
+    def component_of(self, owner: str) -> Set[str]:
+        """All owners connected to an owner by any chain of cables."""
+        seen = {owner}
+        queue = deque([owner])
+        while queue:
+            for neighbor in self.owner_neighbors(queue.popleft()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self.node_keys),
+            "owners": len(self.owner_nodes),
+            "cables": len(self.cable_nodes),
+            "csr_edges": len(self.neighbors),
+            "overlay_edges": sum(len(edges) for edges in self.overlay.values()),
+            "pass_throughs": len(self.front_to_rear),
+            "age_seconds": round(time.time() - self.built_at, 1),
+        }
+
+
+class CableGraphIndex:
+    """Lazily built, incrementally updated CableGraph for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._graph: Optional[CableGraph] = None
+        self._pending_cables: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def get(self) -> CableGraph:
+        """Return the graph, building it or applying pending cable creates first."""
+        max_age = self.client.config.cache.ttl.devices
+        with self._lock:
+            graph = self._graph
+            if graph is not None and time.time() - graph.built_at >= max_age:
+                graph = None
+            if graph is None:
+                started = time.time()
+                graph = CableGraph.build(self.client.stream("dcim.cables"),
+                                         self.client.stream("dcim.front_ports"))
+                self._graph = graph
+                self._pending_cables.clear()
+                logger.info(f"Built cable graph: {graph.get_stats()} in {time.time() - started:.2f}s")
+            elif self._pending_cables:
+                pending = sorted(self._pending_cables)
+                self._pending_cables.clear()
+                for i in range(0, len(pending), CABLE_FETCH_CHUNK_SIZE):
+                    for cable in self.client.api.dcim.cables.filter(id=pending[i:i + CABLE_FETCH_CHUNK_SIZE]):
+                        graph.add_cable(cable)
+            return graph
+
+    def apply_cable_write(self, record: Optional[Dict[str, Any]] = None, deleted_ids: Iterable[int] = ()) -> None:
+        """
+        Apply a cable write to the loaded graph.
+
+        Deletions are masked immediately. Serialized cables carry only
+        termination IDs, not their types, so created or updated cables are
+        fetched in one batch on the next get().
+        """
+        with self._lock:
+            if self._graph is None:
+                return
+            for cable_id in deleted_ids:
+                self._graph.remove_cable(cable_id)
+                self._pending_cables.discard(cable_id)
+            if record is not None:
+                self._graph.remove_cable(record["id"])
+                self._pending_cables.add(record["id"])
+
+    def clear(self) -> None:
+        """Drop the graph; it is rebuilt on next use."""
+        with self._lock:
+            self._graph = None
+            self._pending_cables.clear()
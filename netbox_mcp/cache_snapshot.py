@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Cache Snapshot Persistence for NetBox MCP Server
+
+Writes the live contents of the CacheManager to a compact binary file on
+shutdown and memory-maps it again on startup, so a restart costs a quick
+reload instead of minutes of cold NetBox traffic.
+
+**File Layout:**
+- Fixed header: magic, codec/compression flags, index length, creation time
+- Index: one [object_type, cache_key, expires_at, offset, length] row per entry
+- Payload: one individually compressed blob per entry
+
+Blobs are compressed individually so entries can be rehydrated lazily, one
+at a time, straight from the memory map when they are first requested.
+
+msgpack and zstandard are used when installed (``pip install netbox-mcp[snapshot]``);
+otherwise the snapshot falls back to JSON and zlib from the standard library.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"NBMCPSN1"
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+COMPRESSION_ZLIB = 0
+COMPRESSION_ZSTD = 1
+
+# magic, codec, compression, reserved, index length, created_at
+_HEADER = struct.Struct("<8sBBHId")
+
+# (object_type, expires_at, offset, length)
+SnapshotIndexEntry = Tuple[str, float, int, int]
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file cannot be written or read."""
+
+
+def _encode(payload: Any, codec: int) -> bytes:
+    """Serialize a payload with the selected codec."""
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True, default=str)
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode(data: bytes, codec: int) -> Any:
+    """Deserialize a payload written with the selected codec."""
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise SnapshotError("Snapshot was written with msgpack, which is not installed")
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data.decode("utf-8"))
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    """Compress a serialized payload."""
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, compression: int) -> bytes:
+    """Decompress a payload blob."""
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SnapshotError("Snapshot was written with zstd, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def default_codec() -> Tuple[int, int]:
+    """Return the best available (codec, compression) pair."""
+    codec = CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+    compression = COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+    return codec, compression
+
+
+def encode_value(value: Any, codec: int, compression: int) -> bytes:
+    """Encode a single cached value into a snapshot blob."""
+    return _compress(_encode(value, codec), compression)
+
+
+def write_snapshot(
+    path: str,
+    entries: Iterable[Tuple[str, str, float, Any]],
+    raw_entries: Iterable[Tuple[str, str, float, bytes]] = (),
+    codec: Optional[int] = None,
+    compression: Optional[int] = None
+) -> int:
+    """
+    Write cache entries to a snapshot file atomically.
+
+    Args:
+        path: Destination file path
+        entries: (object_type, cache_key, expires_at, value) tuples
+        raw_entries: (object_type, cache_key, expires_at, blob) tuples that are
+            already encoded with the given codec/compression (e.g. entries that
+            were restored from a previous snapshot and never rehydrated)
+        codec: Serialization codec (defaults to the best available)
+        compression: Compression algorithm (defaults to the best available)
+
+    Returns:
+        Number of entries written
+    """
+    best_codec, best_compression = default_codec()
+    codec = best_codec if codec is None else codec
+    compression = best_compression if compression is None else compression
+
+    index = []
+    blobs = []
+    offset = 0
+
+    for object_type, cache_key, expires_at, value in entries:
+        blob = encode_value(value, codec, compression)
+        index.append([object_type, cache_key, expires_at, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+
+    for object_type, cache_key, expires_at, blob in raw_entries:
+        index.append([object_type, cache_key, expires_at, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+
+    index_blob = encode_value(index, codec, compression)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, codec, compression, 0, len(index_blob), time.time())
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so a crash mid-write never leaves a torn snapshot
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(index_blob)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise SnapshotError(f"Failed to write cache snapshot to {path}: {e}")
+
+    logger.info(f"Cache snapshot written: {len(index)} entries, {_HEADER.size + len(index_blob) + offset} bytes -> {path}")
+    return len(index)
+
+
+class CacheSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Only the index is decoded when the snapshot is opened; entry payloads stay
+    in the memory map until read_value() or read_blob() is called for them.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and memory-map a snapshot file.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            SnapshotError: If the file is missing, truncated or not a snapshot
+        """
+        self.path = path
+        self._file = None
+        self._mmap = None
+
+        try:
+            self._file = open(path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            self.close()
+            raise SnapshotError(f"Cannot open cache snapshot {path}: {e}")
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise SnapshotError(f"Cache snapshot {path} is truncated")
+
+        magic, codec, compression, _, index_length, created_at = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"{path} is not a NetBox MCP cache snapshot")
+
+        self.codec = codec
+        self.compression = compression
+        self.created_at = created_at
+        self._payload_start = _HEADER.size + index_length
+
+        try:
+            index_blob = self._mmap[_HEADER.size:self._payload_start]
+            rows = _decode(_decompress(index_blob, compression), codec)
+        except SnapshotError:
+            self.close()
+            raise
+        except Exception as e:
+            self.close()
+            raise SnapshotError(f"Cache snapshot {path} has a corrupt index: {e}")
+
+        self.index: Dict[str, SnapshotIndexEntry] = {
+            cache_key: (object_type, expires_at, offset, length)
+            for object_type, cache_key, expires_at, offset, length in rows
+        }
+
+    def read_blob(self, offset: int, length: int) -> bytes:
+        """Return the raw (still compressed) blob for an entry."""
+        start = self._payload_start + offset
+        return self._mmap[start:start + length]
+
+    def read_value(self, offset: int, length: int) -> Any:
+        """Decode and return the cached value for an entry."""
+        return _decode(_decompress(self.read_blob(offset, length), self.compression), self.codec)
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -32,22 +32,38 @@ dynamically routing all requests to the appropriate NetBox API endpoints.
 """
 
 import logging
+import os
 import threading
 import time
-from typing import Dict, List, Optional, Any, Union, TYPE_CHECKING
-from dataclasses import dataclass
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple, Union, TYPE_CHECKING
+from dataclasses import dataclass, field
 
 import pynetbox
 import requests
 from requests.adapters import HTTPAdapter
 from requests import Session
 from cachetools import TTLCache
+from pynetbox.core.app import App
+from pynetbox.core.endpoint import Endpoint
 
 if TYPE_CHECKING:
-    from pynetbox.core.endpoint import Endpoint
     from pynetbox.core.api import Api
 
 from .config import NetBoxConfig
+from .cache_snapshot import CacheSnapshot, SnapshotError, default_codec, write_snapshot
+from .replica import ReplicaStore
+from .ipam_index import VRFIndex
+from .vlan_bitmap import VLANAllocator
+from .rack_index import RackSpaceIndex
+from .cable_graph import CableGraphIndex
+from .power_index import PowerBudgetIndex
+from .name_index import FUZZY_INDEX_FIELDS, FuzzyNameIndex, did_you_mean
+from .tenant_index import TENANT_RESOURCE_ENDPOINTS, TenantRollupIndex
+from .records import choice_value, related_id
 from .exceptions import (
     NetBoxError,
     NetBoxConnectionError,
@@ -61,6 +77,156 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Objects per page for NetBoxClient.stream()
+STREAM_PAGE_SIZE = 1000
+
+# Writes to these endpoints invalidate the IPAM radix indexes
+IPAM_INDEX_MODELS = frozenset({"ipam.prefixes", "ipam.ip_addresses"})
+
+# Changelog model labels applied to the IPAM indexes
+IPAM_INDEX_CHANGE_MODELS = frozenset({"ipam.prefix", "ipam.ipaddress"})
+
+# Writes to these endpoints invalidate the rack occupancy indexes
+RACK_INDEX_MODELS = frozenset({"dcim.devices", "dcim.racks", "dcim.device_types"})
+
+# Writes to these endpoints are applied to the tenant rollup index
+TENANT_ROLLUP_MODELS = frozenset(TENANT_RESOURCE_ENDPOINTS.values())
+
+# Writes to these endpoints (and to cables) invalidate the power budget models
+POWER_INDEX_MODELS = frozenset({"dcim.power_panels", "dcim.power_feeds", "dcim.power_ports", "dcim.power_outlets"})
+
+
+def _build_endpoint_table(schema: Dict[str, Any]) -> Dict[str, frozenset]:
+    """
+    Build the app -> endpoint dispatch table from NetBox's OpenAPI schema.
+    
+    Paths look like "/api/dcim/device-types/{id}/"; the app is the first
+    segment after "/api/" and the endpoint is the second, with dashes mapped
+    to the underscores pynetbox uses for attribute names. Plugin endpoints
+    are nested one level deeper and are left out of the table.
+    
+    Args:
+        schema: Parsed OpenAPI document as returned by pynetbox's api.openapi()
+        
+    Returns:
+        Mapping of app name to the frozenset of its endpoint names
+    """
+    table: Dict[str, set] = defaultdict(set)
+    for path in schema.get("paths", {}):
+        segments = [segment for segment in path.strip("/").split("/") if segment]
+        if len(segments) < 3 or segments[0] != "api" or segments[1] == "plugins":
+            continue
+        endpoint = segments[2]
+        if endpoint.startswith("{"):
+            continue
+        table[segments[1]].add(endpoint.replace("-", "_"))
+    return {app: frozenset(endpoints) for app, endpoints in table.items()}
+
+
+def _endpoint_matches_model(object_type: str, model: str) -> bool:
+    """
+    Check whether a cache object type refers to a changelog model.
+    
+    Cache object types are built from pynetbox endpoint names (e.g.
+    "dcim.device-types"), while NetBox's changelog reports model labels
+    (e.g. "dcim.devicetype").
+    """
+    app, _, endpoint = object_type.partition(".")
+    model_app, _, model_name = model.partition(".")
+    if app != model_app or not model_name:
+        return False
+    
+    endpoint = endpoint.replace("-", "").replace("_", "")
+    if endpoint in (model_name, f"{model_name}s", f"{model_name}es"):
+        return True
+    return model_name.endswith("y") and endpoint == f"{model_name[:-1]}ies"
+
+
+def _cache_key_shape(cache_key: str) -> str:
+    """
+    Reduce a cache key to its shape by replacing parameter values with '*'.
+    
+    "dcim.devices:name=sw-01:site=ams" -> "dcim.devices:name=*:site=*"
+    Colons inside values (IPv6 addresses) are folded into the preceding parameter.
+    """
+    shape = []
+    in_params = False
+    for part in cache_key.split(":"):
+        if "=" in part:
+            shape.append(f"{part.split('=', 1)[0]}=*")
+            in_params = True
+        elif not in_params:
+            shape.append(part)
+    return ":".join(shape)
+
+
+# Containers with more items than this are sized from an evenly spaced sample
+SIZE_SAMPLE_ITEMS = 16
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Estimate the JSON size of a cached value in bytes without serializing it.
+    
+    Small values are measured exactly (string escaping aside); long lists and
+    dicts are extrapolated from a sample of SIZE_SAMPLE_ITEMS items, so the
+    cost does not grow with the size of the value.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if value is None or isinstance(value, bool):
+        return 5 if value is False else 4
+    if isinstance(value, (int, float)):
+        return len(repr(value))
+    if isinstance(value, dict):
+        count = len(value)
+        if count == 0:
+            return 2
+        sample = value.items() if count <= SIZE_SAMPLE_ITEMS else list(islice(value.items(), SIZE_SAMPLE_ITEMS))
+        sampled = sum(len(str(key)) + 4 + _estimate_size(item) for key, item in sample)
+        return 2 + sampled * count // len(sample) + 2 * (count - 1)
+    if isinstance(value, (list, tuple)):
+        count = len(value)
+        if count == 0:
+            return 2
+        if count <= SIZE_SAMPLE_ITEMS:
+            sample = value
+        else:
+            step = count / SIZE_SAMPLE_ITEMS
+            sample = [value[int(i * step)] for i in range(SIZE_SAMPLE_ITEMS)]
+        sampled = sum(_estimate_size(item) for item in sample)
+        return 2 + sampled * count // len(sample) + 2 * (count - 1)
+    return len(str(value)) + 2
+
+
+def _new_type_stats() -> Dict[str, Any]:
+    """Counters tracked per cached object type."""
+    return {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "sets": 0,
+        "fetches": 0,
+        "fetch_seconds": 0.0,
+        "changes": 0,
+        "first_seen": time.time(),
+        "last_change": None,
+    }
+
+
+class _TrackedTTLCache(TTLCache):
+    """TTLCache that reports capacity evictions (not expirations) to a callback."""
+    
+    def __init__(self, maxsize: int, ttl: int, on_evict: Optional[Callable[[str], None]] = None):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._on_evict = on_evict
+    
+    def popitem(self):
+        key, value = super().popitem()
+        if self._on_evict is not None:
+            self._on_evict(key)
+        return key, value
+
 
 @dataclass
 class ConnectionStatus:
@@ -75,6 +241,23 @@ class ConnectionStatus:
     error: Optional[str] = None
 
 
+@dataclass
+class Lookup:
+    """
+    A reference to resolve with NetBoxClient.resolve_all().
+    
+    The value is tried against each field in turn (e.g. name, then slug) and
+    the first non-empty result wins.
+    """
+    endpoint: str                                  # "app.endpoint", e.g. "dcim.sites"
+    value: Any
+    fields: Tuple[str, ...] = ("name", "slug")
+    filters: Dict[str, Any] = field(default_factory=dict)
+    required: bool = True
+    all_matches: bool = False                      # Return every match instead of the first
+    label: Optional[str] = None                    # Used in not-found messages, e.g. "Site"
+
+
 class CacheManager:
     """
     Cache manager implementing Gemini's caching strategy.
@@ -102,6 +285,25 @@ class CacheManager:
         # Add thread safety lock
         self.lock = threading.Lock()
         
+        # Wall-clock expiry per key, used to carry remaining TTLs into snapshots
+        self._expires_at: Dict[str, float] = {}
+        
+        # Entries restored from a snapshot, rehydrated lazily on first access:
+        # cache_key -> [object_type, expires_at, offset, length, value]
+        self._restored: Dict[str, list] = {}
+        self._snapshot: Optional[CacheSnapshot] = None
+        self.snapshot_created_at: Optional[float] = None
+        
+        # Per-object-type and per-key-shape analytics
+        self._type_stats: Dict[str, Dict[str, Any]] = defaultdict(_new_type_stats)
+        self._shape_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._entry_bytes: Dict[str, int] = {}
+        
+        # TTLs chosen by the auto-tuner, by object type
+        self.ttl_overrides: Dict[str, int] = {}
+        self._last_auto_tune = time.time()
+        self._per_type_cache_size = config.cache.max_items
+        
         if self.enabled:
             logger.info("Cache is enabled. Initializing per-type TTL caches.")
             
@@ -116,10 +318,15 @@ class CacheManager:
             
             for obj_type, ttl in object_types:
                 cache_size = config.cache.max_items // len(object_types) if object_types else config.cache.max_items
-                self.caches[obj_type] = TTLCache(maxsize=cache_size, ttl=ttl)
+                self.caches[obj_type] = _TrackedTTLCache(maxsize=cache_size, ttl=ttl, on_evict=self._record_eviction)
+                self._per_type_cache_size = cache_size
             
             # Default cache for other object types
-            self.default_cache = TTLCache(maxsize=config.cache.max_items // 4, ttl=config.cache.ttl.default)
+            self.default_cache = _TrackedTTLCache(
+                maxsize=config.cache.max_items // 4,
+                ttl=config.cache.ttl.default,
+                on_evict=self._record_eviction
+            )
             
             logger.info(f"Cache initialized: enabled={self.enabled}, max_items={config.cache.max_items}, caches={len(self.caches)}")
         else:
@@ -163,6 +370,8 @@ class CacheManager:
             "health": self.config.cache.ttl.health
         }
         
+        if object_type in self.ttl_overrides:
+            return self.ttl_overrides[object_type]
         return type_mapping.get(object_type, self.config.cache.ttl.default)
     
     def get(self, cache_key: str, object_type: str) -> Optional[Any]:
@@ -182,19 +391,38 @@ class CacheManager:
                 # Check if item exists and is not expired
                 if cache_key in cache:
                     self.stats["hits"] += 1
+                    self._record_lookup(object_type, cache_key, hit=True)
                     logger.debug(f"Cache HIT: {cache_key}")
                     return cache[cache_key]
-                else:
-                    self.stats["misses"] += 1
-                    logger.debug(f"Cache MISS: {cache_key}")
-                    return None
+                
+                # Fall back to entries restored from a snapshot
+                if self._restored:
+                    value = self._get_restored(cache_key)
+                    if value is not None:
+                        self.stats["hits"] += 1
+                        self._record_lookup(object_type, cache_key, hit=True)
+                        logger.debug(f"Cache HIT (snapshot): {cache_key}")
+                        return value
+                
+                self.stats["misses"] += 1
+                self._record_lookup(object_type, cache_key, hit=False)
+                logger.debug(f"Cache MISS: {cache_key}")
+                return None
                 
         except Exception as e:
             logger.warning(f"Cache get error for key {cache_key}: {e}")
             return None
     
-    def set(self, cache_key: str, value: Any, object_type: str) -> None:
-        """Set item in cache with object-specific TTL."""
+    def set(self, cache_key: str, value: Any, object_type: str, fetch_seconds: Optional[float] = None) -> None:
+        """
+        Set item in cache with object-specific TTL.
+        
+        Args:
+            cache_key: Key generated by generate_cache_key()
+            value: Serialized value to cache
+            object_type: NetBox object type used to select the cache
+            fetch_seconds: Time the API call producing this value took (for analytics)
+        """
         if not self.enabled:
             logger.debug(f"Cache SET SKIPPED: cache disabled")
             return
@@ -218,6 +446,17 @@ class CacheManager:
                 
                 # Store in appropriate TTL cache
                 cache[cache_key] = value
+                self._expires_at[cache_key] = time.time() + cache.ttl
+                self._restored.pop(cache_key, None)
+                if len(self._expires_at) > 2 * self.config.cache.max_items:
+                    self._prune_expiry_index()
+                
+                if self.config.cache.enable_stats:
+                    self._record_set(object_type, cache_key, value, fetch_seconds)
+                
+                if self.config.cache.auto_tune_ttl and \
+                        time.time() - self._last_auto_tune >= self.config.cache.auto_tune_interval:
+                    self._auto_tune_ttls_locked()
                 
                 logger.debug(f"Cache SET SUCCESS: {cache_key} in {object_type} cache (size after: {len(cache)})")
                 
@@ -258,6 +497,12 @@ class CacheManager:
                         del cache[key]
                         self.stats["invalidations"] += 1
                         total_invalidated += 1
+                
+                total_invalidated += self._discard_restored_locked(lambda key: pattern in key)
+                
+                # Type-level invalidations (e.g. "dcim.devices" after a write) signal a change
+                if "." in pattern and ":" not in pattern:
+                    self._record_change(pattern)
             
             logger.debug(f"Cache invalidated {total_invalidated} entries matching pattern: {pattern}")
             return total_invalidated
@@ -315,6 +560,11 @@ class CacheManager:
                         del cache[key]
                         self.stats["invalidations"] += 1
                         total_invalidated += 1
+                
+                total_invalidated += self._discard_restored_locked(
+                    lambda key: any(pattern in key for pattern in patterns_to_check)
+                )
+                self._record_change(object_type)
             
             logger.debug(f"Cache invalidated {total_invalidated} entries for {object_type} ID {object_id}")
             return total_invalidated
@@ -331,8 +581,13 @@ class CacheManager:
                     cache.clear()
                 if self.default_cache:
                     self.default_cache.clear()
+                self._expires_at.clear()
+                self._entry_bytes.clear()
+                self._discard_restored_locked()
                 # Reset stats
                 self.stats.update({"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0})
+                self._type_stats.clear()
+                self._shape_stats.clear()
             logger.info("Cache cleared")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -354,8 +609,373 @@ class CacheManager:
                 "size": total_size,
                 "max_size": self.config.cache.max_items,
                 "hit_ratio_percent": round(hit_ratio, 2),
+                "snapshot_entries": len(self._restored),
                 **self.stats.copy()  # Return copy to avoid external modifications
             }
+    
+    # ANALYTICS AND TTL AUTO-TUNING
+    # =====================================================================
+    
+    def _record_lookup(self, object_type: str, cache_key: str, hit: bool) -> None:
+        """Count a lookup per object type and key shape (caller holds the lock)."""
+        if not self.config.cache.enable_stats:
+            return
+        field_name = "hits" if hit else "misses"
+        self._type_stats[object_type][field_name] += 1
+        self._shape_stats[_cache_key_shape(cache_key)][field_name] += 1
+    
+    def _record_set(self, object_type: str, cache_key: str, value: Any, fetch_seconds: Optional[float]) -> None:
+        """Track entry size and fetch latency for a stored value (caller holds the lock)."""
+        type_stats = self._type_stats[object_type]
+        type_stats["sets"] += 1
+        if fetch_seconds is not None:
+            type_stats["fetches"] += 1
+            type_stats["fetch_seconds"] += fetch_seconds
+        self._entry_bytes[cache_key] = _estimate_size(value)
+    
+    def _record_eviction(self, cache_key: str) -> None:
+        """Callback from _TrackedTTLCache when capacity forces an eviction (lock held by set())."""
+        self.stats["evictions"] += 1
+        if self.config.cache.enable_stats:
+            self._type_stats[cache_key.split(":", 1)[0]]["evictions"] += 1
+        self._expires_at.pop(cache_key, None)
+        self._entry_bytes.pop(cache_key, None)
+    
+    def _record_change(self, object_type: str) -> None:
+        """Record an observed change of an object type (caller holds the lock)."""
+        if not self.config.cache.enable_stats:
+            return
+        type_stats = self._type_stats[object_type]
+        type_stats["changes"] += 1
+        type_stats["last_change"] = time.time()
+    
+    def _current_ttl(self, object_type: str) -> int:
+        """TTL currently applied to entries of an object type."""
+        cache = self.caches.get(object_type, self.default_cache)
+        return int(cache.ttl) if cache is not None else self.config.cache.ttl.default
+    
+    def _apply_ttl_locked(self, object_type: str, ttl: int) -> None:
+        """
+        Give an object type its own TTL cache (caller holds the lock).
+        
+        TTLCache has a fixed TTL, so the type's entries are migrated into a new
+        cache; migrated entries restart their TTL from now.
+        """
+        old_cache = self.caches.get(object_type)
+        new_cache = _TrackedTTLCache(maxsize=self._per_type_cache_size, ttl=ttl, on_evict=self._record_eviction)
+        
+        if old_cache is not None:
+            items = list(old_cache.items())
+        elif self.default_cache is not None:
+            prefix = f"{object_type}:"
+            items = [(key, value) for key, value in list(self.default_cache.items())
+                     if key == object_type or key.startswith(prefix)]
+            for key, _ in items:
+                del self.default_cache[key]
+        else:
+            items = []
+        
+        now = time.time()
+        for key, value in items[-self._per_type_cache_size:]:
+            new_cache[key] = value
+            self._expires_at[key] = now + ttl
+        
+        self.caches[object_type] = new_cache
+        self.ttl_overrides[object_type] = ttl
+    
+    def _auto_tune_ttls_locked(self) -> Dict[str, Dict[str, int]]:
+        """
+        Adjust TTLs from observed change frequency (caller holds the lock).
+        
+        Types that never changed over at least one full TTL get their TTL
+        doubled; types that change more often than their TTL get a TTL of half
+        the mean change interval. Results are clamped to the configured bounds.
+        
+        Returns:
+            Mapping of object type to {"old_ttl", "new_ttl"} for adjusted types
+        """
+        cache_config = self.config.cache
+        now = time.time()
+        self._last_auto_tune = now
+        adjustments = {}
+        
+        for object_type, type_stats in list(self._type_stats.items()):
+            if type_stats["hits"] + type_stats["misses"] < cache_config.auto_tune_min_requests:
+                continue
+            
+            current_ttl = self._current_ttl(object_type)
+            observed_seconds = now - type_stats["first_seen"]
+            
+            if type_stats["changes"] == 0:
+                if observed_seconds < current_ttl:
+                    continue
+                new_ttl = current_ttl * 2
+            else:
+                mean_change_interval = observed_seconds / type_stats["changes"]
+                if mean_change_interval >= current_ttl:
+                    continue
+                new_ttl = int(mean_change_interval / 2)
+            
+            new_ttl = max(cache_config.auto_tune_min_ttl, min(cache_config.auto_tune_max_ttl, new_ttl))
+            if new_ttl != current_ttl:
+                self._apply_ttl_locked(object_type, new_ttl)
+                adjustments[object_type] = {"old_ttl": current_ttl, "new_ttl": new_ttl}
+        
+        if adjustments:
+            logger.info(f"Cache TTL auto-tune adjusted {len(adjustments)} object types: {adjustments}")
+        return adjustments
+    
+    def auto_tune_ttls(self) -> Dict[str, Dict[str, int]]:
+        """
+        Run a TTL auto-tuning pass now.
+        
+        Returns:
+            Mapping of object type to {"old_ttl", "new_ttl"} for adjusted types
+        """
+        if not self.enabled:
+            return {}
+        with self.lock:
+            return self._auto_tune_ttls_locked()
+    
+    def get_cache_analytics(self) -> Dict[str, Any]:
+        """
+        Get per-object-type and per-key-shape cache analytics.
+        
+        Returns:
+            Dictionary with per-type counters (hits, misses, evictions, live bytes,
+            mean fetch latency, change rate, current TTL), per-key-shape hit
+            ratios and the TTL overrides chosen by the auto-tuner
+        """
+        if not self.enabled:
+            return {"enabled": False}
+        
+        with self.lock:
+            now = time.time()
+            live_bytes: Dict[str, int] = defaultdict(int)
+            live_entries: Dict[str, int] = defaultdict(int)
+            all_caches = list(self.caches.values())
+            if self.default_cache is not None:
+                all_caches.append(self.default_cache)
+            for cache in all_caches:
+                for key in cache.keys():
+                    object_type = key.split(":", 1)[0]
+                    live_entries[object_type] += 1
+                    live_bytes[object_type] += self._entry_bytes.get(key, 0)
+            
+            object_types = {}
+            for object_type, type_stats in self._type_stats.items():
+                lookups = type_stats["hits"] + type_stats["misses"]
+                observed_hours = max(now - type_stats["first_seen"], 1.0) / 3600
+                object_types[object_type] = {
+                    "hits": type_stats["hits"],
+                    "misses": type_stats["misses"],
+                    "hit_ratio_percent": round(type_stats["hits"] / lookups * 100, 2) if lookups else 0,
+                    "evictions": type_stats["evictions"],
+                    "entries": live_entries.get(object_type, 0),
+                    "bytes": live_bytes.get(object_type, 0),
+                    "mean_fetch_ms": round(type_stats["fetch_seconds"] / type_stats["fetches"] * 1000, 2)
+                    if type_stats["fetches"] else None,
+                    "changes": type_stats["changes"],
+                    "changes_per_hour": round(type_stats["changes"] / observed_hours, 3),
+                    "ttl": self._current_ttl(object_type),
+                }
+            
+            key_shapes = {
+                shape: {
+                    **counts,
+                    "hit_ratio_percent": round(counts["hits"] / (counts["hits"] + counts["misses"]) * 100, 2)
+                    if counts["hits"] + counts["misses"] else 0
+                }
+                for shape, counts in self._shape_stats.items()
+            }
+            
+            return {
+                "enabled": True,
+                "object_types": object_types,
+                "key_shapes": key_shapes,
+                "ttl_overrides": dict(self.ttl_overrides),
+                "auto_tune": {
+                    "enabled": self.config.cache.auto_tune_ttl,
+                    "interval": self.config.cache.auto_tune_interval,
+                    "min_ttl": self.config.cache.auto_tune_min_ttl,
+                    "max_ttl": self.config.cache.auto_tune_max_ttl,
+                    "last_run": datetime.fromtimestamp(self._last_auto_tune, tz=timezone.utc).isoformat(),
+                },
+            }
+    
+    # SNAPSHOT PERSISTENCE
+    # =====================================================================
+    
+    def _get_restored(self, cache_key: str) -> Optional[Any]:
+        """Rehydrate a snapshot entry on first access (caller holds the lock)."""
+        entry = self._restored.get(cache_key)
+        if entry is None:
+            return None
+        
+        object_type, expires_at, offset, length, value = entry
+        if time.time() >= expires_at:
+            del self._restored[cache_key]
+            return None
+        
+        if value is None:
+            try:
+                value = self._snapshot.read_value(offset, length)
+            except Exception as e:
+                logger.warning(f"Dropping unreadable snapshot entry {cache_key}: {e}")
+                del self._restored[cache_key]
+                return None
+            entry[4] = value
+        return value
+    
+    def _discard_restored_locked(self, predicate: Optional[Callable[[str], bool]] = None) -> int:
+        """Drop restored entries whose key matches predicate (all if None). Caller holds the lock."""
+        if not self._restored:
+            return 0
+        
+        if predicate is None:
+            keys_to_remove = list(self._restored)
+        else:
+            keys_to_remove = [key for key in self._restored if predicate(key)]
+        
+        for key in keys_to_remove:
+            del self._restored[key]
+        
+        if not self._restored:
+            self._release_snapshot()
+        return len(keys_to_remove)
+    
+    def _release_snapshot(self) -> None:
+        """Close the memory-mapped snapshot once no entry refers to it."""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+    
+    def _prune_expiry_index(self) -> None:
+        """Forget expiry times of keys that TTLCache has already evicted (caller holds the lock)."""
+        live_keys = set()
+        for cache in self.caches.values():
+            live_keys.update(cache.keys())
+        if self.default_cache:
+            live_keys.update(self.default_cache.keys())
+        self._expires_at = {key: exp for key, exp in self._expires_at.items() if key in live_keys}
+        self._entry_bytes = {key: size for key, size in self._entry_bytes.items() if key in live_keys}
+    
+    def discard_restored(self, object_type_matcher: Optional[Callable[[str], bool]] = None) -> int:
+        """
+        Drop snapshot entries that can no longer be trusted.
+        
+        Args:
+            object_type_matcher: Called with each entry's object type; entries for
+                which it returns True are dropped. Drops everything when None.
+            
+        Returns:
+            Number of restored entries dropped
+        """
+        with self.lock:
+            if object_type_matcher is None:
+                return self._discard_restored_locked()
+            stale_keys = {
+                key for key, entry in self._restored.items()
+                if object_type_matcher(entry[0])
+            }
+            return self._discard_restored_locked(lambda key: key in stale_keys)
+    
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write all live entries and their remaining TTLs to a snapshot file.
+        
+        Args:
+            path: Destination file path
+            
+        Returns:
+            Number of entries written (0 when the cache is disabled)
+        """
+        if not self.enabled:
+            return 0
+        
+        now = time.time()
+        entries = []
+        raw_entries = []
+        codec, compression = default_codec()
+        
+        with self.lock:
+            all_caches = list(self.caches.values())
+            if self.default_cache is not None:
+                all_caches.append(self.default_cache)
+            
+            for cache in all_caches:
+                for key, value in list(cache.items()):
+                    expires_at = self._expires_at.get(key, now + cache.ttl)
+                    if expires_at > now:
+                        # Keys always start with the object type (see generate_cache_key)
+                        object_type = key.split(":", 1)[0]
+                        entries.append((object_type, key, expires_at, value))
+            
+            # Carry over restored entries that were never requested without decoding them
+            live_keys = {entry[1] for entry in entries}
+            same_format = (
+                self._snapshot is not None and
+                (self._snapshot.codec, self._snapshot.compression) == (codec, compression)
+            )
+            for key, (object_type, expires_at, offset, length, value) in self._restored.items():
+                if key in live_keys or expires_at <= now:
+                    continue
+                if value is not None:
+                    entries.append((object_type, key, expires_at, value))
+                elif same_format:
+                    raw_entries.append((object_type, key, expires_at, self._snapshot.read_blob(offset, length)))
+                else:
+                    entries.append((object_type, key, expires_at, self._snapshot.read_value(offset, length)))
+        
+        return write_snapshot(path, entries, raw_entries, codec=codec, compression=compression)
+    
+    def load_snapshot(self, path: str, max_age: Optional[int] = None) -> int:
+        """
+        Memory-map a snapshot file and register its entries for lazy rehydration.
+        
+        Expired entries are skipped; values are only decoded when first requested.
+        
+        Args:
+            path: Snapshot file path
+            max_age: Ignore the snapshot entirely if it is older than this (seconds)
+            
+        Returns:
+            Number of entries restored (0 if the snapshot is missing, stale or corrupt)
+        """
+        if not self.enabled:
+            return 0
+        
+        if not os.path.exists(path):
+            logger.info(f"No cache snapshot found at {path} - starting cold")
+            return 0
+        
+        try:
+            snapshot = CacheSnapshot(path)
+        except SnapshotError as e:
+            logger.warning(f"Ignoring cache snapshot: {e}")
+            return 0
+        
+        now = time.time()
+        if max_age is not None and now - snapshot.created_at > max_age:
+            logger.info(f"Ignoring cache snapshot older than {max_age}s: {path}")
+            snapshot.close()
+            return 0
+        
+        with self.lock:
+            self._release_snapshot()
+            self._snapshot = snapshot
+            self.snapshot_created_at = snapshot.created_at
+            self._restored = {
+                key: [object_type, expires_at, offset, length, None]
+                for key, (object_type, expires_at, offset, length) in snapshot.index.items()
+                if expires_at > now
+            }
+            restored = len(self._restored)
+            if not restored:
+                self._release_snapshot()
+        
+        logger.info(f"Cache snapshot loaded: {restored} live entries from {path}")
+        return restored
 
 
 class EndpointWrapper:
@@ -388,10 +1008,53 @@ class EndpointWrapper:
         self._app_name = app_name or 'unknown'
         self._obj_type = f"{self._app_name}.{endpoint_name}"
         
+        # Replica tables are keyed by the attribute name (underscores, not dashes)
+        self._replica_key = f"{self._app_name}.{endpoint_name.replace('-', '_')}"
+        
         self.cache = self._client.cache
         
         logger.debug(f"EndpointWrapper initialized for {self._obj_type}")
     
+    def _after_write(self, record: Optional[dict] = None, deleted_ids=()) -> None:
+        """Apply a successful write to the local replica and derived indexes."""
+        if self._replica_key in FUZZY_INDEX_FIELDS:
+            self._client.name_index.clear(self._replica_key)
+        if self._replica_key in TENANT_ROLLUP_MODELS:
+            try:
+                self._client.tenant_rollup.apply_write(self._replica_key, record=record, deleted_ids=deleted_ids)
+            except Exception as e:
+                logger.warning(f"Tenant rollup update failed, rebuilding on next use: {e}")
+                self._client.tenant_rollup.clear()
+        elif self._replica_key == "tenancy.tenants":
+            # Deleting a tenant orphans its objects on the server side
+            for tenant_id in deleted_ids:
+                self._client.tenant_rollup.remove_tenant(int(tenant_id))
+        if self._replica_key in IPAM_INDEX_MODELS:
+            self._client.apply_ipam_write(self._replica_key, record=record, deleted_ids=deleted_ids)
+        elif self._replica_key in RACK_INDEX_MODELS:
+            self._client.rack_index.clear(device_types=self._replica_key == "dcim.device_types")
+        elif self._replica_key in POWER_INDEX_MODELS:
+            self._client.power_budget.clear()
+        elif self._replica_key == "dcim.cables":
+            self._client.cable_graph.apply_cable_write(record=record, deleted_ids=deleted_ids)
+            self._client.power_budget.clear()
+        elif self._replica_key in ("dcim.front_ports", "dcim.rear_ports"):
+            self._client.cable_graph.clear()
+        elif self._replica_key == "ipam.vlans":
+            try:
+                self._client.vlan_allocator.apply_write(record=record, deleted_ids=deleted_ids)
+            except Exception as e:
+                logger.warning(f"VLAN bitmap update failed, rebuilding on next use: {e}")
+                self._client.vlan_allocator.clear()
+        
+        replica = self._client.replica
+        if replica is None:
+            return
+        try:
+            replica.apply_write(self._replica_key, record=record, deleted_ids=deleted_ids)
+        except Exception as e:
+            logger.warning(f"Replica write-through failed for {self._obj_type}: {e}")
+    
     def _serialize_result(self, result):
         """
         Serialize pynetbox objects for caching using Gemini's recommended strategy.
@@ -440,6 +1103,15 @@ class EndpointWrapper:
             # Return raw pynetbox objects to preserve expand functionality
             return list(self._endpoint.filter(*args, **kwargs))
         
+        # Answer from the local replica when it can serve this filter exactly;
+        # no_cache reads (conflict detection) always go to the API
+        replica = self._client.replica
+        if replica is not None and not no_cache and not args:
+            replica_result = replica.filter(self._replica_key, kwargs)
+            if replica_result is not None:
+                logger.debug(f"REPLICA HIT for {self._obj_type} with params: {kwargs}")
+                return replica_result
+        
         # Generate cache key from filter parameters (excluding no_cache)
         filter_kwargs = {k: v for k, v in kwargs.items() if k != 'no_cache'}
         cache_key = self.cache.generate_cache_key(self._obj_type, **filter_kwargs)
@@ -459,13 +1131,15 @@ class EndpointWrapper:
         else:
             logger.debug(f"CACHE MISS for {self._obj_type}. Fetching from API with params: {filter_kwargs}")
         
+        fetch_start = time.time()
         live_result = list(self._endpoint.filter(*args, **filter_kwargs))
+        fetch_seconds = time.time() - fetch_start
         
         # Serialize for caching (Gemini's obj.serialize() strategy)
         serialized_result = self._serialize_result(live_result)
         
         # Store in cache (always store, even for no_cache requests to benefit subsequent calls)
-        self.cache.set(cache_key, serialized_result, self._obj_type)
+        self.cache.set(cache_key, serialized_result, self._obj_type, fetch_seconds=fetch_seconds)
         logger.debug(f"Cached {len(serialized_result)} objects for {self._obj_type}")
         
         return serialized_result
@@ -492,7 +1166,9 @@ class EndpointWrapper:
         
         # Cache miss: fetch from API
         logger.debug(f"CACHE MISS for {self._obj_type}.get(). Fetching from API with params: {kwargs}")
+        fetch_start = time.time()
         live_result = self._endpoint.get(*args, **kwargs)
+        fetch_seconds = time.time() - fetch_start
         
         if live_result is None:
             logger.debug(f"No object found for {self._obj_type}.get() with params: {kwargs}")
@@ -502,7 +1178,7 @@ class EndpointWrapper:
         serialized_result = self._serialize_single_result(live_result)
         
         # Store in cache
-        self.cache.set(cache_key, serialized_result, self._obj_type)
+        self.cache.set(cache_key, serialized_result, self._obj_type, fetch_seconds=fetch_seconds)
         logger.debug(f"Cached single object for {self._obj_type}")
         
         return serialized_result
@@ -529,13 +1205,15 @@ class EndpointWrapper:
         
         # Cache miss: fetch from API
         logger.debug(f"CACHE MISS for {self._obj_type}.all(). Fetching from API")
+        fetch_start = time.time()
         live_result = list(self._endpoint.all(*args, **kwargs))
+        fetch_seconds = time.time() - fetch_start
         
         # Serialize for caching
         serialized_result = self._serialize_result(live_result)
         
         # Store in cache
-        self.cache.set(cache_key, serialized_result, self._obj_type)
+        self.cache.set(cache_key, serialized_result, self._obj_type, fetch_seconds=fetch_seconds)
         logger.debug(f"Cached {len(serialized_result)} objects for {self._obj_type}.all()")
         
         return serialized_result
@@ -582,6 +1260,7 @@ class EndpointWrapper:
             # Type-based cache invalidation (Gemini's recommended strategy)
             self._client.cache.invalidate_pattern(self._obj_type)
             logger.info(f"Cache invalidated for {self._obj_type} after create operation")
+            self._after_write(record=serialized_result)
             
             logger.info(f"✅ Successfully created {self._obj_type} with ID: {result.id}")
             return serialized_result
@@ -639,6 +1318,7 @@ class EndpointWrapper:
             # Type-based cache invalidation
             self._client.cache.invalidate_pattern(self._obj_type)
             logger.info(f"Cache invalidated for {self._obj_type} after update operation")
+            self._after_write(record=serialized_result)
             
             logger.info(f"✅ Successfully updated {self._obj_type} ID {obj_id}")
             return serialized_result
@@ -687,6 +1367,7 @@ class EndpointWrapper:
             # Type-based cache invalidation
             self._client.cache.invalidate_pattern(self._obj_type)
             logger.info(f"Cache invalidated for {self._obj_type} after delete operation")
+            self._after_write(deleted_ids=[obj_id])
             
             logger.info(f"✅ Successfully deleted {self._obj_type} ID {obj_id}")
             return True
@@ -696,6 +1377,96 @@ class EndpointWrapper:
             logger.error(error_msg)
             raise NetBoxError(error_msg)
     
+    def bulk_create(self, objects: List[dict], confirm: bool = False) -> List[dict]:
+        """
+        Create several objects with a single list POST.
+        
+        NetBox creates the whole list in one transaction, so either every
+        object in the request is created or none is.
+        
+        Args:
+            objects: Payload dictionaries, one per object
+            confirm: Required safety confirmation (must be True)
+            
+        Returns:
+            List of serialized created objects, in request order
+            
+        Raises:
+            NetBoxConfirmationError: If confirm=True not provided
+            NetBoxError: For API or validation errors
+        """
+        if not confirm:
+            raise NetBoxConfirmationError(
+                f"bulk create operation on {self._obj_type} requires confirm=True"
+            )
+        
+        if not objects:
+            return []
+        
+        if self._client.config.safety.dry_run_mode:
+            logger.info(f"[DRY-RUN] Would BULK CREATE {len(objects)} {self._obj_type} objects")
+            return [{"id": f"dry-run-generated-id-{i}", **payload} for i, payload in enumerate(objects)]
+        
+        try:
+            logger.info(f"Bulk creating {len(objects)} {self._obj_type} objects")
+            result = self._endpoint.create(list(objects))
+            if not isinstance(result, list):
+                result = [result]
+            
+            serialized_result = [self._serialize_single_result(obj) for obj in result]
+            
+            self._client.cache.invalidate_pattern(self._obj_type)
+            for record in serialized_result:
+                self._after_write(record=record)
+            logger.info(f"✅ Successfully bulk created {len(serialized_result)} {self._obj_type} objects")
+            return serialized_result
+            
+        except Exception as e:
+            error_msg = f"Failed to bulk create {self._obj_type}: {e}"
+            logger.error(error_msg)
+            raise NetBoxError(error_msg)
+    
+    def bulk_delete(self, obj_ids: List[int], confirm: bool = False) -> bool:
+        """
+        Delete several objects with a single list DELETE.
+        
+        Args:
+            obj_ids: IDs of the objects to delete
+            confirm: Required safety confirmation (must be True)
+            
+        Returns:
+            True if deletion successful
+            
+        Raises:
+            NetBoxConfirmationError: If confirm=True not provided
+            NetBoxError: For API or validation errors
+        """
+        if not confirm:
+            raise NetBoxConfirmationError(
+                f"bulk delete operation on {self._obj_type} requires confirm=True"
+            )
+        
+        if not obj_ids:
+            return True
+        
+        if self._client.config.safety.dry_run_mode:
+            logger.info(f"[DRY-RUN] Would BULK DELETE {self._obj_type} IDs {obj_ids}")
+            return True
+        
+        try:
+            logger.info(f"Bulk deleting {len(obj_ids)} {self._obj_type} objects")
+            result = self._endpoint.delete([int(obj_id) for obj_id in obj_ids])
+            
+            self._client.cache.invalidate_pattern(self._obj_type)
+            self._after_write(deleted_ids=obj_ids)
+            logger.info(f"✅ Successfully bulk deleted {len(obj_ids)} {self._obj_type} objects")
+            return bool(result)
+            
+        except Exception as e:
+            error_msg = f"Failed to bulk delete {self._obj_type} IDs {obj_ids}: {e}"
+            logger.error(error_msg)
+            raise NetBoxError(error_msg)
+    
     def __call__(self, *args, **kwargs):
         """Make EndpointWrapper callable to handle method calls through the endpoint."""
         return self._endpoint(*args, **kwargs)
@@ -713,30 +1484,34 @@ class AppWrapper:
     routing from NetBox API applications (dcim, ipam, tenancy) to their
     specific endpoints, wrapping each endpoint in EndpointWrapper.
     
-    Following Gemini's architectural guidance for robust error handling
-    and comprehensive debugging visibility.
+    EndpointWrappers are memoized per app, so repeated attribute access such
+    as client.dcim.devices inside a loop is a single dict lookup.
     """
     
-    def __init__(self, app, client: 'NetBoxClient'):
+    def __init__(self, app, client: 'NetBoxClient', endpoints: Optional[frozenset] = None):
         """
         Initialize AppWrapper with pynetbox app and client reference.
         
         Args:
             app: pynetbox.core.app.App instance (e.g., dcim, ipam)
             client: NetBoxClient instance for access to config, cache, logging
+            endpoints: Known endpoint names for this app from the dispatch table,
+                or None to accept any endpoint name
         """
         self._app = app
         self._client = client
         self._app_name = getattr(app, 'name', 'unknown')
+        self._known_endpoints = endpoints
+        self._endpoint_wrappers: Dict[str, EndpointWrapper] = {}
         
         logger.debug(f"AppWrapper initialized for app '{self._app_name}'")
     
     def __getattr__(self, name: str):
         """
-        Navigate from app to endpoint with comprehensive error handling.
+        Navigate from app to a memoized EndpointWrapper.
         
-        Implements Gemini's robust error handling pattern with try/except
-        and detailed debugging logs for troubleshooting __getattr__ chain.
+        Only called for names that are not regular attributes, i.e. on the
+        first access of each endpoint; later accesses hit the memo directly.
         
         Args:
             name: Endpoint name (e.g., 'devices', 'manufacturers', 'sites')
@@ -747,32 +1522,21 @@ class AppWrapper:
         Raises:
             AttributeError: If the endpoint doesn't exist on the app
         """
-        logger.debug(f"AppWrapper.__getattr__('{name}') on app '{self._app_name}'")
+        # Private names never map to endpoints; this also keeps lookups during
+        # construction or unpickling from recursing into __getattr__
+        if name.startswith('_'):
+            raise AttributeError(name)
         
-        try:
-            # Attempt to get the endpoint from the pynetbox app
-            endpoint = getattr(self._app, name)
-            
-            # More strict validation: check if it's actually a pynetbox Endpoint class
-            # pynetbox endpoints have specific attributes and behaviors
-            if (hasattr(endpoint, 'filter') and hasattr(endpoint, 'get') and hasattr(endpoint, 'all') and
-                hasattr(endpoint, 'name') and hasattr(endpoint, 'api') and
-                str(type(endpoint)) == "<class 'pynetbox.core.endpoint.Endpoint'>"):
-                
-                logger.debug(f"Found valid endpoint '{name}' on app '{self._app_name}'")
-                logger.debug(f"Returning EndpointWrapper for '{self._app_name}.{name}'")
-                
-                # Return wrapped endpoint with app name for proper object type construction
-                return EndpointWrapper(endpoint, self._client, app_name=self._app_name)
-            else:
-                logger.debug(f"Object '{name}' on app '{self._app_name}' is not a valid pynetbox Endpoint")
-                logger.debug(f"Object type: {type(endpoint)}")
-                
-        except AttributeError:
-            # Log the attempt for debugging
-            logger.debug(f"Endpoint '{name}' not found on app '{self._app_name}'")
+        wrapper = self._endpoint_wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+        
+        if self._known_endpoints is None or name in self._known_endpoints:
+            endpoint = getattr(self._app, name, None)
+            if isinstance(endpoint, Endpoint):
+                wrapper = EndpointWrapper(endpoint, self._client, app_name=self._app_name)
+                return self._endpoint_wrappers.setdefault(name, wrapper)
         
-        # If we reach here, the endpoint doesn't exist or isn't valid
         raise AttributeError(
             f"NetBox API application '{self._app_name}' has no endpoint named '{name}'. "
             f"Available endpoints can be discovered through the NetBox API documentation."
@@ -811,6 +1575,39 @@ class NetBoxClient:
         self._connection_status = None
         self._last_health_check = 0
         
+        # Local inventory replica, see enable_replica()
+        self.replica: Optional[ReplicaStore] = None
+        
+        self._lookup_executor: Optional[ThreadPoolExecutor] = None
+        self._lookup_executor_lock = threading.Lock()
+        
+        # Per-VRF IPAM radix indexes, see get_ipam_index()
+        self._ipam_indexes: Dict[Optional[int], VRFIndex] = {}
+        self._ipam_index_lock = threading.Lock()
+        
+        # Per-scope VLAN ID bitmaps, updated on VLAN writes
+        self.vlan_allocator = VLANAllocator(self)
+        
+        # Per-site rack unit occupancy, see netbox_find_rack_space
+        self.rack_index = RackSpaceIndex(self)
+        
+        # Cable topology graph, see tools/dcim/topology.py
+        self.cable_graph = CableGraphIndex(self)
+        
+        # Per-site power models, see netbox_get_power_capacity_report
+        self.power_budget = PowerBudgetIndex(self)
+        
+        # Trigram name indexes for "did you mean" suggestions on failed lookups
+        self.name_index = FuzzyNameIndex(self)
+        
+        # Per-tenant resource ownership, see netbox_get_tenant_resource_report
+        self.tenant_rollup = TenantRollupIndex(self)
+        
+        # Memoized AppWrappers and the optional endpoint dispatch table; set up
+        # before anything can reach __getattr__ and reset on every (re)connect
+        self._app_wrappers: Dict[str, AppWrapper] = {}
+        self._endpoint_table: Optional[Dict[str, frozenset]] = None
+        
         # Add instance tracking for debugging
         self.instance_id = id(self)
         logger.info(f"INITIALIZING new NetBoxClient instance with ID: {self.instance_id}")
@@ -848,6 +1645,12 @@ class NetBoxClient:
             if self.config.custom_headers:
                 self._api.http_session.headers.update(self.config.custom_headers)
             
+            # Wrappers hold references to the previous Api's apps and endpoints
+            self._app_wrappers = {}
+            self._endpoint_table = None
+            if self.config.discover_endpoints:
+                self._endpoint_table = self._discover_endpoints()
+            
             logger.info("NetBox API connection initialized successfully")
             
         except Exception as e:
@@ -855,6 +1658,30 @@ class NetBoxClient:
             logger.error(error_msg)
             raise NetBoxConnectionError(error_msg, {"url": self.config.url})
     
+    def _discover_endpoints(self) -> Optional[Dict[str, frozenset]]:
+        """
+        Fetch NetBox's OpenAPI schema and build the endpoint dispatch table.
+        
+        Discovery is best effort: if the schema cannot be fetched or parsed,
+        the client falls back to accepting any endpoint name.
+        
+        Returns:
+            App -> endpoint names mapping, or None if discovery failed
+        """
+        try:
+            table = _build_endpoint_table(self._api.openapi())
+        except Exception as e:
+            logger.warning(f"Endpoint discovery from OpenAPI schema failed, accepting all endpoints: {e}")
+            return None
+        
+        if not table:
+            logger.warning("OpenAPI schema contained no endpoints, accepting all endpoints")
+            return None
+        
+        logger.info(f"Discovered {sum(len(endpoints) for endpoints in table.values())} endpoints "
+                    f"across {len(table)} NetBox apps")
+        return table
+    
     @property
     def api(self) -> 'Api':
         """Get the pynetbox API instance."""
@@ -943,6 +1770,445 @@ class NetBoxClient:
             self._connection_status = ConnectionStatus(connected=False, error=error_msg)
             raise NetBoxError(error_msg)
     
+    # CACHE SNAPSHOT PERSISTENCE
+    # =====================================================================
+    
+    # Changelog rows inspected during reconciliation before the snapshot is
+    # considered too stale to be worth reconciling
+    SNAPSHOT_RECONCILE_MAX_CHANGES = 5000
+    
+    # IDs per id= query when re-fetching objects named in the changelog
+    CHANGELOG_FETCH_CHUNK_SIZE = 100
+    
+    # Upper bound on concurrent reference lookups issued by resolve_all()
+    LOOKUP_MAX_WORKERS = 8
+    
+    def save_cache_snapshot(self) -> int:
+        """
+        Persist the live cache to the configured snapshot file.
+        
+        Returns:
+            Number of entries written (0 on failure)
+        """
+        path = self.config.cache.get_snapshot_path()
+        try:
+            return self.cache.save_snapshot(path)
+        except Exception as e:
+            logger.error(f"Failed to save cache snapshot to {path}: {e}")
+            return 0
+    
+    def restore_cache_snapshot(self) -> int:
+        """
+        Reload the cache snapshot and reconcile it against NetBox's changelog.
+        
+        Entries for object types changed since the snapshot was written are
+        dropped. If the changelog cannot be read, the whole snapshot is
+        discarded rather than risk serving stale data.
+        
+        Returns:
+            Number of restored entries that survived reconciliation
+        """
+        cache_config = self.config.cache
+        restored = self.cache.load_snapshot(cache_config.get_snapshot_path(), cache_config.snapshot_max_age)
+        if not restored:
+            return 0
+        
+        try:
+            changed_models = self._get_changed_models_since(self.cache.snapshot_created_at)
+        except Exception as e:
+            logger.warning(f"Cache snapshot reconciliation failed, discarding snapshot: {e}")
+            self.cache.discard_restored()
+            return 0
+        
+        if changed_models is None:
+            logger.info(
+                f"More than {self.SNAPSHOT_RECONCILE_MAX_CHANGES} changes since cache snapshot - discarding snapshot"
+            )
+            self.cache.discard_restored()
+            return 0
+        
+        dropped = self.cache.discard_restored(
+            lambda object_type: any(_endpoint_matches_model(object_type, model) for model in changed_models)
+        )
+        logger.info(
+            f"Cache snapshot reconciled: {restored - dropped} entries kept, {dropped} dropped "
+            f"({len(changed_models)} object types changed since snapshot)"
+        )
+        return restored - dropped
+    
+    def enable_replica(self, background: bool = False) -> Optional[ReplicaStore]:
+        """
+        Bulk-load the local inventory replica and start its changelog sync.
+        
+        Once enabled, EndpointWrapper.filter() answers whitelisted equality
+        filters on replicated models locally. A failed load leaves the
+        replica disabled and every read going to the API.
+        
+        Args:
+            background: Load in a thread and return at once. The store is
+                installed immediately but is not fresh until the load
+                completes, so reads fall through to the API meanwhile.
+        
+        Returns:
+            The ReplicaStore, or None if loading failed
+        """
+        store = ReplicaStore(self, self.config.replica)
+        if background:
+            self.replica = store
+            threading.Thread(target=self._load_replica, args=(store,),
+                             name="netbox-replica-load", daemon=True).start()
+            return store
+        return self._load_replica(store)
+    
+    def _load_replica(self, store: ReplicaStore) -> Optional[ReplicaStore]:
+        """Load a replica store and start its sync; drop it if loading fails."""
+        try:
+            store.load()
+        except Exception as e:
+            logger.warning(f"Replica load failed, serving reads from the API: {e}")
+            if self.replica is store:
+                self.replica = None
+            return None
+        
+        store.start()
+        self.replica = store
+        return store
+    
+    def get_ipam_index(self, vrf_id: Optional[int] = None) -> VRFIndex:
+        """
+        Return the IPAM radix index of a VRF, building it if needed.
+        
+        The index holds every prefix and IP address of the VRF. Writes
+        through this client are applied to it directly, and changes made
+        elsewhere are applied from the changelog once it is older than the
+        ip_addresses cache TTL. It is only rebuilt after the ipam_index TTL
+        or when the changelog cannot be read. Prefixes are read through the
+        cache/replica; addresses come from the replica when it can answer,
+        otherwise from one brief listing so full IP records are never cached
+        just to be counted.
+        
+        Args:
+            vrf_id: VRF ID, or None for the global table
+            
+        Returns:
+            VRFIndex for the VRF
+        """
+        ttl = self.config.cache.ttl
+        vrf_filter = vrf_id if vrf_id is not None else "null"
+        with self._ipam_index_lock:
+            index = self._ipam_indexes.get(vrf_id)
+        
+        if index is not None and time.time() - index.built_at < ttl.ipam_index:
+            if index.prefixes_stale:
+                prefixes = self.ipam.prefixes.filter(vrf_id=vrf_filter)
+                with self._ipam_index_lock:
+                    index.set_prefixes(prefixes)
+            if time.time() - index.synced_at < ttl.ip_addresses or self._sync_ipam_index(index, vrf_id):
+                return index
+        
+        started = time.time()
+        prefixes = self.ipam.prefixes.filter(vrf_id=vrf_filter)
+        
+        replica_addresses = None
+        if self.replica is not None:
+            replica_addresses = self.replica.filter("ipam.ip_addresses", {"vrf_id": vrf_filter})
+        if replica_addresses is not None:
+            addresses = [(ip["id"], ip["address"]) for ip in replica_addresses]
+        else:
+            addresses = [(ip.id, ip.address)
+                         for ip in self.api.ipam.ip_addresses.filter(vrf_id=vrf_filter, brief=1)]
+        
+        index = VRFIndex.build(prefixes, addresses)
+        logger.info(
+            f"Built IPAM index for VRF {vrf_filter}: {len(prefixes)} prefixes, "
+            f"{len(addresses)} addresses in {time.time() - started:.2f}s"
+        )
+        with self._ipam_index_lock:
+            self._ipam_indexes[vrf_id] = index
+        return index
+    
+    def _sync_ipam_index(self, index: VRFIndex, vrf_id: Optional[int]) -> bool:
+        """
+        Apply prefix and IP address changes from the changelog to an index.
+        
+        Changed addresses are re-fetched by ID; prefixes are re-read in full
+        when any prefix changed.
+        
+        Returns:
+            False if the changelog could not be applied and the index must be rebuilt
+        """
+        started = time.time()
+        try:
+            changes = self.get_object_changes_since(index.synced_at, IPAM_INDEX_CHANGE_MODELS)
+        except Exception as e:
+            logger.warning(f"IPAM index changelog sync failed, rebuilding: {e}")
+            return False
+        if changes is None:
+            return False
+        
+        changed_addresses = changes.get("ipam.ipaddress", {})
+        refresh = [obj_id for obj_id, action in changed_addresses.items() if action != "delete"]
+        records = {}
+        for start in range(0, len(refresh), self.CHANGELOG_FETCH_CHUNK_SIZE):
+            chunk = refresh[start:start + self.CHANGELOG_FETCH_CHUNK_SIZE]
+            for ip in self.api.ipam.ip_addresses.filter(id=chunk):
+                records[ip.id] = ip
+        
+        prefixes = None
+        if "ipam.prefix" in changes:
+            vrf_filter = vrf_id if vrf_id is not None else "null"
+            prefixes = self.ipam.prefixes.filter(vrf_id=vrf_filter, no_cache=True)
+        
+        with self._ipam_index_lock:
+            for obj_id in changed_addresses:
+                ip = records.get(obj_id)
+                # Addresses that moved to another VRF leave this index
+                if ip is not None and related_id(ip.vrf) == vrf_id:
+                    index.add_address(obj_id, ip.address)
+                else:
+                    index.remove_address(obj_id)
+            if prefixes is not None:
+                index.set_prefixes(prefixes)
+            index.synced_at = started
+        
+        if changes:
+            logger.debug(f"IPAM index for VRF {vrf_id} synced: {len(changed_addresses)} address changes, "
+                         f"prefixes {'reloaded' if prefixes is not None else 'unchanged'}")
+        return True
+    
+    def apply_ipam_write(self, object_type: str, record: Optional[Dict[str, Any]] = None,
+                         deleted_ids: Iterable[int] = ()) -> None:
+        """
+        Apply a prefix or IP address written through this client to the loaded IPAM indexes.
+        
+        Addresses are updated in place; a prefix write marks the prefixes for
+        reloading on next use, leaving the addresses as they are.
+        
+        Args:
+            object_type: "ipam.prefixes" or "ipam.ip_addresses"
+            record: Serialized created or updated object
+            deleted_ids: IDs of deleted objects
+        """
+        with self._ipam_index_lock:
+            for vrf_id, index in self._ipam_indexes.items():
+                if object_type == "ipam.prefixes":
+                    index.prefixes_stale = True
+                    continue
+                for obj_id in deleted_ids:
+                    index.remove_address(int(obj_id))
+                if record is not None and isinstance(record.get("id"), int):
+                    index.remove_address(record["id"])
+                    if related_id(record.get("vrf")) == vrf_id and record.get("address"):
+                        index.add_address(record["id"], record["address"])
+    
+    def invalidate_ipam_index(self) -> None:
+        """Drop all IPAM radix indexes; they are rebuilt on next use."""
+        with self._ipam_index_lock:
+            self._ipam_indexes.clear()
+    
+    def _get_changed_models_since(self, since: float) -> Optional[set]:
+        """
+        Collect model labels (e.g. "dcim.device") changed after a timestamp.
+        
+        Returns:
+            Set of changed model labels, or None if more changes than
+            SNAPSHOT_RECONCILE_MAX_CHANGES were found
+            
+        Raises:
+            NetBoxError: If no object-change endpoint could be queried
+        """
+        changes = self.get_object_changes_since(since)
+        return set(changes) if changes is not None else None
+    
+    def get_object_changes_since(self, since: float,
+                                 models: Optional[Iterable[str]] = None) -> Optional[Dict[str, Dict[int, str]]]:
+        """
+        Collect the objects changed after a timestamp from the changelog.
+        
+        With models given, the changelog is queried per model with NetBox's
+        changed_object_type filter, so changes to other models are neither
+        downloaded nor counted toward SNAPSHOT_RECONCILE_MAX_CHANGES.
+        
+        Args:
+            since: Unix timestamp
+            models: Model labels (e.g. "ipam.ipaddress") to collect; None for all
+            
+        Returns:
+            {model label: {object ID: latest action}}, with actions "create",
+            "update" or "delete", or None if more changes than
+            SNAPSHOT_RECONCILE_MAX_CHANGES were found
+            
+        Raises:
+            NetBoxError: If no object-change endpoint could be queried
+        """
+        since_iso = datetime.fromtimestamp(since, tz=timezone.utc).isoformat()
+        wanted = set(models) if models is not None else None
+        # changed_object_type takes a single model label, so one query per model
+        queries = [{}] if wanted is None else [{"changed_object_type": model} for model in sorted(wanted)]
+        last_error = None
+        
+        # NetBox 4.1+ serves the changelog from core, older releases from extras
+        for app_name in ("core", "extras"):
+            try:
+                endpoint = getattr(self.api, app_name).object_changes
+                changed: Dict[str, Dict[int, str]] = {}
+                count = 0
+                for query in queries:
+                    for change in endpoint.filter(time_after=since_iso, ordering="id", **query):
+                        model = getattr(change, "changed_object_type", None)
+                        # Servers ignoring the filter return every change; skip the others
+                        if not model or (wanted is not None and str(model) not in wanted):
+                            continue
+                        count += 1
+                        if count > self.SNAPSHOT_RECONCILE_MAX_CHANGES:
+                            return None
+                        changed.setdefault(str(model), {})[change.changed_object_id] = choice_value(change.action)
+                return changed
+            except pynetbox.RequestError as e:
+                last_error = e
+        
+        raise NetBoxError(f"Unable to read NetBox changelog: {last_error}")
+    
+    def stream(self, endpoint: str, page_size: int = STREAM_PAGE_SIZE, **filters):
+        """
+        Iterate over every object matching a filter in bounded memory.
+        
+        Pages are requested explicitly by offset, up to LOOKUP_MAX_WORKERS at
+        a time on the lookup pool, and yielded as raw pynetbox Records in id
+        order. The first page is fetched alone: NetBox caps page sizes at its
+        MAX_PAGE_SIZE, so when it returns a short first page the remaining
+        offsets advance by the size the server actually serves. Unlike
+        EndpointWrapper.filter() nothing is cached and at most one window of
+        pages is held at once, so full-estate scans stay flat in memory.
+        Objects created or deleted during a scan may shift page boundaries;
+        callers needing an exact snapshot should re-check hits.
+        
+        Args:
+            endpoint: Endpoint path, e.g. "ipam.ip_addresses"
+            page_size: Objects per page request
+            **filters: NetBox filter parameters
+            
+        Yields:
+            pynetbox Records
+        """
+        app_name, endpoint_name = endpoint.split(".", 1)
+        api_endpoint = getattr(getattr(self.api, app_name), endpoint_name)
+        total = api_endpoint.count(**filters)
+        
+        def fetch(offset: int) -> list:
+            return list(api_endpoint.filter(**filters, ordering="id", limit=page_size, offset=offset))
+        
+        first_page = fetch(0) if total else []
+        yield from first_page
+        if not first_page:
+            return
+        
+        # A first page shorter than both page_size and total is the server's MAX_PAGE_SIZE
+        server_page_size = len(first_page)
+        executor = self._get_lookup_executor()
+        offsets = list(range(server_page_size, total, server_page_size))
+        for start in range(0, len(offsets), self.LOOKUP_MAX_WORKERS):
+            window = offsets[start:start + self.LOOKUP_MAX_WORKERS]
+            for page in executor.map(fetch, window):
+                yield from page
+    
+    def _get_lookup_executor(self) -> ThreadPoolExecutor:
+        """Return the shared thread pool used by resolve_all(), creating it on first use."""
+        with self._lookup_executor_lock:
+            if self._lookup_executor is None:
+                self._lookup_executor = ThreadPoolExecutor(
+                    max_workers=self.LOOKUP_MAX_WORKERS,
+                    thread_name_prefix="netbox-lookup"
+                )
+            return self._lookup_executor
+    
+    def _resolve_lookup(self, lookup: Lookup) -> Any:
+        """Resolve a single Lookup, trying each of its fields in order."""
+        app_name, endpoint_name = lookup.endpoint.split(".", 1)
+        endpoint = getattr(getattr(self, app_name), endpoint_name)
+        
+        for field_name in lookup.fields:
+            results = endpoint.filter(**{field_name: lookup.value}, **lookup.filters)
+            if results:
+                return list(results) if lookup.all_matches else results[0]
+        
+        return [] if lookup.all_matches else None
+    
+    def resolve_all(self, lookups: Dict[str, Optional[Lookup]]) -> Dict[str, Any]:
+        """
+        Resolve several independent references concurrently.
+        
+        Provisioning tools typically need a site, a device type, a role and a
+        few optional references before they can create anything. Issuing those
+        lookups in parallel makes the cost max(lookup) instead of sum(lookups).
+        
+        Args:
+            lookups: Mapping of result key to Lookup. None entries and lookups
+                without a value (unset optional parameters) resolve to None.
+                
+        Returns:
+            Mapping of the same keys to the first matching object (or the list
+            of matches for all_matches lookups); optional misses map to None
+            
+        Raises:
+            NetBoxNotFoundError: If any required lookup has no match; all
+                misses are reported together in details["missing"]
+            NetBoxError: If any lookup failed with an API error
+        """
+        resolved: Dict[str, Any] = {}
+        pending = {}
+        for key, lookup in lookups.items():
+            if lookup is None or lookup.value in (None, ""):
+                resolved[key] = None
+            else:
+                pending[key] = lookup
+        
+        def run(lookup: Lookup):
+            try:
+                return self._resolve_lookup(lookup), None
+            except Exception as e:
+                return None, e
+        
+        # A lone lookup gains nothing from the pool, so it runs inline
+        if len(pending) <= 1:
+            outcomes = {key: run(lookup) for key, lookup in pending.items()}
+        else:
+            executor = self._get_lookup_executor()
+            futures = {key: executor.submit(run, lookup) for key, lookup in pending.items()}
+            outcomes = {key: future.result() for key, future in futures.items()}
+        
+        errors = {}
+        missing = {}
+        for key, (result, error) in outcomes.items():
+            lookup = pending[key]
+            if error is not None:
+                errors[key] = str(error)
+                continue
+            if not result and lookup.required:
+                missing[key] = lookup.value
+            resolved[key] = result if result else None
+        
+        if errors:
+            raise NetBoxError(
+                "Failed to resolve " + ", ".join(f"{key}: {error}" for key, error in errors.items()),
+                {"errors": errors}
+            )
+        
+        if missing:
+            messages = []
+            suggestions = {}
+            for key, value in missing.items():
+                label = pending[key].label or key.replace("_", " ").capitalize()
+                try:
+                    suggestions[key] = self.name_index.suggest(pending[key].endpoint, value, limit=3)
+                except Exception as e:
+                    logger.debug(f"No name suggestions for {key}: {e}")
+                    suggestions[key] = []
+                messages.append(f"{label} '{value}' not found{did_you_mean(suggestions[key])}")
+            raise NetBoxNotFoundError("; ".join(messages), {"missing": missing, "suggestions": suggestions})
+        
+        return resolved
+    
     def __getattr__(self, name: str):
         """
         Dynamic proxy to NetBox API applications with comprehensive routing.
@@ -953,6 +2219,8 @@ class NetBoxClient:
         Implements the "Entrypoint" role in the three-component architecture:
         NetBoxClient → AppWrapper → EndpointWrapper
         
+        AppWrappers are memoized per client and rebuilt after a reconnect.
+        
         Args:
             name: NetBox API application name (e.g., 'dcim', 'ipam', 'tenancy')
             
@@ -962,26 +2230,21 @@ class NetBoxClient:
         Raises:
             AttributeError: If the application doesn't exist in the NetBox API
         """
-        logger.debug(f"NetBoxClient.__getattr__('{name}') -> routing to AppWrapper")
+        # Private names are never apps; without this guard a missing _api or
+        # _app_wrappers attribute would recurse through the api property
+        if name.startswith('_'):
+            raise AttributeError(name)
         
-        try:
-            # Attempt to get the app from the pynetbox API
-            app = getattr(self.api, name)
-            
-            # Validate that it's actually a pynetbox App
-            if hasattr(app, 'name') and hasattr(app, 'models') and str(type(app)) == "<class 'pynetbox.core.app.App'>":
-                logger.debug(f"Found valid NetBox API app '{name}'")
-                logger.debug(f"Returning AppWrapper for '{name}'")
-                
-                # Return wrapped app for navigation to endpoints
-                return AppWrapper(app, self)
-            else:
-                logger.debug(f"Object '{name}' is not a valid pynetbox App")
-                
-        except AttributeError:
-            logger.debug(f"NetBox API application '{name}' not found")
+        wrapper = self._app_wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+        
+        app = getattr(self.api, name, None)
+        if isinstance(app, App):
+            endpoints = self._endpoint_table.get(name) if self._endpoint_table is not None else None
+            wrapper = AppWrapper(app, self, endpoints=endpoints)
+            return self._app_wrappers.setdefault(name, wrapper)
         
-        # If we reach here, the app doesn't exist or isn't valid
         raise AttributeError(
             f"NetBox API has no application named '{name}'. "
             f"Available applications include: dcim, ipam, tenancy, extras, users, virtualization, wireless"
@@ -12,8 +12,10 @@ Safety-focused configuration with write operation controls and enterprise secret
 """
 
 import logging
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from .secrets import get_secrets_manager, validate_secrets
 
@@ -78,6 +80,10 @@ class CacheTTLConfig:
     device_interfaces: int = 60             # 1 minute - interfaces change frequently
     vlans: int = 300                        # 5 minutes - VLANs moderately dynamic
     
+    # Derived indexes, kept current from writes and the changelog in between
+    ipam_index: int = 3600                  # 1 hour - full IPAM index rebuild
+    tenant_rollup: int = 3600               # 1 hour - full tenant rollup sweep
+    
     # System status (always fresh)
     status: int = 30                        # 30 seconds - status should be fresh
     health: int = 30                        # 30 seconds - health should be fresh
@@ -108,8 +114,98 @@ class CacheConfig:
     warm_on_startup: bool = False          # Whether to warm cache on startup
     compression: bool = False              # Whether to compress cached data
     
+    # Snapshot persistence across restarts
+    snapshot_enabled: bool = False         # Write snapshot on shutdown, reload on startup
+    snapshot_path: Optional[str] = None    # Defaults to <path>/cache_snapshot.bin
+    snapshot_max_age: int = 86400          # Ignore snapshots older than this (seconds)
+    
+    def get_snapshot_path(self) -> str:
+        """Resolve the snapshot file location."""
+        if self.snapshot_path:
+            return self.snapshot_path
+        return str(Path(self.path or "/tmp/netbox_mcp_cache") / "cache_snapshot.bin")
+    
     # Statistics
     enable_stats: bool = True              # Whether to track cache statistics
+    
+    # TTL auto-tuning from observed change frequency (requires enable_stats)
+    auto_tune_ttl: bool = False            # Lengthen stable / shorten churny object type TTLs
+    auto_tune_interval: int = 300          # Seconds between tuning passes
+    auto_tune_min_ttl: int = 30            # Lower bound for tuned TTLs
+    auto_tune_max_ttl: int = 86400         # Upper bound for tuned TTLs
+    auto_tune_min_requests: int = 20       # Lookups required before a type is tuned
+
+
+@dataclass
+class ReplicaConfig:
+    """Local inventory replica configuration."""
+    
+    enabled: bool = False                  # Answer whitelisted read filters from a local replica
+    sync_interval: int = 30                # Seconds between changelog sync passes
+    max_staleness: int = 300               # Fall back to the API if the last sync is older than this
+    models: List[str] = field(default_factory=lambda: [
+        "dcim.sites",
+        "dcim.racks",
+        "dcim.devices",
+        "dcim.interfaces",
+        "dcim.cables",
+        "ipam.ip_addresses",
+        "ipam.prefixes",
+        "ipam.vlans",
+        "virtualization.virtual_machines",
+    ])
+
+
+@dataclass
+class ExecutionConfig:
+    """Thread pools that run the (blocking) tools off the MCP event loop."""
+    
+    max_workers: int = 16                  # Pool size for categories without their own pool
+    category_workers: Dict[str, int] = field(default_factory=dict)  # e.g. {"ipam": 8, "dcim": 8}
+    wait_sample_size: int = 1000           # Recent queue wait times kept per pool for metrics
+    expensive_max_concurrency: int = 2     # Concurrent calls per "expensive" tool without its own limit
+    max_queued_per_tool: int = 8           # Calls waiting on a limited tool before new ones are rejected
+    default_timeout: float = 300.0         # Seconds a read-only tool call may take, including time queued
+    batch_max_concurrency: int = 16        # Calls of one batch request run at the same time
+    batch_max_calls: int = 500             # Calls accepted in one batch request
+
+
+@dataclass
+class ResponseConfig:
+    """Token budget for tool results; larger results are paged by cursor."""
+    
+    enabled: bool = True
+    max_tokens: int = 12000                # Estimated tokens per result before it is paged
+    cursor_ttl: int = 900                  # Seconds a truncated result stays available to fetch more
+    max_cursors: int = 100                 # Truncated results kept at once (least recently used dropped)
+
+
+@dataclass
+class HealthConfig:
+    """Background readiness prober behind the /readyz endpoint."""
+    
+    probe_interval: float = 10.0           # Seconds between NetBox health probes
+    failure_threshold: int = 3             # Consecutive failed probes before the server is not ready
+    max_probe_age: float = 60.0            # Seconds a successful probe keeps the server ready
+
+
+@dataclass
+class TransportConfig:
+    """How MCP clients reach the server: stdio, or HTTP served by worker processes."""
+    
+    mode: str = "stdio"                    # "stdio", "sse" or "streamable-http"
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1                       # Processes behind the listener (streamable-http only)
+    state_dir: str = ""                    # State shared by workers; default under /dev/shm or the temp dir
+    metrics_interval: float = 5.0          # Seconds between worker metrics snapshots
+    
+    def get_state_dir(self) -> str:
+        """Directory for state shared between worker processes."""
+        if self.state_dir:
+            return self.state_dir
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        return os.path.join(base, f"netbox-mcp-{self.port}")
 
 
 @dataclass  
@@ -177,12 +273,31 @@ class NetBoxConfig:
     enable_degraded_mode: bool = True
     enable_read_operations: bool = True
     
+    # Build the endpoint dispatch table from NetBox's OpenAPI schema at connect
+    # time so that unknown endpoints fail fast instead of with an HTTP 404
+    discover_endpoints: bool = False
+    
     # Advanced settings
     custom_headers: Dict[str, str] = field(default_factory=dict)
     
     # Cache configuration
     cache: CacheConfig = field(default_factory=CacheConfig)
     
+    # Local inventory replica
+    replica: ReplicaConfig = field(default_factory=ReplicaConfig)
+    
+    # Tool execution pools
+    execution: ExecutionConfig = field(default_factory=ExecutionConfig)
+    
+    # Response size budget
+    response: ResponseConfig = field(default_factory=ResponseConfig)
+    
+    # Readiness probing
+    health: HealthConfig = field(default_factory=HealthConfig)
+    
+    # MCP transport and worker processes
+    transport: TransportConfig = field(default_factory=TransportConfig)
+    
     # Logging configuration
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     
@@ -221,6 +336,49 @@ class NetBoxConfig:
         if self.safety.max_batch_size <= 0:
             raise ValueError("Max batch size must be positive")
         
+        # Replica validations
+        if self.replica.sync_interval <= 0:
+            raise ValueError("Replica sync interval must be positive")
+        
+        # Execution pool validations
+        if self.execution.max_workers <= 0:
+            raise ValueError("Execution max workers must be positive")
+        if any(workers <= 0 for workers in self.execution.category_workers.values()):
+            raise ValueError("Execution category workers must be positive")
+        if self.execution.expensive_max_concurrency <= 0:
+            raise ValueError("Execution expensive max concurrency must be positive")
+        if self.execution.max_queued_per_tool < 0:
+            raise ValueError("Execution max queued per tool cannot be negative")
+        if self.execution.default_timeout <= 0:
+            raise ValueError("Execution default timeout must be positive")
+        if self.execution.batch_max_concurrency <= 0 or self.execution.batch_max_calls <= 0:
+            raise ValueError("Execution batch limits must be positive")
+        
+        # Response budget validations
+        if self.response.max_tokens <= 0:
+            raise ValueError("Response max tokens must be positive")
+        if self.response.cursor_ttl <= 0 or self.response.max_cursors <= 0:
+            raise ValueError("Response cursor TTL and max cursors must be positive")
+        
+        # Readiness probe validations
+        if self.health.probe_interval <= 0 or self.health.max_probe_age <= 0:
+            raise ValueError("Health probe interval and max probe age must be positive")
+        if self.health.failure_threshold <= 0:
+            raise ValueError("Health failure threshold must be positive")
+        
+        # Transport validations
+        valid_transports = ["stdio", "sse", "streamable-http"]
+        if self.transport.mode not in valid_transports:
+            raise ValueError(f"Invalid transport: {self.transport.mode}. Must be one of {valid_transports}")
+        if self.transport.port <= 0 or self.transport.port > 65535:
+            raise ValueError("Transport port must be between 1 and 65535")
+        if self.transport.workers <= 0:
+            raise ValueError("Transport workers must be positive")
+        if self.transport.workers > 1 and self.transport.mode != "streamable-http":
+            raise ValueError("Multiple workers require the streamable-http transport")
+        if self.transport.metrics_interval <= 0:
+            raise ValueError("Transport metrics interval must be positive")
+        
         # Log safety configuration warnings
         if self.safety.dry_run_mode:
             logger.warning("NetBox MCP running in DRY-RUN mode - no actual writes will be performed")
@@ -354,6 +512,7 @@ class ConfigurationManager:
             'NETBOX_ENABLE_HEALTH_SERVER': ('enable_health_server', cls._parse_bool),
             'NETBOX_ENABLE_DEGRADED_MODE': ('enable_degraded_mode', cls._parse_bool),
             'NETBOX_ENABLE_READ_OPERATIONS': ('enable_read_operations', cls._parse_bool),
+            'NETBOX_DISCOVER_ENDPOINTS': ('discover_endpoints', cls._parse_bool),
         }
         
         # Safety configuration mappings
@@ -377,6 +536,56 @@ class ConfigurationManager:
             'NETBOX_CACHE_MAX_ITEMS': ('cache.max_items', int),
             'NETBOX_CACHE_PATH': ('cache.path', str),
             'NETBOX_CACHE_ENABLE_STATS': ('cache.enable_stats', cls._parse_bool),
+            'NETBOX_CACHE_SNAPSHOT_ENABLED': ('cache.snapshot_enabled', cls._parse_bool),
+            'NETBOX_CACHE_SNAPSHOT_PATH': ('cache.snapshot_path', str),
+            'NETBOX_CACHE_SNAPSHOT_MAX_AGE': ('cache.snapshot_max_age', int),
+            'NETBOX_CACHE_AUTO_TUNE_TTL': ('cache.auto_tune_ttl', cls._parse_bool),
+            'NETBOX_CACHE_AUTO_TUNE_INTERVAL': ('cache.auto_tune_interval', int),
+            'NETBOX_CACHE_AUTO_TUNE_MIN_TTL': ('cache.auto_tune_min_ttl', int),
+            'NETBOX_CACHE_AUTO_TUNE_MAX_TTL': ('cache.auto_tune_max_ttl', int),
+        }
+        
+        # Replica configuration mappings
+        replica_mappings = {
+            'NETBOX_REPLICA_ENABLED': ('replica.enabled', cls._parse_bool),
+            'NETBOX_REPLICA_SYNC_INTERVAL': ('replica.sync_interval', int),
+            'NETBOX_REPLICA_MAX_STALENESS': ('replica.max_staleness', int),
+        }
+        
+        # Execution pool mappings
+        execution_mappings = {
+            'NETBOX_EXECUTION_MAX_WORKERS': ('execution.max_workers', int),
+            'NETBOX_EXECUTION_CATEGORY_WORKERS': ('execution.category_workers', cls._parse_int_map),
+            'NETBOX_EXECUTION_EXPENSIVE_MAX_CONCURRENCY': ('execution.expensive_max_concurrency', int),
+            'NETBOX_EXECUTION_MAX_QUEUED_PER_TOOL': ('execution.max_queued_per_tool', int),
+            'NETBOX_EXECUTION_DEFAULT_TIMEOUT': ('execution.default_timeout', float),
+            'NETBOX_EXECUTION_BATCH_MAX_CONCURRENCY': ('execution.batch_max_concurrency', int),
+            'NETBOX_EXECUTION_BATCH_MAX_CALLS': ('execution.batch_max_calls', int),
+        }
+        
+        # Response budget mappings
+        response_mappings = {
+            'NETBOX_RESPONSE_SHAPING_ENABLED': ('response.enabled', cls._parse_bool),
+            'NETBOX_RESPONSE_MAX_TOKENS': ('response.max_tokens', int),
+            'NETBOX_RESPONSE_CURSOR_TTL': ('response.cursor_ttl', int),
+            'NETBOX_RESPONSE_MAX_CURSORS': ('response.max_cursors', int),
+        }
+        
+        # Readiness probe mappings
+        health_mappings = {
+            'NETBOX_HEALTH_PROBE_INTERVAL': ('health.probe_interval', float),
+            'NETBOX_HEALTH_FAILURE_THRESHOLD': ('health.failure_threshold', int),
+            'NETBOX_HEALTH_MAX_PROBE_AGE': ('health.max_probe_age', float),
+        }
+        
+        # Transport mappings
+        transport_mappings = {
+            'NETBOX_MCP_TRANSPORT': ('transport.mode', str),
+            'NETBOX_MCP_HOST': ('transport.host', str),
+            'NETBOX_MCP_PORT': ('transport.port', int),
+            'NETBOX_MCP_WORKERS': ('transport.workers', int),
+            'NETBOX_MCP_STATE_DIR': ('transport.state_dir', str),
+            'NETBOX_MCP_METRICS_INTERVAL': ('transport.metrics_interval', float),
         }
         
         # Logging configuration mappings
@@ -394,7 +603,7 @@ class ConfigurationManager:
         }
         
         # Combine all mappings
-        all_mappings = {**env_mappings, **safety_mappings, **cache_mappings, **logging_mappings}
+        all_mappings = {**env_mappings, **safety_mappings, **cache_mappings, **replica_mappings, **execution_mappings, **response_mappings, **health_mappings, **transport_mappings, **logging_mappings}
         
         for env_var, config_key in all_mappings.items():
             # Use secrets manager to get values (handles all sources)
@@ -427,6 +636,18 @@ class ConfigurationManager:
             return value
         return value.lower() in ('true', '1', 'yes', 'on', 'enabled')
     
+    @staticmethod
+    def _parse_int_map(value: str) -> Dict[str, int]:
+        """Parse "key=1,other=2" into {"key": 1, "other": 2}."""
+        if isinstance(value, dict):
+            return {k: int(v) for k, v in value.items()}
+        result = {}
+        for item in value.split(','):
+            if item.strip():
+                key, _, number = item.partition('=')
+                result[key.strip()] = int(number)
+        return result
+    
     @staticmethod
     def _set_nested_value(config: Dict[str, Any], key: str, value: Any):
         """Set nested configuration value using dot notation."""
@@ -459,6 +680,26 @@ class ConfigurationManager:
             
             processed['cache'] = CacheConfig(**cache_config)
         
+        # Handle replica configuration
+        if 'replica' in processed and isinstance(processed['replica'], dict):
+            processed['replica'] = ReplicaConfig(**processed['replica'])
+        
+        # Handle execution pool configuration
+        if 'execution' in processed and isinstance(processed['execution'], dict):
+            processed['execution'] = ExecutionConfig(**processed['execution'])
+        
+        # Handle response budget configuration
+        if 'response' in processed and isinstance(processed['response'], dict):
+            processed['response'] = ResponseConfig(**processed['response'])
+        
+        # Handle readiness probe configuration
+        if 'health' in processed and isinstance(processed['health'], dict):
+            processed['health'] = HealthConfig(**processed['health'])
+        
+        # Handle transport configuration
+        if 'transport' in processed and isinstance(processed['transport'], dict):
+            processed['transport'] = TransportConfig(**processed['transport'])
+        
         # Handle logging configuration
         if 'logging' in processed and isinstance(processed['logging'], dict):
             processed['logging'] = LoggingConfig(**processed['logging'])
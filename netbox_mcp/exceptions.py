@@ -72,4 +72,21 @@ class NetBoxConflictError(NetBoxError):
         if existing_id:
             details["existing_id"] = existing_id
             message += f" (ID: {existing_id})"
-        super().__init__(message, details)
\ No newline at end of file
+        super().__init__(message, details)
+
+
+class NetBoxOverloadedError(NetBoxError):
+    """Raised when a tool call is rejected because the tool is at its concurrency and queue limits."""
+    
+    def __init__(self, tool_name: str, retry_after: float):
+        message = f"Tool '{tool_name}' is at capacity, retry in {retry_after:g}s"
+        super().__init__(message, {"tool_name": tool_name, "retry_after": retry_after})
+        self.retry_after = retry_after
+
+
+class NetBoxTimeoutError(NetBoxError):
+    """Raised when a tool call does not finish within its timeout."""
+    
+    def __init__(self, tool_name: str, timeout: float):
+        message = f"Tool '{tool_name}' did not finish within {timeout:g}s"
+        super().__init__(message, {"tool_name": tool_name, "timeout": timeout})
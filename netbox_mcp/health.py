@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Readiness Probing for NetBox MCP Server
+
+A background thread probes NetBox at a fixed interval and records the
+outcome, together with the state of the cache, the replica and the tool
+bulkheads. /readyz answers from this record without calling NetBox, so a
+slow NetBox never holds up health requests; it makes the server unready
+once probes keep failing.
+
+The component states come from the process the prober runs in unless it
+is given another source: a supervisor serving through several workers
+reads them from the workers' metrics snapshots instead.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import HealthConfig
+from .tool_executor import get_tool_executor
+
+logger = logging.getLogger(__name__)
+
+
+def shedding_tools(tools: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Tools whose bulkhead queue is full and which are rejecting calls, from executor metrics."""
+    return sorted(name for name, m in tools.items() if m["max_queued"] and m["queued"] >= m["max_queued"])
+
+
+def component_state(client: Any) -> Dict[str, Any]:
+    """
+    State of the cache, the replica and the tool bulkheads in this process.
+
+    Args:
+        client: The NetBox client, or None if it could not be obtained
+
+    Returns:
+        The cache, replica and shedding_tools fields of the readiness detail
+    """
+    cache, replica = {}, None
+    if client is not None:
+        try:
+            stats = client.cache.get_stats()
+            cache = {
+                "warm": stats.get("size", 0) > 0,
+                "size": stats.get("size", 0),
+                "max_size": stats.get("max_size"),
+                "hit_ratio_percent": stats.get("hit_ratio_percent"),
+                "snapshot_entries": stats.get("snapshot_entries", 0),
+            } if stats.get("enabled") else {"enabled": False}
+            if client.replica is not None:
+                replica_stats = client.replica.get_stats()
+                replica = {"fresh": replica_stats["fresh"], "age_seconds": replica_stats["age_seconds"]}
+        except Exception as e:
+            logger.debug(f"Could not read cache state: {e}")
+
+    tools = get_tool_executor().get_metrics().get("tools", {})
+    return {"cache": cache, "replica": replica, "shedding_tools": shedding_tools(tools)}
+
+
+class ReadinessProber:
+    """Probes NetBox in the background and serves the latest readiness from memory."""
+
+    def __init__(self, get_client: Callable[[], Any], config: Optional[HealthConfig] = None,
+                 get_components: Callable[[Any], Dict[str, Any]] = component_state):
+        self.get_client = get_client
+        self.config = config or HealthConfig()
+        self.get_components = get_components
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.probes = 0
+        self.consecutive_failures = 0
+        self.last_probe: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.probe_duration_ms: Optional[float] = None
+        self.netbox: Dict[str, Any] = {"connected": False, "error": "not probed yet"}
+        self.components: Dict[str, Any] = {"cache": {}, "replica": None, "shedding_tools": []}
+
+    def start(self) -> None:
+        """Start probing in a daemon thread; the first probe runs immediately."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="netbox-readiness-prober", daemon=True)
+        self._thread.start()
+        logger.info(f"Readiness prober started (interval {self.config.probe_interval}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.config.probe_interval)
+
+    def probe(self) -> None:
+        """Check NetBox once and record the outcome and component states."""
+        started = time.time()
+        try:
+            client = self.get_client()
+            status = client.health_check(force=True)
+            netbox = {
+                "connected": status.connected,
+                "version": status.version,
+                "response_time_ms": status.response_time_ms,
+                "error": status.error,
+            }
+        except Exception as e:
+            client = None
+            netbox = {"connected": False, "error": str(e)}
+        finished = time.time()
+
+        try:
+            components = self.get_components(client)
+        except Exception as e:
+            logger.debug(f"Readiness prober could not read component states: {e}")
+            components = {}
+
+        with self._lock:
+            self.probes += 1
+            self.last_probe = finished
+            self.probe_duration_ms = round((finished - started) * 1000, 1)
+            self.netbox = netbox
+            if netbox["connected"]:
+                self.consecutive_failures = 0
+                self.last_success = finished
+            else:
+                self.consecutive_failures += 1
+            self.components = components
+
+        if not netbox["connected"]:
+            logger.warning(f"Readiness probe failed ({self.consecutive_failures} in a row): {netbox['error']}")
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        The readiness recorded by the last probe.
+
+        Returns:
+            (ready, detail) where detail is the /readyz response body
+        """
+        now = time.time()
+        with self._lock:
+            ready = (
+                self.last_success is not None
+                and self.consecutive_failures < self.config.failure_threshold
+                and now - self.last_success <= self.config.max_probe_age
+            )
+            detail = {
+                "status": "OK" if ready else "Service Unavailable",
+                "netbox_connected": self.netbox["connected"],
+                "netbox_version": self.netbox.get("version"),
+                "response_time_ms": self.netbox.get("response_time_ms"),
+                "error": self.netbox.get("error"),
+                "probe": {
+                    "count": self.probes,
+                    "age_seconds": round(now - self.last_probe, 1) if self.last_probe else None,
+                    "duration_ms": self.probe_duration_ms,
+                    "interval_seconds": self.config.probe_interval,
+                    "consecutive_failures": self.consecutive_failures,
+                    "failure_threshold": self.config.failure_threshold,
+                    "last_success_age_seconds": round(now - self.last_success, 1) if self.last_success else None,
+                },
+                **self.components,
+            }
+        return ready, detail
+
+
+_readiness_prober: Optional[ReadinessProber] = None
+_readiness_prober_lock = threading.Lock()
+
+
+def get_readiness_prober() -> Optional[ReadinessProber]:
+    """Get the global readiness prober, if one was configured."""
+    return _readiness_prober
+
+
+def configure_readiness_prober(get_client: Callable[[], Any], config: HealthConfig,
+                               get_components: Callable[[Any], Dict[str, Any]] = component_state) -> ReadinessProber:
+    """Replace the global readiness prober with a started one using the given settings."""
+    global _readiness_prober
+    with _readiness_prober_lock:
+        previous, _readiness_prober = _readiness_prober, ReadinessProber(get_client, config, get_components)
+    if previous is not None:
+        previous.stop()
+    _readiness_prober.start()
+    return _readiness_prober
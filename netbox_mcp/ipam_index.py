@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+IPAM Radix Index for NetBox MCP Server
+
+In-process index of the prefixes and IP addresses of one VRF, so utilization,
+child-prefix rollups, free-block search and next-available queries are
+answered without re-downloading the address table on every tool call.
+
+**Structures:**
+- PrefixTrie: path-compressed binary (Patricia) trie of prefixes per address
+  family, keyed by the integer network address and prefix length
+- Sorted integer lists of host addresses per family, so counting the
+  addresses inside any prefix is two bisections
+
+All arithmetic is done on Python integers, so IPv4 and IPv6 are handled by
+the same code with 32 and 128 bit widths.
+"""
+
+import bisect
+import ipaddress
+import logging
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FAMILY_BITS = {4: 32, 6: 128}
+
+# Upper bound on CIDR blocks returned by free_blocks(); the total free
+# address count is always exact
+MAX_FREE_BLOCKS = 256
+
+
+def parse_prefix(prefix: str) -> Tuple[int, int, int]:
+    """Parse a prefix into (version, network integer, prefix length)."""
+    network = ipaddress.ip_network(prefix, strict=False)
+    return network.version, int(network.network_address), network.prefixlen
+
+
+def parse_address(address: str) -> Tuple[int, int]:
+    """Parse an address with or without mask into (version, host integer)."""
+    interface = ipaddress.ip_interface(address)
+    return interface.version, int(interface.ip)
+
+
+def format_address(version: int, value: int) -> str:
+    """Format a host integer as an address string."""
+    return str(ipaddress.ip_address(value) if version == 4 else ipaddress.IPv6Address(value))
+
+
+def usable_range(version: int, network: int, length: int) -> Tuple[int, int]:
+    """
+    Return the first and last assignable host of a prefix (inclusive).
+
+    IPv4 prefixes shorter than /31 exclude the network and broadcast
+    addresses; /31, /32 and all IPv6 prefixes use every address.
+    """
+    last = network + (1 << (FAMILY_BITS[version] - length)) - 1
+    if version == 4 and length < 31:
+        return network + 1, last - 1
+    return network, last
+
+
+def usable_addresses(version: int, length: int) -> int:
+    """Number of assignable hosts in a prefix of the given length."""
+    first, last = usable_range(version, 0, length)
+    return last - first + 1
+
+
+def cidr_blocks(version: int, start: int, end: int, limit: int = MAX_FREE_BLOCKS) -> List[str]:
+    """Decompose the inclusive range [start, end] into the fewest CIDR blocks."""
+    bits = FAMILY_BITS[version]
+    blocks = []
+    while start <= end and len(blocks) < limit:
+        # Largest block aligned at start, shrunk until it fits the range
+        size = start & -start if start else 1 << bits
+        while size > end - start + 1:
+            size >>= 1
+        length = bits - size.bit_length() + 1
+        blocks.append(f"{format_address(version, start)}/{length}")
+        start += size
+    return blocks
+
+
+class _TrieNode:
+    __slots__ = ("network", "length", "children", "record")
+
+    def __init__(self, network: int, length: int, record: Optional[Dict[str, Any]] = None):
+        self.network = network
+        self.length = length
+        self.children: List[Optional["_TrieNode"]] = [None, None]
+        self.record = record
+
+
+class PrefixTrie:
+    """
+    Path-compressed binary trie of prefixes for one address family.
+
+    Only nodes carrying a prefix record or branching into two subtrees are
+    stored, so depth is bounded by the number of distinct branch points
+    rather than the address width.
+    """
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.root = _TrieNode(0, 0)
+        self.size = 0
+
+    def _mask(self, network: int, length: int) -> int:
+        host_bits = self.bits - length
+        return (network >> host_bits) << host_bits
+
+    def _bit(self, network: int, position: int) -> int:
+        return (network >> (self.bits - 1 - position)) & 1
+
+    def _common_length(self, a: int, b: int, limit: int) -> int:
+        diff = a ^ b
+        if diff == 0:
+            return limit
+        return min(self.bits - diff.bit_length(), limit)
+
+    def insert(self, network: int, length: int, record: Dict[str, Any]) -> None:
+        """Insert or replace the record for a prefix."""
+        node = self.root
+        while True:
+            if node.length == length and node.network == network:
+                if node.record is None:
+                    self.size += 1
+                node.record = record
+                return
+
+            bit = self._bit(network, node.length)
+            child = node.children[bit]
+            if child is None:
+                node.children[bit] = _TrieNode(network, length, record)
+                self.size += 1
+                return
+
+            common = self._common_length(child.network, network, min(child.length, length))
+            if common == child.length:
+                node = child
+                continue
+
+            new_node = _TrieNode(network, length, record)
+            self.size += 1
+            if common == length:
+                # The new prefix covers the existing child
+                new_node.children[self._bit(child.network, length)] = child
+                node.children[bit] = new_node
+            else:
+                branch = _TrieNode(self._mask(network, common), common)
+                branch.children[self._bit(child.network, common)] = child
+                branch.children[self._bit(network, common)] = new_node
+                node.children[bit] = branch
+            return
+
+    def _subtrees(self, network: int, length: int) -> List[_TrieNode]:
+        """Return the trie nodes strictly inside a prefix, nearest first."""
+        node = self.root
+        while True:
+            if node.length == length and node.network == network:
+                return [child for child in node.children if child is not None]
+
+            child = node.children[self._bit(network, node.length)]
+            if child is None:
+                return []
+            if child.length > length:
+                return [child] if self._mask(child.network, length) == network else []
+            if self._mask(network, child.length) != child.network:
+                return []
+            node = child
+
+    def get(self, network: int, length: int) -> Optional[Dict[str, Any]]:
+        """Return the record stored for an exact prefix."""
+        node = self.root
+        while node is not None:
+            if node.length == length and node.network == network:
+                return node.record
+            if node.length >= length or self._mask(network, node.length) != node.network:
+                return None
+            node = node.children[self._bit(network, node.length)]
+        return None
+
+    def descendants(self, network: int, length: int, direct_only: bool = False) -> Iterator[_TrieNode]:
+        """
+        Yield record-carrying nodes inside a prefix, in address order.
+
+        Args:
+            network: Network integer of the enclosing prefix
+            length: Prefix length of the enclosing prefix
+            direct_only: Only yield the nearest records, not their descendants
+        """
+        stack = list(reversed(self._subtrees(network, length)))
+        while stack:
+            node = stack.pop()
+            if node.record is not None:
+                yield node
+                if direct_only:
+                    continue
+            for child in reversed(node.children):
+                if child is not None:
+                    stack.append(child)
+
+
+class VRFIndex:
+    """Prefix tries and sorted host addresses for a single VRF."""
+
+    def __init__(self):
+        self.tries = {version: PrefixTrie(bits) for version, bits in FAMILY_BITS.items()}
+        self.addresses: Dict[int, List[int]] = {4: [], 6: []}
+        # Address ID -> (family, value), so addresses can be updated and removed by ID
+        self.address_ids: Dict[int, Tuple[int, int]] = {}
+        self.built_at = time.time()
+        self.synced_at = self.built_at
+        self.prefixes_stale = False
+
+    @classmethod
+    def build(cls, prefixes: Iterable[Dict[str, Any]],
+              addresses: Iterable[Union[str, Tuple[int, str]]]) -> "VRFIndex":
+        """
+        Build an index from prefix records and addresses.
+
+        Args:
+            prefixes: Serialized prefix records (must contain "prefix")
+            addresses: IP address strings such as "10.0.0.5/24", or
+                (ID, address) pairs; only addresses given with their ID can
+                later be updated or removed
+        """
+        index = cls()
+        index.set_prefixes(prefixes)
+
+        for item in addresses:
+            obj_id, address = item if isinstance(item, tuple) else (None, item)
+            try:
+                version, value = parse_address(address)
+            except ValueError:
+                logger.warning(f"IPAM index: skipping invalid address {address!r}")
+                continue
+            index.addresses[version].append(value)
+            if obj_id is not None:
+                index.address_ids[obj_id] = (version, value)
+
+        for values in index.addresses.values():
+            values.sort()
+        return index
+
+    def set_prefixes(self, prefixes: Iterable[Dict[str, Any]]) -> None:
+        """Replace the indexed prefixes, keeping the addresses."""
+        tries = {version: PrefixTrie(bits) for version, bits in FAMILY_BITS.items()}
+        for record in prefixes:
+            try:
+                version, network, length = parse_prefix(record["prefix"])
+            except (KeyError, ValueError):
+                logger.warning(f"IPAM index: skipping invalid prefix record {record.get('id')}")
+                continue
+            tries[version].insert(network, length, record)
+        self.tries = tries
+        self.prefixes_stale = False
+
+    def add_address(self, obj_id: int, address: str) -> None:
+        """Index an address by ID, replacing the address previously indexed under that ID."""
+        self.remove_address(obj_id)
+        version, value = parse_address(address)
+        bisect.insort(self.addresses[version], value)
+        self.address_ids[obj_id] = (version, value)
+
+    def remove_address(self, obj_id: int) -> bool:
+        """Remove the address indexed under an ID; False if there is none."""
+        entry = self.address_ids.pop(obj_id, None)
+        if entry is None:
+            return False
+        version, value = entry
+        values = self.addresses[version]
+        position = bisect.bisect_left(values, value)
+        if position < len(values) and values[position] == value:
+            del values[position]
+        return True
+
+    def count_addresses(self, version: int, first: int, last: int) -> int:
+        """Number of indexed addresses in the inclusive range [first, last]."""
+        values = self.addresses[version]
+        return bisect.bisect_right(values, last) - bisect.bisect_left(values, first)
+
+    def utilization(self, prefix: str) -> Dict[str, Any]:
+        """
+        Address utilization of a prefix.
+
+        Returns:
+            Dict with total (assignable), used, available and percentage
+        """
+        return self._utilization(*parse_prefix(prefix))
+
+    def _utilization(self, version: int, network: int, length: int) -> Dict[str, Any]:
+        total = usable_addresses(version, length)
+        last = network + (1 << (FAMILY_BITS[version] - length)) - 1
+        used = self.count_addresses(version, network, last)
+        return {
+            "total_addresses": total,
+            "used_addresses": used,
+            "available_addresses": max(total - used, 0),
+            "usage_percentage": round(used / total * 100, 2) if total > 0 else 0,
+        }
+
+    def child_prefixes(self, prefix: str, direct_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Child prefixes of a prefix with their own address utilization.
+
+        Args:
+            prefix: Enclosing prefix
+            direct_only: Only the nearest children, not grandchildren
+
+        Returns:
+            One entry per child with "record" and the utilization() fields
+        """
+        version, network, length = parse_prefix(prefix)
+        children = []
+        for node in self.tries[version].descendants(network, length, direct_only=direct_only):
+            children.append({
+                "prefix": f"{format_address(version, node.network)}/{node.length}",
+                "record": node.record,
+                **self._utilization(version, node.network, node.length),
+            })
+        return children
+
+    def hierarchy_report(self) -> List[Dict[str, Any]]:
+        """
+        Utilization of every indexed prefix in one pass over the tries.
+
+        Each entry carries the prefix record, its depth in the prefix
+        hierarchy, the record of its nearest enclosing prefix, its size, the
+        number of direct child prefixes and the addresses those children
+        cover, plus the utilization() fields. Entries are in address order, IPv4 first.
+        """
+        entries = []
+        for version, trie in self.tries.items():
+            bits = FAMILY_BITS[version]
+            stack = [(trie.root, None)]
+            while stack:
+                node, parent = stack.pop()
+                entry = parent
+                if node.record is not None:
+                    entry = {
+                        "prefix": f"{format_address(version, node.network)}/{node.length}",
+                        "record": node.record,
+                        "parent": parent["record"] if parent else None,
+                        "depth": parent["depth"] + 1 if parent else 0,
+                        "size": 1 << (bits - node.length),
+                        "child_count": 0,
+                        "child_addresses": 0,
+                        **self._utilization(version, node.network, node.length),
+                    }
+                    if parent:
+                        parent["child_count"] += 1
+                        parent["child_addresses"] += 1 << (bits - node.length)
+                    entries.append(entry)
+                for child in reversed(node.children):
+                    if child is not None:
+                        stack.append((child, entry))
+        return entries
+
+    def free_blocks(self, prefix: str) -> Dict[str, Any]:
+        """
+        Address space of a prefix not covered by any child prefix.
+
+        Returns:
+            Dict with the free CIDR blocks (largest-first decomposition of
+            each gap, capped at MAX_FREE_BLOCKS) and the exact free address count
+        """
+        version, network, length = parse_prefix(prefix)
+        end = network + (1 << (FAMILY_BITS[version] - length)) - 1
+
+        blocks = []
+        free_addresses = 0
+        cursor = network
+        for node in self.tries[version].descendants(network, length, direct_only=True):
+            child_end = node.network + (1 << (FAMILY_BITS[version] - node.length)) - 1
+            if node.network > cursor:
+                free_addresses += node.network - cursor
+                blocks.extend(cidr_blocks(version, cursor, node.network - 1, MAX_FREE_BLOCKS - len(blocks)))
+            cursor = max(cursor, child_end + 1)
+        if cursor <= end:
+            free_addresses += end - cursor + 1
+            blocks.extend(cidr_blocks(version, cursor, end, MAX_FREE_BLOCKS - len(blocks)))
+
+        return {"free_blocks": blocks, "free_addresses": free_addresses,
+                "truncated": len(blocks) >= MAX_FREE_BLOCKS}
+
+    def next_available(self, prefix: str, count: int = 1) -> Optional[List[str]]:
+        """
+        First run of count consecutive unallocated host addresses in a prefix.
+
+        Returns:
+            The addresses as strings, or None if no such run exists
+        """
+        version, network, length = parse_prefix(prefix)
+        first, last = usable_range(version, network, length)
+        values = self.addresses[version]
+
+        candidate = first
+        position = bisect.bisect_left(values, first)
+        while position < len(values) and values[position] <= last:
+            used = values[position]
+            if used - candidate >= count:
+                break
+            candidate = max(candidate, used + 1)
+            position += 1
+
+        if last - candidate + 1 < count:
+            return None
+        suffix = f"/{length}"
+        return [format_address(version, candidate + offset) + suffix for offset in range(count)]
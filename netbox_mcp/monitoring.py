@@ -316,6 +316,7 @@ class MetricsCollector:
             performance_monitor: Performance monitor instance
         """
         self.performance_monitor = performance_monitor or PerformanceMonitor()
+        self.cache_manager = None  # Will be set by dependency injection
         self._collection_interval = 60  # seconds
         self._collection_task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
@@ -383,16 +384,8 @@ class MetricsCollector:
             system_metrics = SystemMetrics.collect()
             self.performance_monitor.record_system_metrics(system_metrics)
             
-            # Collect cache metrics (would integrate with actual cache)
-            # This is a placeholder - would get real cache stats
-            cache_metrics = CacheMetrics(
-                hits=0,
-                misses=0,
-                hit_ratio=0.0,
-                cache_size_mb=0.0,
-                evictions=0,
-                timestamp=datetime.now()
-            )
+            # Collect cache metrics from the client's CacheManager when available
+            cache_metrics = self._collect_cache_metrics()
             self.performance_monitor.record_cache_metrics(cache_metrics)
             
             collection_duration = time.time() - start_time
@@ -401,6 +394,37 @@ class MetricsCollector:
         except Exception as e:
             logger.error(f"Failed to collect metrics: {e}")
     
+    def _collect_cache_metrics(self) -> CacheMetrics:
+        """Build CacheMetrics from the attached CacheManager (zeros if none)."""
+        if self.cache_manager is None:
+            return CacheMetrics(
+                hits=0,
+                misses=0,
+                hit_ratio=0.0,
+                cache_size_mb=0.0,
+                evictions=0,
+                timestamp=datetime.now()
+            )
+        
+        stats = self.cache_manager.get_stats()
+        analytics = self.cache_manager.get_cache_analytics()
+        cache_size_bytes = sum(
+            type_stats.get("bytes", 0)
+            for type_stats in analytics.get("object_types", {}).values()
+        )
+        return CacheMetrics.calculate(
+            hits=stats.get("hits", 0),
+            misses=stats.get("misses", 0),
+            cache_size_bytes=cache_size_bytes,
+            evictions=stats.get("evictions", 0)
+        )
+    
+    def get_cache_analytics(self) -> Optional[Dict[str, Any]]:
+        """Get per-object-type cache analytics from the attached CacheManager."""
+        if self.cache_manager is None:
+            return None
+        return self.cache_manager.get_cache_analytics()
+    
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of collected metrics."""
         summary = {
@@ -744,6 +768,7 @@ class MetricsDashboard:
             "overview": self._get_overview(),
             "operation_metrics": self._get_operation_metrics(),
             "cache_metrics": self._get_cache_metrics(),
+            "cache_analytics": self._get_cache_analytics(),
             "system_metrics": self._get_system_metrics(),
             "health_status": self.health_check.get_health_status()
         }
@@ -803,6 +828,14 @@ class MetricsDashboard:
             return cache_metrics.to_dict()
         return None
     
+    def _get_cache_analytics(self) -> Optional[Dict[str, Any]]:
+        """Get per-object-type cache analytics for dashboard."""
+        try:
+            return self.metrics_collector.get_cache_analytics()
+        except Exception as e:
+            logger.warning(f"Failed to collect cache analytics: {e}")
+            return None
+    
     def _get_system_metrics(self) -> Optional[Dict[str, Any]]:
         """Get system metrics for dashboard."""
         system_metrics = self.metrics_collector.performance_monitor.get_latest_system_metrics()
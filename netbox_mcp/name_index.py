@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Name Index for NetBox MCP Server
+
+Trigram index over the names and slugs of frequently referenced objects
+(sites, devices, device types, manufacturers, tenants, racks and VLANs), so
+a failed exact lookup can offer ranked "did you mean" candidates locally
+instead of the caller guessing variants one API round trip at a time.
+
+Trigrams follow PostgreSQL's pg_trgm: text is lowercased, split into words
+on non-alphanumerics and each word is padded with two leading and one
+trailing space. Similarity is |shared| / |union| of the trigram sets; the
+candidates are gathered from trigram posting lists, so a query only touches
+names sharing at least one trigram with it.
+
+Each endpoint's index is built on first use from the local replica when it
+is loaded and fresh, otherwise from one streamed brief listing, and dropped
+on writes to that endpoint.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+# Indexed endpoints and the fields matched for each
+FUZZY_INDEX_FIELDS: Dict[str, tuple] = {
+    "dcim.sites": ("name", "slug"),
+    "dcim.devices": ("name",),
+    "dcim.device_types": ("model", "slug"),
+    "dcim.manufacturers": ("name", "slug"),
+    "dcim.racks": ("name",),
+    "tenancy.tenants": ("name", "slug"),
+    "ipam.vlans": ("name",),
+}
+
+# pg_trgm's default similarity threshold
+DEFAULT_MIN_SIMILARITY = 0.3
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigram set of a string."""
+    result = set()
+    for word in _NON_ALNUM.split(str(text).lower()):
+        if word:
+            padded = f"  {word} "
+            result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class NameIndex:
+    """Trigram posting lists over the names of one endpoint's objects."""
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self.entries: List[Dict[str, Any]] = []
+        # One term per indexed (entry, field) value
+        self.term_entry: List[int] = []
+        self.term_size: List[int] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.built_at = time.time()
+
+    @classmethod
+    def build(cls, records: Iterable[Dict[str, Any]], fields: Iterable[str]) -> "NameIndex":
+        index = cls(fields)
+        for record in records:
+            index.add(record)
+        return index
+
+    def add(self, record: Dict[str, Any]) -> None:
+        entry = len(self.entries)
+        self.entries.append({"id": record.get("id"), **{f: record.get(f) for f in self.fields}})
+        seen = set()
+        for field_name in self.fields:
+            value = record.get(field_name)
+            if not value or str(value).lower() in seen:
+                continue
+            seen.add(str(value).lower())
+            grams = trigrams(value)
+            if not grams:
+                continue
+            term = len(self.term_entry)
+            self.term_entry.append(entry)
+            self.term_size.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(term)
+
+    def search(self, query: str, limit: int = 5,
+               min_similarity: float = DEFAULT_MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Rank entries by trigram similarity to query.
+
+        Returns:
+            Up to limit entries with a "similarity" score, best first; ties
+            are broken by name so results are stable
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best: Dict[int, float] = {}
+        for term, count in shared.items():
+            similarity = count / (len(grams) + self.term_size[term] - count)
+            entry = self.term_entry[term]
+            if similarity >= min_similarity and similarity > best.get(entry, 0):
+                best[entry] = similarity
+
+        name_field = self.fields[0]
+        ranked = sorted(best.items(), key=lambda item: (-item[1], str(self.entries[item[0]][name_field])))
+        return [{**self.entries[entry], "similarity": round(similarity, 3)} for entry, similarity in ranked[:limit]]
+
+
+class FuzzyNameIndex:
+    """Lazily built NameIndex per endpoint for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._indexes: Dict[str, NameIndex] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, endpoint: str) -> Iterable[Dict[str, Any]]:
+        replica = self.client.replica
+        if replica is not None:
+            rows = replica.filter(endpoint, {})
+            if rows is not None:
+                return rows
+        return (dict(record) for record in self.client.stream(endpoint, brief=1))
+
+    def get(self, endpoint: str) -> NameIndex:
+        """Return the index of an endpoint in FUZZY_INDEX_FIELDS, building it if needed."""
+        ttl = self.client.config.cache.ttl
+        max_age = getattr(ttl, endpoint.split(".", 1)[1], ttl.default)
+        with self._lock:
+            index = self._indexes.get(endpoint)
+            if index is not None and time.time() - index.built_at < max_age:
+                return index
+
+        index = NameIndex.build(self._load(endpoint), FUZZY_INDEX_FIELDS[endpoint])
+        with self._lock:
+            self._indexes[endpoint] = index
+        logger.debug(f"Built name index for {endpoint}: {len(index.entries)} objects")
+        return index
+
+    def suggest(self, endpoint: str, query: str, limit: int = 5,
+                min_similarity: float = DEFAULT_MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """Ranked "did you mean" candidates, or [] for endpoints that are not indexed."""
+        if endpoint not in FUZZY_INDEX_FIELDS or not query:
+            return []
+        return self.get(endpoint).search(str(query), limit=limit, min_similarity=min_similarity)
+
+    def clear(self, endpoint: Optional[str] = None) -> None:
+        """Drop one endpoint's index, or all of them."""
+        with self._lock:
+            if endpoint is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(endpoint, None)
+
+
+def did_you_mean(suggestions: List[Dict[str, Any]]) -> str:
+    """Message suffix such as " (did you mean 'a' or 'b'?)", or "" without suggestions."""
+    names = [f"'{s.get('name') or s.get('model') or s.get('slug')}'" for s in suggestions]
+    if not names:
+        return ""
+    return f" (did you mean {' or '.join(names)}?)"
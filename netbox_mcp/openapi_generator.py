@@ -16,7 +16,7 @@ from dataclasses import dataclass
 import inspect
 import re
 
-from netbox_mcp.registry import TOOL_REGISTRY, list_tools
+from netbox_mcp.registry import TOOL_REGISTRY, get_manifest_entry, list_tools
 from netbox_mcp.exceptions import NetBoxError
 
 logger = logging.getLogger(__name__)
@@ -365,11 +365,16 @@ class OpenAPIGenerator:
                 tools_by_category[category] = []
             tools_by_category[category].append(tool)
         
+        # Path items in the tool manifest were generated with the default
+        # configuration; use them unless examples or security are turned off
+        use_manifest = self.config.include_examples and self.config.include_security
+        
         # Generate paths for each tool
         for category, category_tools in tools_by_category.items():
             for tool in category_tools:
                 path = f"/api/v1/tools/{tool['name']}"
-                paths[path] = self._generate_path_item(tool, category)
+                entry = get_manifest_entry(tool["name"]) if use_manifest else None
+                paths[path] = entry["openapi"] if entry else self._generate_path_item(tool, category)
         
         # Add utility endpoints
         paths.update(self._generate_utility_paths())
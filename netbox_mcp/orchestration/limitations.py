@@ -140,6 +140,7 @@ I've detected this query might return a large dataset that could cause token ove
 **Progressive Disclosure Strategy**:
 - Showing first {limit} results initially
 - You can request additional batches as needed
+- Results over the response budget carry a cursor; netbox_fetch_more returns the next page without querying NetBox again
 - Apply filters to reduce scope if desired
 
 **Your Options**:
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Power Budget Index for NetBox MCP Server
+
+Per-site power model built from four bulk queries (power panels, feeds,
+power ports and power outlets of the site). The feed -> PDU inlet ->
+outlet -> device power port tree is assembled from the ports' connected
+endpoints, which NetBox resolves from the cable paths, so no per-feed or
+per-cable lookups are needed.
+
+Draw follows NetBox's own rules: a power port with outlets attached (a
+PDU inlet) draws the sum of the ports plugged into those outlets, per feed
+leg; any other port draws its own allocated_draw/maximum_draw. Feed
+capacity is voltage x amperage x max_utilization, times sqrt(3) for
+three-phase feeds.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from .records import choice_value, related_id
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+FEED_LEGS = ("A", "B", "C")
+
+# Draw as (allocated watts, maximum watts)
+Draw = Tuple[int, int]
+
+
+def feed_capacity(feed: Dict[str, Any]) -> int:
+    """Usable watts of a feed after its max_utilization derating."""
+    voltage = feed.get("voltage") or 0
+    amperage = feed.get("amperage") or 0
+    max_utilization = feed.get("max_utilization")
+    if max_utilization is None:
+        max_utilization = 100
+    watts = abs(voltage) * amperage * max_utilization / 100
+    if choice_value(feed.get("phase")) == "three-phase":
+        watts *= math.sqrt(3)
+    return int(watts)
+
+
+def _percent(part: float, whole: float) -> Optional[float]:
+    return round(part / whole * 100, 2) if whole else None
+
+
+def _connected_ids(record: Dict[str, Any], endpoint_type: str) -> List[int]:
+    """IDs of the connected endpoints of a record if they are of endpoint_type."""
+    if record.get("connected_endpoints_type") != endpoint_type:
+        return []
+    return [related_id(endpoint) for endpoint in record.get("connected_endpoints") or []]
+
+
+class SitePower:
+    """Power tree and utilization of one site."""
+
+    def __init__(self, panels: List[Dict[str, Any]], feeds: List[Dict[str, Any]],
+                 ports: List[Dict[str, Any]], outlets: List[Dict[str, Any]]):
+        self.panels = {panel["id"]: panel for panel in panels}
+        self.feeds = {feed["id"]: feed for feed in feeds}
+        self.ports = {port["id"]: port for port in ports}
+        self.built_at = time.time()
+
+        # inlet port -> its outlets; outlet -> ports plugged into it; feed -> inlet ports
+        self.inlet_outlets: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for outlet in outlets:
+            inlet = related_id(outlet.get("power_port"))
+            if inlet is not None:
+                self.inlet_outlets[inlet].append(outlet)
+        self.outlet_ports: Dict[int, List[int]] = defaultdict(list)
+        self.feed_ports: Dict[int, List[int]] = defaultdict(list)
+        for port in ports:
+            for outlet_id in _connected_ids(port, "dcim.poweroutlet"):
+                self.outlet_ports[outlet_id].append(port["id"])
+            for feed_id in _connected_ids(port, "dcim.powerfeed"):
+                self.feed_ports[feed_id].append(port["id"])
+
+        self._draws: Dict[int, Tuple[Draw, Dict[str, Draw], Set[int]]] = {}
+
+    def port_draw(self, port_id: int, _path: Optional[Set[int]] = None) -> Tuple[Draw, Dict[str, Draw], Set[int]]:
+        """
+        Draw of a power port, its per-leg split and the devices it feeds.
+
+        Cascaded PDUs are followed; a port seen twice on one path (a wiring
+        loop) contributes nothing the second time.
+        """
+        if port_id in self._draws:
+            return self._draws[port_id]
+        path = _path or set()
+        port = self.ports.get(port_id)
+        if port is None or port_id in path:
+            return (0, 0), {}, set()
+        path.add(port_id)
+
+        devices = {related_id(port.get("device"))}
+        legs: Dict[str, List[int]] = {}
+        outlets = self.inlet_outlets.get(port_id)
+        if outlets:
+            allocated = maximum = 0
+            for outlet in outlets:
+                leg = choice_value(outlet.get("feed_leg"))
+                for downstream in self.outlet_ports.get(outlet["id"], ()):
+                    (down_allocated, down_maximum), _, down_devices = self.port_draw(downstream, path)
+                    allocated += down_allocated
+                    maximum += down_maximum
+                    devices |= down_devices
+                    if leg in FEED_LEGS:
+                        leg_draw = legs.setdefault(leg, [0, 0])
+                        leg_draw[0] += down_allocated
+                        leg_draw[1] += down_maximum
+        else:
+            allocated = port.get("allocated_draw") or 0
+            maximum = port.get("maximum_draw") or 0
+
+        path.discard(port_id)
+        result = (allocated, maximum), {leg: tuple(draw) for leg, draw in legs.items()}, devices
+        self._draws[port_id] = result
+        return result
+
+    def feed_report(self, feed_id: int) -> Dict[str, Any]:
+        """Load versus capacity of a feed, with phase balance for three-phase feeds."""
+        feed = self.feeds[feed_id]
+        capacity = feed_capacity(feed)
+        allocated = maximum = 0
+        legs: Dict[str, List[int]] = {leg: [0, 0] for leg in FEED_LEGS}
+        devices: Set[int] = set()
+        for port_id in self.feed_ports.get(feed_id, ()):
+            (port_allocated, port_maximum), port_legs, port_devices = self.port_draw(port_id)
+            allocated += port_allocated
+            maximum += port_maximum
+            devices |= port_devices
+            for leg, (leg_allocated, leg_maximum) in port_legs.items():
+                legs[leg][0] += leg_allocated
+                legs[leg][1] += leg_maximum
+        devices.discard(None)
+
+        report = {
+            "id": feed_id,
+            "name": feed.get("name"),
+            "power_panel": related_id(feed.get("power_panel")),
+            "rack": related_id(feed.get("rack")),
+            "status": choice_value(feed.get("status")),
+            "type": choice_value(feed.get("type")),
+            "phase": choice_value(feed.get("phase")),
+            "capacity_watts": capacity,
+            "allocated_watts": allocated,
+            "maximum_watts": maximum,
+            "utilization_percent": _percent(allocated, capacity),
+            "device_count": len(devices),
+        }
+        if report["phase"] == "three-phase":
+            leg_allocated = {leg: legs[leg][0] for leg in FEED_LEGS}
+            report["legs"] = {
+                leg: {"allocated_watts": leg_allocated[leg], "utilization_percent": _percent(leg_allocated[leg], capacity / 3)}
+                for leg in FEED_LEGS
+            }
+            report["phase_imbalance_percent"] = self.phase_imbalance(list(leg_allocated.values()))
+        return report
+
+    @staticmethod
+    def phase_imbalance(loads: List[int]) -> Optional[float]:
+        """Largest deviation of a leg from the mean leg load, in percent of the mean."""
+        mean = sum(loads) / len(loads)
+        if not mean:
+            return None
+        return round(max(abs(load - mean) for load in loads) / mean * 100, 2)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-feed, per-panel and per-rack utilization in one pass over the feeds."""
+        feeds = [self.feed_report(feed_id) for feed_id in sorted(self.feeds)]
+
+        def rollup(key: str) -> Dict[int, Dict[str, Any]]:
+            totals: Dict[int, Dict[str, Any]] = {}
+            for feed in feeds:
+                if feed[key] is None:
+                    continue
+                entry = totals.setdefault(feed[key], {"id": feed[key], "feed_count": 0, "capacity_watts": 0,
+                                                      "allocated_watts": 0, "maximum_watts": 0})
+                entry["feed_count"] += 1
+                for field in ("capacity_watts", "allocated_watts", "maximum_watts"):
+                    entry[field] += feed[field]
+            for entry in totals.values():
+                entry["utilization_percent"] = _percent(entry["allocated_watts"], entry["capacity_watts"])
+            return totals
+
+        panels = rollup("power_panel")
+        for panel_id, panel in self.panels.items():
+            panels.setdefault(panel_id, {"id": panel_id, "feed_count": 0, "capacity_watts": 0,
+                                         "allocated_watts": 0, "maximum_watts": 0, "utilization_percent": None})
+            panels[panel_id]["name"] = panel.get("name")
+
+        return {"feeds": feeds, "panels": list(panels.values()), "racks": list(rollup("rack").values())}
+
+
+class PowerBudgetIndex:
+    """Per-site power models for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._sites: Dict[int, SitePower] = {}
+        self._lock = threading.Lock()
+
+    def get(self, site_id: int) -> SitePower:
+        """Return the power model of a site, building it if needed."""
+        max_age = self.client.config.cache.ttl.devices
+        with self._lock:
+            site = self._sites.get(site_id)
+            if site is not None and time.time() - site.built_at < max_age:
+                return site
+
+        dcim = self.client.dcim
+        site = SitePower(
+            dcim.power_panels.filter(site_id=site_id),
+            dcim.power_feeds.filter(site_id=site_id),
+            dcim.power_ports.filter(site_id=site_id),
+            dcim.power_outlets.filter(site_id=site_id),
+        )
+        with self._lock:
+            self._sites[site_id] = site
+        logger.debug(f"Built power model for site {site_id}: {len(site.feeds)} feeds, {len(site.ports)} ports")
+        return site
+
+    def clear(self) -> None:
+        """Drop the site models; they are rebuilt on next use."""
+        with self._lock:
+            self._sites.clear()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Progress Reporting for NetBox MCP Server
+
+Long-running tools report progress through the reporter of the call they
+run in, obtained with get_progress_reporter(). Under MCP the reporter sends
+progress notifications for the request (when the client asked for them with
+a progress token) and partial results as log notifications tied to the
+request, so clients see the call is alive and keep it open instead of timing
+out and retrying. Elsewhere (REST API, tests) the reporter does nothing, so
+tools can report unconditionally.
+
+Tools run in worker threads; notifications are handed to the event loop the
+request arrived on and never block the tool.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress notifications; the final one is always sent
+PROGRESS_MIN_INTERVAL = 0.25
+
+# Logger name on partial result notifications
+PARTIAL_RESULT_LOGGER = "netbox_mcp.progress"
+
+
+class ProgressReporter:
+    """No-op reporter, used when the caller cannot receive progress."""
+
+    def advance(self, completed: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        """Report completed units of work out of total."""
+
+    def partial(self, result: Any) -> None:
+        """Report a partial result, e.g. the outcome of one batch."""
+
+
+class MCPProgressReporter(ProgressReporter):
+    """Reporter sending MCP notifications through a FastMCP Context."""
+
+    def __init__(self, ctx: Any, loop: asyncio.AbstractEventLoop, min_interval: float = PROGRESS_MIN_INTERVAL):
+        self.ctx = ctx
+        self.loop = loop
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_sent = 0.0
+
+    def advance(self, completed: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        final = total is not None and completed >= total
+        with self._lock:
+            now = time.monotonic()
+            if not final and now - self._last_sent < self.min_interval:
+                return
+            self._last_sent = now
+        self._send(self.ctx.report_progress(completed, total, message))
+
+    def partial(self, result: Any) -> None:
+        session = self.ctx.request_context.session
+        self._send(session.send_log_message(
+            level="info",
+            data={"partial_result": result},
+            logger=PARTIAL_RESULT_LOGGER,
+            related_request_id=self.ctx.request_id,
+        ))
+
+    def _send(self, coroutine) -> None:
+        try:
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        except RuntimeError as e:
+            # The loop has closed; the request is gone
+            coroutine.close()
+            logger.debug(f"Progress notification dropped: {e}")
+            return
+        future.add_done_callback(_log_failure)
+
+
+def _log_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug(f"Progress notification failed: {future.exception()}")
+
+
+_NULL_REPORTER = ProgressReporter()
+_current_reporter: contextvars.ContextVar = contextvars.ContextVar("netbox_progress_reporter", default=_NULL_REPORTER)
+
+
+def get_progress_reporter() -> ProgressReporter:
+    """The progress reporter of the tool call running in this thread."""
+    return _current_reporter.get()
+
+
+@contextmanager
+def progress_scope(reporter: Optional[ProgressReporter]) -> Iterator[ProgressReporter]:
+    """Make reporter the current one for the duration of a tool call."""
+    token = _current_reporter.set(reporter or _NULL_REPORTER)
+    try:
+        yield _current_reporter.get()
+    finally:
+        _current_reporter.reset(token)
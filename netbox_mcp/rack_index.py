@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Rack Space Occupancy Index for NetBox MCP Server
+
+Per-site index of rack unit occupancy: one bitset per rack face, built from
+one bulk device query for the site plus a device-type height map that is
+cached across sites. Contiguous free-space searches are shift-and-mask
+operations on the bitsets.
+
+Bit n of a face bitset is the unit starting_unit + n. Full-depth devices
+occupy both faces; half-depth devices only the face they are mounted on.
+Fractional heights and positions are rounded outward to whole units.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from .records import choice_value, related_id
+from .vlan_bitmap import contiguous_starts
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+FACES = ("front", "rear")
+
+# Device type IDs per request when filling the height map
+DEVICE_TYPE_CHUNK_SIZE = 100
+
+
+class RackOccupancy:
+    """Front and rear unit bitsets of one rack."""
+
+    def __init__(self, rack: Dict[str, Any]):
+        self.rack = rack
+        self.u_height = int(rack.get("u_height") or 0)
+        self.starting_unit = int(rack.get("starting_unit") or 1)
+        self.faces = {face: 0 for face in FACES}
+        self.device_count = 0
+
+    def place(self, position: float, height: float, face: Optional[str], full_depth: bool) -> None:
+        """Mark the units of a mounted device as occupied."""
+        self.device_count += 1
+        if height <= 0:
+            return  # Zero-U devices do not take rack units
+        first = math.floor(position) - self.starting_unit
+        count = math.ceil(position + height) - math.floor(position)
+        if first < 0:
+            count += first
+            first = 0
+        if count <= 0:
+            return
+        mask = ((1 << count) - 1) << first
+        # Unknown faces are treated as blocking both sides
+        for side in (FACES if full_depth or face not in FACES else (face,)):
+            self.faces[side] |= mask
+
+    def free_mask(self, face: str = "front") -> int:
+        """Bitset of free units on a face, or on both faces for "both"."""
+        used = self.faces["front"] | self.faces["rear"] if face == "both" else self.faces[face]
+        return ~used & ((1 << self.u_height) - 1)
+
+    def free_units(self, face: str = "front") -> int:
+        """Number of free units on a face."""
+        return bin(self.free_mask(face)).count("1")
+
+    def positions(self, u_height: int, face: str = "front") -> List[int]:
+        """Lowest unit numbers where a device of u_height units fits, ascending."""
+        starts = contiguous_starts(self.free_mask(face), u_height)
+        units = []
+        while starts:
+            low = starts & -starts
+            units.append(low.bit_length() - 1 + self.starting_unit)
+            starts ^= low
+        return units
+
+
+class SiteRacks:
+    """Occupancy of every rack in a site."""
+
+    def __init__(self, racks: Dict[int, RackOccupancy]):
+        self.racks = racks
+        self.built_at = time.time()
+
+
+class RackSpaceIndex:
+    """Per-site rack occupancy indexes for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._sites: Dict[int, SiteRacks] = {}
+        self._type_heights: Dict[int, Tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def device_type_heights(self, type_ids: Iterable[int]) -> Dict[int, Tuple[float, bool]]:
+        """
+        Return (u_height, is_full_depth) per device type ID.
+
+        Device types rarely change, so the map is kept across sites and
+        rebuilds; only IDs not seen before are fetched, in chunks.
+        """
+        missing = sorted({type_id for type_id in type_ids if type_id is not None} - set(self._type_heights))
+        for i in range(0, len(missing), DEVICE_TYPE_CHUNK_SIZE):
+            for device_type in self.client.dcim.device_types.filter(id=missing[i:i + DEVICE_TYPE_CHUNK_SIZE]):
+                self._type_heights[device_type["id"]] = (
+                    float(device_type.get("u_height") or 0),
+                    bool(device_type.get("is_full_depth", True))
+                )
+        return self._type_heights
+
+    def get(self, site_id: int) -> SiteRacks:
+        """Return the occupancy of a site's racks, building it if needed."""
+        max_age = self.client.config.cache.ttl.devices
+        with self._lock:
+            site = self._sites.get(site_id)
+            if site is not None and time.time() - site.built_at < max_age:
+                return site
+
+        racks = {rack["id"]: RackOccupancy(rack) for rack in self.client.dcim.racks.filter(site_id=site_id)}
+        devices = [device for device in self.client.dcim.devices.filter(site_id=site_id)
+                   if device.get("position") is not None and related_id(device.get("rack")) in racks]
+        heights = self.device_type_heights(related_id(device.get("device_type")) for device in devices)
+
+        for device in devices:
+            u_height, full_depth = heights.get(related_id(device.get("device_type")), (1.0, True))
+            racks[related_id(device["rack"])].place(
+                float(device["position"]), u_height, choice_value(device.get("face")), full_depth
+            )
+
+        site = SiteRacks(racks)
+        with self._lock:
+            self._sites[site_id] = site
+        logger.debug(f"Built rack occupancy for site {site_id}: {len(racks)} racks, {len(devices)} devices")
+        return site
+
+    def clear(self, device_types: bool = False) -> None:
+        """Drop the site indexes (and the device-type height map if requested)."""
+        with self._lock:
+            self._sites.clear()
+            if device_types:
+                self._type_heights.clear()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Record Field Helpers for NetBox MCP Server
+
+NetBox relations and choice fields arrive in different shapes depending on
+where a record came from: nested dicts from the API, bare values from
+Record.serialize() and the replica, or pynetbox objects. The indexes read
+them through these helpers so every shape gives the same answer.
+"""
+
+from typing import Any, Optional
+
+
+def related_id(value: Any) -> Optional[int]:
+    """ID of a related object given as a bare ID, a nested dict or a pynetbox Record (None if unset)."""
+    if isinstance(value, dict):
+        return value.get("id")
+    return getattr(value, "id", value)
+
+
+def choice_value(value: Any) -> Any:
+    """Raw value of a choice field given as a plain value, {"value": ...} or a pynetbox choice object."""
+    if isinstance(value, dict):
+        return value.get("value")
+    return getattr(value, "value", value)
@@ -7,11 +7,17 @@ The @mcp_tool decorator automatically inspects and registers functions,
 making them discoverable and executable via the dynamic API endpoints.
 """
 
+import hashlib
+import importlib
 import inspect
+import json
 import logging
 from functools import wraps
+from pathlib import Path
 from typing import Dict, List, Any, Callable, Optional, get_type_hints, Union
 
+from .response_shaping import get_response_shaper
+
 logger = logging.getLogger(__name__)
 
 # Global tool registry - contains all registered MCP tools
@@ -20,6 +26,32 @@ TOOL_REGISTRY: Dict[str, Dict[str, Any]] = {}
 # Global prompt registry - contains all registered MCP prompts
 PROMPT_REGISTRY: Dict[str, Dict[str, Any]] = {}
 
+# Tool name -> module defining it, for tools known from the manifest but not
+# imported yet (see ensure_tool_loaded)
+TOOL_MODULES: Dict[str, str] = {}
+
+# Tool name -> manifest entry (see tool_manifest.py): the metadata the
+# decorator would otherwise introspect, FastMCP schemas and OpenAPI fragments
+TOOL_MANIFEST: Dict[str, Dict[str, Any]] = {}
+
+# Manifest entry keys that are not registry metadata
+MANIFEST_ONLY_KEYS = ("input_schema", "output_schema", "openapi")
+
+# Manifest source files are relative to the package
+PACKAGE_PATH = Path(__file__).parent
+
+_tools_loaded = False
+
+# Fingerprint of the installed manifest's tools
+_manifest_version: Optional[str] = None
+
+# (tool count, digest) of the introspected registry, see get_registry_version
+_registry_version: Optional[tuple] = None
+
+# Tool cost classes: cheap tools are never limited, expensive tools get a
+# concurrency limit by default (see ExecutionConfig)
+COST_CLASSES = ("cheap", "standard", "expensive")
+
 
 def extract_parameter_info(func: Callable) -> List[Dict[str, Any]]:
     """
@@ -157,7 +189,10 @@ def parse_docstring(docstring: str) -> Dict[str, str]:
 def mcp_tool(
     name: Optional[str] = None,
     description: Optional[str] = None,
-    category: str = "general"
+    category: str = "general",
+    cost: str = "standard",
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
 ) -> Callable:
     """
     Decorator to register a function as an MCP tool.
@@ -169,6 +204,10 @@ def mcp_tool(
         name: Override the tool name (defaults to function name)
         description: Override the description (defaults to first line of docstring)
         category: Tool category for organization (default: "general")
+        cost: Cost class, one of "cheap", "standard" or "expensive" (default: "standard")
+        max_concurrency: Maximum concurrent calls of this tool (default: from the cost class)
+        timeout: Seconds a call may take, including time queued (default: from config
+            for read-only tools, none for write tools taking confirm)
         
     Returns:
         The decorated function (unchanged functionality)
@@ -180,35 +219,30 @@ def mcp_tool(
             # Implementation here
             pass
     """
+    if cost not in COST_CLASSES:
+        raise ValueError(f"Invalid cost class '{cost}'. Valid options: {', '.join(COST_CLASSES)}")
+    if max_concurrency is not None and max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    
     def decorator(func: Callable) -> Callable:
         # Determine tool name
         tool_name = name or func.__name__
         
-        # Extract function metadata
-        docstring_info = parse_docstring(func.__doc__ or "")
-        parameters = extract_parameter_info(func)
-        return_info = extract_return_info(func)
-        
-        # Build tool metadata
-        tool_metadata = {
-            "name": tool_name,
-            "function": func,  # Keep reference to actual function
-            "category": category,
-            "description": description or docstring_info.get("description", f"Execute {tool_name}"),
-            "docstring": {
-                "full": func.__doc__ or "",
-                "parsed": docstring_info
-            },
-            "parameters": parameters,
-            "return_info": return_info,
-            "module": func.__module__,
-            "source_file": inspect.getfile(func) if hasattr(func, '__code__') else "unknown"
-        }
+        if tool_name in TOOL_MANIFEST and TOOL_MANIFEST[tool_name]["module"] == func.__module__:
+            # Described by the manifest; skip introspection
+            tool_metadata = manifest_metadata(tool_name)
+            tool_metadata["function"] = func
+        else:
+            tool_metadata = introspect_tool(func, tool_name, description, category, {
+                "cost": cost,
+                "max_concurrency": max_concurrency,
+                "timeout": timeout
+            })
         
         # Register the tool
         TOOL_REGISTRY[tool_name] = tool_metadata
         
-        logger.info(f"Registered MCP tool: {tool_name} (category: {category})")
+        logger.debug(f"Registered MCP tool: {tool_name} (category: {category})")
         
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -219,6 +253,44 @@ def mcp_tool(
     return decorator
 
 
+def introspect_tool(
+    func: Callable,
+    tool_name: str,
+    description: Optional[str],
+    category: str,
+    execution: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build a tool's registry metadata by inspecting its function.
+    
+    Args:
+        func: The tool function
+        tool_name: Name of the tool
+        description: Explicit description, if any
+        category: Tool category
+        execution: Cost class, concurrency limit and timeout
+        
+    Returns:
+        Tool metadata dictionary
+    """
+    docstring_info = parse_docstring(func.__doc__ or "")
+    return {
+        "name": tool_name,
+        "function": func,  # Keep reference to actual function
+        "category": category,
+        "description": description or docstring_info.get("description", f"Execute {tool_name}"),
+        "docstring": {
+            "full": func.__doc__ or "",
+            "parsed": docstring_info
+        },
+        "parameters": extract_parameter_info(func),
+        "return_info": extract_return_info(func),
+        "execution": execution,
+        "module": func.__module__,
+        "source_file": inspect.getfile(func) if hasattr(func, '__code__') else "unknown"
+    }
+
+
 def mcp_prompt(name: str, description: str) -> Callable:
     """
     Decorator for registering MCP prompts.
@@ -273,12 +345,94 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary mapping tool names to their metadata
     """
+    load_tools()
     return TOOL_REGISTRY.copy()
 
 
+def ensure_tool_loaded(tool_name: str) -> None:
+    """
+    Import the module of a tool known from the manifest if it is not registered yet.
+    
+    Args:
+        tool_name: Name of the tool
+    """
+    if tool_name in TOOL_REGISTRY or tool_name not in TOOL_MODULES:
+        return
+    module = TOOL_MODULES[tool_name]
+    importlib.import_module(module)
+    if tool_name not in TOOL_REGISTRY:
+        logger.error(f"Module {module} did not register tool '{tool_name}'; the tool manifest is stale")
+    else:
+        logger.debug(f"Loaded {module} for tool '{tool_name}'")
+
+
+def install_manifest(manifest: Dict[str, Any]) -> None:
+    """
+    Use a tool manifest: tools are known without importing their modules and
+    are registered from their manifest entries when imported.
+    
+    Args:
+        manifest: A manifest as returned by tool_manifest.load_manifest()
+    """
+    global _manifest_version
+    TOOL_MANIFEST.clear()
+    TOOL_MANIFEST.update(manifest["tools"])
+    _manifest_version = f"{manifest['version']}-{manifest['fingerprint']}"
+    TOOL_MODULES.update({name: entry["module"] for name, entry in TOOL_MANIFEST.items()})
+    logger.info(f"Tool manifest installed: {len(TOOL_MANIFEST)} tools")
+
+
+def get_manifest_entry(tool_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a tool's manifest entry, if a manifest is installed.
+    
+    Args:
+        tool_name: Name of the tool
+        
+    Returns:
+        Manifest entry or None
+    """
+    return TOOL_MANIFEST.get(tool_name)
+
+
+def manifest_metadata(tool_name: str) -> Dict[str, Any]:
+    """
+    A tool's registry metadata (without function reference) from its manifest entry.
+    
+    Args:
+        tool_name: Name of a tool in the installed manifest
+        
+    Returns:
+        Tool metadata dictionary
+    """
+    entry = TOOL_MANIFEST[tool_name]
+    metadata = {key: value for key, value in entry.items() if key not in MANIFEST_ONLY_KEYS}
+    if metadata["source_file"] != "unknown":
+        metadata["source_file"] = str(PACKAGE_PATH / metadata["source_file"])
+    return metadata
+
+
+def get_registry_version() -> str:
+    """
+    Identify the registered tools and their descriptions.
+    
+    Returns:
+        A string that changes whenever the tools change
+    """
+    global _registry_version
+    if TOOL_MANIFEST and _manifest_version:
+        return _manifest_version
+    
+    load_tools()
+    if _registry_version is None or _registry_version[0] != len(TOOL_REGISTRY):
+        digest = hashlib.sha256(json.dumps(list_tools(), sort_keys=True, default=str).encode()).hexdigest()
+        _registry_version = (len(TOOL_REGISTRY), digest)
+    return _registry_version[1]
+
+
 def get_tool_by_name(tool_name: str) -> Optional[Dict[str, Any]]:
     """
-    Get a specific tool by name.
+    Get a specific tool by name, importing its module on first use.
     
     Args:
         tool_name: Name of the tool to retrieve
@@ -286,6 +440,7 @@ def get_tool_by_name(tool_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Tool metadata dictionary or None if not found
     """
+    ensure_tool_loaded(tool_name)
     return TOOL_REGISTRY.get(tool_name)
 
 
@@ -299,6 +454,7 @@ def get_tools_by_category(category: str) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary of tools in the specified category
     """
+    load_tools()
     return {
         name: metadata 
         for name, metadata in TOOL_REGISTRY.items() 
@@ -313,17 +469,21 @@ def get_registry_stats() -> Dict[str, Any]:
     Returns:
         Dictionary with registry statistics
     """
+    tools = TOOL_MANIFEST
+    if not tools:
+        load_tools()
+        tools = TOOL_REGISTRY
     categories = {}
-    total_tools = len(TOOL_REGISTRY)
+    total_tools = len(tools)
     
-    for tool_name, metadata in TOOL_REGISTRY.items():
+    for tool_name, metadata in tools.items():
         category = metadata.get("category", "unknown")
         categories[category] = categories.get(category, 0) + 1
     
     return {
         "total_tools": total_tools,
         "categories": categories,
-        "tool_names": list(TOOL_REGISTRY.keys())
+        "tool_names": list(tools.keys())
     }
 
 
@@ -337,6 +497,9 @@ def serialize_tool_for_api(tool_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Serialized tool metadata without the function reference
     """
+    if tool_name in TOOL_MANIFEST:
+        return manifest_metadata(tool_name)
+    
     tool = get_tool_by_name(tool_name)
     if not tool:
         return None
@@ -355,8 +518,12 @@ def list_tools() -> List[Dict[str, Any]]:
     Returns:
         List of tool metadata dictionaries for OpenAPI generation
     """
+    registry = TOOL_MANIFEST
+    if not registry:
+        load_tools()
+        registry = TOOL_REGISTRY
     tools = []
-    for tool_name, tool_metadata in TOOL_REGISTRY.items():
+    for tool_name, tool_metadata in registry.items():
         tool_info = {
             "name": tool_name,
             "description": tool_metadata.get("description", ""),
@@ -374,6 +541,10 @@ def serialize_registry_for_api() -> List[Dict[str, Any]]:
     Returns:
         List of tool metadata dictionaries (without function references)
     """
+    if TOOL_MANIFEST:
+        return [manifest_metadata(tool_name) for tool_name in TOOL_MANIFEST]
+    
+    load_tools()
     return [
         serialize_tool_for_api(tool_name) 
         for tool_name in TOOL_REGISTRY.keys()
@@ -442,12 +613,16 @@ def load_tools():
     """
     Load all tools from the tools package.
     
-    This function imports the tools package which automatically discovers
-    and registers all tools using the @mcp_tool decorator.
+    This function imports every tool module, registering all tools using the
+    @mcp_tool decorator. Later calls return immediately.
     """
+    global _tools_loaded
+    if _tools_loaded:
+        return
     try:
-        # Import the tools package - this triggers automatic tool discovery
-        from . import tools
+        from .tools import load_all_tools
+        load_all_tools()
+        _tools_loaded = True
         logger.info(f"Tools loaded via package import: {len(TOOL_REGISTRY)} tools registered")
     except ImportError as e:
         logger.warning(f"Failed to import tools package: {e}")
@@ -485,7 +660,8 @@ def execute_tool(tool_name: str, client, **parameters) -> Any:
         **parameters: Tool parameters
         
     Returns:
-        Tool execution result (potentially merged with context information)
+        Tool execution result (potentially merged with context information),
+        truncated with a continuation cursor if it exceeds the response budget
         
     Raises:
         ValueError: If tool not found
@@ -525,7 +701,8 @@ def execute_tool(tool_name: str, client, **parameters) -> Any:
             # Continue with normal tool execution - context failure should not block tools
             execute_tool._context_initialized = True  # Prevent retry loops
     
-    return result
+    # Page results over the response budget; the rest is served by netbox_fetch_more
+    return get_response_shaper().shape(tool_name, result)
 
 
 def reset_context_state() -> None:
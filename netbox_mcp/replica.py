@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Local Inventory Replica for NetBox MCP Server
+
+Keeps an in-memory copy of the core inventory models (sites, racks, devices,
+interfaces, cables, IP addresses, prefixes, VLANs, virtual machines) so read
+tools can be answered without a round trip to NetBox.
+
+**Lifecycle:**
+- Bulk load: every replicated model is fetched once with endpoint.all()
+- Sync: NetBox's object-change log is tailed by change ID; changed objects are
+  re-fetched in batches and deleted objects are dropped
+- Write-through: creates, updates and deletes made through EndpointWrapper are
+  applied immediately, so the server always reads its own writes
+
+**Storage:**
+Each model lives in a ReplicaTable that stores one list per field (columnar)
+plus equality indexes on the whitelisted filter fields. EndpointWrapper.filter()
+consults the replica first; filters on anything outside the whitelist, or reads
+while the replica is staler than max_staleness, fall through to the API.
+Results served from the replica are ReplicaResult lists carrying the time of
+the last successful sync as a freshness watermark.
+"""
+
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import pynetbox
+
+from .config import ReplicaConfig
+from .records import choice_value
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+# Marks fields absent from a row so they are left out when it is rebuilt
+_MISSING = object()
+
+# Strings up to this length are interned, which collapses repeated values
+# such as statuses, interface types and site slugs into one object
+_INTERN_MAX_LENGTH = 64
+
+
+@dataclass(frozen=True)
+class ReplicaModel:
+    """A replicated model and the filters the replica can answer for it."""
+    model: str                              # Changelog label, e.g. "dcim.device"
+    scalar_filters: Tuple[str, ...]         # Filter "<field>" matches column "<field>"
+    related_filters: Tuple[str, ...]        # Filter "<field>_id" matches column "<field>"
+
+    def column_for(self, filter_name: str) -> Optional[str]:
+        """Map a NetBox filter name to a column, or None if not answerable locally."""
+        if filter_name in self.scalar_filters:
+            return filter_name
+        if filter_name.endswith("_id") and filter_name[:-3] in self.related_filters:
+            return filter_name[:-3]
+        return None
+
+
+REPLICA_MODELS: Dict[str, ReplicaModel] = {
+    "dcim.sites": ReplicaModel(
+        "dcim.site", ("id", "name", "slug", "status", "facility"), ("region", "group", "tenant")
+    ),
+    "dcim.racks": ReplicaModel(
+        "dcim.rack", ("id", "name", "status", "serial", "asset_tag"), ("site", "location", "tenant", "role")
+    ),
+    "dcim.devices": ReplicaModel(
+        "dcim.device",
+        ("id", "name", "status", "serial", "asset_tag", "face", "position"),
+        ("site", "location", "rack", "role", "device_type", "platform", "tenant", "cluster",
+         "primary_ip4", "primary_ip6")
+    ),
+    "dcim.interfaces": ReplicaModel(
+        "dcim.interface", ("id", "name", "type"), ("device", "lag", "parent")
+    ),
+    "dcim.cables": ReplicaModel(
+        "dcim.cable", ("id", "label", "type", "status", "color"), ("tenant",)
+    ),
+    "ipam.ip_addresses": ReplicaModel(
+        "ipam.ipaddress",
+        ("id", "status", "role", "dns_name", "assigned_object_type", "assigned_object_id"),
+        ("vrf", "tenant")
+    ),
+    "ipam.prefixes": ReplicaModel(
+        "ipam.prefix", ("id", "prefix", "status"), ("vrf", "tenant", "vlan", "role")
+    ),
+    "ipam.vlans": ReplicaModel(
+        "ipam.vlan", ("id", "vid", "name", "status"), ("site", "group", "tenant", "role")
+    ),
+    "virtualization.virtual_machines": ReplicaModel(
+        "virtualization.virtualmachine", ("id", "name", "status"),
+        ("cluster", "site", "role", "tenant", "platform")
+    ),
+}
+
+
+class ReplicaResult(list):
+    """A filter() result served from the replica, carrying its freshness watermark."""
+
+    source = "replica"
+
+    def __init__(self, rows: Iterable[dict], watermark: Optional[float]):
+        super().__init__(rows)
+        self.watermark = watermark
+
+
+def _compact(value: Any) -> Any:
+    """Intern short strings so repeated column values share one object."""
+    if isinstance(value, str) and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class ReplicaTable:
+    """
+    Column-oriented storage for one replicated model.
+
+    Rows are kept dense: deleting a row moves the last row into its slot.
+    Equality indexes map each filter column value to the set of object IDs.
+    """
+
+    def __init__(self, object_type: str, spec: ReplicaModel):
+        self.object_type = object_type
+        self.spec = spec
+        self.columns: Dict[str, List[Any]] = {}
+        self._ids: List[int] = []
+        self._row_of: Dict[int, int] = {}
+        self._indexes: Dict[str, Dict[Any, set]] = {
+            column: {} for column in spec.scalar_filters + spec.related_filters if column != "id"
+        }
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, obj_id: int) -> bool:
+        return obj_id in self._row_of
+
+    def _index_add(self, obj_id: int, column: str, value: Any) -> None:
+        try:
+            self._indexes[column].setdefault(value, set()).add(obj_id)
+        except TypeError:
+            pass  # Unhashable values are never matched by equality filters
+
+    def _index_discard(self, obj_id: int, column: str, value: Any) -> None:
+        try:
+            ids = self._indexes[column].get(value)
+        except TypeError:
+            return
+        if ids is not None:
+            ids.discard(obj_id)
+            if not ids:
+                del self._indexes[column][value]
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert a serialized record or replace the stored copy."""
+        obj_id = record["id"]
+        row = self._row_of.get(obj_id)
+
+        if row is None:
+            row = len(self._ids)
+            self._ids.append(obj_id)
+            self._row_of[obj_id] = row
+            for values in self.columns.values():
+                values.append(_MISSING)
+        else:
+            for column in self._indexes:
+                if column in self.columns:
+                    self._index_discard(obj_id, column, self.columns[column][row])
+
+        for field_name in record.keys() - self.columns.keys():
+            self.columns[field_name] = [_MISSING] * len(self._ids)
+
+        for field_name, values in self.columns.items():
+            values[row] = _compact(record[field_name]) if field_name in record else _MISSING
+
+        for column in self._indexes:
+            if column in record:
+                self._index_add(obj_id, column, record[column])
+
+    def remove(self, obj_id: int) -> bool:
+        """Remove a record by ID. Returns False if it was not stored."""
+        row = self._row_of.pop(obj_id, None)
+        if row is None:
+            return False
+
+        for column in self._indexes:
+            if column in self.columns:
+                self._index_discard(obj_id, column, self.columns[column][row])
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._row_of[moved_id] = row
+            for values in self.columns.values():
+                values[row] = values[last]
+
+        self._ids.pop()
+        for values in self.columns.values():
+            values.pop()
+        return True
+
+    def get_row(self, obj_id: int) -> Optional[Dict[str, Any]]:
+        """Rebuild the record dictionary for an object ID."""
+        row = self._row_of.get(obj_id)
+        if row is None:
+            return None
+        return {
+            field_name: values[row]
+            for field_name, values in self.columns.items()
+            if values[row] is not _MISSING
+        }
+
+    def match(self, criteria: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Return records matching every column, each against any of its values.
+
+        Args:
+            criteria: Column name -> accepted values
+
+        Returns:
+            Matching records ordered by ID
+        """
+        candidates: Optional[set] = None
+        for column, accepted in criteria.items():
+            if column == "id":
+                ids = {value for value in accepted if value in self._row_of}
+            else:
+                index = self._indexes[column]
+                ids = set()
+                for value in accepted:
+                    ids.update(index.get(value, ()))
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        if candidates is None:
+            candidates = self._row_of.keys()
+        return [self.get_row(obj_id) for obj_id in sorted(candidates)]
+
+
+class ReplicaStore:
+    """
+    In-memory replica of NetBox's core inventory, kept current from the changelog.
+
+    Reads go through filter(); the replica declines (returns None) whenever it
+    cannot answer exactly as the API would, and the caller falls back to NetBox.
+    """
+
+    # Beyond this many changes in one sync pass a full reload is cheaper
+    SYNC_MAX_CHANGES = 10000
+
+    # IDs per id= query when re-fetching changed objects
+    FETCH_CHUNK_SIZE = 100
+
+    def __init__(self, client: 'NetBoxClient', config: ReplicaConfig):
+        """
+        Initialize an empty replica.
+
+        Args:
+            client: NetBoxClient whose raw pynetbox API is used for loading
+            config: Replica configuration
+        """
+        self._client = client
+        self.config = config
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self.tables: Dict[str, ReplicaTable] = {}
+        self._model_types: Dict[str, str] = {}
+        self._last_change_id = 0
+        self._changelog_app: Optional[str] = None
+        self.watermark: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "syncs": 0,
+            "sync_errors": 0,
+            "changes_applied": 0,
+            "full_loads": 0,
+        }
+
+    def _endpoint(self, object_type: str):
+        """Return the raw pynetbox endpoint for an object type."""
+        app_name, endpoint_name = object_type.split(".", 1)
+        return getattr(getattr(self._client.api, app_name), endpoint_name)
+
+    def _changelog(self):
+        """Return the object-change endpoint, probing core before extras once."""
+        if self._changelog_app is not None:
+            return getattr(self._client.api, self._changelog_app).object_changes
+
+        last_error = None
+        # NetBox 4.1+ serves the changelog from core, older releases from extras
+        for app_name in ("core", "extras"):
+            endpoint = getattr(self._client.api, app_name).object_changes
+            try:
+                next(iter(endpoint.filter(limit=1)), None)
+            except pynetbox.RequestError as e:
+                last_error = e
+                continue
+            self._changelog_app = app_name
+            return endpoint
+
+        raise RuntimeError(f"Unable to read NetBox changelog: {last_error}")
+
+    def _latest_change_id(self) -> int:
+        """Return the newest changelog ID, or 0 for an empty changelog."""
+        latest = next(iter(self._changelog().filter(ordering="-id", limit=1)), None)
+        return latest.id if latest is not None else 0
+
+    def load(self) -> int:
+        """
+        Bulk-load every configured model, replacing the current tables.
+
+        The changelog position is captured before loading, so changes made
+        while the load is running are replayed by the next sync.
+
+        Returns:
+            Total number of rows loaded
+        """
+        with self._sync_lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> int:
+        started_at = time.time()
+        last_change_id = self._latest_change_id()
+
+        tables = {}
+        for object_type in self.config.models:
+            spec = REPLICA_MODELS.get(object_type)
+            if spec is None:
+                logger.warning(f"Replica: unsupported model '{object_type}' ignored")
+                continue
+            table = ReplicaTable(object_type, spec)
+            for record in self._endpoint(object_type).all():
+                table.upsert(record.serialize())
+            tables[object_type] = table
+            logger.debug(f"Replica: loaded {len(table)} {object_type}")
+
+        with self._lock:
+            self.tables = tables
+            self._model_types = {table.spec.model: object_type for object_type, table in tables.items()}
+            self._last_change_id = last_change_id
+            self.watermark = started_at
+            self.stats["full_loads"] += 1
+
+        total = sum(len(table) for table in tables.values())
+        logger.info(f"Replica loaded: {total} rows across {len(tables)} models in {time.time() - started_at:.1f}s")
+        return total
+
+    def sync(self) -> int:
+        """
+        Apply changes recorded in NetBox's changelog since the last sync.
+
+        Returns:
+            Number of changelog entries processed
+        """
+        with self._sync_lock:
+            started_at = time.time()
+            last_change_id = self._last_change_id
+            latest_action: Dict[Tuple[str, int], str] = {}
+
+            changes = self._changelog().filter(id__gt=last_change_id, ordering="id")
+            processed = 0
+            for change in changes:
+                processed += 1
+                if processed > self.SYNC_MAX_CHANGES:
+                    logger.info(f"Replica: more than {self.SYNC_MAX_CHANGES} changes pending, reloading")
+                    self._load_locked()
+                    return processed
+
+                last_change_id = max(last_change_id, change.id)
+                object_type = self._model_types.get(str(getattr(change, "changed_object_type", "")))
+                if object_type is None:
+                    continue
+                latest_action[(object_type, change.changed_object_id)] = choice_value(change.action)
+
+            refresh: Dict[str, List[int]] = {}
+            deleted: Dict[str, List[int]] = {}
+            for (object_type, obj_id), action in latest_action.items():
+                target = deleted if action == "delete" else refresh
+                target.setdefault(object_type, []).append(obj_id)
+
+            # Fetch outside the read lock so filters keep being served meanwhile
+            fetched: Dict[str, List[dict]] = {}
+            for object_type, obj_ids in refresh.items():
+                endpoint = self._endpoint(object_type)
+                records = []
+                for start in range(0, len(obj_ids), self.FETCH_CHUNK_SIZE):
+                    chunk = obj_ids[start:start + self.FETCH_CHUNK_SIZE]
+                    records.extend(record.serialize() for record in endpoint.filter(id=chunk))
+                fetched[object_type] = records
+
+            with self._lock:
+                for object_type, records in fetched.items():
+                    table = self.tables[object_type]
+                    found = set()
+                    for record in records:
+                        table.upsert(record)
+                        found.add(record["id"])
+                    # Changed objects that no longer come back were deleted since
+                    for obj_id in set(refresh[object_type]) - found:
+                        table.remove(obj_id)
+                for object_type, obj_ids in deleted.items():
+                    for obj_id in obj_ids:
+                        self.tables[object_type].remove(obj_id)
+
+                self._last_change_id = last_change_id
+                self.watermark = started_at
+                self.stats["syncs"] += 1
+                self.stats["changes_applied"] += len(latest_action)
+
+            if latest_action:
+                logger.debug(f"Replica: applied {len(latest_action)} object changes")
+            return processed
+
+    def start(self) -> None:
+        """Start the background sync thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sync_loop, name="netbox-replica-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sync thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _sync_loop(self) -> None:
+        while not self._stop_event.wait(self.config.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                self.stats["sync_errors"] += 1
+                logger.warning(f"Replica sync failed: {e}")
+
+    def is_fresh(self) -> bool:
+        """Whether the last successful sync is within max_staleness."""
+        return self.watermark is not None and (time.time() - self.watermark) <= self.config.max_staleness
+
+    def filter(self, object_type: str, filters: Dict[str, Any]) -> Optional[ReplicaResult]:
+        """
+        Answer an equality filter locally.
+
+        Args:
+            object_type: Replica model key, e.g. "dcim.devices"
+            filters: NetBox filter keyword arguments; list values match any
+
+        Returns:
+            ReplicaResult, or None if the replica cannot answer this query
+        """
+        table = self.tables.get(object_type)
+        if table is None or not self.is_fresh():
+            return None
+
+        criteria = {}
+        for filter_name, value in filters.items():
+            column = table.spec.column_for(filter_name)
+            if column is None:
+                self.stats["misses"] += 1
+                return None
+
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if column == "id" or column in table.spec.related_filters:
+                try:
+                    # "null" is NetBox's spelling for an unset relation (e.g. the global VRF)
+                    values = [None if v in (None, "null") else int(v) for v in values]
+                except (TypeError, ValueError):
+                    self.stats["misses"] += 1
+                    return None
+            criteria[column] = values
+
+        with self._lock:
+            rows = table.match(criteria)
+            watermark = self.watermark
+
+        self.stats["hits"] += 1
+        return ReplicaResult(rows, watermark)
+
+    def apply_write(self, object_type: str, record: Optional[Dict[str, Any]] = None,
+                    deleted_ids: Iterable[int] = ()) -> None:
+        """
+        Apply a write made through this server without waiting for the next sync.
+
+        Args:
+            object_type: Replica model key, e.g. "dcim.devices"
+            record: Serialized created or updated object
+            deleted_ids: IDs of deleted objects
+        """
+        table = self.tables.get(object_type)
+        if table is None:
+            return
+        with self._lock:
+            if record is not None and isinstance(record.get("id"), int):
+                table.upsert(record)
+            for obj_id in deleted_ids:
+                table.remove(int(obj_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return row counts, freshness and hit statistics."""
+        with self._lock:
+            return {
+                "tables": {object_type: len(table) for object_type, table in self.tables.items()},
+                "watermark": self.watermark,
+                "age_seconds": round(time.time() - self.watermark, 1) if self.watermark else None,
+                "fresh": self.is_fresh(),
+                "last_change_id": self._last_change_id,
+                **self.stats,
+            }
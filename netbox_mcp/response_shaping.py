@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Response Shaping for NetBox MCP Server
+
+Keeps tool results within a token budget. A result whose serialized size
+exceeds the budget has its lists cut to what fits, in the order they appear,
+and gets a "continuation" block with a cursor. The full result is kept in
+memory so netbox_fetch_more(cursor) can return the next page without asking
+NetBox again.
+
+Sizes are estimated from the JSON serialization at CHARS_PER_TOKEN
+characters per token. Cursors are stable: fetching the same cursor again
+returns the same page, until the stored result expires.
+
+When the server runs several worker processes, truncated results are also
+written to a directory the workers share, so a cursor can be fetched from
+any worker. Pages are computed deterministically from the stored result,
+so a worker that did not hand out the previous pages recomputes their
+offsets.
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import ResponseConfig
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in serialized JSON
+CHARS_PER_TOKEN = 4
+
+# Lists nested deeper than this are not paged
+MAX_LIST_DEPTH = 3
+
+Path = Tuple[str, ...]
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimated token count of a value's JSON serialization."""
+    return len(_dumps(value)) // CHARS_PER_TOKEN
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _find_lists(value: Any, path: Path = ()) -> List[Path]:
+    """Paths of the lists inside nested dicts, in order of appearance."""
+    if isinstance(value, list):
+        return [path] if len(value) > 1 else []
+    if isinstance(value, dict) and len(path) < MAX_LIST_DEPTH:
+        return [p for key, item in value.items() for p in _find_lists(item, path + (str(key),))]
+    return []
+
+
+def _get(value: Any, path: Path) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _replace(value: Dict[str, Any], path: Path, items: List[Any]) -> Dict[str, Any]:
+    """Copy of value with the list at path replaced, copying only the dicts on the way."""
+    head, rest = path[0], path[1:]
+    return {**value, head: _replace(value[head], rest, items) if rest else items}
+
+
+def _take(items: List[Any], start: int, budget: int) -> Tuple[int, int]:
+    """End index of the items from start that fit in budget characters, and the characters used."""
+    used = 0
+    end = start
+    while end < len(items):
+        size = len(_dumps(items[end])) + 2
+        if used + size > budget:
+            break
+        used += size
+        end += 1
+    return end, used
+
+
+class StoredResult:
+    """A truncated result and the list offsets of each page handed out."""
+
+    def __init__(self, tool_name: str, result: Dict[str, Any], paths: List[Path]):
+        self.tool_name = tool_name
+        self.result = result
+        self.paths = paths
+        self.pages: List[Dict[Path, int]] = []
+        self.created = time.time()
+
+    def totals(self) -> Dict[str, int]:
+        return {".".join(path): len(_get(self.result, path)) for path in self.paths}
+
+
+class ResponseShaper:
+    """Truncates oversized results and serves their remainder by cursor."""
+
+    def __init__(self, config: Optional[ResponseConfig] = None, shared_dir: Optional[str] = None):
+        self.config = config or ResponseConfig()
+        self.shared_dir = shared_dir
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    @property
+    def budget(self) -> int:
+        """Budget in serialized characters."""
+        return self.config.max_tokens * CHARS_PER_TOKEN
+
+    def shape(self, tool_name: str, result: Any) -> Any:
+        """
+        Return result unchanged if it fits the budget, otherwise its first page.
+
+        Only dict results with lists in them can be paged; anything else is
+        returned whole.
+        """
+        if not self.config.enabled or not isinstance(result, dict):
+            return result
+        size = len(_dumps(result))
+        if size <= self.budget:
+            return result
+        paths = _find_lists(result)
+        if not paths:
+            logger.warning(f"Result of {tool_name} (~{size // CHARS_PER_TOKEN} tokens) exceeds the "
+                           f"response budget but has no lists to page")
+            return result
+
+        # The first page shares the budget with everything that is not paged,
+        # including the continuation block itself
+        stored = StoredResult(tool_name, result, paths)
+        list_size = sum(len(_dumps(_get(result, path))) for path in paths)
+        envelope = size - list_size + self._continuation_size(stored)
+        offsets = {path: 0 for path in paths}
+        page, next_offsets = self._page(stored, offsets, max(self.budget - envelope, 0))
+
+        shaped = result
+        for path in paths:
+            shaped = _replace(shaped, path, page[path])
+        if next_offsets is None:
+            return result
+
+        stored.pages = [offsets, next_offsets]
+        cursor_id = self._store(stored)
+        shaped = dict(shaped)
+        shaped["continuation"] = self._continuation(stored, cursor_id, 1, next_offsets)
+        logger.info(f"Truncated {tool_name} result from ~{size // CHARS_PER_TOKEN} tokens, cursor {cursor_id}")
+        return shaped
+
+    def fetch(self, cursor: str) -> Dict[str, Any]:
+        """
+        Return the page a cursor points at.
+
+        Raises:
+            KeyError: If the cursor is malformed, unknown or expired
+        """
+        cursor_id, _, number = cursor.rpartition("-")
+        if not number.isdigit():
+            raise KeyError(cursor)
+        page_number = int(number)
+        with self._lock:
+            self._expire()
+            stored = self._results.get(cursor_id)
+            if stored is not None:
+                self._results.move_to_end(cursor_id)
+        if stored is None and self.shared_dir:
+            stored = self._load_shared(cursor_id)
+        if stored is None or page_number <= 0:
+            raise KeyError(cursor)
+        if self.shared_dir:
+            # Another worker may have handed out the pages before this one
+            self._extend_pages(stored, page_number)
+        if page_number >= len(stored.pages):
+            raise KeyError(cursor)
+
+        response, next_offsets = self._fetch_page(stored, page_number)
+        if next_offsets is None:
+            response["continuation"] = {"truncated": False, "totals": stored.totals()}
+            return response
+
+        with self._lock:
+            if len(stored.pages) == page_number + 1:
+                stored.pages.append(next_offsets)
+        response["continuation"] = self._continuation(stored, cursor_id, page_number + 1, next_offsets)
+        return response
+
+    def _fetch_page(self, stored: StoredResult,
+                    page_number: int) -> Tuple[Dict[str, Any], Optional[Dict[Path, int]]]:
+        """A fetched page without its continuation block, and the next offsets (None when done)."""
+        offsets = stored.pages[page_number]
+        skeleton = {
+            "success": True,
+            "tool_name": stored.tool_name,
+            "page": page_number,
+            "items": {".".join(path): [] for path in stored.paths},
+            "offsets": {".".join(path): offset for path, offset in offsets.items()},
+        }
+        envelope = len(_dumps(skeleton)) + self._continuation_size(stored)
+        page, next_offsets = self._page(stored, offsets, max(self.budget - envelope, 0))
+        response: Dict[str, Any] = {
+            "tool_name": stored.tool_name,
+            "page": page_number,
+            "items": {".".join(path): items for path, items in page.items() if items},
+            "offsets": skeleton["offsets"],
+        }
+        return response, next_offsets
+
+    def _extend_pages(self, stored: StoredResult, page_number: int) -> None:
+        """Compute the offsets of the pages up to page_number that this process has not seen."""
+        while len(stored.pages) <= page_number:
+            last = len(stored.pages) - 1
+            _, next_offsets = self._fetch_page(stored, last)
+            if next_offsets is None:
+                return
+            with self._lock:
+                if len(stored.pages) == last + 1:
+                    stored.pages.append(next_offsets)
+
+    def _page(self, stored: StoredResult, offsets: Dict[Path, int],
+              budget: int) -> Tuple[Dict[Path, List[Any]], Optional[Dict[Path, int]]]:
+        """Items from offsets that fit in budget, and the next offsets (None when done)."""
+        page: Dict[Path, List[Any]] = {}
+        next_offsets: Dict[Path, int] = {}
+        remaining = budget
+        for path in stored.paths:
+            items = _get(stored.result, path)
+            start = offsets[path]
+            end, used = _take(items, start, max(remaining, 0))
+            # Each page makes progress even if a single item exceeds the budget
+            if end == start < len(items) and not any(page.values()):
+                end, used = start + 1, remaining
+            page[path] = items[start:end]
+            next_offsets[path] = end
+            remaining -= used
+        done = all(next_offsets[path] >= len(_get(stored.result, path)) for path in stored.paths)
+        return page, None if done else next_offsets
+
+    def _continuation_size(self, stored: StoredResult) -> int:
+        """Upper bound of the serialized size of a continuation block for stored."""
+        widest = {path: len(_get(stored.result, path)) for path in stored.paths}
+        block = self._continuation(stored, "0" * 16, 10 ** 6, widest)
+        return len(_dumps({"continuation": block}))
+
+    def _continuation(self, stored: StoredResult, cursor_id: str, page_number: int,
+                      next_offsets: Dict[Path, int]) -> Dict[str, Any]:
+        cursor = f"{cursor_id}-{page_number}"
+        return {
+            "truncated": True,
+            "cursor": cursor,
+            "returned_through": {".".join(path): offset for path, offset in next_offsets.items()},
+            "totals": stored.totals(),
+            "expires_in": self.config.cursor_ttl,
+            "hint": f"Result exceeded ~{self.config.max_tokens} tokens. "
+                    f"Call netbox_fetch_more(cursor='{cursor}') for the next page."
+        }
+
+    def _store(self, stored: StoredResult) -> str:
+        cursor_id = secrets.token_hex(8)
+        with self._lock:
+            self._expire()
+            self._results[cursor_id] = stored
+            while len(self._results) > self.config.max_cursors:
+                self._results.popitem(last=False)
+        if self.shared_dir:
+            self._write_shared(cursor_id, stored)
+        return cursor_id
+
+    def _write_shared(self, cursor_id: str, stored: StoredResult) -> None:
+        """Write a stored result to the shared directory and prune old ones."""
+        data = {
+            "tool_name": stored.tool_name,
+            "result": stored.result,
+            "paths": [list(path) for path in stored.paths],
+            "pages": [[offsets[path] for path in stored.paths] for offsets in stored.pages[:2]],
+            "created": stored.created,
+        }
+        path = os.path.join(self.shared_dir, f"{cursor_id}.json")
+        try:
+            with open(f"{path}.tmp", "w") as f:
+                f.write(_dumps(data))
+            os.replace(f"{path}.tmp", path)
+            self._prune_shared()
+        except OSError as e:
+            logger.warning(f"Could not share cursor {cursor_id} with other workers: {e}")
+
+    def _load_shared(self, cursor_id: str) -> Optional[StoredResult]:
+        """Read a stored result another worker wrote, if it exists and has not expired."""
+        if not cursor_id.isalnum():
+            return None
+        try:
+            with open(os.path.join(self.shared_dir, f"{cursor_id}.json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data["created"] < time.time() - self.config.cursor_ttl:
+            return None
+
+        paths = [tuple(path) for path in data["paths"]]
+        stored = StoredResult(data["tool_name"], data["result"], paths)
+        stored.pages = [dict(zip(paths, offsets)) for offsets in data["pages"]]
+        stored.created = data["created"]
+        with self._lock:
+            stored = self._results.setdefault(cursor_id, stored)
+            while len(self._results) > self.config.max_cursors:
+                self._results.popitem(last=False)
+        return stored
+
+    def _prune_shared(self) -> None:
+        """Drop shared results past the TTL, and the oldest beyond max_cursors."""
+        entries = []
+        for name in os.listdir(self.shared_dir):
+            if name.endswith(".json"):
+                path = os.path.join(self.shared_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        cutoff = time.time() - self.config.cursor_ttl
+        excess = len(entries) - self.config.max_cursors
+        for index, (mtime, path) in enumerate(entries):
+            if mtime < cutoff or index < excess:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.config.cursor_ttl
+        for cursor_id in [c for c, s in self._results.items() if s.created < cutoff]:
+            del self._results[cursor_id]
+
+
+_response_shaper: Optional[ResponseShaper] = None
+_response_shaper_lock = threading.Lock()
+
+
+def get_response_shaper() -> ResponseShaper:
+    """Get the global response shaper, with default settings until configured."""
+    global _response_shaper
+    with _response_shaper_lock:
+        if _response_shaper is None:
+            _response_shaper = ResponseShaper()
+        return _response_shaper
+
+
+def configure_response_shaper(config: ResponseConfig, shared_dir: Optional[str] = None) -> ResponseShaper:
+    """Replace the global response shaper with one using the given settings."""
+    global _response_shaper
+    with _response_shaper_lock:
+        _response_shaper = ResponseShaper(config, shared_dir)
+        return _response_shaper
@@ -9,26 +9,35 @@ Version: 0.9.7 - Hierarchical Architecture with Registry Bridge
 """
 
 from mcp.server.fastmcp import FastMCP
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from .client import NetBoxClient
-from .config import load_config
+from .config import NetBoxConfig, load_config
 from .registry import (
     TOOL_REGISTRY, PROMPT_REGISTRY, 
-    load_tools, load_prompts, 
+    load_tools, load_prompts, get_tool_by_name,
     serialize_registry_for_api, serialize_prompts_for_api,
     execute_tool, execute_prompt
 )
 from .dependencies import NetBoxClientManager, get_netbox_client  # Use new dependency system
 from .monitoring import get_performance_monitor, MetricsCollector, HealthCheck, MetricsDashboard
-from .openapi_generator import OpenAPIGenerator, generate_api_documentation
+from .tool_executor import get_tool_executor, configure_tool_executor
+from .exceptions import NetBoxOverloadedError, NetBoxTimeoutError
+from .response_shaping import configure_response_shaper
+from .tool_bridge import LazyTool, create_tool_wrapper
+from .tool_manifest import use_manifest
+from .api_artifacts import get_artifact_store
+from .health import configure_readiness_prober, get_readiness_prober
+import asyncio
+import atexit
 import logging
 import os
+import signal
 import threading
 import time
 import inspect
-from functools import wraps
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import json
 from typing import Dict, List, Optional, Any
 
@@ -38,10 +47,14 @@ logger = logging.getLogger(__name__)
 
 # === REGISTRY BRIDGE IMPLEMENTATION ===
 
-# Step 1: Load all tools and prompts into our internal registries
-load_tools()
+# Step 1: Read the tool manifest and load the prompts into our internal registry.
+# Tool modules are only imported here if there is no usable manifest; otherwise
+# each is imported the first time one of its tools is called.
+tool_manifest = use_manifest()
+if tool_manifest is None:
+    load_tools()
+    logger.info(f"Internal tool registry initialized with {len(TOOL_REGISTRY)} tools")
 load_prompts()
-logger.info(f"Internal tool registry initialized with {len(TOOL_REGISTRY)} tools")
 logger.info(f"Internal prompt registry initialized with {len(PROMPT_REGISTRY)} prompts")
 
 # Step 2: Initialize FastMCP server (empty at first)
@@ -53,61 +66,27 @@ mcp = FastMCP(
 # Step 3: The Registry Bridge function
 def bridge_tools_to_fastmcp():
     """
-    Dynamically registers all tools from our internal TOOL_REGISTRY
-    with the FastMCP instance, creating wrappers for dependency injection.
+    Registers all tools with the FastMCP instance: from the manifest as
+    LazyTools when it is available, otherwise from our internal TOOL_REGISTRY
+    with wrappers for dependency injection.
     """
+    if tool_manifest is not None:
+        for tool_name, entry in tool_manifest["tools"].items():
+            # FastMCP has no public API for registering a prebuilt Tool: add_tool()
+            # builds one from the function, which would import every tool module.
+            # The LazyTool therefore goes straight into the ToolManager's table.
+            mcp._tool_manager._tools[tool_name] = LazyTool.from_manifest(tool_name, entry)
+        logger.info(f"Registered {len(tool_manifest['tools'])} tools with FastMCP from the manifest")
+        return
+
     bridged_count = 0
     for tool_name, tool_metadata in TOOL_REGISTRY.items():
         try:
-            original_func = tool_metadata["function"]
             description = tool_metadata.get("description", f"Executes the {tool_name} tool.")
             category = tool_metadata.get("category", "General")
 
-            # Create a 'wrapper' that injects the client with EXACT function signature (Gemini's Fix)
-            def create_tool_wrapper(original_func):
-                """
-                Creates a tool wrapper that mimics the exact signature of the original function,
-                while automatically injecting the NetBox client and preventing argument duplicates.
-                """
-                sig = inspect.signature(original_func)
-                wrapper_params = [p for p in sig.parameters.values() if p.name != 'client']
-
-                @wraps(original_func)
-                def tool_wrapper(*args, **kwargs):
-                    # Get performance monitor for timing
-                    monitor = get_performance_monitor()
-                    
-                    with monitor.time_operation(tool_name, kwargs):
-                        try:
-                            # ----- SAFE ARGUMENT HANDLING -----
-                            # 1. Create a list of expected parameter names (excluding 'client')
-                            param_names = [p.name for p in wrapper_params]
-
-                            # 2. Create a dictionary from positional arguments (*args)
-                            final_kwargs = dict(zip(param_names, args))
-
-                            # 3. Update with keyword arguments (**kwargs).
-                            #    This overwrites any duplicates and is the core of the fix.
-                            final_kwargs.update(kwargs)
-                            # ----------------------------------------
-
-                            client = get_netbox_client()
-
-                            # Call the original function with clean, deduplicated arguments.
-                            return original_func(client, **final_kwargs)
-
-                        except Exception as e:
-                            logger.error(f"Execution of tool '{tool_name}' failed: {e}", exc_info=True)
-                            return {"success": False, "error": str(e), "error_type": type(e).__name__}
-
-                new_sig = sig.replace(parameters=wrapper_params)
-                # Use setattr to avoid type checker issues with __signature__
-                setattr(tool_wrapper, '__signature__', new_sig)
-                return tool_wrapper
-
-            # Register the 'wrapper' with FastMCP with the correct metadata
-            wrapped_tool = create_tool_wrapper(original_func)
-            mcp.tool(name=tool_name, description=description)(wrapped_tool)
+            # Register a wrapper that injects the client with the exact function signature
+            mcp.add_tool(create_tool_wrapper(tool_name, tool_metadata), name=tool_name, description=description)
 
             bridged_count += 1
             logger.debug(f"Bridged tool: {tool_name} (category: {category})")
@@ -187,6 +166,11 @@ class ExecutionRequest(BaseModel):
     tool_name: str
     parameters: Dict[str, Any] = {}
 
+class BatchExecutionRequest(BaseModel):
+    calls: List[ExecutionRequest]
+    max_concurrency: Optional[int] = None
+    stream: bool = False
+
 class ToolFilter(BaseModel):
     category: Optional[str] = None
     name_pattern: Optional[str] = None
@@ -242,8 +226,13 @@ async def execute_mcp_tool(
     try:
         logger.info(f"Executing tool: {request.tool_name} with parameters: {request.parameters}")
 
-        # Execute tool with dependency injection
-        result = execute_tool(request.tool_name, client, **request.parameters)
+        # Execute tool with dependency injection, off the event loop and within its limits
+        tool = get_tool_by_name(request.tool_name)
+        if tool is None:
+            raise ValueError(f"Tool '{request.tool_name}' not found in registry")
+        result = await get_tool_executor().run_tool(
+            tool, lambda: execute_tool(request.tool_name, client, **request.parameters)
+        )
 
         return {
             "success": True,
@@ -256,11 +245,135 @@ async def execute_mcp_tool(
         logger.warning(f"Tool not found: {request.tool_name}")
         raise HTTPException(status_code=404, detail=str(e))
 
+    except NetBoxOverloadedError as e:
+        logger.warning(f"Rejected {request.tool_name}: {e.message}")
+        raise HTTPException(status_code=429, detail=e.message,
+                            headers={"Retry-After": str(int(e.retry_after))})
+
+    except NetBoxTimeoutError as e:
+        logger.warning(f"Timed out {request.tool_name}: {e.message}")
+        raise HTTPException(status_code=504, detail=e.message)
+
     except Exception as e:
         logger.error(f"Tool execution failed for {request.tool_name}: {e}")
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
 
 
+async def _execute_batch_call(index: int, call: ExecutionRequest, client: NetBoxClient) -> Dict[str, Any]:
+    """Run one call of a batch, returning its outcome instead of raising."""
+    outcome: Dict[str, Any] = {"index": index, "tool_name": call.tool_name}
+    tool = get_tool_by_name(call.tool_name)
+    if tool is None:
+        return {**outcome, "success": False, "error": f"Tool '{call.tool_name}' not found in registry",
+                "error_type": "NotFound"}
+    try:
+        result = await get_tool_executor().run_tool(
+            tool, lambda: execute_tool(call.tool_name, client, **call.parameters)
+        )
+        return {**outcome, "success": True, "result": result}
+    except (NetBoxOverloadedError, NetBoxTimeoutError) as e:
+        return {**outcome, "success": False, "error": e.message, "error_type": type(e).__name__, **e.details}
+    except Exception as e:
+        logger.error(f"Batch call {index} ({call.tool_name}) failed: {e}")
+        return {**outcome, "success": False, "error": str(e), "error_type": type(e).__name__}
+
+
+@api_app.post("/api/v1/execute/batch")
+async def execute_mcp_tool_batch(
+    request: BatchExecutionRequest,
+    client: NetBoxClient = Depends(get_netbox_client)
+):
+    """
+    Batch execution endpoint: Execute many independent tool calls in one request.
+
+    Calls run concurrently, at most max_concurrency at a time (default and
+    upper bound from the execution config), on the shared client so lookups
+    reuse one cache. Identical read calls (no confirm=True) run only once.
+    Calls of a tool with a concurrency limit run at most that many at a time
+    within the batch, so a batch never overflows the tool's queue by itself;
+    other traffic can still fill it. A call that fails or is rejected reports
+    its error without affecting the others.
+
+    Request Body:
+        calls: List of {tool_name, parameters}
+        max_concurrency: Calls to run at the same time
+        stream: Return NDJSON lines in completion order instead of one response
+
+    Returns:
+        {"results": [...]} in request order, or an application/x-ndjson stream
+        of results, each with the index of its call
+    """
+    execution = client.config.execution
+    if not request.calls:
+        raise HTTPException(status_code=400, detail="Batch contains no calls")
+    if len(request.calls) > execution.batch_max_calls:
+        raise HTTPException(status_code=413,
+                            detail=f"Batch has {len(request.calls)} calls, limit is {execution.batch_max_calls}")
+    fan_out = min(request.max_concurrency or execution.batch_max_concurrency, execution.batch_max_concurrency)
+    if fan_out <= 0:
+        raise HTTPException(status_code=400, detail="max_concurrency must be positive")
+
+    logger.info(f"Executing batch of {len(request.calls)} tool calls (fan-out {fan_out})")
+    semaphore = asyncio.Semaphore(fan_out)
+    tool_semaphores: Dict[str, asyncio.Semaphore] = {}
+    for call in request.calls:
+        tool = get_tool_by_name(call.tool_name)
+        limit = get_tool_executor().limits(tool)[0] if tool else None
+        if limit and call.tool_name not in tool_semaphores:
+            tool_semaphores[call.tool_name] = asyncio.Semaphore(limit)
+    shared: Dict[str, asyncio.Task] = {}
+
+    async def run(index: int, call: ExecutionRequest) -> Dict[str, Any]:
+        # Wait for the tool's own limit first, so waiting does not hold a fan-out slot
+        tool_semaphore = tool_semaphores.get(call.tool_name)
+        if tool_semaphore is None:
+            async with semaphore:
+                return await _execute_batch_call(index, call, client)
+        async with tool_semaphore, semaphore:
+            return await _execute_batch_call(index, call, client)
+
+    def start(index: int, call: ExecutionRequest) -> "asyncio.Future":
+        if call.parameters.get("confirm"):
+            return asyncio.ensure_future(run(index, call))
+        key = json.dumps([call.tool_name, call.parameters], sort_keys=True, default=str)
+        if key not in shared:
+            shared[key] = asyncio.ensure_future(run(index, call))
+        original = shared[key]
+
+        async def result() -> Dict[str, Any]:
+            return {**await asyncio.shield(original), "index": index}
+        return asyncio.ensure_future(result())
+
+    tasks = [start(index, call) for index, call in enumerate(request.calls)]
+    pending = set(tasks) | set(shared.values())
+
+    if not request.stream:
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in pending:
+                task.cancel()
+        succeeded = sum(1 for r in results if r["success"])
+        return {
+            "success": succeeded == len(results),
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results
+        }
+
+    async def stream_results():
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield json.dumps(await next_result, default=str) + "\n"
+        finally:
+            # The client went away or the stream ended: stop what is left
+            for task in pending:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 # === PROMPT ENDPOINTS ===
 
 class PromptRequest(BaseModel):
@@ -336,13 +449,36 @@ async def get_performance_metrics() -> Dict[str, Any]:
         Complete performance metrics including operations, cache, and system stats
     """
     try:
+        # Attach the client's cache for per-object-type analytics (metrics work without it)
+        try:
+            metrics_collector.cache_manager = get_netbox_client().cache
+        except Exception as e:
+            logger.debug(f"Cache analytics unavailable: {e}")
+        
         dashboard_data = metrics_dashboard.get_dashboard_data()
+        dashboard_data["tool_executor"] = get_tool_executor().get_metrics()
         return dashboard_data
     except Exception as e:
         logger.error(f"Error getting performance metrics: {e}")
         raise HTTPException(status_code=500, detail=f"Metrics error: {str(e)}")
 
 
+@api_app.get("/api/v1/metrics/workers")
+async def get_worker_metrics_endpoint() -> Dict[str, Any]:
+    """
+    Get tool execution and operation metrics aggregated over all worker processes.
+    
+    Returns:
+        Summed pool, bulkhead and operation metrics with the reporting workers
+    """
+    try:
+        from .serving import get_worker_metrics
+        return await asyncio.to_thread(get_worker_metrics)
+    except Exception as e:
+        logger.error(f"Error aggregating worker metrics: {e}")
+        raise HTTPException(status_code=500, detail=f"Worker metrics error: {str(e)}")
+
+
 @api_app.get("/api/v1/health/detailed")
 async def get_detailed_health() -> Dict[str, Any]:
     """
@@ -443,8 +579,28 @@ async def export_metrics(format: str = "json") -> Dict[str, Any]:
 
 # === API DOCUMENTATION ENDPOINTS ===
 
+async def _artifact_response(name: str, request: Request) -> Response:
+    """
+    Serve a pre-rendered documentation artifact in the best encoding the client
+    accepts, or 304 Not Modified if the client's ETag is current.
+    """
+    # Rendering happens in a worker thread, once per registry version
+    artifact = await asyncio.to_thread(get_artifact_store().get, name)
+    encoding = artifact.negotiate(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": artifact.etags[encoding],
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache"
+    }
+    if artifact.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=artifact.bodies[encoding], media_type=artifact.media_type, headers=headers)
+
+
 @api_app.get("/api/v1/openapi.json")
-async def get_openapi_spec() -> Dict[str, Any]:
+async def get_openapi_spec(request: Request) -> Response:
     """
     Get OpenAPI 3.0 specification for all NetBox MCP tools.
     
@@ -452,26 +608,14 @@ async def get_openapi_spec() -> Dict[str, Any]:
         OpenAPI specification as JSON
     """
     try:
-        from .openapi_generator import OpenAPIConfig
-        
-        config = OpenAPIConfig(
-            title="NetBox MCP Server API",
-            description="Production-ready Model Context Protocol server for NetBox automation with 142+ enterprise-grade tools",
-            version="1.0.0",
-            server_url="http://localhost:8000"
-        )
-        
-        generator = OpenAPIGenerator(config)
-        spec = generator.generate_spec()
-        
-        return spec
+        return await _artifact_response("openapi.json", request)
     except Exception as e:
         logger.error(f"Error generating OpenAPI spec: {e}")
         raise HTTPException(status_code=500, detail=f"OpenAPI generation error: {str(e)}")
 
 
 @api_app.get("/api/v1/openapi.yaml")
-async def get_openapi_spec_yaml() -> str:
+async def get_openapi_spec_yaml(request: Request) -> Response:
     """
     Get OpenAPI 3.0 specification as YAML.
     
@@ -479,31 +623,14 @@ async def get_openapi_spec_yaml() -> str:
         OpenAPI specification as YAML string
     """
     try:
-        from .openapi_generator import OpenAPIConfig
-        import yaml
-        
-        config = OpenAPIConfig(
-            title="NetBox MCP Server API",
-            description="Production-ready Model Context Protocol server for NetBox automation with 142+ enterprise-grade tools",
-            version="1.0.0",
-            server_url="http://localhost:8000"
-        )
-        
-        generator = OpenAPIGenerator(config)
-        spec = generator.generate_spec()
-        
-        yaml_content = yaml.dump(spec, default_flow_style=False, sort_keys=False)
-        
-        # Return as plain text with correct content type
-        from fastapi import Response
-        return Response(content=yaml_content, media_type="application/x-yaml")
+        return await _artifact_response("openapi.yaml", request)
     except Exception as e:
         logger.error(f"Error generating OpenAPI YAML: {e}")
         raise HTTPException(status_code=500, detail=f"OpenAPI YAML generation error: {str(e)}")
 
 
 @api_app.get("/api/v1/postman")
-async def get_postman_collection() -> Dict[str, Any]:
+async def get_postman_collection(request: Request) -> Response:
     """
     Get Postman collection for all NetBox MCP tools.
     
@@ -511,18 +638,7 @@ async def get_postman_collection() -> Dict[str, Any]:
         Postman collection JSON
     """
     try:
-        from .openapi_generator import OpenAPIConfig
-        
-        config = OpenAPIConfig(
-            title="NetBox MCP Server API",
-            version="1.0.0",
-            server_url="http://localhost:8000"
-        )
-        
-        generator = OpenAPIGenerator(config)
-        collection = generator.generate_postman_collection()
-        
-        return collection
+        return await _artifact_response("postman", request)
     except Exception as e:
         logger.error(f"Error generating Postman collection: {e}")
         raise HTTPException(status_code=500, detail=f"Postman collection error: {str(e)}")
@@ -708,32 +824,18 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 self.wfile.write(json.dumps(response).encode())
 
             elif self.path == '/readyz':
-                # Readiness check - test NetBox connection
-                try:
-                    status = NetBoxClientManager.get_client().health_check()
-                    if status.connected:
-                        self.send_response(200)
-                        response = {
-                            "status": "OK",
-                            "netbox_connected": True,
-                            "netbox_version": status.version,
-                            "response_time_ms": status.response_time_ms
-                        }
-                    else:
-                        self.send_response(503)
-                        response = {
-                            "status": "Service Unavailable",
-                            "netbox_connected": False,
-                            "error": status.error
-                        }
-                except Exception as e:
-                    self.send_response(503)
-                    response = {
+                # Readiness as recorded by the background prober; never calls NetBox
+                prober = get_readiness_prober()
+                if prober is None:
+                    ready, response = False, {
                         "status": "Service Unavailable",
                         "netbox_connected": False,
-                        "error": str(e)
+                        "error": "Readiness prober not running"
                     }
+                else:
+                    ready, response = prober.readiness()
 
+                self.send_response(200 if ready else 503)
                 self.send_header('Content-Type', 'application/json')
                 self.end_headers()
                 self.wfile.write(json.dumps(response).encode())
@@ -761,10 +863,11 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
 
 
 def start_health_server(port: int):
-    """Start the HTTP health check server in a separate thread."""
+    """Start the HTTP health check server in a separate thread, one thread per request."""
     def run_server():
         try:
-            server = HTTPServer(('0.0.0.0', port), HealthCheckHandler)
+            server = ThreadingHTTPServer(('0.0.0.0', port), HealthCheckHandler)
+            server.daemon_threads = True
             logger.info(f"Health check server started on port {port}")
             logger.info(f"Health endpoints: /health, /healthz (liveness), /readyz (readiness)")
             server.serve_forever()
@@ -775,8 +878,45 @@ def start_health_server(port: int):
     health_thread.start()
 
 
-def initialize_server():
-    """Initialize the NetBox MCP server with configuration and client."""
+def install_cache_snapshot_handlers(client: NetBoxClient) -> None:
+    """Write a cache snapshot on SIGTERM and at interpreter exit."""
+    saved = threading.Event()
+
+    def save_snapshot():
+        if not saved.is_set():
+            saved.set()
+            client.save_cache_snapshot()
+
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        logger.info("SIGTERM received - writing cache snapshot before shutdown")
+        save_snapshot()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+        else:
+            raise SystemExit(0)
+
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+    except ValueError:
+        # Signal handlers can only be installed from the main thread
+        logger.warning("Cannot install SIGTERM handler outside the main thread - snapshot will only be written at exit")
+
+    atexit.register(save_snapshot)
+    logger.info(f"Cache snapshot enabled: {client.config.cache.get_snapshot_path()}")
+
+
+def initialize_server(health_server: bool = True) -> NetBoxConfig:
+    """
+    Initialize the NetBox MCP server with configuration and client.
+    
+    Args:
+        health_server: Start the health check server if the configuration enables it
+        
+    Returns:
+        The loaded configuration
+    """
     try:
         # Load configuration
         config = load_config()
@@ -809,14 +949,29 @@ def initialize_server():
             logger.warning(f"⚠️ NetBox connection failed during startup, running in degraded mode: {e}")
             # Continue startup - health server should still start for liveness probes
 
-        # Async task system removed - using synchronous operations only
-        logger.info("NetBox MCP server using synchronous operations")
-
-        # Start health check server if enabled
-        if config.enable_health_server:
+        # Reload the cache from the previous run and persist it again on shutdown
+        if config.cache.snapshot_enabled:
+            client.restore_cache_snapshot()
+            install_cache_snapshot_handlers(client)
+
+        # Serve whitelisted reads from a local replica kept current from the changelog;
+        # it loads in the background and reads go to the API until it is fresh
+        if config.replica.enabled:
+            client.enable_replica(background=True)
+
+        # Tools are synchronous; run them in bounded pools off the event loop
+        configure_tool_executor(config.execution)
+        configure_response_shaper(config.response)
+        logger.info(f"Tool executor configured: {config.execution.max_workers} default workers, "
+                    f"category pools {config.execution.category_workers or 'none'}")
+
+        # Start health check server if enabled, with readiness probed in the background
+        if health_server and config.enable_health_server:
+            configure_readiness_prober(NetBoxClientManager.get_client, config.health)
             start_health_server(config.health_check_port)
 
         logger.info("NetBox MCP server initialization complete")
+        return config
 
     except Exception as e:
         logger.error(f"Failed to initialize NetBox MCP server: {e}")
@@ -826,6 +981,13 @@ def initialize_server():
 def main():
     """Main entry point for the NetBox MCP server."""
     try:
+        # Network transports run in worker processes, initialized there
+        config = load_config()
+        if config.transport.mode != "stdio":
+            from .serving import serve
+            serve(config)
+            return
+
         # Initialize server
         initialize_server()
 
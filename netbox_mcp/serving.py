@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Network Serving for NetBox MCP Server
+
+Serves MCP over SSE or streamable HTTP instead of stdio, together with the
+REST API, from worker processes behind one listening socket. uvicorn binds
+the socket in the supervisor and starts the workers, which all accept from
+it, so throughput scales with cores instead of being bound to one GIL.
+
+With more than one worker the streamable HTTP transport runs stateless:
+any worker can serve any request, so no MCP session state has to be shared.
+State that must outlive a request lives in a directory the workers share
+(under /dev/shm where available):
+
+- cursors/: truncated results, so netbox_fetch_more works on any worker
+- metrics/: a metrics snapshot per worker, aggregated by
+  /api/v1/metrics/workers; the supervisor's /readyz reports the cache,
+  replica and shedding tools of the workers from these snapshots
+
+The NetBox response cache stays per worker. Each worker warms it from the
+cache snapshot when snapshots are enabled. Tool concurrency limits also
+apply per worker.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import NetBoxConfig, TransportConfig, load_config
+from .health import component_state
+from .monitoring import get_performance_monitor
+from .tool_executor import get_tool_executor
+
+logger = logging.getLogger(__name__)
+
+# Import string of the worker application factory, for uvicorn
+WORKER_APP = "netbox_mcp.serving:create_worker_app"
+
+# Snapshots older than this many metrics intervals belong to dead workers
+STALE_INTERVALS = 3
+
+
+def worker_snapshot(client: Any = None) -> Dict[str, Any]:
+    """This process's metrics, in the form aggregate_snapshots() merges, and its component states."""
+    return {
+        "pid": os.getpid(),
+        "updated": time.time(),
+        "tool_executor": get_tool_executor().get_metrics(),
+        "operations": get_performance_monitor().get_all_operations_summary(),
+        "components": component_state(client),
+    }
+
+
+class MetricsPublisher:
+    """Writes this worker's metrics snapshot to the shared directory at an interval."""
+
+    def __init__(self, metrics_dir: str, interval: float, get_client: Optional[Callable[[], Any]] = None):
+        self.metrics_dir = metrics_dir
+        self.interval = interval
+        self.get_client = get_client
+        self.path = os.path.join(metrics_dir, f"{os.getpid()}.json")
+        self._stop = threading.Event()
+        os.makedirs(metrics_dir, exist_ok=True)
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="netbox-metrics-publisher", daemon=True).start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.publish()
+            self._stop.wait(self.interval)
+
+    def publish(self) -> None:
+        try:
+            client = self.get_client() if self.get_client is not None else None
+        except Exception as e:
+            logger.debug(f"Publishing worker metrics without a client: {e}")
+            client = None
+        try:
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump(worker_snapshot(client), f, default=str)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            logger.warning(f"Could not publish worker metrics: {e}")
+
+
+def read_snapshots(metrics_dir: str, max_age: float) -> List[Dict[str, Any]]:
+    """The current snapshots of all workers; stale ones are removed."""
+    snapshots = []
+    cutoff = time.time() - max_age
+    try:
+        names = os.listdir(metrics_dir)
+    except OSError:
+        return snapshots
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(metrics_dir, name)
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if snapshot.get("updated", 0) < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        snapshots.append(snapshot)
+    return sorted(snapshots, key=lambda s: s["pid"])
+
+
+def _merge_pool(total: Dict[str, Any], pool: Dict[str, Any]) -> None:
+    counters = ("max_workers", "queue_depth", "active", "completed", "failed", "cancelled")
+    previous = total.get("completed", 0)
+    for key in counters:
+        total[key] = total.get(key, 0) + pool.get(key, 0)
+    waits = total.setdefault("wait_time_ms", {"avg": 0.0, "p95": 0.0, "max": 0.0})
+    completed = total["completed"]
+    if completed:
+        # Average weighted by completed calls; p95 and max are upper bounds
+        waits["avg"] = round((waits["avg"] * previous + pool["wait_time_ms"]["avg"] * pool.get("completed", 0))
+                             / completed, 2)
+    waits["p95"] = max(waits["p95"], pool["wait_time_ms"]["p95"])
+    waits["max"] = max(waits["max"], pool["wait_time_ms"]["max"])
+
+
+def _merge_operation(total: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    if not stats.get("total_operations"):
+        return
+    first = not total.get("total_operations")
+    for key in ("total_operations", "successful_operations", "total_duration"):
+        total[key] = total.get(key, 0) + stats[key]
+    total["min_duration"] = stats["min_duration"] if first else min(total["min_duration"], stats["min_duration"])
+    total["max_duration"] = max(total.get("max_duration", 0.0), stats["max_duration"])
+    total["last_execution"] = max(str(total.get("last_execution") or ""), str(stats.get("last_execution") or ""))
+    total["success_rate"] = total["successful_operations"] / total["total_operations"]
+    total["average_duration"] = total["total_duration"] / total["total_operations"]
+
+
+def aggregate_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge worker snapshots: counters are summed, durations combined.
+
+    Args:
+        snapshots: Snapshots as produced by worker_snapshot()
+
+    Returns:
+        Aggregated metrics with the per-worker snapshots' ages
+    """
+    pools: Dict[str, Dict[str, Any]] = {}
+    tools: Dict[str, Dict[str, Any]] = {}
+    operations: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        executor = snapshot.get("tool_executor", {})
+        for name, pool in executor.items():
+            if name != "tools":
+                _merge_pool(pools.setdefault(name, {}), pool)
+        for name, bulkhead in executor.get("tools", {}).items():
+            total = tools.setdefault(name, {})
+            for key in ("max_concurrency", "running", "queued", "max_queued", "rejected"):
+                total[key] = total.get(key, 0) + bulkhead.get(key, 0)
+        for name, stats in snapshot.get("operations", {}).items():
+            _merge_operation(operations.setdefault(name, {}), stats)
+
+    now = time.time()
+    return {
+        "worker_count": len(snapshots),
+        "workers": [{"pid": s["pid"], "age_seconds": round(now - s["updated"], 1)} for s in snapshots],
+        "tool_executor": {**pools, "tools": tools},
+        "operations": {name: stats for name, stats in operations.items() if stats},
+    }
+
+
+def worker_components(metrics_dir: str, max_age: float) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Component states for a supervisor's readiness prober, read from the workers' snapshots.
+
+    The supervisor holds no cache, replica or tool calls of its own, so the
+    readiness detail lists each worker's cache and replica instead, and the
+    tools shedding load on any worker.
+    """
+    def get_components(client: Any) -> Dict[str, Any]:
+        snapshots = [s for s in read_snapshots(metrics_dir, max_age) if "components" in s]
+        return {
+            "workers": [{"pid": s["pid"], "cache": s["components"]["cache"], "replica": s["components"]["replica"]}
+                        for s in snapshots],
+            "shedding_tools": sorted({name for s in snapshots for name in s["components"]["shedding_tools"]}),
+        }
+    return get_components
+
+
+_metrics_publisher: Optional[MetricsPublisher] = None
+
+
+def get_worker_metrics() -> Dict[str, Any]:
+    """Metrics aggregated over all workers, or over this process when it serves alone."""
+    if _metrics_publisher is None:
+        return aggregate_snapshots([worker_snapshot()])
+    _metrics_publisher.publish()
+    max_age = _metrics_publisher.interval * STALE_INTERVALS
+    return aggregate_snapshots(read_snapshots(_metrics_publisher.metrics_dir, max_age))
+
+
+# Paths served by the REST API; everything else, and the lifespan, goes to MCP
+API_PREFIXES = ("/api/", "/docs", "/redoc", "/openapi.json")
+
+
+def combine_apps(mcp_app, api_app):
+    """One ASGI application dispatching REST API paths to api_app and the rest to mcp_app."""
+    async def app(scope, receive, send):
+        if scope["type"] in ("http", "websocket") and scope["path"].startswith(API_PREFIXES):
+            await api_app(scope, receive, send)
+        else:
+            await mcp_app(scope, receive, send)
+    return app
+
+
+def create_worker_app():
+    """
+    Application factory run in each worker process: initialize the server,
+    share state through the state directory and serve MCP and the REST API.
+    """
+    global _metrics_publisher
+    from .dependencies import NetBoxClientManager
+    from .response_shaping import configure_response_shaper
+    from .server import api_app, initialize_server, mcp
+
+    config = initialize_server(health_server=False)
+    transport = config.transport
+    state_dir = transport.get_state_dir()
+
+    if transport.workers > 1:
+        configure_response_shaper(config.response, shared_dir=os.path.join(state_dir, "cursors"))
+        _metrics_publisher = MetricsPublisher(os.path.join(state_dir, "metrics"), transport.metrics_interval,
+                                              NetBoxClientManager.get_client)
+        _metrics_publisher.start()
+
+    if transport.mode == "sse":
+        mcp_app = mcp.sse_app()
+    else:
+        # Any worker may receive any request of a client, so keep no session state
+        mcp.settings.stateless_http = transport.workers > 1
+        mcp_app = mcp.streamable_http_app()
+
+    logger.info(f"Worker {os.getpid()} serving MCP ({transport.mode}) and the REST API")
+    return combine_apps(mcp_app, api_app)
+
+
+def prepare_state_dir(transport: TransportConfig) -> str:
+    """Create the shared state directory, clearing what previous runs left behind."""
+    state_dir = transport.get_state_dir()
+    for name in ("cursors", "metrics"):
+        directory = os.path.join(state_dir, name)
+        os.makedirs(directory, exist_ok=True)
+        for entry in os.listdir(directory):
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                pass
+    return state_dir
+
+
+def serve(config: Optional[NetBoxConfig] = None) -> None:
+    """
+    Serve MCP over the network with config.transport.workers worker processes.
+
+    The health server and readiness prober run in this supervising process
+    only; the workers serve MCP and the REST API on the transport port. With
+    several workers the prober reports their component states from the
+    metrics snapshots they publish.
+    """
+    import uvicorn
+
+    from .dependencies import NetBoxClientManager
+    from .health import configure_readiness_prober
+    from .server import start_health_server
+
+    config = config or load_config()
+    transport = config.transport
+    get_components = component_state
+    if transport.workers > 1:
+        state_dir = prepare_state_dir(transport)
+        logger.info(f"Worker state shared through {state_dir}")
+        get_components = worker_components(os.path.join(state_dir, "metrics"),
+                                           transport.metrics_interval * STALE_INTERVALS)
+
+    if config.enable_health_server:
+        NetBoxClientManager.initialize(config)
+        configure_readiness_prober(NetBoxClientManager.get_client, config.health, get_components)
+        start_health_server(config.health_check_port)
+
+    logger.info(f"Serving MCP over {transport.mode} on {transport.host}:{transport.port} "
+                f"with {transport.workers} worker(s)")
+    uvicorn.run(
+        WORKER_APP,
+        factory=True,
+        host=transport.host,
+        port=transport.port,
+        workers=transport.workers,
+        log_level=config.log_level.lower(),
+    )
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Tenant Resource Rollup Index for NetBox MCP Server
+
+Per-tenant ownership of the resource types covered by tenant reports,
+built from one streamed sweep per type that keeps only a small projection
+of each object (ID, tenant, site and status). Reports read counts and ID
+lists from the index and fetch full records by ID only when details are
+asked for.
+
+Writes made through this server update the index in place. Changes made
+elsewhere are applied from NetBox's changelog once the index is older than
+the default cache TTL; the full sweep is repeated only after the
+tenant_rollup TTL or when the changelog cannot be applied.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from .records import choice_value, related_id
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+# Report resource type -> endpoint
+TENANT_RESOURCE_ENDPOINTS: Dict[str, str] = {
+    "devices": "dcim.devices",
+    "racks": "dcim.racks",
+    "sites": "dcim.sites",
+    "prefixes": "ipam.prefixes",
+    "vlans": "ipam.vlans",
+    "ip_addresses": "ipam.ip_addresses",
+    "circuits": "circuits.circuits",
+    "clusters": "virtualization.clusters",
+}
+
+# Changelog model label -> report resource type
+MODEL_RESOURCE_TYPES: Dict[str, str] = {
+    "dcim.device": "devices",
+    "dcim.rack": "racks",
+    "dcim.site": "sites",
+    "ipam.prefix": "prefixes",
+    "ipam.vlan": "vlans",
+    "ipam.ipaddress": "ip_addresses",
+    "circuits.circuit": "circuits",
+    "virtualization.cluster": "clusters",
+}
+
+# Resource types that can be scoped to a site
+SITE_SCOPED_TYPES = frozenset({"devices", "racks", "prefixes", "vlans", "clusters"})
+
+# Fields requested during a sweep; servers without field selection return
+# whole records, which are projected locally all the same
+SWEEP_FIELDS = "id,tenant,site,scope_type,scope_id,status"
+
+# Object IDs per request when fetching records for a report
+ID_FETCH_CHUNK_SIZE = 100
+
+# Object: (site ID, status value)
+Projection = Tuple[Optional[int], Optional[str]]
+
+
+def project(record: Dict[str, Any]) -> Tuple[Optional[int], Projection]:
+    """Tenant ID and (site ID, status) of a record; NetBox 4.2+ scopes count as sites."""
+    site = related_id(record.get("site"))
+    if site is None and record.get("scope_type") == "dcim.site":
+        site = record.get("scope_id")
+    return related_id(record.get("tenant")), (site, choice_value(record.get("status")))
+
+
+class TenantRollup:
+    """Object ownership per resource type and tenant."""
+
+    def __init__(self):
+        # resource type -> tenant ID -> object ID -> projection
+        self.owned: Dict[str, Dict[int, Dict[int, Projection]]] = {t: defaultdict(dict) for t in TENANT_RESOURCE_ENDPOINTS}
+        # resource type -> object ID -> tenant ID, for moving objects on update
+        self.owner: Dict[str, Dict[int, int]] = {t: {} for t in TENANT_RESOURCE_ENDPOINTS}
+        self.built_at = time.time()
+        self.synced_at = self.built_at
+
+    def upsert(self, resource_type: str, record: Dict[str, Any]) -> None:
+        self.remove(resource_type, record["id"])
+        tenant_id, projection = project(record)
+        if tenant_id is not None:
+            self.owned[resource_type][tenant_id][record["id"]] = projection
+            self.owner[resource_type][record["id"]] = tenant_id
+
+    def remove(self, resource_type: str, obj_id: int) -> None:
+        tenant_id = self.owner[resource_type].pop(obj_id, None)
+        if tenant_id is not None:
+            self.owned[resource_type][tenant_id].pop(obj_id, None)
+
+    def remove_tenant(self, tenant_id: int) -> None:
+        """Forget a deleted tenant; NetBox unsets it on its objects without logging changes."""
+        for resource_type, owned in self.owned.items():
+            for obj_id in owned.pop(tenant_id, {}):
+                self.owner[resource_type].pop(obj_id, None)
+
+    def ids(self, resource_type: str, tenant_id: int, site_id: Optional[int] = None,
+            status: Optional[str] = None) -> List[int]:
+        """IDs of a tenant's objects of a type, optionally scoped to a site and status."""
+        owned = self.owned[resource_type].get(tenant_id, {})
+        scope_site = site_id if resource_type in SITE_SCOPED_TYPES else None
+        return sorted(
+            obj_id for obj_id, (site, obj_status) in owned.items()
+            if (scope_site is None or site == scope_site) and (status is None or obj_status == status)
+        )
+
+
+class TenantRollupIndex:
+    """Lazily built, incrementally updated TenantRollup for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._rollup: Optional[TenantRollup] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _is_current(self, rollup: Optional[TenantRollup]) -> bool:
+        ttl = self.client.config.cache.ttl
+        now = time.time()
+        return rollup is not None and now - rollup.built_at < ttl.tenant_rollup and now - rollup.synced_at < ttl.default
+
+    def get(self) -> TenantRollup:
+        """
+        Return the rollup, bringing it up to date first if needed.
+
+        A rollup older than the default cache TTL is synced from the
+        changelog; while one caller syncs, others are answered from the
+        rollup as it is. Every resource type is swept again only when there
+        is no rollup yet, after the tenant_rollup TTL, or when the sync fails.
+        """
+        with self._lock:
+            rollup = self._rollup
+        if self._is_current(rollup):
+            return rollup
+
+        if rollup is not None and time.time() - rollup.built_at < self.client.config.cache.ttl.tenant_rollup:
+            if not self._build_lock.acquire(blocking=False):
+                # Another caller is syncing; answer from the rollup as it is
+                return rollup
+            try:
+                if self._rollup is rollup and (self._is_current(rollup) or self._sync(rollup)):
+                    return rollup
+            finally:
+                self._build_lock.release()
+
+        with self._build_lock:
+            with self._lock:
+                rollup = self._rollup
+            if self._is_current(rollup):
+                return rollup
+
+            started = time.time()
+            rollup = TenantRollup()
+            for resource_type, endpoint in TENANT_RESOURCE_ENDPOINTS.items():
+                for record in self.client.stream(endpoint, fields=SWEEP_FIELDS):
+                    rollup.upsert(resource_type, dict(record))
+            with self._lock:
+                self._rollup = rollup
+            logger.info(f"Built tenant rollup: {sum(len(o) for o in rollup.owner.values())} "
+                        f"tenant-owned objects in {time.time() - started:.2f}s")
+            return rollup
+
+    def _sync(self, rollup: TenantRollup) -> bool:
+        """
+        Apply changes since the last sync from the changelog (caller holds the build lock).
+
+        Changed objects are re-fetched by ID with the sweep projection.
+
+        Returns:
+            False if the changelog could not be applied and the rollup must be swept again
+        """
+        started = time.time()
+        try:
+            changes = self.client.get_object_changes_since(
+                rollup.synced_at, {*MODEL_RESOURCE_TYPES, "tenancy.tenant"}
+            )
+        except Exception as e:
+            logger.warning(f"Tenant rollup changelog sync failed, sweeping again: {e}")
+            return False
+        if changes is None:
+            return False
+
+        fetched: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        try:
+            for model, actions in changes.items():
+                resource_type = MODEL_RESOURCE_TYPES.get(model)
+                if resource_type is None:
+                    continue
+                app_name, endpoint_name = TENANT_RESOURCE_ENDPOINTS[resource_type].split(".", 1)
+                endpoint = getattr(getattr(self.client.api, app_name), endpoint_name)
+                refresh = [obj_id for obj_id, action in actions.items() if action != "delete"]
+                records = fetched.setdefault(resource_type, {})
+                for start in range(0, len(refresh), ID_FETCH_CHUNK_SIZE):
+                    chunk = refresh[start:start + ID_FETCH_CHUNK_SIZE]
+                    for record in endpoint.filter(id=chunk, fields=SWEEP_FIELDS):
+                        row = dict(record)
+                        records[row["id"]] = row
+        except Exception as e:
+            logger.warning(f"Tenant rollup could not fetch changed objects, sweeping again: {e}")
+            return False
+
+        with self._lock:
+            for model, actions in changes.items():
+                resource_type = MODEL_RESOURCE_TYPES.get(model)
+                if resource_type is None:
+                    # Deleted tenants; their objects were unset without changelog entries
+                    for tenant_id, action in actions.items():
+                        if action == "delete":
+                            rollup.remove_tenant(tenant_id)
+                    continue
+                for obj_id in actions:
+                    record = fetched[resource_type].get(obj_id)
+                    # Objects that no longer come back were deleted since
+                    if record is None:
+                        rollup.remove(resource_type, obj_id)
+                    else:
+                        rollup.upsert(resource_type, record)
+            rollup.synced_at = started
+
+        if changes:
+            logger.debug(f"Tenant rollup synced: {sum(len(a) for a in changes.values())} object changes")
+        return True
+
+    def apply_write(self, endpoint: str, record: Optional[Dict[str, Any]] = None,
+                    deleted_ids: Iterable[int] = ()) -> None:
+        """Apply a write to one of TENANT_RESOURCE_ENDPOINTS to the loaded rollup."""
+        resource_type = next(t for t, e in TENANT_RESOURCE_ENDPOINTS.items() if e == endpoint)
+        with self._lock:
+            if self._rollup is None:
+                return
+            for obj_id in deleted_ids:
+                self._rollup.remove(resource_type, obj_id)
+            if record is not None:
+                self._rollup.upsert(resource_type, record)
+
+    def remove_tenant(self, tenant_id: int) -> None:
+        """Apply the deletion of a tenant to the loaded rollup."""
+        with self._lock:
+            if self._rollup is not None:
+                self._rollup.remove_tenant(tenant_id)
+
+    def clear(self) -> None:
+        """Drop the rollup; it is rebuilt on next use."""
+        with self._lock:
+            self._rollup = None
+
+
+def fetch_tenant_resources(client: "NetBoxClient", tenant_id: int,
+                           ids_by_type: Optional[Dict[str, List[int]]] = None,
+                           site_id: Optional[int] = None, status: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch a tenant's records of every resource type concurrently.
+
+    With ids_by_type (from the rollup) records are fetched by ID in chunks;
+    without it each type is queried with tenant, site and status filters.
+    A type whose query fails comes back empty.
+
+    Returns:
+        Resource type -> serialized records
+    """
+    tasks: List[Tuple[str, Dict[str, Any]]] = []
+    for resource_type in TENANT_RESOURCE_ENDPOINTS:
+        if ids_by_type is not None:
+            ids = ids_by_type.get(resource_type, [])
+            tasks.extend((resource_type, {"id": ids[i:i + ID_FETCH_CHUNK_SIZE]})
+                         for i in range(0, len(ids), ID_FETCH_CHUNK_SIZE))
+        else:
+            filters: Dict[str, Any] = {"tenant_id": tenant_id}
+            if site_id is not None and resource_type in SITE_SCOPED_TYPES:
+                filters["site_id"] = site_id
+            if status:
+                filters["status"] = status
+            tasks.append((resource_type, filters))
+
+    def run(task: Tuple[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        resource_type, filters = task
+        app_name, endpoint_name = TENANT_RESOURCE_ENDPOINTS[resource_type].split(".", 1)
+        try:
+            return list(getattr(getattr(client, app_name), endpoint_name).filter(**filters))
+        except Exception as e:
+            logger.warning(f"Failed to fetch {resource_type} for tenant {tenant_id}: {e}")
+            return []
+
+    results: Dict[str, List[Dict[str, Any]]] = {resource_type: [] for resource_type in TENANT_RESOURCE_ENDPOINTS}
+    for (resource_type, _), records in zip(tasks, client._get_lookup_executor().map(run, tasks)):
+        results[resource_type].extend(records)
+    return results
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tool Bridge for NetBox MCP Server
+
+Adapts registered tools to FastMCP. create_tool_wrapper() turns a tool
+function into the async callable FastMCP invokes: it injects the NetBox
+client, runs the call in the tool executor under the tool's limits, installs
+the progress reporter and shapes the result.
+
+LazyTool registers a tool with FastMCP from its manifest entry alone (name,
+description and schemas), so the server can list every tool without
+importing any tool module. The module is imported and the real FastMCP tool
+built the first time the tool is called.
+"""
+
+import asyncio
+import inspect
+import logging
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata, func_metadata
+from pydantic import PrivateAttr
+
+from .dependencies import get_netbox_client
+from .exceptions import NetBoxOverloadedError, NetBoxTimeoutError
+from .monitoring import get_performance_monitor
+from .progress import MCPProgressReporter, progress_scope
+from .registry import get_tool_by_name
+from .response_shaping import get_response_shaper
+from .tool_executor import get_tool_executor
+
+logger = logging.getLogger(__name__)
+
+# Name of the wrapper parameter FastMCP fills with the request Context
+CONTEXT_PARAMETER = "mcp_context"
+
+
+def create_tool_wrapper(tool_name: str, tool_metadata: Dict[str, Any]):
+    """
+    Creates a tool wrapper that mimics the exact signature of the original function,
+    while automatically injecting the NetBox client and preventing argument duplicates.
+    """
+    original_func = tool_metadata["function"]
+    sig = inspect.signature(original_func)
+    wrapper_params = [p for p in sig.parameters.values() if p.name != 'client']
+
+    def call_tool(final_kwargs, reporter):
+        # Get performance monitor for timing
+        monitor = get_performance_monitor()
+
+        with monitor.time_operation(tool_name, final_kwargs), progress_scope(reporter):
+            try:
+                client = get_netbox_client()
+
+                # Call the original function with clean, deduplicated arguments,
+                # paging results over the response budget
+                return get_response_shaper().shape(tool_name, original_func(client, **final_kwargs))
+
+            except Exception as e:
+                logger.error(f"Execution of tool '{tool_name}' failed: {e}", exc_info=True)
+                return {"success": False, "error": str(e), "error_type": type(e).__name__}
+
+    @wraps(original_func)
+    async def tool_wrapper(*args, mcp_context: Optional[Context] = None, **kwargs):
+        # Progress notifications only go to clients that asked for them
+        reporter = None
+        if mcp_context is not None and mcp_context.request_context.meta \
+                and mcp_context.request_context.meta.progressToken is not None:
+            reporter = MCPProgressReporter(mcp_context, asyncio.get_running_loop())
+
+        # ----- SAFE ARGUMENT HANDLING -----
+        # 1. Create a list of expected parameter names (excluding 'client')
+        param_names = [p.name for p in wrapper_params]
+
+        # 2. Create a dictionary from positional arguments (*args)
+        final_kwargs = dict(zip(param_names, args))
+
+        # 3. Update with keyword arguments (**kwargs).
+        #    This overwrites any duplicates and is the core of the fix.
+        final_kwargs.update(kwargs)
+        # ----------------------------------------
+
+        # Blocking NetBox calls run in the category's thread pool, off the event loop,
+        # within the tool's concurrency limit and timeout
+        try:
+            return await get_tool_executor().run_tool(tool_metadata, call_tool, final_kwargs, reporter)
+        except (NetBoxOverloadedError, NetBoxTimeoutError) as e:
+            logger.warning(f"Tool '{tool_name}' not completed: {e.message}")
+            return {"success": False, "error": e.message, "error_type": type(e).__name__, **e.details}
+
+    # FastMCP injects the request context into the Context-typed parameter
+    # and leaves it out of the tool's input schema
+    context_param = inspect.Parameter(
+        CONTEXT_PARAMETER, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Context
+    )
+    new_sig = sig.replace(parameters=wrapper_params + [context_param])
+    # Use setattr to avoid type checker issues with __signature__
+    setattr(tool_wrapper, '__signature__', new_sig)
+    return tool_wrapper
+
+
+def build_fastmcp_tool(tool_name: str, tool_metadata: Dict[str, Any]) -> Tool:
+    """The FastMCP Tool of a registered tool."""
+    description = tool_metadata.get("description", f"Executes the {tool_name} tool.")
+    return Tool.from_function(create_tool_wrapper(tool_name, tool_metadata), name=tool_name, description=description)
+
+
+def _unloaded(*args, **kwargs):
+    raise RuntimeError("LazyTool must be resolved before it is called")
+
+
+_placeholder_metadata: Optional[FuncMetadata] = None
+
+
+def _get_placeholder_metadata() -> FuncMetadata:
+    global _placeholder_metadata
+    if _placeholder_metadata is None:
+        _placeholder_metadata = func_metadata(_unloaded)
+    return _placeholder_metadata
+
+
+class LazyTool(Tool):
+    """A FastMCP tool known from the manifest, built from its module on first call."""
+
+    module: str
+    manifest_output_schema: Optional[Dict[str, Any]] = None
+    _resolved: Optional[Tool] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_manifest(cls, tool_name: str, entry: Dict[str, Any]) -> "LazyTool":
+        return cls(
+            fn=_unloaded,
+            name=tool_name,
+            description=entry["description"],
+            parameters=entry["input_schema"],
+            fn_metadata=_get_placeholder_metadata(),
+            is_async=True,
+            context_kwarg=CONTEXT_PARAMETER,
+            module=entry["module"],
+            manifest_output_schema=entry.get("output_schema"),
+        )
+
+    @property
+    def output_schema(self) -> Optional[Dict[str, Any]]:
+        return self._resolved.output_schema if self._resolved is not None else self.manifest_output_schema
+
+    def resolve(self) -> Tool:
+        """Import the tool's module and build its FastMCP tool, once."""
+        if self._resolved is None:
+            tool_metadata = get_tool_by_name(self.name)
+            if tool_metadata is None:
+                raise RuntimeError(f"Tool '{self.name}' is in the manifest but {self.module} does not define it")
+            self._resolved = build_fastmcp_tool(self.name, tool_metadata)
+        return self._resolved
+
+    async def run(self, arguments: Dict[str, Any], context=None, convert_result: bool = False) -> Any:
+        return await self.resolve().run(arguments, context=context, convert_result=convert_result)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Tool Executor for NetBox MCP Server
+
+Tools are synchronous and block on pynetbox HTTP calls, so running them on
+the MCP event loop would stall every other request on the server. The
+executor runs them in bounded thread pools instead: one pool per category
+with a configured size, and a shared default pool for the rest, so a burst
+of slow calls in one category cannot starve the others.
+
+Each pool reports its queue depth, active and completed calls, and how long
+calls waited for a worker. When the caller is cancelled (the MCP client
+aborted the request) a call that has not started yet is dropped; one that
+is already running cannot be interrupted and finishes in the background.
+
+Tools may also be limited individually through the cost class, concurrency
+and timeout given to @mcp_tool. A limited tool gets a bulkhead: calls beyond
+its concurrency wait on the event loop without holding a worker thread, and
+once its queue is full further calls are rejected at once with a retry hint,
+so a burst of expensive reports cannot occupy the pools that cheap lookups
+need. A slot is held until the call's thread finishes, also when the caller
+timed out or was cancelled and the call goes on in the background.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import ExecutionConfig
+from .exceptions import NetBoxOverloadedError, NetBoxTimeoutError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL = "default"
+
+
+def is_write_tool(tool: Dict[str, Any]) -> bool:
+    """Whether a registered tool writes to NetBox, i.e. takes the confirm safety parameter."""
+    return any(param["name"] == "confirm" for param in tool.get("parameters", []))
+
+
+class ToolPool:
+    """A bounded thread pool with queue and wait-time accounting."""
+
+    def __init__(self, name: str, max_workers: int, wait_sample_size: int = 1000):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"netbox-tool-{name}")
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=wait_sample_size)
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs):
+        """Submit a call; returns a concurrent.futures.Future."""
+        submitted = time.monotonic()
+
+        def run():
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self._waits.append(time.monotonic() - submitted)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+            return result
+
+        with self._lock:
+            self.queued += 1
+        return self._executor.submit(run)
+
+    def record_cancel(self, dropped: bool) -> None:
+        with self._lock:
+            self.cancelled += 1
+            if dropped:
+                # The call never started, so it never left the queue
+                self.queued -= 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            metrics = {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+            }
+        if waits:
+            metrics["wait_time_ms"] = {
+                "avg": round(sum(waits) / len(waits) * 1000, 2),
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2),
+                "max": round(waits[-1] * 1000, 2),
+            }
+        else:
+            metrics["wait_time_ms"] = {"avg": 0.0, "p95": 0.0, "max": 0.0}
+        return metrics
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class Bulkhead:
+    """
+    Concurrency limit with a bounded wait queue for one tool.
+
+    Waiters are futures on their own event loop and are woken thread-safely,
+    so one bulkhead serves callers from any loop (MCP and REST API).
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queued: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+        self.running = 0
+        self.rejected = 0
+        # Moving average of call durations, for the retry hint
+        self._avg_duration = 1.0
+
+    def retry_after(self) -> float:
+        """Seconds until a slot is likely to be free, at least one."""
+        backlog = len(self._waiters) + self.running
+        return float(max(1, round(self._avg_duration * backlog / self.max_concurrency)))
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if needed.
+
+        Raises:
+            NetBoxOverloadedError: If all slots are taken and the queue is full
+        """
+        with self._lock:
+            if self.running < self.max_concurrency and not self._waiters:
+                self.running += 1
+                return
+            if len(self._waiters) >= self.max_queued:
+                self.rejected += 1
+                raise NetBoxOverloadedError(self.name, self.retry_after())
+            loop = asyncio.get_running_loop()
+            waiter: Tuple[asyncio.AbstractEventLoop, asyncio.Future] = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except BaseException:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    # Released to us just as we gave up; pass the slot on
+                    granted = True
+            if granted:
+                self.release()
+            raise
+
+    def release(self, duration: Optional[float] = None) -> None:
+        """Free a slot, handing it straight to the next waiter if there is one."""
+        with self._lock:
+            if duration is not None:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+                    return
+                except RuntimeError:
+                    # The waiter's loop has closed
+                    continue
+            self.running -= 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self.running,
+                "queued": len(self._waiters),
+                "max_queued": self.max_queued,
+                "rejected": self.rejected,
+            }
+
+
+class ToolExecutor:
+    """Per-category ToolPools and per-tool Bulkheads, created on first use."""
+
+    def __init__(self, config: Optional[ExecutionConfig] = None):
+        self.config = config or ExecutionConfig()
+        self._pools: Dict[str, ToolPool] = {}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, category: Optional[str]) -> ToolPool:
+        """The pool for a category: its own if configured, otherwise the default pool."""
+        name = category if category in self.config.category_workers else DEFAULT_POOL
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                workers = self.config.category_workers.get(name, self.config.max_workers)
+                pool = self._pools[name] = ToolPool(name, workers, self.config.wait_sample_size)
+            return pool
+
+    async def run(self, category: Optional[str], func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call in the category's pool and await its result.
+
+        Raises:
+            asyncio.CancelledError: If the awaiting task is cancelled; the call
+                is dropped if it has not started yet
+        """
+        pool = self.pool(category)
+        return await self._wait(pool, pool.submit(func, *args, **kwargs))
+
+    async def _wait(self, pool: ToolPool, future) -> Any:
+        """Await a submitted call, dropping it if the caller is cancelled before it starts."""
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            dropped = future.cancel()
+            pool.record_cancel(dropped)
+            logger.info(f"Tool call cancelled in pool '{pool.name}' "
+                        f"({'dropped from queue' if dropped else 'finishing in background'})")
+            raise
+
+    def limits(self, tool: Dict[str, Any]) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Concurrency limit and timeout of a registered tool (None for unlimited).
+
+        The default timeout only applies to read-only tools. A write tool
+        (one taking confirm) that times out goes on writing in the background,
+        and a client retrying it would repeat the writes, so write tools only
+        time out when they declare their own timeout.
+        """
+        execution = tool.get("execution") or {}
+        max_concurrency = execution.get("max_concurrency")
+        if max_concurrency is None and execution.get("cost") == "expensive":
+            max_concurrency = self.config.expensive_max_concurrency
+        timeout = execution.get("timeout")
+        if timeout is None and not is_write_tool(tool):
+            timeout = self.config.default_timeout
+        return max_concurrency, timeout
+
+    def bulkhead(self, tool_name: str, max_concurrency: int) -> Bulkhead:
+        with self._lock:
+            bulkhead = self._bulkheads.get(tool_name)
+            if bulkhead is None:
+                bulkhead = self._bulkheads[tool_name] = Bulkhead(
+                    tool_name, max_concurrency, self.config.max_queued_per_tool
+                )
+            return bulkhead
+
+    async def run_tool(self, tool: Dict[str, Any], func: Callable[..., Any], *args) -> Any:
+        """
+        Run a registered tool's call under its concurrency limit and timeout.
+
+        Args:
+            tool: The tool's TOOL_REGISTRY entry
+            func: Blocking callable to run in the tool's category pool
+
+        Raises:
+            NetBoxOverloadedError: If the tool is at capacity and its queue is full
+            NetBoxTimeoutError: If the call, including time queued, exceeds the timeout
+                (the call itself cannot be interrupted and finishes in the background)
+        """
+        max_concurrency, timeout = self.limits(tool)
+        bulkhead = self.bulkhead(tool["name"], max_concurrency) if max_concurrency else None
+
+        async def limited():
+            if bulkhead is None:
+                return await self.run(tool.get("category"), func, *args)
+            await bulkhead.acquire()
+            started = time.monotonic()
+            pool = self.pool(tool.get("category"))
+            try:
+                future = pool.submit(func, *args)
+            except BaseException:
+                bulkhead.release()
+                raise
+            # A running call cannot be interrupted, so the slot is freed when the
+            # call actually ends, not when its caller times out or is cancelled
+            future.add_done_callback(lambda _: bulkhead.release(time.monotonic() - started))
+            return await self._wait(pool, future)
+
+        try:
+            return await asyncio.wait_for(limited(), timeout)
+        except asyncio.TimeoutError:
+            raise NetBoxTimeoutError(tool["name"], timeout) from None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            pools = dict(self._pools)
+            bulkheads = dict(self._bulkheads)
+        metrics = {name: pool.get_metrics() for name, pool in sorted(pools.items())}
+        if bulkheads:
+            metrics["tools"] = {name: bulkhead.get_metrics() for name, bulkhead in sorted(bulkheads.items())}
+        return metrics
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+
+_tool_executor: Optional[ToolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Get the global tool executor, with default settings until configured."""
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ToolExecutor()
+        return _tool_executor
+
+
+def configure_tool_executor(config: ExecutionConfig) -> ToolExecutor:
+    """Replace the global tool executor with one using the given settings."""
+    global _tool_executor
+    with _tool_executor_lock:
+        previous, _tool_executor = _tool_executor, ToolExecutor(config)
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _tool_executor
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tool Manifest for NetBox MCP Server
+
+A JSON file generated at build time describing every tool: its registry
+metadata (description, parsed docstring, parameters, return info, execution
+limits, module), the input/output schemas FastMCP advertises and its OpenAPI
+path item. With it the server registers all tools at startup without
+importing a single tool module, each module is imported the first time one
+of its tools is called, and the decorator, the discovery endpoint and the
+OpenAPI generator take tool descriptions from the manifest instead of
+introspecting the functions again in every process.
+
+The manifest records the manifest format, the package version and a
+fingerprint of the tool sources and of the modules that turn them into
+manifest entries (the registry, the FastMCP bridge and the OpenAPI
+generator). If any of them differs, it is ignored and
+tools are loaded and introspected at startup as before. Regenerate it after
+changing tools:
+
+    python -m netbox_mcp.tool_manifest
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the manifest changes
+MANIFEST_FORMAT = 2
+
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+TOOLS_PATH = Path(__file__).with_name("tools")
+
+# Modules whose code shapes the manifest entries built from the tools
+GENERATOR_SOURCES = tuple(Path(__file__).with_name(name) for name in
+                          ("registry.py", "tool_bridge.py", "openapi_generator.py"))
+
+
+def tools_fingerprint(tools_path: Path = TOOLS_PATH) -> str:
+    """SHA-256 over the paths and contents of the tool sources and GENERATOR_SOURCES."""
+    digest = hashlib.sha256()
+    sources = [(source.relative_to(tools_path).as_posix(), source) for source in sorted(tools_path.rglob("*.py"))]
+    sources += [(source.name, source) for source in GENERATOR_SOURCES]
+    for name, source in sources:
+        digest.update(name.encode())
+        digest.update(b"\0")
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def build_manifest() -> Dict[str, Any]:
+    """
+    Load and introspect every tool and describe it as the manifest does.
+    
+    Must run in a process that has not installed a manifest, so that the
+    tools are introspected rather than read back from the manifest.
+    """
+    from . import __version__
+    from .openapi_generator import OpenAPIGenerator
+    from .registry import PACKAGE_PATH, TOOL_MANIFEST, TOOL_REGISTRY, list_tools, load_tools, serialize_tool_for_api
+    from .tool_bridge import build_fastmcp_tool
+
+    if TOOL_MANIFEST:
+        raise RuntimeError("Cannot build the tool manifest in a process that installed one")
+
+    load_tools()
+    # OpenAPI path items as generated with the default configuration
+    openapi_generator = OpenAPIGenerator()
+    tool_infos = {tool_info["name"]: tool_info for tool_info in list_tools()}
+
+    tools = {}
+    for tool_name, tool_metadata in sorted(TOOL_REGISTRY.items()):
+        fastmcp_tool = build_fastmcp_tool(tool_name, tool_metadata)
+        entry = serialize_tool_for_api(tool_name)
+        if entry["source_file"] != "unknown":
+            entry["source_file"] = Path(entry["source_file"]).relative_to(PACKAGE_PATH).as_posix()
+        entry["input_schema"] = fastmcp_tool.parameters
+        entry["output_schema"] = fastmcp_tool.output_schema
+        entry["openapi"] = openapi_generator._generate_path_item(tool_infos[tool_name], tool_metadata["category"])
+        tools[tool_name] = entry
+    return {
+        "format": MANIFEST_FORMAT,
+        "version": __version__,
+        "fingerprint": tools_fingerprint(),
+        "tools": tools,
+    }
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    """Generate the manifest and write it to path."""
+    manifest = build_manifest()
+    path.write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+    logger.info(f"Wrote tool manifest with {len(manifest['tools'])} tools to {path}")
+    return manifest
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest if it exists and matches this package and its tool sources.
+
+    Returns:
+        The manifest, or None if it is missing, unreadable or stale
+    """
+    from . import __version__
+
+    try:
+        manifest = json.loads(path.read_text())
+    except FileNotFoundError:
+        logger.info(f"No tool manifest at {path}; tools are loaded at startup")
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tool manifest {path}: {e}")
+        return None
+
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("version") != __version__:
+        logger.warning(f"Tool manifest format {manifest.get('format')} version {manifest.get('version')} "
+                       f"does not match this package ({MANIFEST_FORMAT}, {__version__}); "
+                       "tools are loaded at startup. Regenerate it with: python -m netbox_mcp.tool_manifest")
+        return None
+    if manifest.get("fingerprint") != tools_fingerprint():
+        logger.warning("Tool manifest does not match the tool sources; tools are loaded at startup. "
+                       "Regenerate it with: python -m netbox_mcp.tool_manifest")
+        return None
+    return manifest
+
+
+def use_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest and install it in the registry if it is current.
+
+    Returns:
+        The installed manifest, or None if tools are introspected instead
+    """
+    from .registry import install_manifest
+
+    manifest = load_manifest(path)
+    if manifest is not None:
+        install_manifest(manifest)
+    return manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    write_manifest()
@@ -11,7 +11,9 @@ The package structure follows NetBox's application organization:
 - dcim_tools.py - Data Center Infrastructure Management tools
 - bulk_tools.py - Bulk operations and orchestration tools
 
-Tools are loaded automatically when this package is imported.
+Importing this package does not import the tools: load_all_tools() imports
+every tool module, and a single module can be imported on its own, which is
+how the server loads tools on first use.
 """
 
 import importlib
@@ -24,9 +26,9 @@ def load_all_tools() -> List[str]:
     """
     Load all tools from the hierarchical domain structure.
     
-    This function directly imports all domain packages, which in turn import
-    their tool modules via their __init__.py files. This approach is more
-    reliable than automatic discovery and ensures all tools are loaded.
+    This function directly imports all domain packages and the tool modules
+    each lists in TOOL_MODULES. This approach is more reliable than automatic
+    discovery and ensures all tools are loaded.
     
     Returns:
         List[str]: Names of successfully loaded domain packages
@@ -45,11 +47,13 @@ def load_all_tools() -> List[str]:
     
     for domain in domain_packages:
         try:
-            # Import the domain package - this triggers all __init__.py imports
+            # Import the domain package and each tool module it lists
             module_name = f"{__name__}.{domain}"
-            importlib.import_module(module_name)
+            package = importlib.import_module(module_name)
+            for tool_module in getattr(package, "TOOL_MODULES", ()):
+                importlib.import_module(f"{module_name}.{tool_module}")
             loaded_domains.append(domain)
-            logger.info(f"Successfully loaded domain package: {domain}")
+            logger.debug(f"Successfully loaded domain package: {domain}")
         except Exception as e:
             logger.error(f"Failed to load domain package {domain}: {e}")
             # Continue loading other domains even if one fails
@@ -57,8 +61,5 @@ def load_all_tools() -> List[str]:
     logger.info(f"Tool loading complete: {len(loaded_domains)} domain packages loaded")
     return loaded_domains
 
-# Automatically load all tools when this package is imported
-_loaded_tools = load_all_tools()
 
-# Export the load function for explicit use if needed
-__all__ = ['load_all_tools']
\ No newline at end of file
+__all__ = ['load_all_tools']
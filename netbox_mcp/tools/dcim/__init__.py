@@ -5,5 +5,25 @@ This module contains enterprise-grade tools for managing NetBox DCIM objects inc
 devices, racks, sites, cables, interfaces, modules, and power infrastructure.
 """
 
-# Import all DCIM tools to make them discoverable by the registry  
-from . import sites, racks, manufacturers, device_roles, device_types, devices, interfaces, cables, modules, power_ports, device_type_components, inventory, module_type_profiles, power_panels, power_feeds, power_outlets, power_connections
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "sites",
+    "racks",
+    "manufacturers",
+    "device_roles",
+    "device_types",
+    "devices",
+    "interfaces",
+    "cables",
+    "modules",
+    "power_ports",
+    "device_type_components",
+    "inventory",
+    "module_type_profiles",
+    "power_panels",
+    "power_feeds",
+    "power_outlets",
+    "power_connections",
+    "power_capacity",
+    "topology",
+)
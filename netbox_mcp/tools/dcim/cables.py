@@ -12,9 +12,17 @@ from datetime import datetime
 from ...registry import mcp_tool
 from ...client import NetBoxClient
 from ...validation import CableValidator
+from ...progress import get_progress_reporter
+from ...records import related_id
 
 logger = logging.getLogger(__name__)
 
+# Maximum values per multi-value filter in bulk lookups, keeping query strings short
+BULK_LOOKUP_CHUNK_SIZE = 50
+
+# Largest number of cables sent in a single list POST
+MAX_BULK_CABLE_BATCH_SIZE = 50
+
 
 @mcp_tool(category="dcim")
 def netbox_create_cable_connection(
@@ -724,6 +732,11 @@ def netbox_bulk_create_cable_connections(
     with comprehensive error handling, progress tracking, and rollback capabilities
     for production infrastructure deployments.
     
+    All devices are resolved with one multi-value name query and their interfaces
+    with one query per chunk of devices; conflicts are detected from the fetched
+    cable fields and cables are created with list POSTs of batch_size cables, so
+    a 48-port patch panel needs a handful of requests instead of several hundred.
+    
     Args:
         client: NetBoxClient instance (injected)
         cable_connections: List of connection specifications:
@@ -741,8 +754,9 @@ def netbox_bulk_create_cable_connections(
         cable_status: Cable status for all connections (planned, installed, connected, decommissioning)
         cable_length: Optional cable length for all connections
         cable_length_unit: Length unit (mm, cm, m, km, in, ft, mi)
-        batch_size: Number of cables to create per batch (default: 10)
-        rollback_on_error: Remove successfully created cables if batch fails (default: True)
+        batch_size: Number of cables to create per list POST (default: 10)
+        rollback_on_error: Create nothing if any connection is invalid and remove all cables
+            created by this operation if a later batch fails (default: True)
         confirm: Must be True to execute (safety mechanism)
         
     Returns:
@@ -839,6 +853,13 @@ def netbox_bulk_create_cable_connections(
                 "error_type": "ValidationError"
             }
         
+        if not (1 <= batch_size <= MAX_BULK_CABLE_BATCH_SIZE):
+            return {
+                "success": False,
+                "error": f"batch_size must be between 1 and {MAX_BULK_CABLE_BATCH_SIZE}",
+                "error_type": "ValidationError"
+            }
+        
         # Validate each connection specification
         required_fields = ["device_a_name", "interface_a_name", "device_b_name", "interface_b_name"]
         for i, connection in enumerate(cable_connections):
@@ -909,75 +930,131 @@ def netbox_bulk_create_cable_connections(
                 "dry_run": True
             }
         
-        # Process connections in batches
-        for batch_start in range(0, len(cable_connections), batch_size):
-            batch_end = min(batch_start + batch_size, len(cable_connections))
-            batch_connections = cable_connections[batch_start:batch_end]
-            
-            logger.info(f"Processing batch {batch_start//batch_size + 1}: connections {batch_start+1}-{batch_end}")
-            
-            batch_success_count = 0
-            batch_failure_count = 0
-            
-            # Process each connection in the batch
-            for connection in batch_connections:
-                try:
-                    # Use the existing single cable creation tool for each connection
-                    cable_result = netbox_create_cable_connection(
-                        client=client,
-                        device_a_name=connection["device_a_name"],
-                        interface_a_name=connection["interface_a_name"],
-                        device_b_name=connection["device_b_name"],
-                        interface_b_name=connection["interface_b_name"],
-                        cable_type=cable_type,
-                        cable_status=cable_status,
-                        cable_color=cable_color,
-                        cable_length=cable_length,
-                        cable_length_unit=cable_length_unit,
-                        label=connection.get("label"),
-                        description=connection.get("description"),
-                        confirm=True
-                    )
+        # Step 1: Resolve every device with multi-value name= queries
+        device_names = sorted({
+            name for connection in cable_connections
+            for name in (connection["device_a_name"], connection["device_b_name"])
+        })
+        devices_by_name = {}
+        for chunk_start in range(0, len(device_names), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = device_names[chunk_start:chunk_start + BULK_LOOKUP_CHUNK_SIZE]
+            for device in client.dcim.devices.filter(name=chunk):
+                devices_by_name.setdefault(device["name"], device)
+        
+        # Step 2: Fetch the candidate interfaces of all those devices at once;
+        # bypass the cache so the cable fields used for conflict detection are fresh
+        device_ids = sorted({device["id"] for device in devices_by_name.values()})
+        interfaces_by_key = {}
+        for chunk_start in range(0, len(device_ids), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = device_ids[chunk_start:chunk_start + BULK_LOOKUP_CHUNK_SIZE]
+            for interface in client.dcim.interfaces.filter(device_id=chunk, no_cache=True):
+                interfaces_by_key[(related_id(interface.get("device")), interface["name"])] = interface
+        
+        # Step 3: Validate each connection against the fetched data
+        pending = []
+        claimed_interfaces = set()
+        for connection in cable_connections:
+            try:
+                terminations = []
+                for side in ("a", "b"):
+                    device_name = connection[f"device_{side}_name"]
+                    interface_name = connection[f"interface_{side}_name"]
                     
-                    if cable_result.get("success"):
-                        operation_result.add_success(connection, cable_result)
-                        batch_success_count += 1
-                        logger.debug(f"Successfully created cable: {connection['device_a_name']}:{connection['interface_a_name']} -> {connection['device_b_name']}:{connection['interface_b_name']}")
-                    else:
-                        operation_result.add_failure(connection, cable_result.get("error", "Unknown error"))
-                        batch_failure_count += 1
-                        logger.warning(f"Failed to create cable: {connection['device_a_name']}:{connection['interface_a_name']} -> {connection['device_b_name']}:{connection['interface_b_name']}, Error: {cable_result.get('error')}")
-                        
-                except Exception as e:
-                    operation_result.add_failure(connection, str(e))
-                    batch_failure_count += 1
-                    logger.error(f"Exception creating cable: {connection['device_a_name']}:{connection['interface_a_name']} -> {connection['device_b_name']}:{connection['interface_b_name']}, Error: {e}")
-            
-            # Check if rollback is needed for this batch
-            if rollback_on_error and batch_failure_count > 0:
-                logger.warning(f"Batch {batch_start//batch_size + 1} had {batch_failure_count} failures, initiating rollback")
+                    device = devices_by_name.get(device_name)
+                    if device is None:
+                        raise ValueError(f"Device {side.upper()} '{device_name}' not found")
+                    
+                    interface = interfaces_by_key.get((device["id"], interface_name))
+                    if interface is None:
+                        raise ValueError(f"Interface {side.upper()} '{interface_name}' not found on device '{device_name}'")
+                    
+                    if interface.get("cable"):
+                        raise ValueError(f"Interface {side.upper()} '{device_name}:{interface_name}' already has a cable connection")
+                    
+                    if interface["id"] in claimed_interfaces:
+                        raise ValueError(f"Interface {side.upper()} '{device_name}:{interface_name}' is used by more than one connection in this request")
+                    
+                    terminations.append(interface["id"])
                 
-                # Rollback successful connections from this batch
-                for success_record in operation_result.successful_connections[-batch_success_count:]:
-                    try:
-                        cable_id = success_record["cable_id"]
-                        if cable_id:
-                            logger.info(f"Rolling back cable ID: {cable_id}")
-                            rollback_result = netbox_disconnect_cable(
-                                client=client,
-                                cable_id=cable_id,
-                                confirm=True
-                            )
-                            operation_result.add_rollback(cable_id, rollback_result)
-                    except Exception as rollback_error:
-                        logger.error(f"Failed to rollback cable {cable_id}: {rollback_error}")
+                if terminations[0] == terminations[1]:
+                    raise ValueError("Cannot connect an interface to itself")
+                
+                claimed_interfaces.update(terminations)
+                
+                cable_data = {
+                    "a_terminations": [{"object_type": "dcim.interface", "object_id": terminations[0]}],
+                    "b_terminations": [{"object_type": "dcim.interface", "object_id": terminations[1]}],
+                    "type": cable_type,
+                    "status": cable_status
+                }
+                if cable_length is not None:
+                    cable_data["length"] = cable_length
+                    cable_data["length_unit"] = cable_length_unit
+                if connection.get("label"):
+                    cable_data["label"] = connection["label"]
+                if connection.get("description"):
+                    cable_data["description"] = connection["description"]
+                if cable_color:
+                    cable_data["color"] = cable_color
+                
+                pending.append((connection, cable_data))
                 
-                # Remove the rolled-back successes from the success list
-                operation_result.successful_connections = operation_result.successful_connections[:-batch_success_count]
+            except ValueError as e:
+                operation_result.add_failure(connection, str(e))
+                logger.warning(f"Invalid cable connection: {connection['device_a_name']}:{connection['interface_a_name']} -> {connection['device_b_name']}:{connection['interface_b_name']}, Error: {e}")
+        
+        # With rollback enabled the operation is all-or-nothing, so nothing is
+        # created when any connection failed validation
+        if rollback_on_error and operation_result.failed_connections:
+            logger.error(f"{len(operation_result.failed_connections)} connections failed validation, "
+                         f"no cables created because rollback_on_error=True")
+            pending = []
+        
+        # Step 4: Create the cables with chunked list POSTs. NetBox creates each
+        # chunk in one transaction, so a failed chunk leaves nothing behind.
+        # Progress and each chunk's outcome are reported as the chunks complete.
+        progress = get_progress_reporter()
+        progress.advance(0, len(pending), f"Creating {len(pending)} cables in chunks of {batch_size}")
+        for chunk_start in range(0, len(pending), batch_size):
+            chunk = pending[chunk_start:chunk_start + batch_size]
+            logger.info(f"Creating cable chunk {chunk_start//batch_size + 1}: connections {chunk_start+1}-{chunk_start+len(chunk)}")
+            
+            try:
+                created = client.dcim.cables.bulk_create([cable_data for _, cable_data in chunk], confirm=True)
+            except Exception as e:
+                for connection, _ in chunk:
+                    operation_result.add_failure(connection, str(e))
+                logger.error(f"Cable chunk {chunk_start//batch_size + 1} failed: {e}")
                 
-                # If rollback_on_error is enabled, stop processing remaining batches
-                logger.error(f"Stopping bulk operation due to batch failures and rollback_on_error=True")
-                break
+                if rollback_on_error:
+                    # Remove every cable this operation created so far in one request
+                    created_ids = [record["cable_id"] for record in operation_result.successful_connections if record["cable_id"]]
+                    if created_ids:
+                        logger.warning(f"Rolling back {len(created_ids)} cables created by this operation")
+                        try:
+                            rolled_back = client.dcim.cables.bulk_delete(created_ids, confirm=True)
+                            rollback_result = {"success": rolled_back}
+                        except Exception as rollback_error:
+                            logger.error(f"Failed to roll back cables {created_ids}: {rollback_error}")
+                            rollback_result = {"success": False, "error": str(rollback_error)}
+                        for cable_id in created_ids:
+                            operation_result.add_rollback(cable_id, rollback_result)
+                        if rollback_result["success"]:
+                            operation_result.successful_connections = []
+                    
+                    logger.error("Stopping bulk operation due to chunk failure and rollback_on_error=True")
+                    progress.partial({"chunk": chunk_start // batch_size + 1, "error": str(e),
+                                      "rolled_back": len(operation_result.rollback_actions)})
+                    break
+                progress.partial({"chunk": chunk_start // batch_size + 1, "error": str(e)})
+                continue
+            
+            for (connection, _), cable in zip(chunk, created):
+                operation_result.add_success(connection, {"cable": cable})
+            progress.advance(chunk_start + len(chunk), len(pending),
+                             f"Created cables {chunk_start + 1}-{chunk_start + len(chunk)} of {len(pending)}")
+            progress.partial({"chunk": chunk_start // batch_size + 1,
+                              "cable_ids": [cable.get("id") for cable in created]})
         
         # Finalize operation
         operation_result.finalize()
@@ -9,7 +9,9 @@ including creation, provisioning, decommissioning, and enterprise-grade function
 from typing import Dict, Optional, Any
 import logging
 from ...registry import mcp_tool
-from ...client import NetBoxClient
+from ...client import Lookup, NetBoxClient
+from ...exceptions import NetBoxNotFoundError
+from ...progress import get_progress_reporter
 
 logger = logging.getLogger(__name__)
 
@@ -657,61 +659,51 @@ def netbox_provision_new_device(
         
         logger.info(f"Provisioning device: {device_name} in {site_name}/{rack_name} at position {position}")
         
-        # Step 1: Find the site
-        logger.debug(f"Looking up site: {site_name}")
-        sites = client.dcim.sites.filter(name=site_name)
-        if not sites:
-            sites = client.dcim.sites.filter(slug=site_name)
-        if not sites:
+        # Steps 1-4: Resolve site, rack, device type, role and the optional
+        # tenant/platform concurrently. Racks are looked up by name across
+        # sites so the lookup need not wait for the site; the site's rack is
+        # picked from the candidates afterwards.
+        try:
+            refs = client.resolve_all({
+                "site": Lookup("dcim.sites", site_name, label="Site"),
+                "racks": Lookup("dcim.racks", rack_name, fields=("name",), all_matches=True, required=False),
+                "device_type": Lookup("dcim.device_types", device_model, fields=("model", "slug"), label="Device type"),
+                "role": Lookup("dcim.device_roles", role_name, label="Device role"),
+                "tenant": Lookup("tenancy.tenants", tenant, required=False),
+                "platform": Lookup("dcim.platforms", platform, required=False),
+            })
+        except NetBoxNotFoundError as e:
             return {
                 "success": False,
-                "error": f"Site '{site_name}' not found",
+                "error": e.message,
                 "error_type": "NotFoundError"
             }
-        site = sites[0]
+        
+        site = refs["site"]
         site_id = site["id"]
         logger.debug(f"Found site: {site['name']} (ID: {site_id})")
         
-        # Step 2: Find the rack within that site
-        logger.debug(f"Looking up rack: {rack_name} in site {site['name']}")
-        racks = client.dcim.racks.filter(site_id=site_id, name=rack_name)
-        if not racks:
+        rack = None
+        for candidate in refs["racks"] or []:
+            rack_site = candidate.get("site")
+            rack_site_id = rack_site.get("id") if isinstance(rack_site, dict) else rack_site
+            if rack_site_id == site_id:
+                rack = candidate
+                break
+        if rack is None:
             return {
                 "success": False,
                 "error": f"Rack '{rack_name}' not found in site '{site['name']}'",
                 "error_type": "NotFoundError"
             }
-        rack = racks[0]
         rack_id = rack["id"]
         logger.debug(f"Found rack: {rack['name']} (ID: {rack_id})")
         
-        # Step 3: Find the device type
-        logger.debug(f"Looking up device type: {device_model}")
-        device_types = client.dcim.device_types.filter(model=device_model)
-        if not device_types:
-            device_types = client.dcim.device_types.filter(slug=device_model)
-        if not device_types:
-            return {
-                "success": False,
-                "error": f"Device type '{device_model}' not found",
-                "error_type": "NotFoundError"
-            }
-        device_type = device_types[0]
+        device_type = refs["device_type"]
         device_type_id = device_type["id"]
         logger.debug(f"Found device type: {device_type['model']} (ID: {device_type_id})")
         
-        # Step 4: Find the device role
-        logger.debug(f"Looking up device role: {role_name}")
-        roles = client.dcim.device_roles.filter(name=role_name)
-        if not roles:
-            roles = client.dcim.device_roles.filter(slug=role_name)
-        if not roles:
-            return {
-                "success": False,
-                "error": f"Device role '{role_name}' not found",
-                "error_type": "NotFoundError"
-            }
-        role = roles[0]
+        role = refs["role"]
         role_id = role["id"]
         logger.debug(f"Found device role: {role['name']} (ID: {role_id})")
         
@@ -754,17 +746,13 @@ def netbox_provision_new_device(
                     "error_type": "ConflictError"
                 }
         
-        # Step 6: Resolve optional foreign keys
+        # Step 6: Optional foreign keys (resolved above)
         tenant_id = None
         tenant_name = None
         if tenant:
-            logger.debug(f"Looking up tenant: {tenant}")
-            tenants = client.tenancy.tenants.filter(name=tenant)
-            if not tenants:
-                tenants = client.tenancy.tenants.filter(slug=tenant)
-            if tenants:
-                tenant_id = tenants[0]["id"]
-                tenant_name = tenants[0]["name"]
+            if refs["tenant"]:
+                tenant_id = refs["tenant"]["id"]
+                tenant_name = refs["tenant"]["name"]
                 logger.debug(f"Found tenant: {tenant_name} (ID: {tenant_id})")
             else:
                 logger.warning(f"Tenant '{tenant}' not found, proceeding without tenant assignment")
@@ -772,13 +760,9 @@ def netbox_provision_new_device(
         platform_id = None
         platform_name = None
         if platform:
-            logger.debug(f"Looking up platform: {platform}")
-            platforms = client.dcim.platforms.filter(name=platform)
-            if not platforms:
-                platforms = client.dcim.platforms.filter(slug=platform)
-            if platforms:
-                platform_id = platforms[0]["id"]
-                platform_name = platforms[0]["name"]
+            if refs["platform"]:
+                platform_id = refs["platform"]["id"]
+                platform_name = refs["platform"]["name"]
                 logger.debug(f"Found platform: {platform_name} (ID: {platform_id})")
             else:
                 logger.warning(f"Platform '{platform}' not found, proceeding without platform assignment")
@@ -1040,8 +1024,14 @@ def netbox_decommission_device(
                 "dry_run": True
             }
         
-        # Step 5: Execute decommissioning plan
+        # Step 5: Execute decommissioning plan, reporting one unit of progress
+        # per IP address, cable and the final device update
         execution_results = {}
+        progress = get_progress_reporter()
+        total_steps = 1
+        total_steps += len(device_ips) if handle_ips != "keep" else 0
+        total_steps += len(device_cables) if handle_cables != "keep" else 0
+        completed_steps = 0
         
         # 5a: Handle IP addresses
         if device_ips and handle_ips != "keep":
@@ -1049,6 +1039,8 @@ def netbox_decommission_device(
             ip_results = []
             
             for ip in device_ips:
+                progress.advance(completed_steps, total_steps, f"Processing IP address {ip['address']}")
+                completed_steps += 1
                 try:
                     if handle_ips == "unassign":
                         # Unassign the IP from the interface
@@ -1085,6 +1077,7 @@ def netbox_decommission_device(
                 "failed": len([r for r in ip_results if r["status"] == "error"]),
                 "details": ip_results
             }
+            progress.partial({"ip_processing": execution_results["ip_processing"]})
         
         # 5b: Handle cables
         if device_cables and handle_cables != "keep":
@@ -1092,6 +1085,8 @@ def netbox_decommission_device(
             cable_results = []
             
             for cable in device_cables:
+                progress.advance(completed_steps, total_steps, f"Processing cable {cable['id']}")
+                completed_steps += 1
                 try:
                     if handle_cables == "remove":
                         # Delete the cable
@@ -1137,9 +1132,11 @@ def netbox_decommission_device(
                 "failed": len([r for r in cable_results if r["status"] == "error"]),
                 "details": cable_results
             }
+            progress.partial({"cable_processing": execution_results["cable_processing"]})
         
         # 5c: Update device status
         logger.info(f"Updating device status to: {decommission_strategy}")
+        progress.advance(completed_steps, total_steps, f"Setting device status to {decommission_strategy}")
         try:
             device_update_data = {"status": decommission_strategy}
             updated_device = client.dcim.devices.update(device_id, confirm=True, **device_update_data)
@@ -1156,6 +1153,7 @@ def netbox_decommission_device(
                 "error": str(e),
                 "status": "error"
             }
+        progress.advance(total_steps, total_steps, "Decommissioning steps completed")
         
         # Step 6: Generate completion summary
         total_actions = 1  # Device status update
@@ -1206,7 +1204,7 @@ def netbox_decommission_device(
 
 
 
-@mcp_tool(category="dcim")
+@mcp_tool(category="dcim", cost="expensive", max_concurrency=4)
 def netbox_list_all_devices(
     client: NetBoxClient,
     limit: int = 100,
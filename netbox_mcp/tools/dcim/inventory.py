@@ -37,6 +37,7 @@ from ...exceptions import (
     NetBoxNotFoundError as NotFoundError,
     NetBoxConflictError as ConflictError
 )
+from ...progress import get_progress_reporter
 
 logger = logging.getLogger(__name__)
 
@@ -1253,8 +1254,10 @@ def netbox_bulk_add_standard_inventory(
     created_items = []
     failed_items = []
     skipped_items = []
+    progress = get_progress_reporter()
     
-    for item_spec in preset_items:
+    for position, item_spec in enumerate(preset_items, 1):
+        progress.advance(position - 1, len(preset_items), f"Adding {item_spec['name']}")
         try:
             # Check if item already exists
             existing_items = client.dcim.inventory_items.filter(
@@ -1302,6 +1305,7 @@ def netbox_bulk_add_standard_inventory(
             })
             
             logger.info(f"Created inventory item: {item_name} (ID: {item_id})")
+            progress.partial({"created": created_items[-1]})
             
         except Exception as e:
             failed_items.append({
@@ -1309,6 +1313,9 @@ def netbox_bulk_add_standard_inventory(
                 "error": str(e)
             })
             logger.error(f"Failed to create inventory item '{item_spec['name']}': {e}")
+            progress.partial({"failed": failed_items[-1]})
+    
+    progress.advance(len(preset_items), len(preset_items), "Inventory items processed")
     
     # STEP 5: RETURN RESULTS
     total_attempted = len(preset_items)
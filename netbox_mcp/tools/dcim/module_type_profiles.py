@@ -24,6 +24,7 @@ import logging
 import json
 from ...registry import mcp_tool
 from ...client import NetBoxClient
+from ...name_index import did_you_mean
 from ...exceptions import (
     NetBoxValidationError as ValidationError,
     NetBoxNotFoundError as NotFoundError,
@@ -765,7 +766,9 @@ def netbox_assign_profile_to_module_type(
         if not manufacturers:
             manufacturers = client.dcim.manufacturers.filter(slug=manufacturer.lower().replace(' ', '-'))
         if not manufacturers:
-            raise NotFoundError(f"Manufacturer '{manufacturer}' not found")
+            suggestions = client.name_index.suggest("dcim.manufacturers", manufacturer, limit=3)
+            raise NotFoundError(f"Manufacturer '{manufacturer}' not found{did_you_mean(suggestions)}",
+                                {"suggestions": suggestions})
         
         manufacturer_obj = manufacturers[0]
         manufacturer_id = manufacturer_obj.get('id') if isinstance(manufacturer_obj, dict) else manufacturer_obj.id
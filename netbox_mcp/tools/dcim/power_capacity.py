@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+DCIM Power Capacity Tools
+
+Site-wide power budget reporting answered from the client's power model:
+load versus capacity per feed, panel and rack, and phase balance of
+three-phase feeds.
+"""
+
+from typing import Dict, Any
+import logging
+from ...registry import mcp_tool
+from ...client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+# Phase imbalance (percent deviation from the mean leg load) worth flagging
+PHASE_IMBALANCE_THRESHOLD = 20.0
+
+
+@mcp_tool(category="dcim", cost="expensive")
+def netbox_get_power_capacity_report(
+    client: NetBoxClient,
+    site: str,
+    warning_threshold: float = 80.0,
+    max_results: int = 50
+) -> Dict[str, Any]:
+    """
+    Get a power capacity report for a site.
+
+    Computes allocated and maximum draw against usable capacity for every
+    power feed of the site, rolled up per power panel and per rack, from one
+    bulk load of panels, feeds, power ports and outlets (cached).
+
+    Args:
+        client: NetBoxClient instance (injected)
+        site: Site name or slug
+        warning_threshold: Utilization percentage at which a feed is flagged
+        max_results: Maximum number of feeds listed, most utilized first
+
+    Returns:
+        Site totals, per-feed/panel/rack utilization and capacity warnings
+
+    Example:
+        netbox_get_power_capacity_report(site="amsterdam-dc", warning_threshold=70)
+    """
+    try:
+        sites = client.dcim.sites.filter(slug=site) or client.dcim.sites.filter(name=site)
+        if not sites:
+            return {
+                "success": False,
+                "error": f"Site '{site}' not found",
+                "error_type": "NotFoundError"
+            }
+        site_obj = sites[0]
+
+        report = client.power_budget.get(site_obj["id"]).report()
+        rack_names = {rack["id"]: rack.get("name") for rack in client.dcim.racks.filter(site_id=site_obj["id"])}
+        for rack in report["racks"]:
+            rack["name"] = rack_names.get(rack["id"])
+
+        warnings = []
+        for feed in report["feeds"]:
+            percent = feed["utilization_percent"]
+            if percent is not None and percent >= warning_threshold:
+                warnings.append(f"Feed {feed['name']} at {percent}% of usable capacity")
+            if feed["capacity_watts"] and feed["maximum_watts"] > feed["capacity_watts"]:
+                warnings.append(f"Feed {feed['name']} maximum draw {feed['maximum_watts']}W exceeds capacity {feed['capacity_watts']}W")
+            imbalance = feed.get("phase_imbalance_percent")
+            if imbalance is not None and imbalance >= PHASE_IMBALANCE_THRESHOLD:
+                warnings.append(f"Feed {feed['name']} phase imbalance {imbalance}%")
+
+        capacity = sum(feed["capacity_watts"] for feed in report["feeds"])
+        allocated = sum(feed["allocated_watts"] for feed in report["feeds"])
+        feeds = sorted(report["feeds"], key=lambda f: f["utilization_percent"] or 0, reverse=True)
+
+        return {
+            "success": True,
+            "site": site_obj.get("name", site),
+            "summary": {
+                "feed_count": len(feeds),
+                "panel_count": len(report["panels"]),
+                "capacity_watts": capacity,
+                "allocated_watts": allocated,
+                "maximum_watts": sum(feed["maximum_watts"] for feed in report["feeds"]),
+                "utilization_percent": round(allocated / capacity * 100, 2) if capacity else None,
+                "feeds_over_threshold": sum(1 for f in feeds if (f["utilization_percent"] or 0) >= warning_threshold)
+            },
+            "feeds": feeds[:max_results],
+            "panels": report["panels"],
+            "racks": report["racks"],
+            "warnings": warnings,
+            "truncated": len(feeds) > max_results
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to build power capacity report for site {site}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
@@ -10,6 +10,7 @@ from typing import Dict, Optional, Any
 import logging
 from ...registry import mcp_tool
 from ...client import NetBoxClient
+from ...rack_index import FACES, RackOccupancy
 
 logger = logging.getLogger(__name__)
 
@@ -167,8 +168,15 @@ def netbox_get_rack_elevation(
         # Get devices in rack
         devices = client.dcim.devices.filter(rack_id=rack_id)
         
-        # Build elevation map
+        # Device type heights come from the shared height map (IDs when serialized)
+        heights = client.rack_index.device_type_heights(
+            device.get("device_type") for device in devices
+            if not isinstance(device.get("device_type"), dict)
+        )
+        
+        # Build elevation map and unit occupancy
         elevation = {}
+        occupancy = RackOccupancy(rack)
         for device in devices:
             position = device.get("position")
             if position:
@@ -177,32 +185,26 @@ def netbox_get_rack_elevation(
                 if isinstance(device_type_info, dict):
                     device_type_model = device_type_info.get("model", "Unknown")
                     device_u_height = device_type_info.get("u_height", 1)
+                    full_depth = device_type_info.get("is_full_depth", True)
                 else:
-                    # device_type is an ID, need to resolve it
                     device_type_model = "Unknown"
-                    device_u_height = 1
+                    device_u_height, full_depth = heights.get(device_type_info, (1, True))
                 
+                face = device.get("face", "front")
                 elevation[position] = {
                     "device": device["name"],
                     "device_type": device_type_model,
                     "u_height": device_u_height,
-                    "face": device.get("face", "front")
+                    "face": face
                 }
-        
-        # Calculate used units properly
-        used_units = 0
-        for device in devices:
-            device_type_info = device.get("device_type", {})
-            if isinstance(device_type_info, dict):
-                used_units += device_type_info.get("u_height", 1)
-            else:
-                used_units += 1  # Default to 1U if we can't determine
+                occupancy.place(float(position), float(device_u_height),
+                                face.get("value") if isinstance(face, dict) else face, full_depth)
         
         return {
             "success": True,
             "rack": rack,
             "device_count": len(devices),
-            "available_units": rack["u_height"] - used_units,
+            "available_units": occupancy.free_units("both"),
             "elevation": elevation,
             "devices": devices
         }
@@ -216,6 +218,99 @@ def netbox_get_rack_elevation(
         }
 
 
+@mcp_tool(category="dcim")
+def netbox_find_rack_space(
+    client: NetBoxClient,
+    site: str,
+    u_height: int = 1,
+    face: str = "front",
+    rack_status: Optional[str] = None,
+    max_results: int = 20
+) -> Dict[str, Any]:
+    """
+    Find racks in a site with room for a device of a given height.
+    
+    Answered from the site's rack occupancy index, so every rack in the
+    site is checked with one device query instead of one per rack.
+    
+    Args:
+        client: NetBoxClient instance (injected)
+        site: Site name or slug
+        u_height: Contiguous rack units required
+        face: Rack face to check: "front", "rear" or "both" (full-depth devices)
+        rack_status: Optional rack status to restrict candidates (e.g. "active")
+        max_results: Maximum number of racks returned
+        
+    Returns:
+        Candidate racks with the lowest positions where the device fits
+        
+    Example:
+        netbox_find_rack_space(site="amsterdam-dc", u_height=4, face="both")
+    """
+    try:
+        if u_height < 1:
+            return {
+                "success": False,
+                "error": "u_height must be at least 1",
+                "error_type": "ValidationError"
+            }
+        if face not in FACES + ("both",):
+            return {
+                "success": False,
+                "error": "face must be 'front', 'rear' or 'both'",
+                "error_type": "ValidationError"
+            }
+        
+        logger.info(f"Finding {u_height}U of {face} rack space in site: {site}")
+        
+        sites = client.dcim.sites.filter(slug=site) or client.dcim.sites.filter(name=site)
+        if not sites:
+            return {
+                "success": False,
+                "error": f"Site '{site}' not found",
+                "error_type": "NotFoundError"
+            }
+        
+        site_racks = client.rack_index.get(sites[0]["id"])
+        
+        candidates = []
+        for occupancy in sorted(site_racks.racks.values(), key=lambda o: o.rack.get("name") or ""):
+            rack = occupancy.rack
+            status = rack.get("status")
+            if rack_status and (status.get("value") if isinstance(status, dict) else status) != rack_status:
+                continue
+            
+            positions = occupancy.positions(u_height, face)
+            if positions:
+                candidates.append({
+                    "rack": rack.get("name"),
+                    "rack_id": rack["id"],
+                    "rack_height": occupancy.u_height,
+                    "free_units": occupancy.free_units(face),
+                    "first_position": positions[0],
+                    "positions": positions[:10],
+                    "position_count": len(positions)
+                })
+        
+        return {
+            "success": True,
+            "site": sites[0].get("name", site),
+            "requirement": {"u_height": u_height, "face": face, "rack_status": rack_status},
+            "racks_checked": len(site_racks.racks),
+            "candidate_count": len(candidates),
+            "candidates": candidates[:max_results],
+            "truncated": len(candidates) > max_results
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to find rack space in site {site}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
 # ========================================
 # HIGH-LEVEL DEVICE PROVISIONING TOOLS
 # ========================================
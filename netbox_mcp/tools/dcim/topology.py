@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+DCIM Topology Tools
+
+Read-only tools answered from the client's cable topology graph: multi-hop
+path traces through patch panels, connected components per site and the
+blast radius of a device failure.
+"""
+
+from typing import Dict, Optional, Any, List
+import logging
+from ...registry import mcp_tool
+from ...client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on names listed per component or dependent group
+MAX_LISTED_DEVICES = 50
+
+
+def _device_owner(client: NetBoxClient, device_name: str, site: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Look up a device by name (optionally within a site slug)."""
+    filters = {"name": device_name}
+    if site:
+        filters["site"] = site
+    devices = client.dcim.devices.filter(**filters)
+    return devices[0] if devices else None
+
+
+def _owner_names(graph, owners: List[str], names: Optional[Dict[str, str]] = None) -> List[str]:
+    """Display names of owners: from the graph, else from names, else the owner key."""
+    names = names or {}
+    return sorted(graph.owner_names.get(owner) or names.get(owner, owner)
+                  for owner in owners)[:MAX_LISTED_DEVICES]
+
+
+@mcp_tool(category="dcim")
+def netbox_trace_cable_path(
+    client: NetBoxClient,
+    device_name: str,
+    port_name: str,
+    site: Optional[str] = None,
+    max_hops: int = 64
+) -> Dict[str, Any]:
+    """
+    Trace the full cable path from a device port to its far end.
+
+    Follows cables hop by hop through patch panels (front port to rear port
+    and back out at the same position) in a single call.
+
+    Args:
+        client: NetBoxClient instance (injected)
+        device_name: Device the trace starts on
+        port_name: Interface, console, power, front or rear port name
+        site: Optional site slug to disambiguate the device
+        max_hops: Maximum number of cable hops to follow
+
+    Returns:
+        Ordered path segments, the far end and the trace status
+        (complete, not_connected, incomplete, split, loop or max_hops)
+
+    Example:
+        netbox_trace_cable_path(device_name="sw-01", port_name="Ethernet1/1")
+    """
+    try:
+        device = _device_owner(client, device_name, site)
+        if not device:
+            return {
+                "success": False,
+                "error": f"Device '{device_name}' not found",
+                "error_type": "NotFoundError"
+            }
+
+        graph = client.cable_graph.get()
+        start = graph.find_node(f"device:{device['id']}", port_name)
+        if start is None:
+            return {
+                "success": True,
+                "device": device_name,
+                "port": port_name,
+                "status": "not_connected",
+                "segments": [],
+                "far_end": []
+            }
+
+        trace = graph.trace(start, max_hops=max_hops)
+        return {
+            "success": True,
+            "device": device_name,
+            "port": port_name,
+            "hop_count": len(trace["segments"]),
+            **trace
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to trace cable path for {device_name}:{port_name}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+@mcp_tool(category="dcim", cost="expensive")
+def netbox_get_site_topology(
+    client: NetBoxClient,
+    site: str,
+    max_components: int = 20
+) -> Dict[str, Any]:
+    """
+    Get the cable-connected components of the devices in a site.
+
+    Devices are in the same component when any chain of cables inside the
+    site (including through patch panels) joins them. Useful for spotting
+    islands and uncabled devices.
+
+    Args:
+        client: NetBoxClient instance (injected)
+        site: Site name or slug
+        max_components: Maximum number of components listed, largest first
+
+    Returns:
+        Component count, uncabled devices and the largest components
+
+    Example:
+        netbox_get_site_topology(site="amsterdam-dc")
+    """
+    try:
+        sites = client.dcim.sites.filter(slug=site) or client.dcim.sites.filter(name=site)
+        if not sites:
+            return {
+                "success": False,
+                "error": f"Site '{site}' not found",
+                "error_type": "NotFoundError"
+            }
+
+        devices = client.dcim.devices.filter(site_id=sites[0]["id"])
+        graph = client.cable_graph.get()
+
+        # Uncabled devices are not in the shared graph; name them locally
+        names = {f"device:{device['id']}": device.get("name") or str(device["id"]) for device in devices}
+        owners = list(names)
+
+        components = graph.components(owners)
+        connected = [c for c in components if len(c) > 1]
+        isolated = [c[0] for c in components if len(c) == 1]
+
+        return {
+            "success": True,
+            "site": sites[0].get("name", site),
+            "device_count": len(devices),
+            "component_count": len(connected),
+            "uncabled_device_count": len(isolated),
+            "uncabled_devices": _owner_names(graph, isolated, names),
+            "components": [
+                {"size": len(component), "devices": _owner_names(graph, component, names)}
+                for component in connected[:max_components]
+            ],
+            "truncated": len(connected) > max_components
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to get topology for site {site}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+@mcp_tool(category="dcim")
+def netbox_get_device_blast_radius(
+    client: NetBoxClient,
+    device_name: str,
+    site: Optional[str] = None,
+    upstream_device: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Find what loses connectivity if a device fails.
+
+    Removes the device from its cable-connected component and reports the
+    devices cut off from the rest. The surviving side is the part holding
+    upstream_device if given, otherwise the largest remaining part.
+
+    Args:
+        client: NetBoxClient instance (injected)
+        device_name: Device assumed to fail (e.g. an access switch)
+        site: Optional site slug to disambiguate the devices
+        upstream_device: Optional device that must stay reachable (e.g. a core router)
+
+    Returns:
+        Directly connected devices and the devices that depend on the failed one
+
+    Example:
+        netbox_get_device_blast_radius(device_name="access-sw-12", upstream_device="core-01")
+    """
+    try:
+        device = _device_owner(client, device_name, site)
+        if not device:
+            return {
+                "success": False,
+                "error": f"Device '{device_name}' not found",
+                "error_type": "NotFoundError"
+            }
+
+        upstream_owner = None
+        if upstream_device:
+            upstream = _device_owner(client, upstream_device, site)
+            if not upstream:
+                return {
+                    "success": False,
+                    "error": f"Device '{upstream_device}' not found",
+                    "error_type": "NotFoundError"
+                }
+            upstream_owner = f"device:{upstream['id']}"
+
+        graph = client.cable_graph.get()
+        owner = f"device:{device['id']}"
+        component = graph.component_of(owner)
+        remaining = graph.components(component, exclude=[owner])
+
+        surviving = remaining[0] if remaining else []
+        if upstream_owner:
+            surviving = next((c for c in remaining if upstream_owner in c), [])
+        dependents = [o for c in remaining if c is not surviving for o in c]
+
+        return {
+            "success": True,
+            "device": device_name,
+            "direct_neighbors": _owner_names(graph, list(graph.owner_neighbors(owner))),
+            "component_size": len(component),
+            "surviving_size": len(surviving),
+            "dependent_count": len(dependents),
+            "dependents": _owner_names(graph, dependents),
+            "upstream_reachable": upstream_owner in surviving if upstream_owner else None
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to compute blast radius for {device_name}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
@@ -1,4 +1,9 @@
 from .journal_entries import (
     netbox_create_journal_entry,
     netbox_list_all_journal_entries,
-)
\ No newline at end of file
+)
+
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "journal_entries",
+)
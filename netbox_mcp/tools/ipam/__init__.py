@@ -5,5 +5,15 @@ This module contains enterprise-grade tools for managing NetBox IPAM objects inc
 IP addresses, prefixes, VLANs, and high-level automation workflows.
 """
 
-# Import all IPAM tools to make them discoverable by the registry
-from . import prefixes, vlans, vrfs, ip_addresses, mac_addresses, addresses, aggregates, rirs, enterprise
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "prefixes",
+    "vlans",
+    "vrfs",
+    "ip_addresses",
+    "mac_addresses",
+    "addresses",
+    "aggregates",
+    "rirs",
+    "enterprise",
+)
@@ -9,10 +9,39 @@ and automated network provisioning with cross-domain integration.
 from typing import Dict, Optional, Any
 import logging
 from ...registry import mcp_tool
-from ...client import NetBoxClient
+from ...client import NetBoxClient, STREAM_PAGE_SIZE
+from ...ipam_index import parse_address
+from ...records import related_id
 
 logger = logging.getLogger(__name__)
 
+# IDs per request when fetching full records of duplicate IPs
+DUPLICATE_FETCH_CHUNK_SIZE = 100
+
+# Fields requested during the duplicate scan; servers without field selection
+# return whole records, of which only these fields are read all the same
+DUPLICATE_SCAN_FIELDS = "id,address,vrf,assigned_object_type,assigned_object_id"
+
+
+def _vrf_id(prefix_obj: Dict[str, Any]) -> Optional[int]:
+    """VRF ID of a serialized prefix, or None for the global table."""
+    vrf = prefix_obj.get("vrf")
+    if isinstance(vrf, dict):
+        return vrf.get("id")
+    return vrf
+
+
+def _utilization_status(percent: float) -> str:
+    """Capacity planning band for a utilization percentage."""
+    if percent >= 90:
+        return "critical"
+    if percent >= 75:
+        return "warning"
+    if percent >= 50:
+        return "moderate"
+    return "healthy"
+
+
 @mcp_tool(category="ipam")
 def netbox_get_ip_usage(
     client: NetBoxClient,
@@ -46,23 +75,13 @@ def netbox_get_ip_usage(
         
         prefix_obj = prefixes[0]
         
-        # Calculate usage
-        prefix_size = prefix_obj.get("_depth", 0)  # Number of host bits
-        total_hosts = 2 ** (32 - int(prefix.split('/')[1])) - 2  # Exclude network and broadcast
-        
-        # Get used IPs in this prefix
-        used_ips = client.ipam.ip_addresses.filter(parent=prefix)
-        used_count = len(used_ips)
-        available_count = total_hosts - used_count
-        usage_percent = (used_count / total_hosts * 100) if total_hosts > 0 else 0
+        # Count addresses from the VRF's radix index (IPv4 and IPv6)
+        usage = client.get_ipam_index(_vrf_id(prefix_obj)).utilization(prefix_obj["prefix"])
         
         return {
             "success": True,
             "prefix": prefix,
-            "total_addresses": total_hosts,
-            "used_addresses": used_count,
-            "available_addresses": available_count,
-            "usage_percentage": round(usage_percent, 2),
+            **usage,
             "prefix_details": prefix_obj
         }
         
@@ -544,43 +563,28 @@ def netbox_get_prefix_utilization(
         if include_child_prefixes:
             logger.debug("Analyzing child prefixes")
             try:
-                # Find child prefixes (longer prefix lengths within this prefix)
-                child_filters = {"within": prefix}
+                # Child prefixes and their address counts come from the VRF's
+                # radix index instead of one IP query per child
+                index = client.get_ipam_index(_vrf_id(prefix_obj))
+                tenant_prefix_ids = None
                 if tenant:
-                    child_filters["tenant"] = tenant
-                if vrf:
-                    child_filters["vrf"] = vrf
+                    tenant_prefix_ids = {p["id"] for p in client.ipam.prefixes.filter(within=prefix, tenant=tenant)}
                 
-                child_prefixes_raw = client.ipam.prefixes.filter(**child_filters)
-                
-                for child in child_prefixes_raw:
-                    if child["id"] != prefix_id:  # Exclude the parent prefix itself
-                        child_prefix = child["prefix"]
-                        try:
-                            child_network = ipaddress.ip_network(child_prefix, strict=False)
-                            child_total = child_network.num_addresses
-                            if child_network.version == 4 and child_network.prefixlen < 31:
-                                child_total -= 2
-                            
-                            # Get IPs in child prefix
-                            child_ips = client.ipam.ip_addresses.filter(parent=child_prefix)
-                            child_allocated = len(child_ips)
-                            child_utilization = (child_allocated / child_total * 100) if child_total > 0 else 0
-                            
-                            child_prefixes.append({
-                                "prefix": child_prefix,
-                                "total_addresses": child_total,
-                                "allocated_addresses": child_allocated,
-                                "utilization_percent": round(child_utilization, 2),
-                                "status": child.get("status", {}),
-                                "description": child.get("description", "")
-                            })
-                            
-                            child_prefix_usage += child_total
-                            
-                        except ValueError:
-                            logger.warning(f"Invalid child prefix format: {child_prefix}")
-                            continue
+                for child in index.child_prefixes(prefix_obj["prefix"]):
+                    record = child["record"]
+                    if tenant_prefix_ids is not None and record.get("id") not in tenant_prefix_ids:
+                        continue
+                    
+                    child_prefixes.append({
+                        "prefix": child["prefix"],
+                        "total_addresses": child["total_addresses"],
+                        "allocated_addresses": child["used_addresses"],
+                        "utilization_percent": child["usage_percentage"],
+                        "status": record.get("status", {}),
+                        "description": record.get("description", "")
+                    })
+                    
+                    child_prefix_usage += child["total_addresses"]
                 
                 # Sort child prefixes by utilization (highest first)
                 child_prefixes.sort(key=lambda x: x["utilization_percent"], reverse=True)
@@ -590,13 +594,7 @@ def netbox_get_prefix_utilization(
         
         # Step 7: Calculate capacity planning insights
         # Determine if this is a critically utilized prefix
-        utilization_status = "healthy"
-        if utilization_percent >= 90:
-            utilization_status = "critical"
-        elif utilization_percent >= 75:
-            utilization_status = "warning"
-        elif utilization_percent >= 50:
-            utilization_status = "moderate"
+        utilization_status = _utilization_status(utilization_percent)
         
         # Calculate growth projections
         growth_projections = []
@@ -692,6 +690,210 @@ def netbox_get_prefix_utilization(
         }
 
 
+@mcp_tool(category="ipam")
+def netbox_find_free_ip_space(
+    client: NetBoxClient,
+    prefix: str,
+    vrf_id: Optional[int] = None,
+    consecutive_count: int = 0
+) -> Dict[str, Any]:
+    """
+    Find unallocated space inside a prefix.
+    
+    Reports the CIDR blocks not covered by any child prefix and, if
+    requested, the first run of consecutive unallocated host addresses.
+    Works for IPv4 and IPv6 and is answered from the VRF's IPAM index.
+    
+    Args:
+        client: NetBoxClient instance (injected)
+        prefix: Network prefix to search (e.g., "10.0.0.0/16")
+        vrf_id: Optional VRF ID; defaults to the VRF of the first matching prefix
+        consecutive_count: Number of consecutive free host addresses to find (0 to skip)
+        
+    Returns:
+        Free child-prefix blocks and optionally the next available addresses
+        
+    Example:
+        netbox_find_free_ip_space("10.0.0.0/16", consecutive_count=4)
+    """
+    try:
+        if consecutive_count < 0:
+            return {
+                "success": False,
+                "error": "consecutive_count must be zero or positive",
+                "error_type": "ValidationError"
+            }
+        
+        filters = {"prefix": prefix}
+        if vrf_id is not None:
+            filters["vrf_id"] = vrf_id
+        prefixes = client.ipam.prefixes.filter(**filters)
+        
+        if not prefixes:
+            return {
+                "success": False,
+                "error": f"Prefix '{prefix}' not found",
+                "error_type": "PrefixNotFound"
+            }
+        
+        prefix_obj = prefixes[0]
+        index = client.get_ipam_index(_vrf_id(prefix_obj))
+        
+        result = {
+            "success": True,
+            "prefix": prefix_obj["prefix"],
+            "vrf_id": _vrf_id(prefix_obj),
+            **index.free_blocks(prefix_obj["prefix"]),
+            **index.utilization(prefix_obj["prefix"])
+        }
+        
+        if consecutive_count:
+            available = index.next_available(prefix_obj["prefix"], consecutive_count)
+            result["next_available"] = available or []
+            result["consecutive_run_found"] = available is not None
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"Failed to find free space in {prefix}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+@mcp_tool(category="ipam")
+def netbox_get_prefix_capacity_report(
+    client: NetBoxClient,
+    site: Optional[str] = None,
+    vrf: Optional[str] = None,
+    max_results: int = 100
+) -> Dict[str, Any]:
+    """
+    Get a utilization report for every prefix of a site or VRF.
+    
+    Prefixes and IP addresses are fetched once per VRF and every prefix in
+    the hierarchy is measured in a single pass, so a capacity review of
+    thousands of prefixes is one tool call instead of one per prefix.
+    
+    Args:
+        client: NetBoxClient instance (injected)
+        site: Optional site name or slug to scope the report
+        vrf: Optional VRF name or route distinguisher to scope the report
+        max_results: Maximum number of prefixes listed, most utilized first
+        
+    Returns:
+        Summary over all matching prefixes and the most utilized prefixes
+        with hierarchy depth, child coverage and utilization status
+        
+    Examples:
+        netbox_get_prefix_capacity_report(site="ams1")
+        netbox_get_prefix_capacity_report(vrf="customer-a", max_results=20)
+    """
+    try:
+        if not site and not vrf:
+            return {
+                "success": False,
+                "error": "site or vrf is required",
+                "error_type": "ValidationError"
+            }
+        if max_results < 1:
+            return {
+                "success": False,
+                "error": "max_results must be at least 1",
+                "error_type": "ValidationError"
+            }
+        
+        logger.info(f"Building prefix capacity report (site: {site}, vrf: {vrf})")
+        
+        # Step 1: Resolve the scope
+        filters = {}
+        if site:
+            sites = client.dcim.sites.filter(slug=site) or client.dcim.sites.filter(name=site)
+            if not sites:
+                return {
+                    "success": False,
+                    "error": f"Site '{site}' not found",
+                    "error_type": "NotFoundError"
+                }
+            filters["site_id"] = sites[0]["id"]
+        if vrf:
+            vrfs = client.ipam.vrfs.filter(name=vrf) or client.ipam.vrfs.filter(rd=vrf)
+            if not vrfs:
+                return {
+                    "success": False,
+                    "error": f"VRF '{vrf}' not found",
+                    "error_type": "NotFoundError"
+                }
+            filters["vrf_id"] = vrfs[0]["id"]
+        
+        # Step 2: Select the prefixes in scope and measure each VRF they belong to
+        scoped_ids = {p["id"]: _vrf_id(p) for p in client.ipam.prefixes.filter(**filters)}
+        
+        entries = []
+        for vrf_id in set(scoped_ids.values()):
+            index = client.get_ipam_index(vrf_id)
+            for entry in index.hierarchy_report():
+                if entry["record"].get("id") in scoped_ids:
+                    entries.append((vrf_id, entry))
+        
+        # Step 3: Summarize; top-level prefixes of the scope carry the address totals
+        status_counts = {"critical": 0, "warning": 0, "moderate": 0, "healthy": 0}
+        total_addresses = 0
+        allocated_addresses = 0
+        report = []
+        
+        for vrf_id, entry in entries:
+            record = entry["record"]
+            status = _utilization_status(entry["usage_percentage"])
+            status_counts[status] += 1
+            
+            parent = entry["parent"]
+            if parent is None or parent.get("id") not in scoped_ids:
+                total_addresses += entry["total_addresses"]
+                allocated_addresses += entry["used_addresses"]
+            
+            report.append({
+                "prefix": entry["prefix"],
+                "prefix_id": record.get("id"),
+                "vrf_id": vrf_id,
+                "depth": entry["depth"],
+                "status": record.get("status", {}),
+                "total_addresses": entry["total_addresses"],
+                "allocated_addresses": entry["used_addresses"],
+                "utilization_percent": entry["usage_percentage"],
+                "utilization_status": status,
+                "child_prefixes": entry["child_count"],
+                "child_coverage_percent": round(entry["child_addresses"] / entry["size"] * 100, 2)
+            })
+        
+        report.sort(key=lambda x: x["utilization_percent"], reverse=True)
+        
+        logger.info(f"✅ Prefix capacity report complete: {len(report)} prefixes")
+        return {
+            "success": True,
+            "scope": {"site": site, "vrf": vrf, "filters_applied": filters},
+            "summary": {
+                "prefix_count": len(report),
+                "total_addresses": total_addresses,
+                "allocated_addresses": allocated_addresses,
+                "utilization_percent": round(allocated_addresses / total_addresses * 100, 2) if total_addresses else 0,
+                "utilization_status_counts": status_counts
+            },
+            "prefixes": report[:max_results],
+            "truncated": len(report) > max_results
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to build prefix capacity report: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
 @mcp_tool(category="ipam")
 def netbox_provision_vlan_with_prefix(
     client: NetBoxClient,
@@ -1086,14 +1288,14 @@ def netbox_provision_vlan_with_prefix(
         }
 
 
-@mcp_tool(category="ipam")
+@mcp_tool(category="ipam", cost="expensive")
 def netbox_find_duplicate_ips(
     client: NetBoxClient,
     vrf: Optional[str] = None,
     tenant: Optional[str] = None,
     include_severity_analysis: bool = True,
     include_resolution_recommendations: bool = True,
-    limit: int = 1000
+    limit: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Find duplicate IP addresses in NetBox for network auditing and data quality assurance.
@@ -1109,7 +1311,7 @@ def netbox_find_duplicate_ips(
         tenant: Optional tenant name to filter IP addresses
         include_severity_analysis: Include conflict severity assessment
         include_resolution_recommendations: Include resolution recommendations
-        limit: Maximum number of IP addresses to analyze (default: 1000, max: 10000)
+        limit: Optional maximum number of IP addresses to analyze (default: all)
         
     Returns:
         Comprehensive duplicate IP report with conflict analysis and recommendations
@@ -1128,18 +1330,18 @@ def netbox_find_duplicate_ips(
             include_resolution_recommendations=True
         )
         
-        # Bulk analysis with custom limit
+        # Sample only the first 5000 addresses
         netbox_find_duplicate_ips(limit=5000)
     """
     try:
-        if limit > 10000:
+        if limit is not None and limit < 1:
             return {
                 "success": False,
-                "error": "Limit cannot exceed 10000 for performance reasons",
+                "error": "limit must be at least 1",
                 "error_type": "ValidationError"
             }
         
-        logger.info(f"Starting duplicate IP analysis (limit: {limit})")
+        logger.info(f"Starting duplicate IP analysis (limit: {limit or 'none'})")
         
         # Step 1: Build filters for IP address collection
         ip_filters = {}
@@ -1183,37 +1385,54 @@ def netbox_find_duplicate_ips(
             else:
                 logger.warning(f"Tenant '{tenant}' not found, proceeding without tenant filter")
         
-        # Step 2: Retrieve all IP addresses with filters
-        logger.debug(f"Retrieving IP addresses with filters: {ip_filters}")
+        # Step 2: Stream every IP address once, keeping only a compact host key
+        # (VRF, host integer tagged with the IP version) and the first ID seen
+        logger.debug(f"Streaming IP addresses with filters: {ip_filters}")
+        first_seen = {}
+        colliding = {}
+        total_analyzed = 0
+        ipv4_count = 0
+        ipv6_count = 0
+        assignment_stats = {
+            "interface_assignments": 0,
+            "device_assignments": 0,
+            "unassigned": 0,
+            "other_assignments": 0
+        }
+        
         try:
-            # Get IPs with pagination support
-            all_ips = []
-            offset = 0
-            batch_size = min(500, limit)  # Process in batches
-            
-            while len(all_ips) < limit:
-                remaining = limit - len(all_ips)
-                current_limit = min(batch_size, remaining)
-                
-                # Apply filters with pagination
-                current_filters = ip_filters.copy()
-                current_filters["limit"] = current_limit
-                current_filters["offset"] = offset
+            for ip_obj in client.stream("ipam.ip_addresses", fields=DUPLICATE_SCAN_FIELDS, **ip_filters):
+                if limit and total_analyzed >= limit:
+                    break
+                total_analyzed += 1
                 
-                batch_ips = client.ipam.ip_addresses.filter(**current_filters)
+                try:
+                    version, host = parse_address(ip_obj.address)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Invalid IP address format: {ip_obj.address} - {e}")
+                    continue
                 
-                if not batch_ips:
-                    break  # No more IPs available
-                
-                all_ips.extend(batch_ips)
-                offset += len(batch_ips)
+                if version == 4:
+                    ipv4_count += 1
+                else:
+                    ipv6_count += 1
                 
-                if len(batch_ips) < current_limit:
-                    break  # Last batch
+                obj_type = (getattr(ip_obj, "assigned_object_type", None) or "").lower()
+                if not obj_type:
+                    assignment_stats["unassigned"] += 1
+                elif "interface" in obj_type:
+                    assignment_stats["interface_assignments"] += 1
+                elif "device" in obj_type:
+                    assignment_stats["device_assignments"] += 1
+                else:
+                    assignment_stats["other_assignments"] += 1
                 
-                logger.debug(f"Retrieved {len(all_ips)} IPs so far...")
+                key = (related_id(getattr(ip_obj, "vrf", None)), host << 1 | (version == 6))
+                first_id = first_seen.setdefault(key, ip_obj.id)
+                if first_id != ip_obj.id:
+                    colliding.setdefault(key, [first_id]).append(ip_obj.id)
             
-            logger.info(f"Retrieved {len(all_ips)} IP addresses for analysis")
+            logger.info(f"Streamed {total_analyzed} IP addresses, {len(colliding)} colliding keys")
             
         except Exception as e:
             logger.error(f"Failed to retrieve IP addresses: {e}")
@@ -1223,7 +1442,9 @@ def netbox_find_duplicate_ips(
                 "error_type": "NetBoxAPIError"
             }
         
-        if not all_ips:
+        first_seen.clear()
+        
+        if not total_analyzed:
             return {
                 "success": True,
                 "duplicates_found": 0,
@@ -1237,85 +1458,49 @@ def netbox_find_duplicate_ips(
                 "message": "No IP addresses found matching the specified criteria"
             }
         
-        # Step 3: Client-side duplicate detection using Python
-        logger.debug("Performing client-side duplicate analysis...")
-        
+        # Step 3: Fetch full records only for the colliding addresses
         import ipaddress
         from collections import defaultdict
         
-        # Dictionary to track IP addresses (without prefix length)
-        ip_tracker = defaultdict(list)
-        ipv4_count = 0
-        ipv6_count = 0
-        assignment_stats = {
-            "interface_assignments": 0,
-            "device_assignments": 0,
-            "unassigned": 0,
-            "other_assignments": 0
-        }
-        
-        # Process each IP address
-        for ip_obj in all_ips:
-            ip_address_str = ip_obj.get("address", "")
-            if not ip_address_str:
-                continue
-            
-            try:
-                # Parse IP address to separate IP from prefix length
-                ip_interface = ipaddress.ip_interface(ip_address_str)
-                ip_only = str(ip_interface.ip)  # Just the IP without prefix length
-                
-                # Track IP version statistics
-                if ip_interface.version == 4:
-                    ipv4_count += 1
-                else:
-                    ipv6_count += 1
-                
-                # Track assignment statistics
-                assigned_obj = ip_obj.get("assigned_object")
-                if assigned_obj:
-                    if isinstance(assigned_obj, dict):
-                        obj_type = assigned_obj.get("object_type", "").lower()
-                        if "interface" in obj_type:
-                            assignment_stats["interface_assignments"] += 1
-                        elif "device" in obj_type:
-                            assignment_stats["device_assignments"] += 1
-                        else:
-                            assignment_stats["other_assignments"] += 1
-                    else:
-                        assignment_stats["other_assignments"] += 1
-                else:
-                    assignment_stats["unassigned"] += 1
-                
-                # Add to tracker with full context
-                ip_context = {
+        colliding_ids = [ip_id for ids in colliding.values() for ip_id in ids]
+        records_by_id = {}
+        for i in range(0, len(colliding_ids), DUPLICATE_FETCH_CHUNK_SIZE):
+            chunk = colliding_ids[i:i + DUPLICATE_FETCH_CHUNK_SIZE]
+            for ip_obj in client.ipam.ip_addresses.filter(id=chunk, no_cache=True):
+                records_by_id[ip_obj["id"]] = ip_obj
+        
+        ip_tracker = {}
+        for key, ids in colliding.items():
+            occurrences = []
+            for ip_id in ids:
+                ip_obj = records_by_id.get(ip_id)
+                if ip_obj is None:
+                    continue  # Deleted since the scan
+                ip_interface = ipaddress.ip_interface(ip_obj["address"])
+                occurrences.append({
                     "id": ip_obj.get("id"),
-                    "full_address": ip_address_str,
-                    "ip_only": ip_only,
+                    "full_address": ip_obj["address"],
+                    "ip_only": str(ip_interface.ip),
                     "prefix_length": ip_interface.network.prefixlen,
                     "status": ip_obj.get("status", {}),
-                    "assigned_object": assigned_obj,
+                    "assigned_object": ip_obj.get("assigned_object"),
                     "description": ip_obj.get("description", ""),
                     "created": ip_obj.get("created", ""),
                     "last_updated": ip_obj.get("last_updated", ""),
                     "tenant": ip_obj.get("tenant", {}),
                     "vrf": ip_obj.get("vrf", {}),
                     "url": ip_obj.get("url", "")
-                }
-                
-                ip_tracker[ip_only].append(ip_context)
-                
-            except ValueError as e:
-                logger.warning(f"Invalid IP address format: {ip_address_str} - {e}")
-                continue
+                })
+            ip_tracker[key] = occurrences
         
         # Step 4: Identify duplicates (IPs that appear more than once)
         duplicates = []
         duplicate_ips_count = 0
         
-        for ip_only, occurrences in ip_tracker.items():
+        for (vrf_id, _), occurrences in ip_tracker.items():
             if len(occurrences) > 1:
                 duplicate_ips_count += 1
+                ip_only = occurrences[0]["ip_only"]
                 
                 # Step 5: Severity analysis if requested
                 severity_info = {}
@@ -1394,6 +1579,7 @@ def netbox_find_duplicate_ips(
                 
                 duplicate_entry = {
                     "ip_address": ip_only,
+                    "vrf_id": vrf_id,
                     "occurrence_count": len(occurrences),
                     "occurrences": occurrences,
                     "severity_analysis": severity_info,
@@ -1417,7 +1603,7 @@ def netbox_find_duplicate_ips(
             "success": True,
             "duplicates_found": duplicate_ips_count,
             "total_ip_conflicts": total_conflicts,
-            "total_ips_analyzed": len(all_ips),
+            "total_ips_analyzed": total_analyzed,
             "duplicates": duplicates,
             "analysis_scope": {
                 "vrf_filter": vrf,
@@ -1429,13 +1615,13 @@ def netbox_find_duplicate_ips(
                 "ipv4_addresses": ipv4_count,
                 "ipv6_addresses": ipv6_count,
                 "assignment_breakdown": assignment_stats,
-                "duplicate_rate": round((duplicate_ips_count / len(all_ips) * 100), 2) if all_ips else 0
+                "duplicate_rate": round((duplicate_ips_count / total_analyzed * 100), 2)
             },
             "analysis_metadata": {
                 "analysis_timestamp": client._get_current_timestamp() if hasattr(client, '_get_current_timestamp') else "unknown",
                 "include_severity_analysis": include_severity_analysis,
                 "include_resolution_recommendations": include_resolution_recommendations,
-                "batch_processing": len(all_ips) > 500
+                "batch_processing": total_analyzed > STREAM_PAGE_SIZE
             }
         }
         
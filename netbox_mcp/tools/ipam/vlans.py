@@ -5,10 +5,11 @@ IPAM VLAN Management Tools
 High-level tools for managing NetBox VLANs and VLAN assignments.
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 import logging
 from ...registry import mcp_tool
 from ...client import NetBoxClient
+from ...vlan_bitmap import find_contiguous, free_mask, free_ranges
 
 logger = logging.getLogger(__name__)
 
@@ -98,29 +99,44 @@ def netbox_create_vlan(
         }
 
 
+def _resolve_site_id(client: NetBoxClient, site: str) -> Optional[int]:
+    """Site ID by slug or name, or None if not found."""
+    sites = client.dcim.sites.filter(slug=site) or client.dcim.sites.filter(name=site)
+    return sites[0]["id"] if sites else None
+
+
 @mcp_tool(category="ipam")
 def netbox_find_available_vlan_id(
     client: NetBoxClient,
     site: Optional[str] = None,
     group: Optional[str] = None,
     start_vid: int = 1,
-    end_vid: int = 4094
+    end_vid: int = 4094,
+    contiguous: int = 1,
+    intersect_sites: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Find available VLAN IDs in a range.
     
+    Free VIDs are returned as compact [start, end] intervals. Optionally
+    finds the first block of contiguous free VIDs, and VIDs free at several
+    sites at once for stretched VLANs.
+    
     Args:
         client: NetBoxClient instance (injected)
         site: Optional site name or slug to filter VLANs
-        group: Optional VLAN group name to filter VLANs
+        group: Optional VLAN group name or slug to filter VLANs
         start_vid: Starting VLAN ID (default: 1)
         end_vid: Ending VLAN ID (default: 4094)
+        contiguous: Number of consecutive free VIDs to find (default: 1)
+        intersect_sites: Additional sites where the VIDs must also be free
         
     Returns:
-        Available VLAN IDs or error details
+        Available VLAN ID ranges or error details
         
-    Example:
+    Examples:
         netbox_find_available_vlan_id(site="main-dc", start_vid=100, end_vid=200)
+        netbox_find_available_vlan_id(site="ams1", intersect_sites=["fra1"], contiguous=4)
     """
     try:
         if not (1 <= start_vid <= 4094) or not (1 <= end_vid <= 4094):
@@ -137,31 +153,57 @@ def netbox_find_available_vlan_id(
                 "error_type": "ValidationError"
             }
         
+        if contiguous < 1:
+            return {
+                "success": False,
+                "error": "contiguous must be at least 1",
+                "error_type": "ValidationError"
+            }
+        
         logger.info(f"Finding available VLAN IDs between {start_vid} and {end_vid}")
         
-        # Build filter
-        vlan_filter = {}
-        if site:
-            vlan_filter["site"] = site
+        # Resolve the scopes to IDs; each scope has its own bitmap
+        group_id = None
         if group:
-            vlan_filter["group"] = group
+            groups = client.ipam.vlan_groups.filter(slug=group) or client.ipam.vlan_groups.filter(name=group)
+            if not groups:
+                return {
+                    "success": False,
+                    "error": f"VLAN group '{group}' not found",
+                    "error_type": "NotFoundError"
+                }
+            group_id = groups[0]["id"]
+        
+        site_ids = []
+        for site_name in ([site] if site else []) + list(intersect_sites or []):
+            site_id = _resolve_site_id(client, site_name)
+            if site_id is None:
+                return {
+                    "success": False,
+                    "error": f"Site '{site_name}' not found",
+                    "error_type": "NotFoundError"
+                }
+            site_ids.append(site_id)
         
-        # Get existing VLANs
-        existing_vlans = client.ipam.vlans.filter(**vlan_filter)
-        used_vids = {vlan["vid"] for vlan in existing_vlans}
+        # A VID is free only if it is free in every scope
+        used = 0
+        for site_id in site_ids or [None]:
+            used |= client.vlan_allocator.get(site_id=site_id, group_id=group_id).used
         
-        # Find available VIDs
-        available_vids = []
-        for vid in range(start_vid, end_vid + 1):
-            if vid not in used_vids:
-                available_vids.append(vid)
+        mask = free_mask(used, start_vid, end_vid)
+        ranges = free_ranges(mask)
+        block_start = find_contiguous(mask, contiguous)
         
         return {
             "success": True,
-            "available_vids": available_vids,
-            "count": len(available_vids),
+            "available_ranges": [[first, last] for first, last in ranges],
+            "count": sum(last - first + 1 for first, last in ranges),
+            "first_available": ranges[0][0] if ranges else None,
+            "contiguous_block": (
+                list(range(block_start, block_start + contiguous)) if block_start is not None else None
+            ),
             "range": {"start": start_vid, "end": end_vid},
-            "filter": vlan_filter
+            "filter": {"site": site, "group": group, "intersect_sites": intersect_sites or []}
         }
         
     except Exception as e:
@@ -5,5 +5,9 @@ This module contains enterprise-grade tools for system monitoring, health checks
 and NetBox MCP server management functionality.
 """
 
-# Import all system tools to make them discoverable by the registry
-from . import health
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "health",
+    "name_search",
+    "results",
+)
@@ -15,7 +15,7 @@ from ...client import NetBoxClient
 logger = logging.getLogger(__name__)
 
 
-@mcp_tool(category="system")
+@mcp_tool(category="system", cost="cheap")
 def netbox_health_check(client: NetBoxClient) -> Dict[str, Any]:
     """
     Get NetBox system health status and connection information.
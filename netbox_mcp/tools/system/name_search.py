@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Object Name Search Tools
+
+Fuzzy name lookup answered from the client's trigram name indexes, for
+resolving misspelled or partial object names in one step.
+"""
+
+from typing import Dict, Any
+import logging
+from ...registry import mcp_tool
+from ...client import NetBoxClient
+from ...name_index import DEFAULT_MIN_SIMILARITY
+
+logger = logging.getLogger(__name__)
+
+# Object types accepted by netbox_suggest_object_names
+OBJECT_TYPE_ENDPOINTS = {
+    "site": "dcim.sites",
+    "device": "dcim.devices",
+    "device_type": "dcim.device_types",
+    "manufacturer": "dcim.manufacturers",
+    "rack": "dcim.racks",
+    "tenant": "tenancy.tenants",
+    "vlan": "ipam.vlans",
+}
+
+
+@mcp_tool(category="system", cost="cheap")
+def netbox_suggest_object_names(
+    client: NetBoxClient,
+    object_type: str,
+    query: str,
+    limit: int = 5,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY
+) -> Dict[str, Any]:
+    """
+    Find objects whose name or slug resembles a query.
+
+    Use this when an exact name lookup failed instead of retrying with
+    guessed spellings: candidates are ranked by trigram similarity, so
+    typos, missing separators and partial names still match.
+
+    Args:
+        client: NetBoxClient instance (injected)
+        object_type: One of site, device, device_type, manufacturer, rack, tenant, vlan
+        query: Name, slug or fragment to match
+        limit: Maximum number of candidates
+        min_similarity: Minimum similarity between 0 and 1
+
+    Returns:
+        Ranked candidates with id, name/slug and similarity score
+
+    Example:
+        netbox_suggest_object_names(object_type="site", query="amstrdam")
+    """
+    endpoint = OBJECT_TYPE_ENDPOINTS.get(object_type)
+    if endpoint is None:
+        return {
+            "success": False,
+            "error": f"Invalid object_type '{object_type}'. Valid options: {', '.join(OBJECT_TYPE_ENDPOINTS)}",
+            "error_type": "ValidationError"
+        }
+    if not 0 <= min_similarity <= 1:
+        return {
+            "success": False,
+            "error": "min_similarity must be between 0 and 1",
+            "error_type": "ValidationError"
+        }
+
+    try:
+        candidates = client.name_index.suggest(endpoint, query, limit=limit, min_similarity=min_similarity)
+        return {
+            "success": True,
+            "object_type": object_type,
+            "query": query,
+            "candidates": candidates,
+            "count": len(candidates)
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to suggest {object_type} names for '{query}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
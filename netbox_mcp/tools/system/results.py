@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Result Paging Tools
+
+Continuation of tool results that exceeded the response budget, served
+from the truncated result kept in memory rather than queried again.
+"""
+
+from typing import Dict, Any
+import logging
+from ...registry import mcp_tool
+from ...client import NetBoxClient
+from ...response_shaping import get_response_shaper
+
+logger = logging.getLogger(__name__)
+
+
+@mcp_tool(category="system", cost="cheap")
+def netbox_fetch_more(
+    client: NetBoxClient,
+    cursor: str
+) -> Dict[str, Any]:
+    """
+    Fetch the next page of a tool result that was truncated.
+
+    Results larger than the response budget end with a "continuation"
+    block holding a cursor. Pass it here to receive the next items of the
+    truncated lists, keyed by their path in the original result (e.g.
+    "devices" or "resources.devices"). Keep calling with the returned cursor
+    until continuation.truncated is false. Fetching the same cursor again
+    returns the same page.
+
+    Args:
+        client: NetBoxClient instance (injected)
+        cursor: Cursor from a previous result's continuation block
+
+    Returns:
+        Page number, items per list path, and the continuation for the next page
+
+    Example:
+        netbox_fetch_more(cursor="3f9c2a7be1d04c55-1")
+    """
+    try:
+        return {"success": True, **get_response_shaper().fetch(cursor)}
+
+    except KeyError:
+        return {
+            "success": False,
+            "error": f"Cursor '{cursor}' is unknown or has expired; run the original tool again",
+            "error_type": "NotFound"
+        }
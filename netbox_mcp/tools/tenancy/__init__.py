@@ -5,5 +5,10 @@ This module contains enterprise-grade tools for managing NetBox tenancy objects
 tenants, tenant groups, contacts, and multi-tenant resource assignments.
 """
 
-# Import all tenancy tools to make them discoverable by the registry
-from . import tenants, tenant_groups, contacts, resources
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "tenants",
+    "tenant_groups",
+    "contacts",
+    "resources",
+)
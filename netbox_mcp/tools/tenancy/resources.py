@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Any
 import logging
 from ...registry import mcp_tool
 from ...client import NetBoxClient
+from ...tenant_index import fetch_tenant_resources
 
 logger = logging.getLogger(__name__)
 
@@ -383,7 +384,7 @@ def netbox_assign_resources_to_tenant(
         }
 
 
-@mcp_tool(category="tenancy")
+@mcp_tool(category="tenancy", cost="expensive")
 def netbox_get_tenant_resource_report(
     client: NetBoxClient,
     tenant_name: str,
@@ -517,73 +518,50 @@ def netbox_get_tenant_resource_report(
             else:
                 logger.warning(f"Site filter '{filter_by_site}' not found, proceeding without site filtering")
         
-        # Step 4: Collect resources from all endpoints
+        # Step 4: Look up the tenant's objects in the rollup index, falling
+        # back to filtered queries per resource type if it cannot be built
+        try:
+            rollup = client.tenant_rollup.get()
+            resource_ids = {
+                resource_type: rollup.ids(resource_type, tenant_id, site_filter, filter_by_status)
+                for resource_type in resource_endpoints
+            }
+        except Exception as e:
+            logger.warning(f"Tenant rollup unavailable, querying each resource type: {e}")
+            resource_ids = None
+        
+        if resource_ids is not None and export_format == "summary":
+            # Counts come straight from the index
+            resource_counts = {k: len(v) for k, v in resource_ids.items() if v}
+            return {
+                "success": True,
+                "tenant": {
+                    "id": tenant_id,
+                    "name": tenant_obj["name"],
+                    "slug": tenant_obj.get("slug", ""),
+                    "description": tenant_obj.get("description", ""),
+                    "url": tenant_obj.get("url", ""),
+                    "display_url": tenant_obj.get("display_url", "")
+                },
+                "summary": {
+                    "total_resources": sum(resource_counts.values()),
+                    "resource_types_found": len(resource_counts),
+                    "resource_breakdown": {k: len(v) for k, v in resource_ids.items()},
+                    "report_timestamp": client.get_server_time() if hasattr(client, 'get_server_time') else None,
+                    "export_format": export_format
+                },
+                "resource_counts": resource_counts
+            }
+        
+        # Step 5: Fetch the records of all resource types concurrently
         logger.info("Collecting tenant resources from all NetBox endpoints...")
+        fetched = fetch_tenant_resources(client, tenant_id, resource_ids, site_filter, filter_by_status)
         resource_collections = {}
         total_resources = 0
         
         for resource_type, config in resource_endpoints.items():
             try:
-                logger.debug(f"Collecting {resource_type} for tenant {tenant_id}")
-                
-                # Get the client endpoint
-                client_path = config["client_path"]
-                endpoint = client
-                for path_part in client_path.split('.'):
-                    endpoint = getattr(endpoint, path_part)
-                
-                # Build filter parameters
-                filter_params = {"tenant": tenant_id}
-                
-                # Add site filter if specified and supported
-                if site_filter and resource_type in ["devices", "racks", "prefixes", "vlans", "clusters"]:
-                    filter_params["site"] = site_filter
-                
-                # Add status filter if specified
-                if filter_by_status:
-                    filter_params["status"] = filter_by_status
-                
-                # Collect resources
-                logger.debug(f"Filtering {resource_type} with params: {filter_params}")
-                
-                # Some endpoints may not support tenant filtering - handle gracefully
-                try:
-                    resources = endpoint.filter(**filter_params)
-                except Exception as filter_error:
-                    # If tenant filtering fails, try without tenant filter and post-filter
-                    logger.warning(f"Direct tenant filtering failed for {resource_type}, attempting manual filtering: {filter_error}")
-                    try:
-                        # Get all resources and filter manually
-                        all_resources = endpoint.filter()
-                        resources = []
-                        
-                        for resource in all_resources:
-                            tenant_field = resource.get("tenant")
-                            tenant_matches = False
-                            
-                            if tenant_field is None:
-                                # No tenant assigned
-                                continue
-                            elif isinstance(tenant_field, dict):
-                                # Tenant as object with ID
-                                tenant_matches = tenant_field.get("id") == tenant_id
-                            elif isinstance(tenant_field, int):
-                                # Tenant as direct ID
-                                tenant_matches = tenant_field == tenant_id
-                            elif isinstance(tenant_field, str):
-                                # Sometimes tenant might be a string ID
-                                try:
-                                    tenant_matches = int(tenant_field) == tenant_id
-                                except (ValueError, TypeError):
-                                    continue
-                            
-                            if tenant_matches:
-                                resources.append(resource)
-                        
-                        logger.debug(f"Manual filtering resulted in {len(resources)} {resource_type}")
-                    except Exception as manual_error:
-                        logger.error(f"Manual filtering also failed for {resource_type}: {manual_error}")
-                        resources = []
+                resources = fetched.get(resource_type, [])
                 
                 # Process resources based on detail level
                 if include_details:
@@ -632,7 +610,7 @@ def netbox_get_tenant_resource_report(
                 resource_collections[resource_type] = []
                 logger.warning(f"⚠️ Skipping {resource_type} collection due to error")
         
-        # Step 5: Calculate utilization statistics
+        # Step 6: Calculate utilization statistics
         utilization_stats = {}
         if include_utilization:
             logger.debug("Calculating resource utilization statistics...")
@@ -734,7 +712,7 @@ def netbox_get_tenant_resource_report(
                 logger.error(f"Failed to calculate utilization statistics: {e}")
                 utilization_stats = {"error": "Failed to calculate statistics"}
         
-        # Step 6: Build comprehensive report
+        # Step 7: Build comprehensive report
         report_timestamp = client.get_server_time() if hasattr(client, 'get_server_time') else None
         
         result = {
@@ -769,7 +747,7 @@ def netbox_get_tenant_resource_report(
         if include_utilization and utilization_stats:
             result["utilization_statistics"] = utilization_stats
         
-        # Step 7: Format output based on export format
+        # Step 8: Format output based on export format
         if export_format == "summary":
             # Return summary-only view
             result = {
@@ -5,10 +5,12 @@ This module contains enterprise-grade tools for managing NetBox virtualization o
 virtual machines, clusters, cluster types, and virtualization platforms.
 """
 
-# Import all virtualization tools to make them discoverable by the registry
-from . import clusters
-from . import cluster_groups
-from . import cluster_types
-from . import virtual_machines
-from . import vm_interfaces
-from . import virtual_disks
\ No newline at end of file
+# Tool modules of this domain, imported by load_all_tools() or on first use
+TOOL_MODULES = (
+    "clusters",
+    "cluster_groups",
+    "cluster_types",
+    "virtual_machines",
+    "vm_interfaces",
+    "virtual_disks",
+)
@@ -9,7 +9,8 @@ cluster lifecycle management, resource allocation, and performance monitoring.
 from typing import Dict, Optional, Any, List
 import logging
 from ...registry import mcp_tool
-from ...client import NetBoxClient
+from ...client import Lookup, NetBoxClient
+from ...exceptions import NetBoxNotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -76,54 +77,32 @@ def netbox_create_cluster(
     if not cluster_type or not cluster_type.strip():
         raise ValueError("cluster_type cannot be empty")
     
-    # STEP 3: LOOKUP CLUSTER TYPE
+    # STEP 3: RESOLVE CLUSTER TYPE, SITE AND CLUSTER GROUP (concurrently)
     try:
-        cluster_types = client.virtualization.cluster_types.filter(name=cluster_type)
-        if not cluster_types:
-            raise ValueError(f"Cluster type '{cluster_type}' not found")
-        
-        cluster_type_obj = cluster_types[0]
-        cluster_type_id = cluster_type_obj.get('id') if isinstance(cluster_type_obj, dict) else cluster_type_obj.id
-        cluster_type_display = cluster_type_obj.get('display', cluster_type) if isinstance(cluster_type_obj, dict) else getattr(cluster_type_obj, 'display', cluster_type)
-        
-    except ValueError:
-        raise
+        refs = client.resolve_all({
+            "cluster_type": Lookup("virtualization.cluster_types", cluster_type, fields=("name",)),
+            "site": Lookup("dcim.sites", site, fields=("name",)),
+            "cluster_group": Lookup("virtualization.cluster_groups", cluster_group, fields=("name",)),
+        })
+    except NetBoxNotFoundError as e:
+        raise ValueError(e.message)
     except Exception as e:
-        raise ValueError(f"Could not find cluster type '{cluster_type}': {e}")
+        raise ValueError(f"Could not resolve cluster references: {e}")
+    
+    cluster_type_obj = refs["cluster_type"]
+    cluster_type_id = cluster_type_obj.get('id') if isinstance(cluster_type_obj, dict) else cluster_type_obj.id
     
-    # STEP 4: LOOKUP SITE (if provided)
     site_id = None
-    if site:
-        try:
-            sites = client.dcim.sites.filter(name=site)
-            if not sites:
-                raise ValueError(f"Site '{site}' not found")
-            
-            site_obj = sites[0]
-            site_id = site_obj.get('id') if isinstance(site_obj, dict) else site_obj.id
-            
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Could not find site '{site}': {e}")
+    if refs["site"]:
+        site_obj = refs["site"]
+        site_id = site_obj.get('id') if isinstance(site_obj, dict) else site_obj.id
     
-    # STEP 5: LOOKUP CLUSTER GROUP (if provided)
     cluster_group_id = None
-    if cluster_group:
-        try:
-            cluster_groups = client.virtualization.cluster_groups.filter(name=cluster_group)
-            if not cluster_groups:
-                raise ValueError(f"Cluster group '{cluster_group}' not found")
-            
-            cluster_group_obj = cluster_groups[0]
-            cluster_group_id = cluster_group_obj.get('id') if isinstance(cluster_group_obj, dict) else cluster_group_obj.id
-            
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Could not find cluster group '{cluster_group}': {e}")
+    if refs["cluster_group"]:
+        cluster_group_obj = refs["cluster_group"]
+        cluster_group_id = cluster_group_obj.get('id') if isinstance(cluster_group_obj, dict) else cluster_group_obj.id
     
-    # STEP 6: CONFLICT DETECTION
+    # STEP 4: CONFLICT DETECTION
     try:
         existing_clusters = client.virtualization.clusters.filter(
             name=name,
@@ -140,7 +119,7 @@ def netbox_create_cluster(
     except Exception as e:
         logger.warning(f"Could not check for existing clusters: {e}")
     
-    # STEP 7: CREATE CLUSTER
+    # STEP 5: CREATE CLUSTER
     create_payload = {
         "name": name,
         "type": cluster_type_id,
@@ -170,7 +149,7 @@ def netbox_create_cluster(
     except Exception as e:
         raise ValueError(f"NetBox API error during cluster creation: {e}")
     
-    # STEP 8: RETURN SUCCESS
+    # STEP 6: RETURN SUCCESS
     return {
         "success": True,
         "message": f"Cluster '{name}' successfully created.",
@@ -9,7 +9,8 @@ VM lifecycle management, resource allocation, and provisioning automation.
 from typing import Dict, Optional, Any, List
 import logging
 from ...registry import mcp_tool
-from ...client import NetBoxClient
+from ...client import Lookup, NetBoxClient
+from ...exceptions import NetBoxNotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -88,70 +89,38 @@ def netbox_create_virtual_machine(
     if not cluster or not cluster.strip():
         raise ValueError("cluster cannot be empty")
     
-    # STEP 3: LOOKUP CLUSTER
+    # STEP 3: RESOLVE CLUSTER, ROLE, TENANT AND PLATFORM (concurrently)
     try:
-        clusters = client.virtualization.clusters.filter(name=cluster)
-        if not clusters:
-            raise ValueError(f"Cluster '{cluster}' not found")
-        
-        cluster_obj = clusters[0]
-        cluster_id = cluster_obj.get('id') if isinstance(cluster_obj, dict) else cluster_obj.id
-        cluster_display = cluster_obj.get('display', cluster) if isinstance(cluster_obj, dict) else getattr(cluster_obj, 'display', cluster)
-        
-    except ValueError:
-        raise
+        refs = client.resolve_all({
+            "cluster": Lookup("virtualization.clusters", cluster, fields=("name",)),
+            "role": Lookup("dcim.device_roles", role, fields=("name",)),
+            "tenant": Lookup("tenancy.tenants", tenant, fields=("name",)),
+            "platform": Lookup("dcim.platforms", platform, fields=("name",)),
+        })
+    except NetBoxNotFoundError as e:
+        raise ValueError(e.message)
     except Exception as e:
-        raise ValueError(f"Could not find cluster '{cluster}': {e}")
+        raise ValueError(f"Could not resolve virtual machine references: {e}")
+    
+    cluster_obj = refs["cluster"]
+    cluster_id = cluster_obj.get('id') if isinstance(cluster_obj, dict) else cluster_obj.id
     
-    # STEP 4: LOOKUP ROLE (if provided)
     role_id = None
-    if role:
-        try:
-            roles = client.dcim.device_roles.filter(name=role)
-            if not roles:
-                raise ValueError(f"Role '{role}' not found")
-            
-            role_obj = roles[0]
-            role_id = role_obj.get('id') if isinstance(role_obj, dict) else role_obj.id
-            
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Could not find role '{role}': {e}")
+    if refs["role"]:
+        role_obj = refs["role"]
+        role_id = role_obj.get('id') if isinstance(role_obj, dict) else role_obj.id
     
-    # STEP 5: LOOKUP TENANT (if provided)
     tenant_id = None
-    if tenant:
-        try:
-            tenants = client.tenancy.tenants.filter(name=tenant)
-            if not tenants:
-                raise ValueError(f"Tenant '{tenant}' not found")
-            
-            tenant_obj = tenants[0]
-            tenant_id = tenant_obj.get('id') if isinstance(tenant_obj, dict) else tenant_obj.id
-            
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Could not find tenant '{tenant}': {e}")
+    if refs["tenant"]:
+        tenant_obj = refs["tenant"]
+        tenant_id = tenant_obj.get('id') if isinstance(tenant_obj, dict) else tenant_obj.id
     
-    # STEP 6: LOOKUP PLATFORM (if provided)
     platform_id = None
-    if platform:
-        try:
-            platforms = client.dcim.platforms.filter(name=platform)
-            if not platforms:
-                raise ValueError(f"Platform '{platform}' not found")
-            
-            platform_obj = platforms[0]
-            platform_id = platform_obj.get('id') if isinstance(platform_obj, dict) else platform_obj.id
-            
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Could not find platform '{platform}': {e}")
+    if refs["platform"]:
+        platform_obj = refs["platform"]
+        platform_id = platform_obj.get('id') if isinstance(platform_obj, dict) else platform_obj.id
     
-    # STEP 7: CONFLICT DETECTION
+    # STEP 4: CONFLICT DETECTION
     try:
         existing_vms = client.virtualization.virtual_machines.filter(
             name=name,
@@ -168,7 +137,7 @@ def netbox_create_virtual_machine(
     except Exception as e:
         logger.warning(f"Could not check for existing virtual machines: {e}")
     
-    # STEP 8: CREATE VIRTUAL MACHINE
+    # STEP 5: CREATE VIRTUAL MACHINE
     create_payload = {
         "name": name,
         "cluster": cluster_id,
@@ -213,7 +182,7 @@ def netbox_create_virtual_machine(
     except Exception as e:
         raise ValueError(f"NetBox API error during virtual machine creation: {e}")
     
-    # STEP 9: RETURN SUCCESS
+    # STEP 6: RETURN SUCCESS
     return {
         "success": True,
         "message": f"Virtual machine '{name}' successfully created.",
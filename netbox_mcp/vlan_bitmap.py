@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+VLAN ID Bitmap Allocator for NetBox MCP Server
+
+Keeps one 4096-bit occupancy bitmap per VLAN scope (site and/or VLAN group)
+so free-VID queries are answered with integer bit operations instead of
+scanning and listing every VID in a range.
+
+**Operations:**
+- Marking a VID used or free: constant time
+- Free ranges: one step per free run, returned as compact intervals
+- N contiguous free VIDs: O(log N) shift-and-mask passes over the bitmap
+- Cross-scope intersection: OR of the used bitmaps
+
+Bitmaps are built lazily per scope, expire after the VLAN cache TTL and are
+updated in place when VLANs are written through the client.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from .records import related_id
+
+if TYPE_CHECKING:
+    from .client import NetBoxClient
+
+logger = logging.getLogger(__name__)
+
+MIN_VID = 1
+MAX_VID = 4094
+
+# Scope key: (site_id, group_id); None matches any
+Scope = Tuple[Optional[int], Optional[int]]
+
+
+def _range_mask(start: int, end: int) -> int:
+    """Bit mask with bits start..end (inclusive) set."""
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+class VLANBitmap:
+    """
+    Occupancy bitmap of VLAN IDs in one scope.
+
+    Bit n is set when at least one VLAN in the scope uses VID n. Reference
+    counts per VID and the VID of each VLAN ID are kept so updates and
+    deletions can clear bits without refetching the scope.
+    """
+
+    def __init__(self, vlans: Iterable[Tuple[int, int]] = ()):
+        self.used = 0
+        self._vid_by_id: Dict[int, int] = {}
+        self._refs: Counter = Counter()
+        self.built_at = time.time()
+        for vlan_id, vid in vlans:
+            self.add(vlan_id, vid)
+
+    def add(self, vlan_id: int, vid: int) -> None:
+        """Mark a VLAN's VID as used."""
+        self.remove(vlan_id)
+        self._vid_by_id[vlan_id] = vid
+        self._refs[vid] += 1
+        self.used |= 1 << vid
+
+    def remove(self, vlan_id: int) -> None:
+        """Forget a VLAN, freeing its VID if no other VLAN in the scope uses it."""
+        vid = self._vid_by_id.pop(vlan_id, None)
+        if vid is None:
+            return
+        self._refs[vid] -= 1
+        if self._refs[vid] <= 0:
+            del self._refs[vid]
+            self.used &= ~(1 << vid)
+
+    def __contains__(self, vid: int) -> bool:
+        return bool(self.used >> vid & 1)
+
+
+def free_mask(used: int, start: int = MIN_VID, end: int = MAX_VID) -> int:
+    """Bit mask of the free VIDs in [start, end]."""
+    return ~used & _range_mask(start, end)
+
+
+def free_ranges(mask: int) -> List[Tuple[int, int]]:
+    """Decompose a free-VID mask into inclusive (start, end) runs."""
+    ranges = []
+    while mask:
+        low = (mask & -mask).bit_length() - 1
+        shifted = mask >> low
+        run = ((shifted + 1) & ~shifted).bit_length() - 1
+        ranges.append((low, low + run - 1))
+        mask &= ~(((1 << run) - 1) << low)
+    return ranges
+
+
+def contiguous_starts(mask: int, count: int) -> int:
+    """
+    Mask of the bits that start a run of count set bits in mask.
+
+    Bit n survives only if bits n..n+count-1 are all set, using O(log count)
+    shift-and-mask passes. Also used for rack unit searches.
+    """
+    runs = mask
+    covered = 1
+    while covered < count and runs:
+        step = min(covered, count - covered)
+        runs &= runs >> step
+        covered += step
+    return runs
+
+
+def find_contiguous(mask: int, count: int) -> Optional[int]:
+    """First VID starting a run of count free VIDs in a free mask."""
+    if count < 1:
+        return None
+    runs = contiguous_starts(mask, count)
+    if not runs:
+        return None
+    return (runs & -runs).bit_length() - 1
+
+
+class VLANAllocator:
+    """Per-scope VLAN bitmaps for a NetBoxClient."""
+
+    def __init__(self, client: "NetBoxClient"):
+        self.client = client
+        self._bitmaps: Dict[Scope, VLANBitmap] = {}
+        self._lock = threading.Lock()
+
+    def get(self, site_id: Optional[int] = None, group_id: Optional[int] = None) -> VLANBitmap:
+        """
+        Return the bitmap of a scope, building it from NetBox if needed.
+
+        Args:
+            site_id: Site ID, or None for any site
+            group_id: VLAN group ID, or None for any group
+        """
+        scope = (site_id, group_id)
+        max_age = self.client.config.cache.ttl.vlans
+        with self._lock:
+            bitmap = self._bitmaps.get(scope)
+            if bitmap is not None and time.time() - bitmap.built_at < max_age:
+                return bitmap
+
+        filters = {}
+        if site_id is not None:
+            filters["site_id"] = site_id
+        if group_id is not None:
+            filters["group_id"] = group_id
+        vlans = self.client.ipam.vlans.filter(**filters) if filters else self.client.ipam.vlans.all()
+
+        bitmap = VLANBitmap((vlan["id"], vlan["vid"]) for vlan in vlans)
+        with self._lock:
+            self._bitmaps[scope] = bitmap
+        logger.debug(f"Built VLAN bitmap for scope {scope}: {len(vlans)} VLANs")
+        return bitmap
+
+    def apply_write(self, record: Optional[Dict[str, Any]] = None, deleted_ids: Iterable[int] = ()) -> None:
+        """
+        Apply a created, updated or deleted VLAN to every loaded bitmap.
+
+        Args:
+            record: Serialized VLAN after create or update
+            deleted_ids: IDs of deleted VLANs
+        """
+        with self._lock:
+            for (site_id, group_id), bitmap in self._bitmaps.items():
+                for vlan_id in deleted_ids:
+                    bitmap.remove(vlan_id)
+                if record is None:
+                    continue
+                bitmap.remove(record["id"])
+                if ((site_id is None or related_id(record.get("site")) == site_id)
+                        and (group_id is None or related_id(record.get("group")) == group_id)):
+                    bitmap.add(record["id"], record["vid"])
+
+    def clear(self) -> None:
+        """Drop all bitmaps; they are rebuilt on next use."""
+        with self._lock:
+            self._bitmaps.clear()
@@ -22,6 +22,7 @@ except ImportError:
 
 from .config import load_config
 from .tasks import initialize_task_manager
+from .tool_manifest import use_manifest
 
 # Configure logging
 logging.basicConfig(
@@ -79,6 +80,10 @@ def run_worker():
             logger.error(f"Failed to load configuration: {e}")
             sys.exit(1)
         
+        # Tools resolved by jobs are described by the shared tool manifest
+        # rather than introspected in every worker process
+        use_manifest()
+        
         # Initialize task manager
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         task_manager = initialize_task_manager(redis_url)
@@ -0,0 +1,86 @@
+"""
+Tests for the API documentation artifacts.
+
+This module tests that the OpenAPI and Postman documents are rendered once
+per registry version, served compressed, and revalidated with ETags.
+"""
+
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from netbox_mcp.api_artifacts import Artifact, ArtifactStore
+from netbox_mcp.server import api_app
+
+
+@pytest.fixture
+def store():
+    """A fresh artifact store, installed as the global one."""
+    store = ArtifactStore()
+    with patch("netbox_mcp.server.get_artifact_store", return_value=store):
+        yield store
+
+
+class TestArtifact:
+    """Test encoding negotiation and ETags."""
+
+    def test_negotiation(self):
+        """The best accepted encoding wins; q=0 excludes an encoding."""
+        artifact = Artifact.render("application/json", b'{"a": 1}' * 100)
+        assert artifact.negotiate("gzip, deflate") == "gzip"
+        assert artifact.negotiate("gzip;q=0, deflate") == "identity"
+        assert artifact.negotiate(None) == "identity"
+        assert gzip.decompress(artifact.bodies["gzip"]) == artifact.bodies["identity"]
+
+    def test_etags_are_strong_and_per_encoding(self):
+        """Each encoding has its own strong ETag, derived from the content."""
+        artifact = Artifact.render("application/json", b"{}")
+        again = Artifact.render("application/json", b"{}")
+        assert artifact.etags == again.etags
+        assert artifact.etags["gzip"] != artifact.etags["identity"]
+        assert not artifact.etags["identity"].startswith("W/")
+        assert artifact.matches(f'"other", {artifact.etags["gzip"]}')
+        assert not artifact.matches('"other"')
+
+
+class TestArtifactEndpoints:
+    """Test the documentation endpoints."""
+
+    def test_rendered_once_per_registry_version(self, store):
+        """Polling serves the stored bytes; a registry change renders again."""
+        client = TestClient(api_app)
+        for _ in range(3):
+            response = client.get("/api/v1/openapi.json")
+            assert response.status_code == 200
+        assert store.renders == 1
+        assert "paths" in response.json()
+
+        with patch("netbox_mcp.api_artifacts.get_registry_version", return_value="changed"):
+            client.get("/api/v1/openapi.json")
+        assert store.renders == 2
+
+    def test_not_modified(self, store):
+        """A current ETag gets 304 without a body."""
+        client = TestClient(api_app)
+        first = client.get("/api/v1/postman", headers={"Accept-Encoding": "gzip"})
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert first.headers["Vary"] == "Accept-Encoding"
+        assert json.loads(first.content)["info"]["name"] == "NetBox MCP Server API"
+
+        second = client.get("/api/v1/postman", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]
+        })
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_yaml(self, store):
+        """The YAML spec is served uncompressed to clients that do not ask otherwise."""
+        response = TestClient(api_app).get("/api/v1/openapi.yaml", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-yaml")
+        assert "Content-Encoding" not in response.headers
+        assert response.text.startswith("openapi:")
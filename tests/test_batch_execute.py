@@ -0,0 +1,113 @@
+"""
+Tests for the batch execution endpoint.
+
+This module tests POST /api/v1/execute/batch: ordered and streamed
+results, the fan-out limit, per-call errors and sharing identical calls.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.dependencies import get_netbox_client
+from netbox_mcp.registry import TOOL_REGISTRY
+from netbox_mcp.server import api_app
+
+
+class FakeClient:
+    """Stands in for the shared NetBoxClient."""
+
+    def __init__(self):
+        self.config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+
+
+def lookup_tool(client, host: str, delay: float = 0.0):
+    lookup_tool.calls.append(host)
+    with lookup_tool.lock:
+        lookup_tool.running += 1
+        lookup_tool.peak = max(lookup_tool.peak, lookup_tool.running)
+    time.sleep(delay)
+    with lookup_tool.lock:
+        lookup_tool.running -= 1
+    if host == "bad":
+        raise RuntimeError("lookup failed")
+    return {"success": True, "host": host}
+
+
+@pytest.fixture
+def api():
+    """API client with a fake NetBox client and a test tool registered."""
+    lookup_tool.calls, lookup_tool.running, lookup_tool.peak = [], 0, 0
+    lookup_tool.lock = threading.Lock()
+    entry = {"name": "test_lookup", "function": lookup_tool, "category": "dcim",
+             "execution": {"cost": "cheap", "max_concurrency": None, "timeout": None}}
+    api_app.dependency_overrides[get_netbox_client] = FakeClient
+    with patch.dict(TOOL_REGISTRY, {"test_lookup": entry}):
+        yield TestClient(api_app)
+    api_app.dependency_overrides.clear()
+
+
+def call(host, **parameters):
+    return {"tool_name": "test_lookup", "parameters": {"host": host, **parameters}}
+
+
+class TestBatchExecute:
+    """Test the batch endpoint."""
+
+    def test_results_in_request_order_with_errors(self, api):
+        """Results keep request order; failures and unknown tools do not affect other calls."""
+        response = api.post("/api/v1/execute/batch", json={"calls": [
+            call("sw1", delay=0.05), call("bad"), {"tool_name": "missing"}, call("sw2"),
+        ]})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+        assert body["results"][0]["result"]["host"] == "sw1"
+        assert body["results"][1]["error_type"] == "RuntimeError"
+        assert body["results"][2]["error_type"] == "NotFound"
+        assert (body["succeeded"], body["failed"], body["success"]) == (2, 2, False)
+
+    def test_fan_out_limit_and_shared_calls(self, api):
+        """At most max_concurrency calls run at once; identical reads run once."""
+        calls = [call(f"sw{i}", delay=0.05) for i in range(6)] + [call("sw0", delay=0.05)]
+        response = api.post("/api/v1/execute/batch", json={"calls": calls, "max_concurrency": 2})
+
+        results = response.json()["results"]
+        assert lookup_tool.peak == 2
+        assert sorted(lookup_tool.calls) == [f"sw{i}" for i in range(6)]
+        assert results[6] == {**results[0], "index": 6}
+
+    def test_streamed_ndjson(self, api):
+        """Streamed results arrive in completion order, one JSON object per line."""
+        response = api.post("/api/v1/execute/batch", json={
+            "calls": [call("slow", delay=0.2), call("fast")], "stream": True,
+        })
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [line["index"] for line in lines] == [1, 0]
+
+    def test_batch_limits(self, api):
+        """Empty and oversized batches are refused."""
+        assert api.post("/api/v1/execute/batch", json={"calls": []}).status_code == 400
+        too_many = [call(f"sw{i}") for i in range(501)]
+        assert api.post("/api/v1/execute/batch", json={"calls": too_many}).status_code == 413
+
+    def test_limited_tool_is_not_overloaded_by_its_batch(self, api):
+        """Calls of a limited tool wait for its slots within the batch instead of being rejected."""
+        limited = {"name": "test_limited_lookup", "function": lookup_tool, "category": "dcim",
+                   "execution": {"cost": "expensive", "max_concurrency": 2, "timeout": None}}
+        calls = [{"tool_name": "test_limited_lookup", "parameters": {"host": f"sw{i}", "delay": 0.05}}
+                 for i in range(16)]
+
+        with patch.dict(TOOL_REGISTRY, {"test_limited_lookup": limited}):
+            body = api.post("/api/v1/execute/batch", json={"calls": calls}).json()
+
+        assert body["succeeded"] == 16
+        assert lookup_tool.peak == 2
@@ -12,6 +12,7 @@ from typing import Dict, Any, List
 from netbox_mcp.tools.dcim.cables import netbox_bulk_create_cable_connections
 from netbox_mcp.client import NetBoxClient
 from netbox_mcp.exceptions import NetBoxValidationError, NetBoxNotFoundError
+from netbox_mcp.progress import ProgressReporter, progress_scope
 
 
 class TestBulkCableCreation:
@@ -660,5 +661,113 @@ class TestBulkCableValidation:
         assert result["error_type"] == "ValidationError"
 
 
+class TestBulkCableEngine:
+    """Test batched resolution, list POST creation and bulk rollback."""
+
+    def setup_method(self):
+        """Setup a client serving two servers and one switch."""
+        self.client = Mock()
+        self.client.dcim.devices.filter.return_value = [
+            {"id": 1, "name": "server-01"},
+            {"id": 2, "name": "server-02"},
+            {"id": 3, "name": "switch1.k3"},
+        ]
+        self.client.dcim.interfaces.filter.return_value = [
+            {"id": 101, "name": "lom1", "device": 1, "cable": None},
+            {"id": 102, "name": "lom1", "device": 2, "cable": None},
+            {"id": 301, "name": "Te1/1/1", "device": 3, "cable": None},
+            {"id": 302, "name": "Te1/1/2", "device": 3, "cable": {"id": 900}},
+            {"id": 303, "name": "Te1/1/3", "device": 3, "cable": None},
+        ]
+        self.client.dcim.cables.bulk_create.side_effect = lambda objects, confirm: [
+            {"id": 500 + i, **payload} for i, payload in enumerate(objects)
+        ]
+
+    def connection(self, server, port):
+        return {"device_a_name": server, "interface_a_name": "lom1",
+                "device_b_name": "switch1.k3", "interface_b_name": port}
+
+    def test_resolution_is_batched(self):
+        """Devices and interfaces are fetched once, cables in one list POST."""
+        result = netbox_bulk_create_cable_connections(
+            client=self.client,
+            cable_connections=[self.connection("server-01", "Te1/1/1"),
+                               self.connection("server-02", "Te1/1/3")],
+            confirm=True
+        )
+
+        assert result["success"] is True
+        assert [c["cable_id"] for c in result["successful_connections"]] == [500, 501]
+        self.client.dcim.devices.filter.assert_called_once_with(name=["server-01", "server-02", "switch1.k3"])
+        self.client.dcim.interfaces.filter.assert_called_once_with(device_id=[1, 2, 3], no_cache=True)
+        payloads = self.client.dcim.cables.bulk_create.call_args[0][0]
+        assert payloads[1]["a_terminations"] == [{"object_type": "dcim.interface", "object_id": 102}]
+        assert payloads[1]["b_terminations"] == [{"object_type": "dcim.interface", "object_id": 303}]
+
+    def test_conflicts_detected_from_fetched_cables(self):
+        """Cabled and doubly-used interfaces fail without creating anything."""
+        result = netbox_bulk_create_cable_connections(
+            client=self.client,
+            cable_connections=[self.connection("server-01", "Te1/1/2"),
+                               self.connection("server-02", "Te1/1/1"),
+                               self.connection("server-01", "Te1/1/3")],
+            confirm=True
+        )
+
+        errors = [c["error"] for c in result["failed_connections"]]
+        assert errors == ["Interface B 'switch1.k3:Te1/1/2' already has a cable connection"]
+        assert result["success"] is False
+        self.client.dcim.cables.bulk_create.assert_not_called()
+
+    def test_failed_chunk_rolls_back_created_cables(self):
+        """A failing chunk triggers one bulk delete of everything created."""
+        self.client.dcim.cables.bulk_create.side_effect = [
+            [{"id": 500}],
+            Exception("HTTP 400"),
+        ]
+
+        result = netbox_bulk_create_cable_connections(
+            client=self.client,
+            cable_connections=[self.connection("server-01", "Te1/1/1"),
+                               self.connection("server-02", "Te1/1/3")],
+            batch_size=1,
+            confirm=True
+        )
+
+        self.client.dcim.cables.bulk_delete.assert_called_once_with([500], confirm=True)
+        assert result["successful_connections"] == []
+        assert [a["cable_id"] for a in result["rollback_actions"]] == [500]
+
+    def test_partial_success_without_rollback(self):
+        """Without rollback, valid connections are created and failures reported."""
+        result = netbox_bulk_create_cable_connections(
+            client=self.client,
+            cable_connections=[self.connection("server-01", "Te1/1/1"),
+                               self.connection("server-09", "Te1/1/3")],
+            rollback_on_error=False,
+            confirm=True
+        )
+
+        assert result["success"] is True
+        assert len(result["successful_connections"]) == 1
+        assert result["failed_connections"][0]["error"] == "Device A 'server-09' not found"
+
+    def test_progress_reported_per_chunk(self):
+        """Each created chunk advances progress and reports its cable IDs."""
+        reporter = Mock(spec=ProgressReporter)
+
+        with progress_scope(reporter):
+            netbox_bulk_create_cable_connections(
+                client=self.client,
+                cable_connections=[self.connection("server-01", "Te1/1/1"),
+                                   self.connection("server-02", "Te1/1/3")],
+                batch_size=1,
+                confirm=True
+            )
+
+        assert [c.args[:2] for c in reporter.advance.call_args_list] == [(0, 2), (1, 2), (2, 2)]
+        assert [c.args[0]["cable_ids"] for c in reporter.partial.call_args_list] == [[500], [500]]
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
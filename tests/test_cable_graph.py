@@ -0,0 +1,170 @@
+"""
+Tests for the cable topology graph.
+
+This module tests path traces through patch panels, the write overlay,
+connected components and the blast radius tool.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from netbox_mcp.cable_graph import CableGraph, termination_key
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.tools.dcim.topology import (
+    netbox_get_device_blast_radius,
+    netbox_get_site_topology,
+    netbox_trace_cable_path,
+)
+
+
+DEVICES = {1: "sw1", 2: "srv1", 3: "pp-a", 4: "pp-b", 5: "srv2", 6: "core"}
+
+
+def port(kind, port_id, name, device_id):
+    return {"id": port_id, "url": f"https://netbox.example.com/api/dcim/{kind}/{port_id}/", "name": name,
+            "device": {"id": device_id, "name": DEVICES[device_id]}}
+
+
+def cable(cable_id, a, b):
+    return SimpleNamespace(id=cable_id, a_terminations=[a], b_terminations=[b])
+
+
+SW1_ETH1 = port("interfaces", 1, "Eth1", 1)
+FRONT_A = port("front-ports", 31, "FP1", 3)
+REAR_A = port("rear-ports", 41, "RP1", 3)
+REAR_B = port("rear-ports", 42, "RP1", 4)
+FRONT_B = port("front-ports", 32, "FP1", 4)
+
+CABLES = [
+    cable(10, SW1_ETH1, FRONT_A),
+    cable(11, REAR_A, REAR_B),
+    cable(12, FRONT_B, port("interfaces", 2, "eth0", 2)),
+    cable(13, port("interfaces", 3, "Eth2", 1), port("interfaces", 5, "eth0", 5)),
+    cable(14, port("interfaces", 6, "Gi0/1", 6), port("interfaces", 4, "Eth3", 1)),
+]
+
+FRONT_PORTS = [
+    {**FRONT_A, "rear_port": {"id": 41, "url": REAR_A["url"], "name": "RP1"}, "rear_port_position": 1},
+    {**FRONT_B, "rear_port": {"id": 42, "url": REAR_B["url"], "name": "RP1"}, "rear_port_position": 1},
+]
+
+
+def make_graph():
+    return CableGraph.build(CABLES, FRONT_PORTS)
+
+
+class TestCableGraph:
+    """Test the CSR graph and traces."""
+
+    def test_termination_key(self):
+        """Endpoint names in URLs map to replica-style labels."""
+        assert termination_key(FRONT_A) == ("dcim.front_ports", 31)
+        assert termination_key({"url": None}) is None
+
+    def test_trace_through_patch_panels(self):
+        """A trace follows front/rear pass-throughs to the far interface."""
+        graph = make_graph()
+        trace = graph.trace(graph.find_node("device:1", "Eth1"))
+
+        assert trace["status"] == "complete"
+        assert [s["cable"] for s in trace["segments"]] == [10, 11, 12]
+        assert trace["segments"][0]["pass_through"]["id"] == 41
+        assert trace["far_end"] == [{"type": "dcim.interfaces", "id": 2, "name": "eth0", "owner": "srv1"}]
+
+    def test_overlay_and_removal(self):
+        """Deleted cables are masked and new cables are traced from the overlay."""
+        graph = make_graph()
+        start = graph.find_node("device:1", "Eth1")
+
+        graph.remove_cable(12)
+        assert graph.trace(start)["status"] == "incomplete"
+
+        graph.add_cable(cable(15, FRONT_B, port("interfaces", 7, "eth1", 2)))
+        trace = graph.trace(start)
+        assert trace["status"] == "complete"
+        assert trace["far_end"][0]["name"] == "eth1"
+        assert graph.get_stats()["cables"] == 5
+
+    def test_components(self):
+        """Removing the switch splits the patch path, srv2 and the core apart."""
+        graph = make_graph()
+        component = graph.component_of("device:1")
+
+        assert len(component) == 6
+        assert graph.components(component, exclude=["device:1"]) == [
+            ["device:2", "device:4", "device:3"], ["device:5"], ["device:6"]
+        ]
+
+
+class TestTopologyTools:
+    """Test the tools through the client's graph index."""
+
+    def make_client(self):
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        client.cable_graph._graph = make_graph()
+        return client
+
+    def devices(self, endpoint, **kwargs):
+        return [SimpleNamespace(serialize=lambda i=i: {"id": i, "name": n})
+                for i, n in DEVICES.items() if n == kwargs.get("name")]
+
+    def test_blast_radius(self):
+        """Everything not on the upstream side of the failed device depends on it."""
+        client = self.make_client()
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", autospec=True, side_effect=self.devices):
+            result = netbox_get_device_blast_radius(client, device_name="sw1", upstream_device="core")
+            largest = netbox_get_device_blast_radius(client, device_name="sw1")
+
+        assert result["success"] is True
+        assert result["direct_neighbors"] == ["core", "pp-a", "srv2"]
+        assert result["dependents"] == ["pp-a", "pp-b", "srv1", "srv2"]
+        assert result["upstream_reachable"] is True
+        assert largest["dependents"] == ["core", "srv2"]
+
+    def test_trace_tool(self):
+        """Unknown ports are reported as not connected."""
+        client = self.make_client()
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", autospec=True, side_effect=self.devices):
+            result = netbox_trace_cable_path(client, device_name="sw1", port_name="Eth1")
+            unknown = netbox_trace_cable_path(client, device_name="sw1", port_name="Eth9")
+            missing = netbox_trace_cable_path(client, device_name="nope", port_name="Eth1")
+
+        assert result["hop_count"] == 3
+        assert unknown["status"] == "not_connected"
+        assert missing["error_type"] == "NotFoundError"
+
+    def test_site_topology_leaves_shared_graph_untouched(self):
+        """Uncabled devices are named in the response without writing to the cached graph."""
+        client = self.make_client()
+        graph = client.cable_graph._graph
+        names_before = dict(graph.owner_names)
+        site_devices = [*DEVICES.items(), (7, "spare")]
+
+        def api_filter(endpoint, **kwargs):
+            if endpoint.name == "sites":
+                return [SimpleNamespace(serialize=lambda: {"id": 1, "name": "ams", "slug": "ams"})]
+            return [SimpleNamespace(serialize=lambda i=i, n=n: {"id": i, "name": n}) for i, n in site_devices]
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", autospec=True, side_effect=api_filter):
+            result = netbox_get_site_topology(client, site="ams")
+
+        assert result["success"] is True
+        assert result["uncabled_devices"] == ["spare"]
+        assert graph.owner_names == names_before
+
+    def test_cable_writes_update_loaded_graph(self):
+        """Deletes are masked at once; creates are fetched on next use."""
+        client = self.make_client()
+        client.cable_graph.apply_cable_write(deleted_ids=[12])
+        client.cable_graph.apply_cable_write(record={"id": 16})
+
+        new_cable = cable(16, FRONT_B, port("interfaces", 8, "eth2", 2))
+        with patch("pynetbox.core.endpoint.Endpoint.filter", return_value=[new_cable]) as api_filter:
+            graph = client.cable_graph.get()
+            graph = client.cable_graph.get()
+
+        api_filter.assert_called_once_with(id=[16])
+        assert graph.trace(graph.find_node("device:1", "Eth1"))["far_end"][0]["name"] == "eth2"
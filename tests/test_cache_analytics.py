@@ -0,0 +1,150 @@
+"""
+Tests for per-object-type cache analytics and TTL auto-tuning.
+
+This module tests the counters kept by CacheManager per object type and
+key shape, and the auto-tuner that adjusts TTLs from change frequency.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import CacheManager, _cache_key_shape, _estimate_size
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.monitoring import MetricsCollector, MetricsDashboard, PerformanceMonitor
+
+
+def make_cache(**cache_overrides) -> CacheManager:
+    """Build a CacheManager with cache config overrides."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+    for key, value in cache_overrides.items():
+        setattr(config.cache, key, value)
+    return CacheManager(config)
+
+
+class TestCacheAnalytics:
+    """Test per-type and per-key-shape counters."""
+
+    @pytest.mark.parametrize("cache_key,shape", [
+        ("dcim.devices", "dcim.devices"),
+        ("dcim.devices:name=sw-01:site=ams", "dcim.devices:name=*:site=*"),
+        ("dcim.devices:get:id=5", "dcim.devices:get:id=*"),
+        ("ipam.prefixes:prefix=2001:db8::/32:vrf_id=3", "ipam.prefixes:prefix=*:vrf_id=*"),
+    ])
+    def test_key_shape(self, cache_key, shape):
+        """Parameter values are stripped from cache keys."""
+        assert _cache_key_shape(cache_key) == shape
+
+    def test_hits_misses_and_latency_per_type(self):
+        """Lookups, bytes and fetch latency are tracked per object type."""
+        cache = make_cache()
+        cache.get("dcim.devices:name=sw-01", "dcim.devices")
+        cache.set("dcim.devices:name=sw-01", [{"id": 1}], "dcim.devices", fetch_seconds=0.25)
+        cache.get("dcim.devices:name=sw-01", "dcim.devices")
+        cache.get("dcim.devices:name=sw-02", "dcim.devices")
+
+        analytics = cache.get_cache_analytics()
+        devices = analytics["object_types"]["dcim.devices"]
+        assert devices["hits"] == 1
+        assert devices["misses"] == 2
+        assert devices["entries"] == 1
+        assert devices["bytes"] == len('[{"id": 1}]')
+        assert devices["mean_fetch_ms"] == 250.0
+        assert analytics["key_shapes"]["dcim.devices:name=*"]["hits"] == 1
+
+    def test_large_values_are_sized_from_a_sample(self):
+        """Long lists are estimated close to their serialized size."""
+        devices = [{"id": i, "name": f"device-{i}", "site": {"id": i % 7, "slug": "ams"}} for i in range(5000)]
+        actual = len(json.dumps(devices))
+        assert abs(_estimate_size(devices) - actual) < actual * 0.05
+
+    def test_invalidation_counts_as_change(self):
+        """Type-level invalidations after writes are recorded as changes."""
+        cache = make_cache()
+        cache.invalidate_pattern("ipam.vlans")
+        cache.invalidate_for_object("ipam.vlans", 12)
+
+        assert cache.get_cache_analytics()["object_types"]["ipam.vlans"]["changes"] == 2
+
+    def test_capacity_evictions_are_counted(self):
+        """Evictions due to maxsize are counted, expirations are not."""
+        cache = make_cache(max_items=8)  # default cache holds max_items // 4 = 2 entries
+        for i in range(3):
+            cache.set(f"ipam.vlans:vid={i}", [{"vid": i}], "ipam.vlans")
+
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_cache_analytics()["object_types"]["ipam.vlans"]["evictions"] == 1
+
+
+class TestTTLAutoTuning:
+    """Test the TTL auto-tuner."""
+
+    def _warm(self, cache, object_type, lookups=20):
+        for _ in range(lookups):
+            cache.get(f"{object_type}:name=x", object_type)
+
+    def test_stable_type_ttl_is_lengthened(self):
+        """A type never invalidated over a full TTL gets a longer TTL."""
+        cache = make_cache(auto_tune_max_ttl=1000)
+        self._warm(cache, "dcim.platforms")
+
+        with patch("netbox_mcp.client.time.time", return_value=time.time() + 600):
+            adjustments = cache.auto_tune_ttls()
+
+        assert adjustments["dcim.platforms"] == {"old_ttl": 300, "new_ttl": 600}
+        assert cache.caches["dcim.platforms"].ttl == 600
+        assert cache.get_ttl_for_object_type("dcim.platforms") == 600
+
+    def test_churny_type_ttl_is_shortened_within_bounds(self):
+        """A type changing faster than its TTL gets a shorter, bounded TTL."""
+        cache = make_cache(auto_tune_min_ttl=45)
+        self._warm(cache, "ipam.ip_addresses")
+        for _ in range(10):
+            cache.invalidate_pattern("ipam.ip_addresses")
+
+        with patch("netbox_mcp.client.time.time", return_value=time.time() + 600):
+            adjustments = cache.auto_tune_ttls()
+
+        # 600s / 10 changes = 60s mean interval -> 30s, clamped to the 45s minimum
+        assert adjustments["ipam.ip_addresses"]["new_ttl"] == 45
+
+    def test_entries_migrate_to_tuned_cache(self):
+        """Entries of a tuned type move from the default cache to its own cache."""
+        cache = make_cache()
+        cache.set("dcim.platforms:name=ios", [{"id": 3}], "dcim.platforms")
+        self._warm(cache, "dcim.platforms")
+
+        with patch("netbox_mcp.client.time.time", return_value=time.time() + 600):
+            cache.auto_tune_ttls()
+
+        assert "dcim.platforms:name=ios" not in cache.default_cache
+        assert cache.get("dcim.platforms:name=ios", "dcim.platforms") == [{"id": 3}]
+
+    def test_types_without_enough_traffic_are_skipped(self):
+        """Types with too few lookups are left alone."""
+        cache = make_cache()
+        self._warm(cache, "dcim.platforms", lookups=3)
+
+        with patch("netbox_mcp.client.time.time", return_value=time.time() + 600):
+            assert cache.auto_tune_ttls() == {}
+
+
+class TestDashboardIntegration:
+    """Test exposure through the metrics dashboard."""
+
+    def test_dashboard_includes_cache_analytics(self):
+        """MetricsDashboard reports analytics from the attached cache."""
+        cache = make_cache()
+        cache.get("dcim.sites:slug=ams", "dcim.sites")
+
+        collector = MetricsCollector(PerformanceMonitor())
+        collector.cache_manager = cache
+        dashboard = MetricsDashboard(collector)
+
+        analytics = dashboard._get_cache_analytics()
+        assert analytics["object_types"]["dcim.sites"]["misses"] == 1
+
+        collector.collect_metrics()
+        assert collector.performance_monitor.get_latest_cache_metrics().misses == 1
@@ -0,0 +1,202 @@
+"""
+Tests for cache snapshot persistence.
+
+This module tests writing the CacheManager contents to a snapshot file,
+lazily rehydrating them after a restart and reconciling them against
+NetBox's changelog.
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import ANY, Mock, patch
+
+import pytest
+
+from netbox_mcp import cache_snapshot
+from netbox_mcp.cache_snapshot import CacheSnapshot, SnapshotError, write_snapshot
+from netbox_mcp.client import CacheManager, NetBoxClient, _endpoint_matches_model
+from netbox_mcp.config import NetBoxConfig
+
+
+def make_config(tmp_path, **cache_overrides) -> NetBoxConfig:
+    """Build a config whose snapshot lives in a temporary directory."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+    config.cache.snapshot_path = str(tmp_path / "snapshot.bin")
+    for key, value in cache_overrides.items():
+        setattr(config.cache, key, value)
+    return config
+
+
+class TestSnapshotFormat:
+    """Test the on-disk snapshot format."""
+
+    def test_round_trip(self, tmp_path):
+        """Entries written to a snapshot can be read back by offset."""
+        path = str(tmp_path / "snapshot.bin")
+        expires_at = time.time() + 60
+        written = write_snapshot(path, [
+            ("dcim.devices", "dcim.devices:name=sw-01", expires_at, [{"id": 1, "name": "sw-01"}]),
+            ("dcim.sites", "dcim.sites:slug=ams", expires_at, [{"id": 7, "slug": "ams"}]),
+        ])
+        assert written == 2
+
+        snapshot = CacheSnapshot(path)
+        try:
+            object_type, entry_expiry, offset, length = snapshot.index["dcim.devices:name=sw-01"]
+            assert object_type == "dcim.devices"
+            assert entry_expiry == pytest.approx(expires_at)
+            assert snapshot.read_value(offset, length) == [{"id": 1, "name": "sw-01"}]
+        finally:
+            snapshot.close()
+
+    def test_stdlib_fallback_codec(self, tmp_path):
+        """Snapshots can be written without msgpack/zstandard installed."""
+        codec, compression = cache_snapshot.CODEC_JSON, cache_snapshot.COMPRESSION_ZLIB
+        path = str(tmp_path / "snapshot.bin")
+        write_snapshot(path, [("ipam.vlans", "ipam.vlans", time.time() + 60, [{"vid": 100}])],
+                       codec=codec, compression=compression)
+
+        snapshot = CacheSnapshot(path)
+        try:
+            assert (snapshot.codec, snapshot.compression) == (codec, compression)
+            _, _, offset, length = snapshot.index["ipam.vlans"]
+            assert snapshot.read_value(offset, length) == [{"vid": 100}]
+        finally:
+            snapshot.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """A file without the snapshot magic is refused."""
+        path = tmp_path / "snapshot.bin"
+        path.write_bytes(b"this is not a snapshot at all, just some bytes")
+
+        with pytest.raises(SnapshotError):
+            CacheSnapshot(str(path))
+
+
+class TestCacheManagerSnapshot:
+    """Test CacheManager save/load behaviour."""
+
+    def test_save_and_lazy_reload(self, tmp_path):
+        """A new CacheManager serves snapshot entries as cache hits."""
+        config = make_config(tmp_path)
+        original = CacheManager(config)
+        original.set("dcim.devices:name=sw-01", [{"id": 1}], "dcim.devices")
+        assert original.save_snapshot(config.cache.get_snapshot_path()) == 1
+
+        restarted = CacheManager(config)
+        assert restarted.load_snapshot(config.cache.get_snapshot_path()) == 1
+        assert restarted._restored["dcim.devices:name=sw-01"][4] is None  # not decoded yet
+
+        assert restarted.get("dcim.devices:name=sw-01", "dcim.devices") == [{"id": 1}]
+        assert restarted.get_stats()["hits"] == 1
+
+    def test_remaining_ttl_is_preserved(self, tmp_path):
+        """Expired snapshot entries are never served."""
+        config = make_config(tmp_path)
+        path = config.cache.get_snapshot_path()
+        write_snapshot(path, [
+            ("dcim.devices", "dcim.devices:name=old", time.time() + 0.05, [{"id": 1}]),
+        ])
+
+        cache = CacheManager(config)
+        assert cache.load_snapshot(path) == 1
+        time.sleep(0.1)
+        assert cache.get("dcim.devices:name=old", "dcim.devices") is None
+
+    def test_max_age_discards_old_snapshot(self, tmp_path):
+        """Snapshots older than snapshot_max_age are ignored."""
+        config = make_config(tmp_path)
+        path = config.cache.get_snapshot_path()
+        write_snapshot(path, [("dcim.sites", "dcim.sites", time.time() + 3600, [])])
+
+        with patch("netbox_mcp.client.time.time", return_value=time.time() + 7200):
+            assert CacheManager(config).load_snapshot(path, max_age=3600) == 0
+
+    def test_invalidation_drops_restored_entries(self, tmp_path):
+        """Write-path invalidation also applies to restored entries."""
+        config = make_config(tmp_path)
+        path = config.cache.get_snapshot_path()
+        expires_at = time.time() + 60
+        write_snapshot(path, [
+            ("dcim.devices", "dcim.devices:name=sw-01", expires_at, [{"id": 1}]),
+            ("dcim.sites", "dcim.sites:slug=ams", expires_at, [{"id": 7}]),
+        ])
+
+        cache = CacheManager(config)
+        cache.load_snapshot(path)
+        cache.invalidate_pattern("dcim.devices")
+
+        assert cache.get("dcim.devices:name=sw-01", "dcim.devices") is None
+        assert cache.get("dcim.sites:slug=ams", "dcim.sites") == [{"id": 7}]
+
+    def test_missing_snapshot_starts_cold(self, tmp_path):
+        """A missing snapshot file is not an error."""
+        config = make_config(tmp_path)
+        assert CacheManager(config).load_snapshot(config.cache.get_snapshot_path()) == 0
+
+
+class TestSnapshotReconciliation:
+    """Test changelog reconciliation on the client."""
+
+    @pytest.mark.parametrize("object_type,model,expected", [
+        ("dcim.devices", "dcim.device", True),
+        ("dcim.device-types", "dcim.devicetype", True),
+        ("ipam.ip-addresses", "ipam.ipaddress", True),
+        ("tenancy.tenant-groups", "tenancy.tenantgroup", True),
+        ("dcim.devices", "ipam.device", False),
+        ("dcim.sites", "dcim.device", False),
+    ])
+    def test_endpoint_matches_model(self, object_type, model, expected):
+        """Endpoint-based cache types are matched to changelog model labels."""
+        assert _endpoint_matches_model(object_type, model) is expected
+
+    def _client_with_snapshot(self, tmp_path):
+        config = make_config(tmp_path)
+        path = config.cache.get_snapshot_path()
+        expires_at = time.time() + 60
+        write_snapshot(path, [
+            ("dcim.devices", "dcim.devices:name=sw-01", expires_at, [{"id": 1}]),
+            ("dcim.sites", "dcim.sites:slug=ams", expires_at, [{"id": 7}]),
+        ])
+        client = Mock(spec=NetBoxClient)
+        client.config = config
+        client.cache = CacheManager(config)
+        client.SNAPSHOT_RECONCILE_MAX_CHANGES = NetBoxClient.SNAPSHOT_RECONCILE_MAX_CHANGES
+        return client
+
+    def test_changed_types_are_dropped(self, tmp_path):
+        """Only object types changed since the snapshot are dropped."""
+        client = self._client_with_snapshot(tmp_path)
+        client._get_changed_models_since = Mock(return_value={"dcim.device"})
+
+        kept = NetBoxClient.restore_cache_snapshot(client)
+
+        assert kept == 1
+        assert client.cache.get("dcim.devices:name=sw-01", "dcim.devices") is None
+        assert client.cache.get("dcim.sites:slug=ams", "dcim.sites") == [{"id": 7}]
+
+    def test_unreadable_changelog_discards_snapshot(self, tmp_path):
+        """The snapshot is discarded when reconciliation is impossible."""
+        client = self._client_with_snapshot(tmp_path)
+        client._get_changed_models_since = Mock(side_effect=Exception("HTTP 403"))
+
+        assert NetBoxClient.restore_cache_snapshot(client) == 0
+        assert client.cache.get_stats()["snapshot_entries"] == 0
+
+    def test_changes_are_filtered_by_model_on_the_server(self):
+        """Only changes to the wanted models are requested and counted toward the cap."""
+        client = Mock(spec=NetBoxClient)
+        client.api = Mock()
+        client.SNAPSHOT_RECONCILE_MAX_CHANGES = 2
+        changelog = client.api.core.object_changes
+        # A server ignoring the filter returns unrelated changes as well
+        changelog.filter.return_value = [
+            SimpleNamespace(changed_object_type=model, changed_object_id=obj_id, action=action)
+            for model, obj_id, action in [("ipam.ipaddress", 1, "update"), ("dcim.device", 5, "update"),
+                                          ("dcim.device", 6, "update"), ("ipam.ipaddress", 2, "delete")]
+        ]
+
+        changes = NetBoxClient.get_object_changes_since(client, time.time() - 60, ["ipam.ipaddress"])
+
+        assert changes == {"ipam.ipaddress": {1: "update", 2: "delete"}}
+        changelog.filter.assert_called_once_with(time_after=ANY, ordering="id", changed_object_type="ipam.ipaddress")
@@ -0,0 +1,94 @@
+"""
+Tests for NetBoxClient app/endpoint wrapper dispatch.
+
+This module tests that AppWrappers and EndpointWrappers are memoized per
+client, that the OpenAPI-derived dispatch table rejects unknown endpoints
+and that reconnecting resets both.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import AppWrapper, EndpointWrapper, NetBoxClient, _build_endpoint_table
+from netbox_mcp.config import NetBoxConfig
+
+SCHEMA = {
+    "paths": {
+        "/api/status/": {},
+        "/api/dcim/devices/": {},
+        "/api/dcim/devices/{id}/": {},
+        "/api/dcim/device-types/": {},
+        "/api/ipam/prefixes/{id}/available-ips/": {},
+        "/api/plugins/bgp/sessions/": {},
+    }
+}
+
+
+def make_client(**overrides) -> NetBoxClient:
+    """Build a client without touching the network."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token", **overrides)
+    return NetBoxClient(config)
+
+
+class TestWrapperMemoization:
+    """Test per-client wrapper reuse."""
+
+    def test_wrappers_are_reused(self):
+        """Repeated attribute access returns the same wrapper objects."""
+        client = make_client()
+
+        assert isinstance(client.dcim, AppWrapper)
+        assert client.dcim is client.dcim
+        assert isinstance(client.dcim.devices, EndpointWrapper)
+        assert client.dcim.devices is client.dcim.devices
+        assert client.dcim.devices._obj_type == "dcim.devices"
+
+    def test_unknown_app_and_private_names_raise(self):
+        """Names that are not pynetbox apps raise AttributeError."""
+        client = make_client()
+
+        with pytest.raises(AttributeError, match="no application named 'plugins'"):
+            client.plugins
+        with pytest.raises(AttributeError):
+            client._not_an_app
+        with pytest.raises(AttributeError):
+            client.dcim._not_an_endpoint
+
+    def test_reconnect_resets_wrappers(self):
+        """Wrappers built for an old connection are dropped on reconnect."""
+        client = make_client()
+        devices = client.dcim.devices
+
+        client._initialize_connection()
+
+        assert client.dcim.devices is not devices
+        assert client.dcim.devices._endpoint.api is client.api
+
+
+class TestEndpointDiscovery:
+    """Test the OpenAPI-derived dispatch table."""
+
+    def test_build_endpoint_table(self):
+        """Schema paths are mapped to app -> endpoint names."""
+        assert _build_endpoint_table(SCHEMA) == {
+            "dcim": frozenset({"devices", "device_types"}),
+            "ipam": frozenset({"prefixes"}),
+        }
+
+    def test_unknown_endpoint_fails_fast(self):
+        """With discovery enabled, endpoints missing from the schema raise."""
+        with patch("pynetbox.core.api.Api.openapi", return_value=SCHEMA):
+            client = make_client(discover_endpoints=True)
+
+        assert isinstance(client.dcim.device_types, EndpointWrapper)
+        with pytest.raises(AttributeError, match="no endpoint named 'devicez'"):
+            client.dcim.devicez
+
+    def test_failed_discovery_accepts_all_endpoints(self):
+        """A schema fetch error leaves the client permissive."""
+        with patch("pynetbox.core.api.Api.openapi", side_effect=Exception("HTTP 500")):
+            client = make_client(discover_endpoints=True)
+
+        assert client._endpoint_table is None
+        assert isinstance(client.dcim.devicez, EndpointWrapper)
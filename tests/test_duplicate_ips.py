@@ -0,0 +1,105 @@
+"""
+Tests for streaming duplicate-IP detection.
+
+This module tests NetBoxClient.stream() paging and the two-pass duplicate
+scan in netbox_find_duplicate_ips.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.tools.ipam.enterprise import DUPLICATE_SCAN_FIELDS, netbox_find_duplicate_ips
+
+
+def ip(ip_id, address, vrf_id=None, assigned_type=None):
+    """A stand-in for a streamed ip-address Record."""
+    vrf = SimpleNamespace(id=vrf_id) if vrf_id else None
+    return SimpleNamespace(id=ip_id, address=address, vrf=vrf, assigned_object_type=assigned_type)
+
+
+STREAMED = [
+    ip(1, "10.0.0.1/24", assigned_type="dcim.interface"),
+    ip(2, "10.0.0.1/25"),
+    ip(3, "10.0.0.2/24"),
+    ip(4, "10.0.0.1/24", vrf_id=7),          # same host, other VRF: not a duplicate
+    ip(5, "::a00:1/128"),                     # same integer as 10.0.0.1, other family
+    ip(6, "10.0.0.2/24", assigned_type="virtualization.vminterface"),
+]
+
+
+def full_record(ip_id):
+    streamed = next(s for s in STREAMED if s.id == ip_id)
+    return {"id": ip_id, "address": streamed.address, "status": {"value": "active"},
+            "assigned_object": None, "vrf": None}
+
+
+class TestClientStream:
+    """Test explicit offset paging."""
+
+    def test_pages_are_requested_by_offset(self):
+        """Every page is requested once, in id order, without caching."""
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        pages = {0: [1, 2], 2: [3, 4], 4: [5]}
+
+        with patch("pynetbox.core.endpoint.Endpoint.count", return_value=5), \
+             patch("pynetbox.core.endpoint.Endpoint.filter",
+                   side_effect=lambda **kw: pages[kw["offset"]]) as api_filter:
+            result = list(client.stream("ipam.ip_addresses", page_size=2, vrf_id=3))
+
+        assert result == [1, 2, 3, 4, 5]
+        assert api_filter.call_count == 3
+        api_filter.assert_any_call(vrf_id=3, ordering="id", limit=2, offset=4)
+
+    def test_server_page_size_cap(self):
+        """Offsets advance by the page size the server serves, not the one requested."""
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        records = list(range(7))
+
+        def capped_filter(**kw):
+            return records[kw["offset"]:kw["offset"] + min(kw["limit"], 3)]
+
+        with patch("pynetbox.core.endpoint.Endpoint.count", return_value=7), \
+             patch("pynetbox.core.endpoint.Endpoint.filter", side_effect=capped_filter) as api_filter:
+            result = list(client.stream("ipam.ip_addresses", page_size=5))
+
+        assert result == records
+        assert [c.kwargs["offset"] for c in api_filter.call_args_list] == [0, 3, 6]
+
+
+class TestFindDuplicateIPs:
+    """Test the streaming duplicate scan."""
+
+    def make_client(self):
+        client = Mock()
+        client.stream.return_value = iter(STREAMED)
+        client.ipam.ip_addresses.filter.side_effect = \
+            lambda id, no_cache: [full_record(i) for i in id]
+        return client
+
+    def test_duplicates_keyed_by_vrf_and_family(self):
+        """Only same-VRF, same-family hosts collide; full records are fetched for those only."""
+        client = self.make_client()
+
+        result = netbox_find_duplicate_ips(client)
+
+        assert result["success"] is True
+        assert result["total_ips_analyzed"] == 6
+        assert result["duplicates_found"] == 2
+        assert sorted(d["ip_address"] for d in result["duplicates"]) == ["10.0.0.1", "10.0.0.2"]
+        client.ipam.ip_addresses.filter.assert_called_once_with(id=[1, 2, 3, 6], no_cache=True)
+        client.stream.assert_called_once_with("ipam.ip_addresses", fields=DUPLICATE_SCAN_FIELDS)
+        assert result["statistics"]["ipv6_addresses"] == 1
+        assert result["statistics"]["assignment_breakdown"]["interface_assignments"] == 2
+
+    def test_limit_stops_the_scan(self):
+        """An explicit limit samples the first addresses only."""
+        result = netbox_find_duplicate_ips(self.make_client(), limit=2)
+
+        assert result["total_ips_analyzed"] == 2
+        assert result["duplicates_found"] == 1
+
+    def test_invalid_limit(self):
+        """A non-positive limit is rejected."""
+        assert netbox_find_duplicate_ips(Mock(), limit=0)["error_type"] == "ValidationError"
@@ -0,0 +1,128 @@
+"""
+Tests for readiness probing.
+
+This module tests the background readiness prober and the health server:
+readiness served from memory, the failure threshold, and /readyz staying
+fast while NetBox is slow.
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import ConnectionStatus
+from netbox_mcp.config import HealthConfig
+from netbox_mcp.health import ReadinessProber
+from netbox_mcp.server import HealthCheckHandler
+
+
+class FakeClient:
+    """A NetBox client whose health check can fail or hang."""
+
+    def __init__(self):
+        self.connected = True
+        self.delay = 0.0
+        self.replica = None
+        self.cache = SimpleNamespace(get_stats=lambda: {
+            "enabled": True, "size": 12, "max_size": 1000, "hit_ratio_percent": 80.0, "snapshot_entries": 0
+        })
+
+    def health_check(self, force=False):
+        time.sleep(self.delay)
+        if not self.connected:
+            return ConnectionStatus(connected=False, error="NetBox unreachable")
+        return ConnectionStatus(connected=True, version="4.1", response_time_ms=12.0)
+
+
+@pytest.fixture
+def health_server():
+    """A health server on a free port, returning its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthCheckHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestReadinessProber:
+    """Test readiness state."""
+
+    def test_not_ready_before_first_probe(self):
+        """Until NetBox answered once the server is not ready."""
+        ready, detail = ReadinessProber(FakeClient).readiness()
+        assert ready is False
+        assert detail["probe"]["count"] == 0
+
+    def test_failure_threshold(self):
+        """A single failed probe is tolerated; failure_threshold in a row is not."""
+        client = FakeClient()
+        prober = ReadinessProber(lambda: client, HealthConfig(failure_threshold=2))
+        prober.probe()
+        assert prober.readiness()[0] is True
+
+        client.connected = False
+        prober.probe()
+        assert prober.readiness()[0] is True
+        prober.probe()
+        ready, detail = prober.readiness()
+        assert ready is False
+        assert detail["probe"]["consecutive_failures"] == 2
+        assert detail["error"] == "NetBox unreachable"
+
+        client.connected = True
+        prober.probe()
+        assert prober.readiness()[0] is True
+
+    def test_detail_includes_cache_warmth(self):
+        """Readiness detail reports the cache state read during the probe."""
+        client = FakeClient()
+        prober = ReadinessProber(lambda: client)
+        prober.probe()
+        _, detail = prober.readiness()
+        assert detail["cache"]["warm"] is True
+        assert detail["netbox_version"] == "4.1"
+        assert detail["shedding_tools"] == []
+
+
+class TestHealthServer:
+    """Test the health endpoints."""
+
+    def test_slow_netbox_does_not_block_probes(self, health_server):
+        """/readyz and /healthz answer from memory while a probe hangs on NetBox."""
+        client = FakeClient()
+        prober = ReadinessProber(lambda: client)
+        prober.probe()
+        client.delay = 2.0
+        threading.Thread(target=prober.probe, daemon=True).start()
+
+        with patch("netbox_mcp.server.get_readiness_prober", return_value=prober):
+            started = time.monotonic()
+            status, body = get(f"{health_server}/readyz")
+            assert get(f"{health_server}/healthz")[0] == 200
+            elapsed = time.monotonic() - started
+
+        assert status == 200
+        assert body["netbox_connected"] is True
+        assert elapsed < 1.0
+
+    def test_readyz_without_prober(self, health_server):
+        """Without a running prober the server reports not ready."""
+        with patch("netbox_mcp.server.get_readiness_prober", return_value=None):
+            status, body = get(f"{health_server}/readyz")
+        assert status == 503
+        assert body["netbox_connected"] is False
@@ -0,0 +1,213 @@
+"""
+Tests for the IPAM radix index.
+
+This module tests the path-compressed prefix trie, utilization and
+free-space queries for IPv4 and IPv6, and the client-level index cache.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.ipam_index import PrefixTrie, VRFIndex, cidr_blocks, parse_prefix
+from netbox_mcp.tools.ipam.enterprise import (
+    netbox_find_free_ip_space,
+    netbox_get_ip_usage,
+    netbox_get_prefix_capacity_report,
+)
+
+
+PREFIXES = [
+    {"id": 1, "prefix": "10.0.0.0/16", "vrf": None, "status": "container"},
+    {"id": 2, "prefix": "10.0.0.0/24", "vrf": None, "status": "active"},
+    {"id": 3, "prefix": "10.0.1.0/24", "vrf": None, "status": "active"},
+    {"id": 4, "prefix": "10.0.0.128/25", "vrf": None, "status": "reserved"},
+    {"id": 5, "prefix": "2001:db8::/32", "vrf": None, "status": "container"},
+    {"id": 6, "prefix": "2001:db8:1::/48", "vrf": None, "status": "active"},
+]
+
+ADDRESSES = ["10.0.0.1/24", "10.0.0.2/24", "10.0.0.4/24", "10.0.0.130/25", "10.0.1.1/24",
+             "2001:db8:1::1/64", "2001:db8:1::2/64", "192.168.1.1/24"]
+
+
+def make_index():
+    return VRFIndex.build(PREFIXES, ADDRESSES)
+
+
+class TestPrefixTrie:
+    """Test trie insertion order independence and traversal."""
+
+    @pytest.mark.parametrize("order", [[0, 1, 2, 3], [3, 2, 1, 0], [1, 3, 0, 2]])
+    def test_descendants_independent_of_insert_order(self, order):
+        """Covering prefixes inserted after their children still nest them."""
+        trie = PrefixTrie(32)
+        for i in order:
+            version, network, length = parse_prefix(PREFIXES[i]["prefix"])
+            trie.insert(network, length, PREFIXES[i])
+
+        _, network, length = parse_prefix("10.0.0.0/16")
+        all_ids = [n.record["id"] for n in trie.descendants(network, length)]
+        direct_ids = [n.record["id"] for n in trie.descendants(network, length, direct_only=True)]
+
+        assert all_ids == [2, 4, 3]
+        assert direct_ids == [2, 3]
+        assert trie.get(*parse_prefix("10.0.0.128/25")[1:])["id"] == 4
+        assert trie.get(*parse_prefix("10.0.2.0/24")[1:]) is None
+        assert trie.size == 4
+
+    def test_cidr_blocks(self):
+        """Ranges decompose into the fewest aligned blocks."""
+        _, start, _ = parse_prefix("10.0.2.0/32")
+        _, end, _ = parse_prefix("10.0.7.255/32")
+
+        assert cidr_blocks(4, start, end) == ["10.0.2.0/23", "10.0.4.0/22"]
+
+
+class TestVRFIndex:
+    """Test utilization and free-space queries."""
+
+    def test_utilization_ipv4_and_ipv6(self):
+        """IPv4 excludes network/broadcast; IPv6 sizes are exact."""
+        index = make_index()
+
+        assert index.utilization("10.0.0.0/24") == {
+            "total_addresses": 254, "used_addresses": 4,
+            "available_addresses": 250, "usage_percentage": 1.57,
+        }
+        assert index.utilization("10.0.0.0/31")["total_addresses"] == 2
+        v6 = index.utilization("2001:db8:1::/48")
+        assert v6["total_addresses"] == 2 ** 80
+        assert v6["used_addresses"] == 2
+
+    def test_child_prefixes_rollup(self):
+        """Children carry their records and own address counts."""
+        children = make_index().child_prefixes("10.0.0.0/16")
+
+        assert [(c["prefix"], c["used_addresses"]) for c in children] == [
+            ("10.0.0.0/24", 4), ("10.0.0.128/25", 1), ("10.0.1.0/24", 1)
+        ]
+        assert children[1]["record"]["status"] == "reserved"
+
+    def test_free_blocks(self):
+        """Space not covered by direct children is reported as CIDR blocks."""
+        free = make_index().free_blocks("10.0.0.0/16")
+
+        assert free["free_blocks"][:3] == ["10.0.2.0/23", "10.0.4.0/22", "10.0.8.0/21"]
+        assert free["free_blocks"][-1] == "10.0.128.0/17"
+        assert free["free_addresses"] == 65536 - 512
+        assert make_index().free_blocks("2001:db8::/32")["free_blocks"][0] == "2001:db8::/48"
+
+    def test_next_available(self):
+        """The first run of N free hosts skips used addresses."""
+        index = make_index()
+
+        assert index.next_available("10.0.0.0/24") == ["10.0.0.3/24"]
+        assert index.next_available("10.0.0.0/24", 3) == ["10.0.0.5/24", "10.0.0.6/24", "10.0.0.7/24"]
+        assert index.next_available("10.0.0.0/30", 2) is None
+        # IPv6 prefixes have no reserved network address
+        assert index.next_available("2001:db8:1::/126") == ["2001:db8:1::/126"]
+        assert index.next_available("2001:db8:1::/126", 2) is None
+
+    def test_hierarchy_report(self):
+        """Every prefix is measured with its depth, parent and child coverage."""
+        report = {e["prefix"]: e for e in make_index().hierarchy_report()}
+
+        assert list(report) == ["10.0.0.0/16", "10.0.0.0/24", "10.0.0.128/25", "10.0.1.0/24",
+                                "2001:db8::/32", "2001:db8:1::/48"]
+        assert report["10.0.0.128/25"]["depth"] == 2
+        assert report["10.0.0.128/25"]["parent"]["id"] == 2
+        assert report["10.0.0.0/16"]["child_count"] == 2
+        assert report["10.0.0.0/16"]["child_addresses"] == 512
+        assert report["10.0.0.0/16"]["used_addresses"] == 5
+
+
+class TestClientIndexCache:
+    """Test index building, caching and invalidation through the client."""
+
+    def make_client(self):
+        return NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+
+    def test_index_is_cached_and_updated_by_ipam_writes(self):
+        """The index is built once per VRF and IPAM writes are applied to it in place."""
+        client = self.make_client()
+        listing = [SimpleNamespace(id=i, address=a) for i, a in enumerate(ADDRESSES, start=1)]
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", side_effect=lambda **kw: listing
+                   if kw.get("brief") else [SimpleNamespace(serialize=lambda p=p: dict(p)) for p in PREFIXES]
+                   ) as api_filter:
+            first = client.get_ipam_index()
+            assert client.get_ipam_index() is first
+            api_filter.assert_any_call(vrf_id="null", brief=1)
+            assert api_filter.call_count == 2
+
+            client.ipam.ip_addresses._after_write(deleted_ids=[1])
+            client.ipam.ip_addresses._after_write(record={"id": 20, "address": "10.0.0.9/24", "vrf": None})
+            client.ipam.ip_addresses._after_write(record={"id": 21, "address": "10.0.0.10/24", "vrf": 7})
+            assert client.get_ipam_index() is first
+            assert first.utilization("10.0.0.0/24")["used_addresses"] == 4
+            assert api_filter.call_count == 2
+
+            client.ipam.prefixes._after_write(deleted_ids=[4])
+            assert first.prefixes_stale
+            assert client.get_ipam_index() is first
+            assert not first.prefixes_stale
+
+    def test_expired_index_is_synced_from_changelog(self):
+        """Changes made elsewhere are applied from the changelog instead of a full reload."""
+        client = self.make_client()
+        client.config.cache.ttl.ip_addresses = 0
+        client._ipam_indexes[None] = index = VRFIndex.build(PREFIXES, list(enumerate(ADDRESSES, start=1)))
+        changes = {"ipam.ipaddress": {1: "delete", 2: "update", 30: "create"}}
+        moved = SimpleNamespace(id=2, address="10.0.0.2/24", vrf=SimpleNamespace(id=7))
+        created = SimpleNamespace(id=30, address="10.0.1.50/24", vrf=None)
+
+        with patch.object(NetBoxClient, "get_object_changes_since", return_value=changes), \
+                patch("pynetbox.core.endpoint.Endpoint.filter", return_value=[moved, created]) as api_filter:
+            assert client.get_ipam_index() is index
+
+        api_filter.assert_called_once_with(id=[2, 30])
+        assert index.utilization("10.0.0.0/24")["used_addresses"] == 2
+        assert index.utilization("10.0.1.0/24")["used_addresses"] == 2
+
+        with patch.object(NetBoxClient, "get_object_changes_since", return_value=None), \
+                patch("pynetbox.core.endpoint.Endpoint.filter", return_value=[]):
+            assert client.get_ipam_index() is not index
+
+    def test_tools_use_index(self):
+        """Usage and free-space tools answer from the index."""
+        client = self.make_client()
+        client._ipam_indexes[None] = make_index()
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter",
+                   return_value=[SimpleNamespace(serialize=lambda: dict(PREFIXES[5]))]):
+            usage = netbox_get_ip_usage(client, prefix="2001:db8:1::/48")
+            free = netbox_find_free_ip_space(client, prefix="2001:db8:1::/48", consecutive_count=2)
+
+        assert usage["success"] is True
+        assert usage["total_addresses"] == 2 ** 80
+        assert usage["used_addresses"] == 2
+        assert free["free_blocks"] == ["2001:db8:1::/48"]
+        assert free["next_available"] == ["2001:db8:1::3/48", "2001:db8:1::4/48"]
+
+    def test_capacity_report(self):
+        """The report covers every scoped prefix, most utilized first."""
+        client = self.make_client()
+        client._ipam_indexes[None] = make_index()
+        vrf = SimpleNamespace(serialize=lambda: {"id": 9, "name": "global-vrf"})
+        records = [SimpleNamespace(serialize=lambda p=p: dict(p)) for p in PREFIXES[:4]]
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter",
+                   side_effect=lambda **kw: [vrf] if "name" in kw else records):
+            report = netbox_get_prefix_capacity_report(client, vrf="global-vrf", max_results=2)
+
+        assert report["success"] is True
+        assert report["summary"]["prefix_count"] == 4
+        # Only the /16 is top-level within the scope
+        assert report["summary"]["total_addresses"] == 65534
+        assert report["summary"]["allocated_addresses"] == 5
+        assert [p["prefix"] for p in report["prefixes"]] == ["10.0.0.0/24", "10.0.0.128/25"]
+        assert report["truncated"] is True
+        assert report["prefixes"][0]["child_coverage_percent"] == 50.0
@@ -0,0 +1,88 @@
+"""
+Tests for the fuzzy name index.
+
+This module tests trigram extraction and ranking, "did you mean"
+suggestions on failed lookups, and netbox_suggest_object_names.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import EndpointWrapper, Lookup, NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.exceptions import NetBoxNotFoundError
+from netbox_mcp.name_index import NameIndex, trigrams
+from netbox_mcp.tools.system.name_search import netbox_suggest_object_names
+
+
+SITES = [
+    {"id": 1, "name": "Amsterdam DC", "slug": "amsterdam-dc"},
+    {"id": 2, "name": "Rotterdam", "slug": "rotterdam"},
+    {"id": 3, "name": "Berlin", "slug": "ber-01"},
+    {"id": 4, "name": "Amsterdam Zuid", "slug": "ams-zuid"},
+]
+
+
+@pytest.fixture
+def client():
+    """A client whose exact lookups all miss and whose listings serve SITES."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+    with patch.object(EndpointWrapper, "filter", lambda self, *args, **kwargs: []), \
+            patch.object(NetBoxClient, "stream", side_effect=lambda endpoint, **kw: iter(SITES)) as stream:
+        client = NetBoxClient(config)
+        client.stream_mock = stream
+        yield client
+
+
+class TestNameIndex:
+    """Test trigram extraction and ranking."""
+
+    def test_trigrams_match_pg_trgm(self):
+        """Words are lowercased and padded like pg_trgm."""
+        assert trigrams("Ab") == {"  a", " ab", "ab "}
+        assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+        assert trigrams("--") == set()
+
+    def test_search_ranks_typos_and_slugs(self):
+        """The best of name and slug similarity ranks each object."""
+        index = NameIndex.build(SITES, ("name", "slug"))
+
+        results = index.search("amstrdam")
+        assert [r["id"] for r in results] == [1, 4]
+        assert results[0]["similarity"] > results[1]["similarity"]
+        assert index.search("ber01")[0]["name"] == "Berlin"
+        assert index.search("amsterdam dc")[0]["similarity"] == 1.0
+        assert index.search("zzz") == []
+
+
+class TestSuggestions:
+    """Test suggestions through the client."""
+
+    def test_resolve_all_suggests_candidates(self, client):
+        """Missing references carry ranked candidates in the message and details."""
+        with pytest.raises(NetBoxNotFoundError) as exc_info:
+            client.resolve_all({"site": Lookup("dcim.sites", "amstrdam", label="Site")})
+
+        assert exc_info.value.message == "Site 'amstrdam' not found (did you mean 'Amsterdam DC' or 'Amsterdam Zuid'?)"
+        assert exc_info.value.details["suggestions"]["site"][0]["slug"] == "amsterdam-dc"
+
+    def test_index_is_cached_and_invalidated_by_writes(self, client):
+        """One listing per endpoint until that endpoint is written to."""
+        client.name_index.suggest("dcim.sites", "rotterdam")
+        client.name_index.suggest("dcim.sites", "berlin")
+        assert client.stream_mock.call_count == 1
+
+        client.dcim.sites._after_write(record={"id": 5, "name": "Utrecht", "slug": "utrecht"})
+        client.name_index.suggest("dcim.sites", "berlin")
+        assert client.stream_mock.call_count == 2
+        client.stream_mock.assert_called_with("dcim.sites", brief=1)
+
+    def test_suggest_tool(self, client):
+        """The tool validates the object type and returns candidates."""
+        result = netbox_suggest_object_names(client, object_type="site", query="roterdam")
+        invalid = netbox_suggest_object_names(client, object_type="planet", query="earth")
+
+        assert result["success"] is True
+        assert result["candidates"][0]["name"] == "Rotterdam"
+        assert invalid["error_type"] == "ValidationError"
@@ -0,0 +1,127 @@
+"""
+Tests for the power budget index.
+
+This module tests the feed -> PDU -> device draw tree, phase balance,
+panel/rack rollups and netbox_get_power_capacity_report.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.power_index import SitePower, feed_capacity
+from netbox_mcp.tools.dcim.power_capacity import netbox_get_power_capacity_report
+
+
+PANELS = [{"id": 1, "name": "PP-A"}, {"id": 2, "name": "PP-B"}]
+
+FEEDS = [
+    {"id": 10, "name": "F-10", "power_panel": 1, "rack": 7, "phase": "single-phase",
+     "voltage": 230, "amperage": 16, "max_utilization": 80},
+    {"id": 11, "name": "F-11", "power_panel": 1, "rack": 7, "phase": "three-phase",
+     "voltage": 230, "amperage": 16, "max_utilization": 100},
+]
+
+
+def port(port_id, device, endpoint_type=None, endpoints=(), allocated=None, maximum=None):
+    return {"id": port_id, "device": device, "connected_endpoints_type": endpoint_type,
+            "connected_endpoints": list(endpoints), "allocated_draw": allocated, "maximum_draw": maximum}
+
+
+PORTS = [
+    port(100, 50, "dcim.powerfeed", [10]),
+    port(300, 60, "dcim.poweroutlet", [200], 500, 700),
+    port(301, 61, "dcim.poweroutlet", [201], 400, 450),
+    port(101, 51, "dcim.powerfeed", [11]),
+    port(302, 62, "dcim.poweroutlet", [202], 600, 600),
+    port(303, 63, "dcim.poweroutlet", [203], 300, 300),
+    port(304, 52, "dcim.poweroutlet", [204], 50, 50),  # cascaded PDU: own draw is ignored
+    port(305, 64, "dcim.poweroutlet", [205], 300, 400),
+    port(306, 65, allocated=999),  # not plugged in
+]
+
+OUTLETS = [
+    {"id": 200, "power_port": 100, "feed_leg": None},
+    {"id": 201, "power_port": 100, "feed_leg": None},
+    {"id": 202, "power_port": 101, "feed_leg": "A"},
+    {"id": 203, "power_port": 101, "feed_leg": "B"},
+    {"id": 204, "power_port": 101, "feed_leg": "C"},
+    {"id": 205, "power_port": 304, "feed_leg": None},
+]
+
+
+def make_site():
+    return SitePower(PANELS, FEEDS, PORTS, OUTLETS)
+
+
+class TestSitePower:
+    """Test draw aggregation and rollups."""
+
+    def test_feed_capacity(self):
+        """Capacity is derated by max_utilization and scaled for three-phase."""
+        assert feed_capacity(FEEDS[0]) == 2944
+        assert feed_capacity(FEEDS[1]) == 6373
+        assert feed_capacity({"voltage": None, "amperage": 16}) == 0
+
+    def test_single_phase_feed(self):
+        """A feed draws what is plugged into its PDU's outlets."""
+        feed = make_site().feed_report(10)
+
+        assert feed["allocated_watts"] == 900
+        assert feed["maximum_watts"] == 1150
+        assert feed["utilization_percent"] == 30.57
+        assert feed["device_count"] == 3
+        assert "legs" not in feed
+
+    def test_three_phase_legs_and_cascade(self):
+        """Cascaded PDUs roll up onto the leg of the outlet they hang off."""
+        feed = make_site().feed_report(11)
+
+        assert feed["allocated_watts"] == 1200
+        assert {leg: v["allocated_watts"] for leg, v in feed["legs"].items()} == {"A": 600, "B": 300, "C": 300}
+        assert feed["phase_imbalance_percent"] == 50.0
+        assert feed["device_count"] == 5
+
+    def test_rollups(self):
+        """Panels without feeds are listed; racks sum their feeds."""
+        report = make_site().report()
+        panels = {p["id"]: p for p in report["panels"]}
+
+        assert panels[1]["capacity_watts"] == 2944 + 6373
+        assert panels[1]["allocated_watts"] == 2100
+        assert panels[2]["feed_count"] == 0
+        assert report["racks"] == [{"id": 7, "feed_count": 2, "capacity_watts": 9317, "allocated_watts": 2100,
+                                    "maximum_watts": 2450, "utilization_percent": 22.54}]
+
+
+class TestPowerCapacityReport:
+    """Test the tool through the client index."""
+
+    def api_filter(self, endpoint, **kwargs):
+        self.calls.append(endpoint.name)
+        rows = {
+            "sites": [{"id": 3, "name": "Amsterdam"}] if kwargs.get("slug") == "ams" else [],
+            "racks": [{"id": 7, "name": "R-07"}],
+            "power-panels": PANELS, "power-feeds": FEEDS, "power-ports": PORTS, "power-outlets": OUTLETS,
+        }[endpoint.name]
+        return [SimpleNamespace(serialize=lambda r=r: dict(r)) for r in rows]
+
+    def test_report_is_cached_and_invalidated(self):
+        """One bulk load per site; power writes drop the model."""
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        self.calls = []
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", autospec=True, side_effect=self.api_filter):
+            report = netbox_get_power_capacity_report(client, site="ams", warning_threshold=30)
+            first = client.power_budget.get(3)
+            assert client.power_budget.get(3) is first
+            client.dcim.power_ports._after_write(deleted_ids=[306])
+            assert client.power_budget.get(3) is not first
+
+        assert report["success"] is True
+        assert [f["name"] for f in report["feeds"]] == ["F-10", "F-11"]
+        assert report["racks"][0]["name"] == "R-07"
+        assert report["summary"]["feeds_over_threshold"] == 1
+        assert report["warnings"] == ["Feed F-10 at 30.57% of usable capacity", "Feed F-11 phase imbalance 50.0%"]
+        assert sorted(self.calls[:6]) == ["power-feeds", "power-outlets", "power-panels", "power-ports", "racks", "sites"]
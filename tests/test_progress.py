@@ -0,0 +1,74 @@
+"""
+Tests for progress reporting.
+
+This module tests the per-call progress reporter: the no-op default,
+MCP notifications sent from worker threads, and throttling.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from netbox_mcp.progress import MCPProgressReporter, ProgressReporter, get_progress_reporter, progress_scope
+from netbox_mcp.tool_executor import ToolExecutor
+
+
+class FakeContext:
+    """Records what a FastMCP Context would send."""
+
+    def __init__(self):
+        self.progress = []
+        self.logs = []
+        self.request_id = "7"
+        self.request_context = SimpleNamespace(session=self)
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append((progress, total, message))
+
+    async def send_log_message(self, level, data, logger=None, related_request_id=None):
+        self.logs.append((level, data, logger, related_request_id))
+
+
+class TestProgressReporter:
+    """Test reporters."""
+
+    def test_default_reporter_is_a_no_op(self):
+        """Outside a tool call reporting does nothing."""
+        reporter = get_progress_reporter()
+        assert type(reporter) is ProgressReporter
+        reporter.advance(1, 2)
+        reporter.partial({"chunk": 1})
+
+    def test_notifications_from_worker_threads(self):
+        """Tools in worker threads notify the loop the request arrived on."""
+        ctx = FakeContext()
+        executor = ToolExecutor()
+
+        def tool(reporter):
+            with progress_scope(reporter):
+                for done in range(1, 4):
+                    get_progress_reporter().advance(done, 3, f"step {done}")
+                    get_progress_reporter().partial({"step": done})
+
+        async def main():
+            reporter = MCPProgressReporter(ctx, asyncio.get_running_loop(), min_interval=0)
+            await executor.run("dcim", tool, reporter)
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        executor.shutdown()
+        assert ctx.progress == [(1, 3, "step 1"), (2, 3, "step 2"), (3, 3, "step 3")]
+        assert ctx.logs[0] == ("info", {"partial_result": {"step": 1}}, "netbox_mcp.progress", "7")
+        assert len(ctx.logs) == 3
+
+    def test_throttling_keeps_the_final_update(self):
+        """Rapid updates are thinned out but completion is always sent."""
+        ctx = FakeContext()
+
+        async def main():
+            reporter = MCPProgressReporter(ctx, asyncio.get_running_loop(), min_interval=60)
+            for done in range(1, 11):
+                reporter.advance(done, 10)
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        assert [p for p, _, _ in ctx.progress] == [1, 10]
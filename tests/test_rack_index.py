@@ -0,0 +1,98 @@
+"""
+Tests for the rack space occupancy index.
+
+This module tests per-face unit bitsets, the per-site index with its
+device-type height map, and netbox_find_rack_space.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.rack_index import RackOccupancy
+from netbox_mcp.tools.dcim.racks import netbox_find_rack_space
+
+
+RACKS = [
+    {"id": 1, "name": "R-02", "site": 5, "u_height": 10, "starting_unit": 1, "status": "active"},
+    {"id": 2, "name": "R-01", "site": 5, "u_height": 10, "starting_unit": 1, "status": "planned"},
+]
+
+DEVICE_TYPES = [
+    {"id": 100, "u_height": 2.0, "is_full_depth": True},
+    {"id": 101, "u_height": 1.0, "is_full_depth": False},
+]
+
+DEVICES = [
+    {"id": 1, "rack": 1, "position": 1.0, "face": "front", "device_type": 100},
+    {"id": 2, "rack": 1, "position": 5.0, "face": "rear", "device_type": 101},
+    {"id": 3, "rack": 2, "position": 3.0, "face": "front", "device_type": 101},
+    {"id": 4, "rack": 2, "position": None, "face": None, "device_type": 100},  # not racked
+]
+
+
+def records(rows):
+    return [SimpleNamespace(serialize=lambda r=r: dict(r)) for r in rows]
+
+
+def api_filter(endpoint, **kwargs):
+    """Stand-in for pynetbox filter, dispatched on the endpoint name."""
+    api_filter.calls.append(endpoint.name)
+    if endpoint.name == "sites":
+        return records([{"id": 5, "name": "Amsterdam"}]) if kwargs.get("slug") == "ams" else []
+    if endpoint.name == "device-types":
+        return records([t for t in DEVICE_TYPES if t["id"] in kwargs["id"]])
+    return records({"racks": RACKS, "devices": DEVICES}[endpoint.name])
+
+
+class TestRackOccupancy:
+    """Test per-face bitsets."""
+
+    def test_faces_depth_and_positions(self):
+        """Full-depth devices block both faces; half-depth only their own."""
+        rack = RackOccupancy({"id": 1, "u_height": 10, "starting_unit": 1})
+        rack.place(1.0, 2.0, "front", full_depth=True)
+        rack.place(5.0, 1.0, "rear", full_depth=False)
+        rack.place(8.5, 0.5, "front", full_depth=False)  # fractional: rounds out to U8
+
+        assert rack.free_units("front") == 7
+        assert rack.free_units("rear") == 7
+        assert rack.free_units("both") == 6
+        assert rack.positions(2, "front") == [3, 4, 5, 6, 9]
+        assert rack.positions(3, "both") == []
+        assert rack.positions(2, "both") == [3, 6, 9]
+
+    def test_starting_unit_offset(self):
+        """Positions are reported in the rack's own unit numbering."""
+        rack = RackOccupancy({"id": 1, "u_height": 4, "starting_unit": 10})
+        rack.place(10.0, 1.0, "front", full_depth=True)
+
+        assert rack.positions(3, "front") == [11]
+
+
+class TestFindRackSpace:
+    """Test the tool through the client index."""
+
+    def test_candidates_from_one_site_query(self):
+        """All racks of the site are checked from one device query."""
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        api_filter.calls = []
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", autospec=True, side_effect=api_filter):
+            result = netbox_find_rack_space(client, site="ams", u_height=4, face="both")
+            active = netbox_find_rack_space(client, site="ams", u_height=4, rack_status="active")
+
+        assert result["success"] is True
+        assert [c["rack"] for c in result["candidates"]] == ["R-01", "R-02"]
+        assert result["candidates"][0]["first_position"] == 4
+        assert result["candidates"][1]["positions"] == [6, 7]
+        assert [c["rack"] for c in active["candidates"]] == ["R-02"]
+        # The second search is served from the cache and the index
+        assert api_filter.calls == ["sites", "racks", "devices", "device-types"]
+
+    def test_invalid_face(self):
+        """Unknown faces are rejected."""
+        result = netbox_find_rack_space(None, site="ams", face="top")
+
+        assert result["error_type"] == "ValidationError"
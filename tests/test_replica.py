@@ -0,0 +1,207 @@
+"""
+Tests for the local inventory replica.
+
+This module tests the columnar ReplicaTable, local filter answering,
+changelog sync and the EndpointWrapper integration.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig, ReplicaConfig
+from netbox_mcp.replica import REPLICA_MODELS, ReplicaResult, ReplicaStore, ReplicaTable
+
+
+def record(data):
+    """A stand-in for a pynetbox Record."""
+    return SimpleNamespace(serialize=lambda: dict(data), **data)
+
+
+def change(change_id, model, obj_id, action):
+    """A stand-in for an object-change Record."""
+    return SimpleNamespace(id=change_id, changed_object_type=model, changed_object_id=obj_id,
+                           action={"value": action, "label": action.title()})
+
+
+DEVICES = [
+    {"id": 1, "name": "leaf-01", "site": 5, "status": "active", "primary_ip4": None},
+    {"id": 2, "name": "leaf-02", "site": 5, "status": "active", "primary_ip4": 40},
+    {"id": 3, "name": "spine-01", "site": 6, "status": "planned", "primary_ip4": 41},
+]
+
+
+def make_table():
+    table = ReplicaTable("dcim.devices", REPLICA_MODELS["dcim.devices"])
+    for device in DEVICES:
+        table.upsert(device)
+    return table
+
+
+class TestReplicaTable:
+    """Test columnar storage and indexes."""
+
+    def test_match_uses_indexes(self):
+        """Equality criteria are intersected; list values match any."""
+        table = make_table()
+
+        assert [r["name"] for r in table.match({"site": [5]})] == ["leaf-01", "leaf-02"]
+        assert [r["id"] for r in table.match({"site": [5], "primary_ip4": [None]})] == [1]
+        assert [r["id"] for r in table.match({"status": ["active", "planned"]})] == [1, 2, 3]
+        assert table.match({"id": [3, 99]}) == [DEVICES[2]]
+
+    def test_update_and_swap_remove_keep_indexes_consistent(self):
+        """Updates re-index and removals move the last row without losing it."""
+        table = make_table()
+        table.upsert({**DEVICES[0], "site": 6})
+        assert table.remove(2) is True
+        assert table.remove(2) is False
+
+        assert [r["id"] for r in table.match({"site": [6]})] == [1, 3]
+        assert table.match({"site": [5]}) == []
+        assert table.get_row(3) == DEVICES[2]
+        assert len(table) == 2
+
+
+class TestReplicaFilter:
+    """Test which filters the replica answers."""
+
+    def make_store(self, **config_overrides):
+        store = ReplicaStore(Mock(), ReplicaConfig(**config_overrides))
+        store.tables = {"dcim.devices": make_table()}
+        store.watermark = time.time()
+        return store
+
+    def test_related_filters_and_watermark(self):
+        """<field>_id filters match related IDs and carry the sync watermark."""
+        store = self.make_store()
+
+        result = store.filter("dcim.devices", {"site_id": "5", "primary_ip4_id": "null"})
+
+        assert isinstance(result, ReplicaResult)
+        assert [r["id"] for r in result] == [1]
+        assert result.watermark == store.watermark
+
+    @pytest.mark.parametrize("object_type,filters", [
+        ("dcim.devices", {"site": "ams"}),           # slug filter needs the API
+        ("dcim.devices", {"name__ic": "leaf"}),      # lookup expressions are not replicated
+        ("dcim.devices", {"site_id": "ams"}),        # non-numeric ID
+        ("dcim.manufacturers", {"name": "Cisco"}),   # model not replicated
+    ])
+    def test_declines_unanswerable_filters(self, object_type, filters):
+        """Anything outside the whitelist falls through to the API."""
+        assert self.make_store().filter(object_type, filters) is None
+
+    def test_stale_replica_is_not_served(self):
+        """Reads fall through once the last sync is older than max_staleness."""
+        store = self.make_store(max_staleness=60)
+        store.watermark = time.time() - 120
+
+        assert store.filter("dcim.devices", {"name": "leaf-01"}) is None
+
+
+class TestReplicaSync:
+    """Test bulk load and changelog sync."""
+
+    def make_store(self):
+        client = Mock()
+        client.api.dcim.devices.all.return_value = [record(d) for d in DEVICES]
+        changelog = client.api.core.object_changes
+        changelog.filter.return_value = [change(100, "dcim.device", 1, "update")]
+        store = ReplicaStore(client, ReplicaConfig(models=["dcim.devices"]))
+        store.load()
+        return store, client, changelog
+
+    def test_load_records_changelog_position(self):
+        """The changelog position is taken before loading."""
+        store, _, _ = self.make_store()
+
+        assert store._last_change_id == 100
+        assert store.get_stats()["tables"] == {"dcim.devices": 3}
+
+    def test_sync_applies_changes(self):
+        """Changed objects are re-fetched in one query and deletions dropped."""
+        store, client, changelog = self.make_store()
+        changelog.filter.return_value = [
+            change(101, "dcim.device", 1, "update"),
+            change(102, "dcim.device", 2, "delete"),
+            change(103, "dcim.site", 5, "update"),
+            change(104, "dcim.device", 9, "create"),
+        ]
+        client.api.dcim.devices.filter.return_value = [
+            record({**DEVICES[0], "status": "offline"}),
+            record({"id": 9, "name": "leaf-09", "site": 5, "status": "active", "primary_ip4": None}),
+        ]
+
+        assert store.sync() == 4
+
+        changelog.filter.assert_called_with(id__gt=100, ordering="id")
+        client.api.dcim.devices.filter.assert_called_once_with(id=[1, 9])
+        assert [r["name"] for r in store.filter("dcim.devices", {"site_id": 5})] == ["leaf-01", "leaf-09"]
+        assert store.filter("dcim.devices", {"id": 1})[0]["status"] == "offline"
+        assert store._last_change_id == 104
+
+
+class TestEndpointWrapperIntegration:
+    """Test replica reads and write-through via the client."""
+
+    def make_client(self):
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        store = ReplicaStore(client, client.config.replica)
+        store.tables = {"dcim.devices": make_table()}
+        store.watermark = time.time()
+        client.replica = store
+        return client
+
+    def test_filter_served_locally(self):
+        """Whitelisted filters never reach pynetbox."""
+        client = self.make_client()
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter") as api_filter:
+            result = client.dcim.devices.filter(site_id=5, status="active")
+            client.dcim.devices.filter(site_id=5, no_cache=True)
+
+        assert [r["name"] for r in result] == ["leaf-01", "leaf-02"]
+        api_filter.assert_called_once_with(site_id=5)
+
+    def test_writes_are_applied_immediately(self):
+        """Creates through the wrapper are visible to the next replica read."""
+        client = self.make_client()
+        created = Mock(id=4)
+        created.serialize.return_value = {"id": 4, "name": "leaf-04", "site": 5,
+                                          "status": "active", "primary_ip4": None}
+
+        with patch("pynetbox.core.endpoint.Endpoint.create", return_value=created):
+            client.dcim.devices.create(confirm=True, name="leaf-04", site=5)
+
+        assert [r["id"] for r in client.dcim.devices.filter(site_id=5)] == [1, 2, 4]
+
+    def test_background_load_falls_through_until_fresh(self):
+        """While the replica loads in the background, reads go to the API."""
+        client = NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+        release = threading.Event()
+        loaded = threading.Event()
+
+        def slow_load(store):
+            release.wait(5)
+            store.tables = {"dcim.devices": make_table()}
+            store.watermark = time.time()
+            loaded.set()
+
+        with patch.object(ReplicaStore, "load", slow_load), patch.object(ReplicaStore, "start"), \
+                patch("pynetbox.core.endpoint.Endpoint.filter", return_value=[]) as api_filter:
+            store = client.enable_replica(background=True)
+            assert client.replica is store
+            client.dcim.devices.filter(site_id=5)
+            assert api_filter.call_count == 1
+
+            release.set()
+            assert loaded.wait(5)
+            result = client.dcim.devices.filter(site_id=5, status="active")
+
+        assert [r["name"] for r in result] == ["leaf-01", "leaf-02"]
+        assert api_filter.call_count == 1
@@ -0,0 +1,136 @@
+"""
+Tests for concurrent reference resolution.
+
+This module tests NetBoxClient.resolve_all() and its use by the
+provisioning tools.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import EndpointWrapper, Lookup, NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.exceptions import NetBoxError, NetBoxNotFoundError
+from netbox_mcp.tools.dcim.devices import netbox_provision_new_device
+from netbox_mcp.tools.virtualization.clusters import netbox_create_cluster
+
+DATA = {
+    "dcim.sites": [{"id": 1, "name": "Main DC", "slug": "main-dc"}],
+    "dcim.racks": [
+        {"id": 10, "name": "R-12", "site": 2, "u_height": 42},
+        {"id": 11, "name": "R-12", "site": 1, "u_height": 42},
+    ],
+    "dcim.device-types": [{"id": 20, "model": "C9300-24T", "slug": "c9300-24t", "u_height": 1}],
+    "dcim.device-roles": [{"id": 30, "name": "Access Switch", "slug": "access-switch"}],
+    "virtualization.cluster-types": [{"id": 40, "name": "VMware vSphere"}],
+}
+
+
+def fake_filter(delay=0.0):
+    """Build an EndpointWrapper.filter replacement serving DATA."""
+    def filter(self, *args, no_cache=False, **kwargs):
+        time.sleep(delay)
+        if kwargs.get("name") == "boom":
+            raise RuntimeError("HTTP 500")
+        return [
+            obj for obj in DATA.get(self._obj_type, [])
+            if all(obj.get(key) == value for key, value in kwargs.items() if key in obj)
+        ]
+    return filter
+
+
+@pytest.fixture
+def client():
+    """A client whose endpoint filters are served from DATA."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+    with patch.object(EndpointWrapper, "filter", fake_filter()):
+        yield NetBoxClient(config)
+
+
+class TestResolveAll:
+    """Test NetBoxClient.resolve_all()."""
+
+    def test_resolves_with_slug_fallback(self, client):
+        """Values are tried against each field in order."""
+        refs = client.resolve_all({
+            "site": Lookup("dcim.sites", "main-dc"),
+            "role": Lookup("dcim.device_roles", "Access Switch"),
+            "tenant": None,
+            "platform": Lookup("dcim.platforms", None, required=False),
+        })
+
+        assert refs["site"]["id"] == 1
+        assert refs["role"]["id"] == 30
+        assert refs["tenant"] is None and refs["platform"] is None
+
+    def test_missing_references_are_aggregated(self, client):
+        """All required misses are reported in a single error."""
+        with pytest.raises(NetBoxNotFoundError) as exc_info:
+            client.resolve_all({
+                "site": Lookup("dcim.sites", "Nowhere", label="Site"),
+                "device_type": Lookup("dcim.device_types", "X1", fields=("model", "slug")),
+                "platform": Lookup("dcim.platforms", "ios", required=False),
+            })
+
+        assert exc_info.value.message == "Site 'Nowhere' not found; Device type 'X1' not found"
+        assert exc_info.value.details["missing"] == {"site": "Nowhere", "device_type": "X1"}
+
+    def test_api_errors_are_raised(self, client):
+        """Lookup failures other than misses raise NetBoxError."""
+        with pytest.raises(NetBoxError, match="site: HTTP 500"):
+            client.resolve_all({
+                "site": Lookup("dcim.sites", "boom"),
+                "role": Lookup("dcim.device_roles", "Access Switch"),
+            })
+
+    def test_lookups_run_concurrently(self):
+        """Latency is bounded by the slowest lookup, not the sum."""
+        config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+        with patch.object(EndpointWrapper, "filter", fake_filter(delay=0.2)):
+            client = NetBoxClient(config)
+            start = time.time()
+            client.resolve_all({
+                "site": Lookup("dcim.sites", "Main DC"),
+                "role": Lookup("dcim.device_roles", "Access Switch"),
+                "device_type": Lookup("dcim.device_types", "C9300-24T", fields=("model",)),
+                "cluster_type": Lookup("virtualization.cluster_types", "VMware vSphere"),
+            })
+            elapsed = time.time() - start
+
+        assert elapsed < 0.6
+        assert any(t.name.startswith("netbox-lookup") for t in threading.enumerate())
+
+
+class TestProvisioningTools:
+    """Test the tools built on resolve_all()."""
+
+    def test_provision_picks_rack_in_site(self, client):
+        """The rack is chosen from the candidates in the resolved site."""
+        result = netbox_provision_new_device(
+            client, device_name="sw-01", site_name="main-dc", rack_name="R-12",
+            device_model="c9300-24t", role_name="Access Switch", position=10
+        )
+
+        assert result["success"] is True
+        assert result["device"]["would_create"]["rack"] == 11
+        assert result["device"]["would_create"]["site"] == 1
+
+    def test_provision_reports_all_missing_references(self, client):
+        """Every missing reference is reported at once."""
+        result = netbox_provision_new_device(
+            client, device_name="sw-01", site_name="Nowhere", rack_name="R-12",
+            device_model="X1", role_name="Access Switch", position=10
+        )
+
+        assert result["success"] is False
+        assert result["error_type"] == "NotFoundError"
+        assert result["error"] == "Site 'Nowhere' not found; Device type 'X1' not found"
+
+    def test_create_cluster_missing_site(self, client):
+        """netbox_create_cluster keeps raising ValueError for missing references."""
+        with pytest.raises(ValueError, match="Site 'Nowhere' not found"):
+            netbox_create_cluster(client, name="c1", cluster_type="VMware vSphere",
+                                  site="Nowhere", confirm=True)
@@ -0,0 +1,86 @@
+"""
+Tests for response shaping.
+
+This module tests truncation of results over the token budget, stable
+continuation cursors and netbox_fetch_more.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.config import ResponseConfig
+from netbox_mcp.response_shaping import ResponseShaper, estimate_tokens
+from netbox_mcp.tools.system.results import netbox_fetch_more
+
+
+def device_list(count):
+    return {
+        "success": True,
+        "count": count,
+        "devices": [{"id": i, "name": f"device-{i:04d}", "site": "Amsterdam"} for i in range(count)],
+        "summary_stats": {"total": count},
+    }
+
+
+@pytest.fixture
+def shaper():
+    """A shaper with a small budget, installed as the global one."""
+    shaper = ResponseShaper(ResponseConfig(max_tokens=500))
+    with patch("netbox_mcp.tools.system.results.get_response_shaper", return_value=shaper):
+        yield shaper
+
+
+class TestResponseShaper:
+    """Test truncation and cursors."""
+
+    def test_small_results_are_untouched(self, shaper):
+        """Results within the budget are returned as they are."""
+        result = device_list(3)
+        assert shaper.shape("netbox_list_all_devices", result) is result
+
+    def test_pages_cover_the_result_exactly_once(self, shaper):
+        """Truncated lists resume where they stopped until every item was returned."""
+        result = device_list(200)
+        first = shaper.shape("netbox_list_all_devices", result)
+
+        assert estimate_tokens(first) <= 500
+        assert first["summary_stats"] == {"total": 200}
+        assert first["continuation"]["totals"] == {"devices": 200}
+        assert result["devices"][199]["id"] == 199
+
+        seen = [d["id"] for d in first["devices"]]
+        cursor = first["continuation"]["cursor"]
+        while cursor:
+            page = netbox_fetch_more(None, cursor=cursor)
+            assert page["success"] is True
+            assert estimate_tokens(page) <= 500
+            seen.extend(d["id"] for d in page["items"]["devices"])
+            cursor = page["continuation"].get("cursor")
+        assert seen == list(range(200))
+
+    def test_cursors_are_stable(self, shaper):
+        """Fetching a cursor twice returns the same page."""
+        first = shaper.shape("netbox_list_all_devices", device_list(200))
+        cursor = first["continuation"]["cursor"]
+
+        assert shaper.fetch(cursor) == shaper.fetch(cursor)
+
+    def test_nested_lists_share_the_budget(self, shaper):
+        """Lists inside nested dicts are paged one after the other."""
+        result = {"resources": {"devices": device_list(60)["devices"], "vlans": device_list(60)["devices"]}}
+        first = shaper.shape("netbox_get_tenant_resource_report", result)
+
+        assert first["continuation"]["totals"] == {"resources.devices": 60, "resources.vlans": 60}
+        assert first["resources"]["vlans"] == []
+        assert len(first["resources"]["devices"]) < 60
+
+    def test_unknown_and_evicted_cursors(self):
+        """Cursors past max_cursors or malformed are reported as not found."""
+        shaper = ResponseShaper(ResponseConfig(max_tokens=500, max_cursors=1))
+        old = shaper.shape("t", device_list(200))["continuation"]["cursor"]
+        shaper.shape("t", device_list(200))
+
+        with patch("netbox_mcp.tools.system.results.get_response_shaper", return_value=shaper):
+            assert netbox_fetch_more(None, cursor=old)["error_type"] == "NotFound"
+            assert netbox_fetch_more(None, cursor="garbage")["error_type"] == "NotFound"
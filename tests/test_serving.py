@@ -0,0 +1,145 @@
+"""
+Tests for multi-process serving.
+
+This module tests state shared between worker processes: cursors fetched
+from another worker, metrics aggregated over workers, request dispatch
+between MCP and the REST API, and transport validation.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from netbox_mcp.client import ConnectionStatus
+from netbox_mcp.config import NetBoxConfig, ResponseConfig, TransportConfig
+from netbox_mcp.health import ReadinessProber
+from netbox_mcp.response_shaping import ResponseShaper
+from netbox_mcp.serving import MetricsPublisher, aggregate_snapshots, combine_apps, read_snapshots, worker_components
+
+
+def device_list(count):
+    return {"success": True, "devices": [{"id": i, "name": f"device-{i:04d}"} for i in range(count)]}
+
+
+def pool(completed, avg, p95, maximum):
+    return {"max_workers": 16, "queue_depth": 0, "active": 1, "completed": completed, "failed": 0,
+            "cancelled": 0, "wait_time_ms": {"avg": avg, "p95": p95, "max": maximum}}
+
+
+def operation(total, duration):
+    return {"total_operations": total, "successful_operations": total, "total_duration": duration,
+            "min_duration": 0.1, "max_duration": duration, "last_execution": "2026-01-01 00:00:00"}
+
+
+class TestSharedCursors:
+    """Test cursors across workers."""
+
+    def test_cursor_fetched_from_another_worker(self, tmp_path):
+        """A worker that did not truncate a result serves its pages, in any order."""
+        config = ResponseConfig(max_tokens=500)
+        first = ResponseShaper(config, shared_dir=str(tmp_path))
+        second = ResponseShaper(config, shared_dir=str(tmp_path))
+
+        shaped = first.shape("netbox_list_all_devices", device_list(200))
+        cursor = shaped["continuation"]["cursor"]
+        page_two = first.fetch(cursor)
+        cursor_three = page_two["continuation"]["cursor"]
+
+        # The second worker never saw page two being handed out
+        assert second.fetch(cursor_three) == first.fetch(cursor_three)
+
+        seen = [d["id"] for d in shaped["devices"]]
+        workers = [second, first]
+        while cursor:
+            page = workers[len(seen) % 2].fetch(cursor)
+            seen.extend(d["id"] for d in page["items"]["devices"])
+            cursor = page["continuation"].get("cursor")
+        assert seen == list(range(200))
+
+    def test_shared_results_are_pruned(self, tmp_path):
+        """No more than max_cursors results stay in the shared directory."""
+        shaper = ResponseShaper(ResponseConfig(max_tokens=500, max_cursors=2), shared_dir=str(tmp_path))
+        for _ in range(4):
+            shaper.shape("t", device_list(200))
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+class TestWorkerMetrics:
+    """Test metrics aggregation."""
+
+    def test_snapshots_are_merged(self):
+        """Counters are summed, the average weighted and maxima kept."""
+        snapshots = [
+            {"pid": 1, "updated": 0, "tool_executor": {"default": pool(10, 2.0, 5.0, 9.0)},
+             "operations": {"netbox_get_device": operation(10, 1.0)}},
+            {"pid": 2, "updated": 0, "tool_executor": {"default": pool(30, 6.0, 8.0, 12.0)},
+             "operations": {"netbox_get_device": operation(30, 6.0)}},
+        ]
+        metrics = aggregate_snapshots(snapshots)
+
+        merged = metrics["tool_executor"]["default"]
+        assert metrics["worker_count"] == 2
+        assert merged["completed"] == 40
+        assert merged["max_workers"] == 32
+        assert merged["wait_time_ms"] == {"avg": 5.0, "p95": 8.0, "max": 12.0}
+        assert metrics["operations"]["netbox_get_device"]["total_operations"] == 40
+        assert metrics["operations"]["netbox_get_device"]["average_duration"] == pytest.approx(0.175)
+
+    def test_published_snapshots_are_read_back(self, tmp_path):
+        """Each worker's published snapshot is read; stale ones are dropped."""
+        MetricsPublisher(str(tmp_path), interval=5).publish()
+        (tmp_path / "999999.json").write_text('{"pid": 999999, "updated": 0}')
+
+        snapshots = read_snapshots(str(tmp_path), max_age=15)
+        assert len(snapshots) == 1
+        assert not (tmp_path / "999999.json").exists()
+
+    def test_supervisor_readiness_reports_worker_components(self, tmp_path):
+        """The supervisor's prober lists the workers' caches and the tools any worker sheds."""
+        def snapshot(pid, size, shedding):
+            cache = {"warm": size > 0, "size": size}
+            components = {"cache": cache, "replica": None, "shedding_tools": shedding}
+            (tmp_path / f"{pid}.json").write_text(json.dumps({"pid": pid, "updated": time.time(),
+                                                              "components": components}))
+
+        snapshot(101, 12, ["netbox_list_all_devices"])
+        snapshot(102, 0, [])
+        supervisor_client = SimpleNamespace(
+            health_check=lambda force=False: ConnectionStatus(connected=True, version="4.1"),
+        )
+        prober = ReadinessProber(lambda: supervisor_client, get_components=worker_components(str(tmp_path), 15))
+        prober.probe()
+        ready, detail = prober.readiness()
+
+        assert ready is True
+        assert "cache" not in detail and "replica" not in detail
+        assert [(w["pid"], w["cache"]["size"]) for w in detail["workers"]] == [(101, 12), (102, 0)]
+        assert detail["shedding_tools"] == ["netbox_list_all_devices"]
+
+
+class TestWorkerApp:
+    """Test dispatch and configuration."""
+
+    def test_api_paths_reach_the_rest_api(self):
+        """REST API paths go to the API app, everything else to MCP."""
+        mcp_app = Starlette(routes=[Route("/mcp", lambda request: PlainTextResponse("mcp"), methods=["POST"])])
+        api_app = Starlette(routes=[Route("/api/v1/tools", lambda request: PlainTextResponse("api"))])
+        client = TestClient(combine_apps(mcp_app, api_app))
+
+        assert client.get("/api/v1/tools").text == "api"
+        assert client.post("/mcp").text == "mcp"
+
+    def test_multiple_workers_need_streamable_http(self):
+        """SSE sessions live in one process, so it cannot run several workers."""
+        with pytest.raises(ValueError, match="streamable-http"):
+            NetBoxConfig(url="https://netbox.example.com", token="t",
+                         transport=TransportConfig(mode="sse", workers=4))
+        config = NetBoxConfig(url="https://netbox.example.com", token="t",
+                              transport=TransportConfig(mode="streamable-http", workers=4, port=9000))
+        assert config.transport.get_state_dir().endswith("netbox-mcp-9000")
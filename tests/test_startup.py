@@ -0,0 +1,94 @@
+"""
+Tests for server startup.
+
+This module tests that the server registers its tools from the manifest
+without importing tool modules, that tools are imported on first call, and
+that the shipped manifest matches what introspecting the tools produces.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from netbox_mcp.tool_manifest import load_manifest, tools_fingerprint
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return its JSON output."""
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Generous ceiling on importing the server in a fresh interpreter; eager tool
+# loading or heavy imports at module level push it well past this
+IMPORT_BUDGET_SECONDS = 10.0
+
+
+class TestStartup:
+    """Test lazy tool loading."""
+
+    def test_server_import_fits_the_budget(self):
+        """Importing the server in a fresh interpreter stays within the import budget."""
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import netbox_mcp.server"], capture_output=True, check=True)
+        elapsed = time.perf_counter() - started
+        assert elapsed < IMPORT_BUDGET_SECONDS, f"Importing netbox_mcp.server took {elapsed:.1f}s"
+
+    def test_manifest_is_current(self):
+        """The shipped manifest was generated from the current tool sources."""
+        manifest = load_manifest()
+        assert manifest is not None, "Regenerate it with: python -m netbox_mcp.tool_manifest"
+        assert manifest["fingerprint"] == tools_fingerprint()
+
+    def test_manifest_matches_introspection(self):
+        """Regenerating the manifest from the tool functions reproduces the shipped one."""
+        result = run_python(
+            "import json\n"
+            "from netbox_mcp.tool_manifest import build_manifest, load_manifest\n"
+            "print(json.dumps({'same': json.loads(json.dumps(build_manifest())) == load_manifest()}))\n"
+        )
+        assert result["same"] is True, "Regenerate it with: python -m netbox_mcp.tool_manifest"
+
+    def test_registry_from_manifest_matches_introspection(self):
+        """Tools registered from the manifest carry the metadata introspection gives them."""
+        dump_registry = (
+            "import json\n"
+            "from netbox_mcp import registry\n"
+            "from netbox_mcp.tool_manifest import use_manifest\n"
+            "{install}"
+            "registry.load_tools()\n"
+            "tools = {{n: {{k: v for k, v in m.items() if k != 'function'}} for n, m in registry.TOOL_REGISTRY.items()}}\n"
+            "print(json.dumps({{'installed': bool(registry.TOOL_MANIFEST), 'tools': tools}}))\n"
+        )
+        introspected = run_python(dump_registry.format(install=""))
+        from_manifest = run_python(dump_registry.format(install="use_manifest()\n"))
+
+        assert introspected["installed"] is False
+        assert from_manifest["installed"] is True
+        assert from_manifest["tools"] == introspected["tools"]
+
+    def test_server_import_loads_no_tool_modules(self):
+        """All tools are listed while no tool module has been imported."""
+        result = run_python(
+            "import json, sys\n"
+            "import netbox_mcp.server as server\n"
+            "modules = [m for m in sys.modules if m.startswith('netbox_mcp.tools.') and m.count('.') > 2]\n"
+            "print(json.dumps({'modules': modules, 'tools': len(server.mcp._tool_manager.list_tools())}))\n"
+        )
+        assert result["modules"] == []
+        assert result["tools"] == len(load_manifest()["tools"])
+
+    def test_first_call_imports_only_the_tool_module(self):
+        """Resolving a tool imports its own module and builds the same schema."""
+        result = run_python(
+            "import json, sys\n"
+            "import netbox_mcp.server as server\n"
+            "tool = server.mcp._tool_manager.get_tool('netbox_fetch_more')\n"
+            "listed = tool.parameters\n"
+            "resolved = tool.resolve()\n"
+            "modules = [m for m in sys.modules if m.startswith('netbox_mcp.tools.') and m.count('.') > 2]\n"
+            "print(json.dumps({'modules': modules, 'same_schema': listed == resolved.parameters}))\n"
+        )
+        assert result["modules"] == ["netbox_mcp.tools.system.results"]
+        assert result["same_schema"] is True
@@ -0,0 +1,145 @@
+"""
+Tests for the tenant rollup index.
+
+This module tests per-tenant ownership tracking, incremental updates from
+writes, and netbox_get_tenant_resource_report on top of the index.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from netbox_mcp.client import EndpointWrapper, NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.tenant_index import TenantRollup
+from netbox_mcp.tools.tenancy.resources import netbox_get_tenant_resource_report
+
+
+DATA = {
+    "tenancy.tenants": [{"id": 1, "name": "Customer-A", "slug": "customer-a"}],
+    "dcim.devices": [
+        {"id": 10, "name": "sw1", "tenant": {"id": 1}, "site": {"id": 5}, "status": {"value": "active"}},
+        {"id": 11, "name": "sw2", "tenant": {"id": 1}, "site": {"id": 6}, "status": {"value": "planned"}},
+        {"id": 12, "name": "sw3", "tenant": {"id": 2}, "site": {"id": 5}, "status": {"value": "active"}},
+        {"id": 13, "name": "sw4", "tenant": None, "site": {"id": 5}, "status": {"value": "active"}},
+    ],
+    "ipam.prefixes": [
+        {"id": 20, "prefix": "10.0.0.0/24", "tenant": {"id": 1}, "scope_type": "dcim.site", "scope_id": 5,
+         "status": {"value": "active"}},
+    ],
+}
+
+
+def fake_filter(self, *args, no_cache=False, **kwargs):
+    """EndpointWrapper.filter replacement serving DATA."""
+    fake_filter.calls.append((self._replica_key, kwargs))
+    rows = DATA.get(self._replica_key, [])
+    if "id" in kwargs:
+        return [row for row in rows if row["id"] in kwargs["id"]]
+    return [row for row in rows if all(row.get(k) == v for k, v in kwargs.items() if k in row)]
+
+
+@pytest.fixture
+def client():
+    """A client whose listings and lookups are served from DATA."""
+    config = NetBoxConfig(url="https://netbox.example.com", token="test-token")
+    fake_filter.calls = []
+    with patch.object(EndpointWrapper, "filter", fake_filter), \
+            patch.object(NetBoxClient, "stream", side_effect=lambda endpoint, **kw: iter(DATA.get(endpoint, []))):
+        yield NetBoxClient(config)
+
+
+class TestTenantRollup:
+    """Test ownership tracking."""
+
+    def test_ids_scoping_and_updates(self):
+        """Objects move between tenants on update and scope by site and status."""
+        rollup = TenantRollup()
+        for record in DATA["dcim.devices"]:
+            rollup.upsert("devices", record)
+        rollup.upsert("prefixes", DATA["ipam.prefixes"][0])
+
+        assert rollup.ids("devices", 1) == [10, 11]
+        assert rollup.ids("devices", 1, site_id=5) == [10]
+        assert rollup.ids("devices", 1, status="planned") == [11]
+        assert rollup.ids("prefixes", 1, site_id=5) == [20]
+        # Site scoping does not apply to types without a site
+        assert rollup.ids("circuits", 1, site_id=5) == []
+
+        rollup.upsert("devices", {"id": 10, "tenant": 2, "site": 5, "status": "active"})
+        rollup.remove("devices", 11)
+        assert rollup.ids("devices", 1) == []
+        assert rollup.ids("devices", 2) == [10, 12]
+
+
+class TestRollupSync:
+    """Test changelog sync of an expired rollup."""
+
+    def test_expired_rollup_is_synced_not_swept(self, client):
+        """Changes made elsewhere are applied from the changelog by ID; no sweep is repeated."""
+        rollup = client.tenant_rollup.get()
+        assert NetBoxClient.stream.call_count == 8
+        rollup.synced_at -= client.config.cache.ttl.default
+        changes = {"dcim.device": {11: "update", 12: "delete", 15: "create"}, "tenancy.tenant": {2: "delete"}}
+        changed = [SimpleNamespace(id=11, tenant=None, site=6, status="planned"),
+                   SimpleNamespace(id=15, tenant=1, site=5, status="active")]
+
+        with patch.object(NetBoxClient, "get_object_changes_since", return_value=changes) as since, \
+                patch("pynetbox.core.endpoint.Endpoint.filter",
+                      side_effect=lambda **kw: [dict(vars(r)) for r in changed]) as api_filter:
+            assert client.tenant_rollup.get() is rollup
+
+        assert NetBoxClient.stream.call_count == 8
+        assert since.call_args[0][1] >= {"dcim.device", "tenancy.tenant"}
+        api_filter.assert_called_once_with(id=[11, 15], fields="id,tenant,site,scope_type,scope_id,status")
+        assert rollup.ids("devices", 1) == [10, 15]
+        assert rollup.ids("devices", 2) == []
+
+    def test_failed_sync_sweeps_again(self, client):
+        """When the changelog cannot be read the rollup is swept from scratch."""
+        rollup = client.tenant_rollup.get()
+        rollup.synced_at -= client.config.cache.ttl.default
+
+        with patch.object(NetBoxClient, "get_object_changes_since", side_effect=RuntimeError("no changelog")):
+            assert client.tenant_rollup.get() is not rollup
+        assert NetBoxClient.stream.call_count == 16
+
+
+class TestTenantReport:
+    """Test the report on top of the index."""
+
+    def test_summary_from_index_and_incremental_writes(self, client):
+        """Summary reports need no record fetches and follow writes without a new sweep."""
+        report = netbox_get_tenant_resource_report(client, tenant_name="Customer-A", export_format="summary")
+        assert report["resource_counts"] == {"devices": 2, "prefixes": 1}
+        assert not any("id" in kwargs for _, kwargs in fake_filter.calls)
+
+        client.dcim.devices._after_write(record={"id": 14, "name": "sw5", "tenant": 1, "site": 5, "status": "active"})
+        client.dcim.devices._after_write(deleted_ids=[10])
+        report = netbox_get_tenant_resource_report(client, tenant_name="customer-a", export_format="summary")
+
+        assert report["resource_counts"] == {"devices": 2, "prefixes": 1}
+        assert NetBoxClient.stream.call_count == 8
+
+    def test_detailed_report_fetches_by_id(self, client):
+        """Records are fetched by the IDs the index holds, scoped by site."""
+        DATA["dcim.sites"] = [{"id": 5, "name": "Amsterdam"}]
+        try:
+            report = netbox_get_tenant_resource_report(client, tenant_name="Customer-A",
+                                                       filter_by_site="Amsterdam", include_details=False)
+        finally:
+            del DATA["dcim.sites"]
+
+        assert report["success"] is True
+        assert [d["name"] for d in report["resources"]["devices"]] == ["sw1"]
+        assert report["summary"]["resource_breakdown"]["prefixes"] == 1
+        assert ("dcim.devices", {"id": [10]}) in fake_filter.calls
+
+    def test_falls_back_to_tenant_filters(self, client):
+        """Without the index each type is queried by tenant_id."""
+        NetBoxClient.stream.side_effect = RuntimeError("HTTP 500")
+        report = netbox_get_tenant_resource_report(client, tenant_name="Customer-A", export_format="summary")
+
+        assert report["success"] is True
+        assert ("dcim.devices", {"tenant_id": 1}) in fake_filter.calls
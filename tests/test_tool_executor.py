@@ -0,0 +1,227 @@
+"""
+Tests for the tool executor.
+
+This module tests that blocking tools run off the event loop in
+per-category pools, cancellation of queued calls, pool metrics, per-tool
+bulkheads and the async wrappers registered with FastMCP.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from netbox_mcp.config import ExecutionConfig, NetBoxConfig
+from netbox_mcp.exceptions import NetBoxOverloadedError, NetBoxTimeoutError
+from netbox_mcp.registry import mcp_tool
+from netbox_mcp.tool_executor import ToolExecutor
+
+
+def tool(name, cost="standard", max_concurrency=None, timeout=None):
+    """A TOOL_REGISTRY-style entry."""
+    return {"name": name, "category": "ipam",
+            "execution": {"cost": cost, "max_concurrency": max_concurrency, "timeout": timeout}}
+
+
+class TestToolExecutor:
+    """Test pools, cancellation and metrics."""
+
+    def test_blocking_calls_do_not_stall_the_loop(self):
+        """The loop keeps running while tools block in worker threads."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=4))
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            results = await asyncio.gather(*(executor.run("ipam", time.sleep, 0.2) for _ in range(4)))
+            task.cancel()
+            return ticks, results
+
+        started = time.monotonic()
+        ticks, results = asyncio.run(main())
+        assert results == [None] * 4
+        assert ticks >= 10
+        assert time.monotonic() - started < 0.6
+        executor.shutdown()
+
+    def test_category_pools_are_isolated(self):
+        """A saturated category pool does not delay calls in other categories."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=2, category_workers={"ipam": 1}))
+        release = threading.Event()
+
+        async def main():
+            blocked = asyncio.ensure_future(executor.run("ipam", release.wait))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(executor.run("ipam", lambda: "ipam"))
+            other = await asyncio.wait_for(executor.run("dcim", lambda: "dcim"), timeout=1)
+            metrics = executor.get_metrics()
+            release.set()
+            return other, await blocked, await queued, metrics
+
+        other, _, queued, metrics = asyncio.run(main())
+        assert (other, queued) == ("dcim", "ipam")
+        assert metrics["ipam"]["max_workers"] == 1
+        assert metrics["ipam"]["active"] == 1
+        assert metrics["ipam"]["queue_depth"] == 1
+        assert metrics["default"]["completed"] == 1
+        executor.shutdown()
+
+    def test_cancel_drops_queued_call(self):
+        """Cancelling a call that has not started means it never runs."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=1))
+        release = threading.Event()
+        ran = []
+
+        async def main():
+            blocked = asyncio.ensure_future(executor.run(None, release.wait))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(executor.run(None, ran.append, "queued"))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            release.set()
+            await blocked
+
+        asyncio.run(main())
+        metrics = executor.get_metrics()["default"]
+        assert ran == []
+        assert metrics["cancelled"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["completed"] == 1
+        assert metrics["wait_time_ms"]["max"] >= 0
+        executor.shutdown()
+
+    def test_execution_config_validation(self):
+        """Pool sizes must be positive."""
+        with pytest.raises(ValueError, match="Execution category workers"):
+            NetBoxConfig(url="https://netbox.example.com", token="test-token",
+                         execution=ExecutionConfig(category_workers={"ipam": 0}))
+
+
+class TestBulkheads:
+    """Test per-tool admission control."""
+
+    def test_expensive_tool_queues_then_rejects(self):
+        """Calls beyond the limit queue; beyond the queue they fail fast with a retry hint."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=8, expensive_max_concurrency=1, max_queued_per_tool=1))
+        report = tool("report", cost="expensive")
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.ensure_future(executor.run_tool(report, release.wait))
+            await asyncio.sleep(0.05)
+            second = asyncio.ensure_future(executor.run_tool(report, lambda: "second"))
+            await asyncio.sleep(0.05)
+            with pytest.raises(NetBoxOverloadedError) as exc_info:
+                await executor.run_tool(report, lambda: "third")
+            # Cheap lookups in the same pool are not held up
+            lookup = await asyncio.wait_for(executor.run_tool(tool("lookup", cost="cheap"), lambda: "ok"), 1)
+            metrics = executor.get_metrics()["tools"]["report"]
+            release.set()
+            return exc_info.value, lookup, metrics, await first, await second
+
+        error, lookup, metrics, _, second = asyncio.run(main())
+        assert error.retry_after >= 1
+        assert error.details["tool_name"] == "report"
+        assert (lookup, second) == ("ok", "second")
+        assert metrics == {"max_concurrency": 1, "running": 1, "queued": 1, "max_queued": 1, "rejected": 1}
+        assert executor.get_metrics()["tools"]["report"]["running"] == 0
+        executor.shutdown()
+
+    def test_cancelled_waiter_frees_its_place(self):
+        """A queued caller that gives up does not keep a slot."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=4))
+        limited = tool("limited", max_concurrency=1)
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.ensure_future(executor.run_tool(limited, release.wait))
+            await asyncio.sleep(0.05)
+            waiting = asyncio.ensure_future(executor.run_tool(limited, lambda: "never"))
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            await first
+            return await executor.run_tool(limited, lambda: "next")
+
+        assert asyncio.run(main()) == "next"
+        assert executor.get_metrics()["tools"]["limited"]["running"] == 0
+        executor.shutdown()
+
+    def test_timed_out_calls_keep_their_slot(self):
+        """A call that times out holds its slot until its thread actually finishes."""
+        executor = ToolExecutor(ExecutionConfig(max_workers=8))
+        limited = tool("limited", max_concurrency=2, timeout=0.05)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def body():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.3)
+            with lock:
+                running.pop()
+
+        async def main():
+            calls = [executor.run_tool(limited, body) for _ in range(4)]
+            results = await asyncio.gather(*calls, return_exceptions=True)
+            running_now = executor.get_metrics()["tools"]["limited"]["running"]
+            await asyncio.sleep(0.4)
+            return results, running_now
+
+        results, running_now = asyncio.run(main())
+        assert all(isinstance(r, NetBoxTimeoutError) for r in results)
+        assert max(peak) == 2
+        assert running_now == 2
+        assert executor.get_metrics()["tools"]["limited"]["running"] == 0
+        executor.shutdown()
+
+    def test_timeout(self):
+        """Calls exceeding the tool timeout raise NetBoxTimeoutError."""
+        executor = ToolExecutor()
+        with pytest.raises(NetBoxTimeoutError):
+            asyncio.run(executor.run_tool(tool("slow", timeout=0.05), time.sleep, 0.5))
+        executor.shutdown()
+
+    def test_write_tools_have_no_default_timeout(self):
+        """Only read-only tools get the default timeout; write tools must declare one."""
+        executor = ToolExecutor(ExecutionConfig(default_timeout=30))
+        write = {**tool("bulk_write"), "parameters": [{"name": "devices"}, {"name": "confirm"}]}
+
+        assert executor.limits(tool("read"))[1] == 30
+        assert executor.limits(write)[1] is None
+        assert executor.limits({**write, "execution": {"timeout": 900}})[1] == 900
+
+    def test_decorator_metadata(self):
+        """@mcp_tool records execution metadata and rejects unknown cost classes."""
+        from netbox_mcp.registry import TOOL_REGISTRY, load_tools
+
+        load_tools()
+        assert TOOL_REGISTRY["netbox_find_duplicate_ips"]["execution"]["cost"] == "expensive"
+        assert TOOL_REGISTRY["netbox_health_check"]["execution"]["cost"] == "cheap"
+        with pytest.raises(ValueError, match="Invalid cost class"):
+            mcp_tool(cost="huge")
+
+
+class TestBridge:
+    """Test the wrappers registered with FastMCP."""
+
+    def test_tools_are_registered_as_async(self):
+        """Bridged tool wrappers are coroutine functions."""
+        from netbox_mcp.server import mcp
+
+        tools = mcp._tool_manager.list_tools()
+        assert tools
+        assert all(tool.is_async for tool in tools)
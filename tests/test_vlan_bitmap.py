@@ -0,0 +1,107 @@
+"""
+Tests for the VLAN ID bitmap allocator.
+
+This module tests bitmap operations, the per-scope allocator with its
+write-through updates, and netbox_find_available_vlan_id.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from netbox_mcp.client import NetBoxClient
+from netbox_mcp.config import NetBoxConfig
+from netbox_mcp.tools.ipam.vlans import netbox_find_available_vlan_id
+from netbox_mcp.vlan_bitmap import VLANBitmap, find_contiguous, free_mask, free_ranges
+
+
+VLANS = [
+    {"id": 1, "vid": 10, "site": 5, "group": None},
+    {"id": 2, "vid": 11, "site": 5, "group": None},
+    {"id": 3, "vid": 13, "site": 5, "group": None},
+    {"id": 4, "vid": 12, "site": 6, "group": None},
+    {"id": 5, "vid": 20, "site": 6, "group": None},
+]
+
+
+def make_client():
+    return NetBoxClient(NetBoxConfig(url="https://netbox.example.com", token="test-token"))
+
+
+def api_filter(**kwargs):
+    """Stand-in for pynetbox filter over sites and VLANs."""
+    if "slug" in kwargs:
+        site_id = {"ams1": 5, "fra1": 6}.get(kwargs["slug"])
+        return [SimpleNamespace(serialize=lambda: {"id": site_id})] if site_id else []
+    if "name" in kwargs:
+        return []
+    return [SimpleNamespace(serialize=lambda v=v: dict(v))
+            for v in VLANS if v["site"] == kwargs["site_id"]]
+
+
+class TestBitmapOperations:
+    """Test bitmap primitives."""
+
+    def test_free_ranges_are_compact(self):
+        """Used VIDs split the free space into inclusive intervals."""
+        bitmap = VLANBitmap((v["id"], v["vid"]) for v in VLANS[:3])
+
+        assert free_ranges(free_mask(bitmap.used, 1, 4094)) == [(1, 9), (12, 12), (14, 4094)]
+        assert free_ranges(free_mask(bitmap.used, 10, 11)) == []
+
+    def test_find_contiguous(self):
+        """The first run of N free VIDs is found at any run length."""
+        used = VLANBitmap([(1, 3), (2, 7), (3, 8)]).used
+        mask = free_mask(used, 1, 20)
+
+        assert find_contiguous(mask, 1) == 1
+        assert find_contiguous(mask, 3) == 4
+        assert find_contiguous(mask, 5) == 9
+        assert find_contiguous(mask, 13) is None
+
+    def test_shared_vid_freed_only_by_last_vlan(self):
+        """A VID used by two VLANs stays used until both are removed."""
+        bitmap = VLANBitmap([(1, 100), (2, 100)])
+        bitmap.remove(1)
+        assert 100 in bitmap
+        bitmap.remove(2)
+        assert 100 not in bitmap
+
+
+class TestFindAvailableVlanId:
+    """Test the tool and allocator through the client."""
+
+    def test_ranges_contiguous_and_intersection(self):
+        """Free ranges are intersected across sites."""
+        client = make_client()
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", side_effect=api_filter):
+            result = netbox_find_available_vlan_id(
+                client, site="ams1", intersect_sites=["fra1"], start_vid=5, end_vid=25, contiguous=3
+            )
+
+        assert result["success"] is True
+        assert result["available_ranges"] == [[5, 9], [14, 19], [21, 25]]
+        assert result["count"] == 16
+        assert result["first_available"] == 5
+        assert result["contiguous_block"] == [5, 6, 7]
+
+    def test_created_vlans_update_loaded_bitmaps(self):
+        """Creates through the client mark the VID used without a refetch."""
+        client = make_client()
+        created = SimpleNamespace(id=9, serialize=lambda: {"id": 9, "vid": 14, "site": 5, "group": None})
+
+        with patch("pynetbox.core.endpoint.Endpoint.filter", side_effect=api_filter) as vlan_filter:
+            assert 14 not in client.vlan_allocator.get(site_id=5)
+            with patch("pynetbox.core.endpoint.Endpoint.create", return_value=created):
+                client.ipam.vlans.create(confirm=True, name="new", vid=14, site=5)
+            bitmap = client.vlan_allocator.get(site_id=5)
+
+        assert 14 in bitmap
+        assert vlan_filter.call_count == 1
+
+    def test_unknown_site(self):
+        """Unknown sites are reported, not treated as empty."""
+        with patch("pynetbox.core.endpoint.Endpoint.filter", side_effect=api_filter):
+            result = netbox_find_available_vlan_id(make_client(), site="nowhere")
+
+        assert result["error_type"] == "NotFoundError"